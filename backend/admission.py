@@ -0,0 +1,194 @@
+"""
+Admission control and rate limiting for the chat endpoints.
+Bounds concurrent RAG queries and rejects excess load early.
+
+AdmissionController admits at most `max_concurrency` queries at once and
+lets a bounded number wait; anything beyond that is rejected immediately
+(503 with Retry-After) instead of slowing every request down.
+TokenBucketLimiter enforces a per-client request rate (429 with Retry-After).
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Tuple
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Response headers for the rejection"""
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class AdmissionController:
+    """
+    Concurrency limiter with a bounded, time-limited wait queue.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        """
+        Args:
+            max_concurrency: Maximum requests processed at once
+            max_queue: Maximum requests waiting for a slot (0 = no queueing)
+            queue_timeout: Seconds a request may wait for a slot
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.max_waiting_seen = 0
+
+        # Exponentially weighted averages, used for Retry-After and metrics
+        self.avg_service_seconds = 1.0
+        self.avg_wait_seconds = 0.0
+
+    def retry_after(self) -> float:
+        """Estimated seconds until a new request would be admitted"""
+        return self.avg_service_seconds * (self.waiting + 1) / self.max_concurrency
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold a processing slot for the duration of the block.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait times out (503)
+        """
+        # Occupancy is counted synchronously, before the first await, so a
+        # burst arriving in the same event loop tick is bounded as well
+        if self.active + self.waiting >= self.max_concurrency + self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(503, "Server is busy, please retry shortly", self.retry_after())
+
+        self.waiting += 1
+        self.max_waiting_seen = max(self.max_waiting_seen, self.waiting)
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected_timeout += 1
+            raise AdmissionRejected(503, "Server is busy, please retry shortly", self.retry_after())
+        finally:
+            self.waiting -= 1
+
+        started = time.monotonic()
+        self.avg_wait_seconds += 0.2 * ((started - queued_at) - self.avg_wait_seconds)
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self.semaphore.release()
+            self.avg_service_seconds += 0.2 * ((time.monotonic() - started) - self.avg_service_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current queue depth and admission counters"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "max_queue_depth_seen": self.max_waiting_seen,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_wait_seconds": round(self.avg_wait_seconds, 3),
+            "avg_service_seconds": round(self.avg_service_seconds, 3),
+        }
+
+
+class TokenBucketLimiter:
+    """
+    Per-client token bucket rate limiter.
+
+    Each client key gets `burst` tokens, refilled at `rate_per_minute`.
+    A request costing more than `burst` (e.g. a large batch) is allowed from a
+    full bucket and leaves the bucket in debt until it refills.
+    Idle clients are evicted least-recently-used beyond `max_clients`.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: int,
+        max_clients: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            rate_per_minute: Sustained requests per minute per client (0 disables limiting)
+            burst: Maximum requests a client can make at once
+            max_clients: Maximum client buckets kept in memory
+            clock: Time source in seconds (injectable for tests)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_clients = max_clients
+        self.clock = clock
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """
+        Take `cost` tokens from a client's bucket.
+
+        Args:
+            key: Client identifier (IP or session)
+            cost: Tokens to take
+
+        Returns:
+            0.0 if allowed, otherwise seconds until enough tokens are available
+        """
+        if not self.enabled:
+            return 0.0
+
+        now = self.clock()
+        tokens, updated = self.buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+        required = min(cost, float(self.burst))
+        if tokens >= required:
+            tokens -= cost
+            retry_after = 0.0
+            self.allowed += 1
+        else:
+            retry_after = (required - tokens) / self.rate
+            self.limited += 1
+
+        self.buckets[key] = (tokens, now)
+        while len(self.buckets) > self.max_clients:
+            self.buckets.popitem(last=False)
+        return retry_after
+
+    def stats(self) -> Dict[str, Any]:
+        """Rate limiter counters"""
+        return {
+            "enabled": self.enabled,
+            "rate_per_minute": round(self.rate * 60, 2),
+            "burst": self.burst,
+            "tracked_clients": len(self.buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
@@ -0,0 +1,26 @@
+"""
+Authentication dependencies for the FastAPI server.
+Admin endpoints require ADMIN_API_KEY as a Bearer token or X-Admin-Key header.
+"""
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from config import config
+
+
+async def require_admin(
+    authorization: Optional[str] = Header(default=None),
+    x_admin_key: Optional[str] = Header(default=None),
+):
+    """Authenticate admin requests with ADMIN_API_KEY (Bearer token or X-Admin-Key header)"""
+    if not config.ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+
+    token = x_admin_key
+    if token is None and authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+
+    if not token or not secrets.compare_digest(token.encode(), config.ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin credentials")
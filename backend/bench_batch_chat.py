@@ -0,0 +1,75 @@
+"""
+Benchmark: one questionnaire via /api/chat/batch vs looping over /api/chat.
+Requires a running backend (uvicorn main:app) with an ingested collection.
+
+Usage: python bench_batch_chat.py [--questions 24] [--base-url http://localhost:8000]
+"""
+import argparse
+import time
+from typing import List
+
+import requests
+
+
+BASE_URL = "http://localhost:8000"
+
+SCREENING_QUESTIONS = [
+    "What programming languages does James know?",
+    "Does James have cloud experience with AWS, Azure or GCP?",
+    "Tell me about James's experience at EY",
+    "What is James's educational background?",
+    "Has James worked with LLMs or LangChain?",
+    "What machine learning frameworks has James used?",
+    "Does James have consulting experience?",
+    "What projects has James worked on?",
+    "Has James written any technical blog posts?",
+    "Does James know SQL databases?",
+    "Has James done reinforcement learning research?",
+    "Does James have front-end experience?",
+]
+
+
+def run_sequential(base_url: str, questions: List[str]) -> float:
+    """Answer each question with its own /api/chat request"""
+    started = time.perf_counter()
+    with requests.Session() as session:
+        for question in questions:
+            session.post(f"{base_url}/api/chat", json={"message": question}, timeout=120).raise_for_status()
+    return time.perf_counter() - started
+
+
+def run_batch(base_url: str, questions: List[str]) -> float:
+    """Answer all questions with one /api/chat/batch request"""
+    started = time.perf_counter()
+    response = requests.post(f"{base_url}/api/chat/batch", json={"messages": questions}, timeout=600)
+    response.raise_for_status()
+    failed = [item for item in response.json()["results"] if not item["success"]]
+    if failed:
+        print(f"✗ {len(failed)} batch items failed, e.g.: {failed[0]['error']}")
+    return time.perf_counter() - started
+
+
+def main(base_url: str, count: int):
+    """Run the benchmark"""
+    questions = (SCREENING_QUESTIONS * (count // len(SCREENING_QUESTIONS) + 1))[:count]
+
+    print("=" * 60)
+    print("BATCH CHAT BENCHMARK")
+    print("=" * 60 + "\n")
+    print(f"Questions per questionnaire: {len(questions)}\n")
+
+    sequential = run_sequential(base_url, questions)
+    print(f"Looping /api/chat:  {sequential:.2f}s ({len(questions) / sequential:.2f} questions/s)")
+
+    batch = run_batch(base_url, questions)
+    print(f"/api/chat/batch:    {batch:.2f}s ({len(questions) / batch:.2f} questions/s)")
+
+    print(f"\nSpeedup: {sequential / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark batch chat throughput")
+    parser.add_argument("--questions", type=int, default=24, help="Questions per questionnaire")
+    parser.add_argument("--base-url", default=BASE_URL, help="Backend base URL")
+    args = parser.parse_args()
+    main(args.base_url, args.questions)
@@ -0,0 +1,148 @@
+"""
+Benchmark: memory footprint, search latency and recall across Qdrant index settings.
+Creates a temporary collection per configuration, searches it and drops it.
+
+Requires a Qdrant server (QDRANT_URL); local mode ignores HNSW and
+quantization. A throwaway `docker run -p 6333:6333 qdrant/qdrant` works.
+Vectors are synthetic clustered unit vectors (or the ingested portfolio
+vectors with --from-collection). Exact nearest neighbours are computed with
+NumPy as ground truth for recall@k. RAM is an estimate from the storage
+layout (float32 vectors, int8/1-bit quantized copies, HNSW links).
+
+Usage: python bench_collection.py [--vectors 20000] [--dimensions 1536] [--queries 200] [--k 10] [--from-collection]
+"""
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from qdrant_client.models import OptimizersConfigDiff
+
+from clients import clients
+from config import config
+from vector_index import IndexSettings
+
+CONFIGURATIONS: Dict[str, IndexSettings] = {
+    "baseline": IndexSettings(),
+    "scalar+rescore": IndexSettings(quantization="scalar"),
+    "scalar, no rescore": IndexSettings(quantization="scalar", rescore=False),
+    "binary+rescore x3": IndexSettings(quantization="binary", oversampling=3.0),
+    "hnsw m32/efc200/ef128": IndexSettings(hnsw_m=32, hnsw_ef_construct=200, hnsw_ef=128),
+    "on-disk + scalar in RAM": IndexSettings(quantization="scalar", on_disk_vectors=True, on_disk_payload=True),
+}
+
+
+def synthetic_vectors(count: int, dimensions: int, clusters: int = 50, seed: int = 7) -> np.ndarray:
+    """Clustered unit vectors (embedding-like neighbourhoods)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimensions))
+    vectors = centers[rng.integers(0, clusters, count)] + 0.6 * rng.normal(size=(count, dimensions))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def collection_vectors() -> np.ndarray:
+    """Vectors of the ingested portfolio collection"""
+    client = clients.qdrant()
+    vectors, offset = [], None
+    while True:
+        points, offset = client.scroll(config.COLLECTION_NAME, limit=256, offset=offset, with_vectors=True)
+        vectors.extend(point.vector for point in points)
+        if offset is None:
+            break
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def make_queries(vectors: np.ndarray, count: int, seed: int = 11) -> np.ndarray:
+    """Perturbed copies of stored vectors"""
+    rng = np.random.default_rng(seed)
+    queries = vectors[rng.integers(0, len(vectors), count)] + 0.3 * rng.normal(size=(count, vectors.shape[1])) / np.sqrt(vectors.shape[1])
+    return (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+
+
+def estimated_ram_mb(settings: IndexSettings, count: int, dimensions: int) -> float:
+    """RAM held by vectors, quantized vectors and HNSW level-0 links"""
+    ram = 0 if settings.on_disk_vectors else count * dimensions * 4
+    if settings.quantization_always_ram:
+        ram += {"none": 0, "scalar": count * dimensions, "binary": count * dimensions / 8}[settings.quantization]
+    ram += count * settings.hnsw_m * 2 * 4
+    return ram / 1024 / 1024
+
+
+def wait_until_indexed(name: str, timeout: float = 600):
+    client = clients.qdrant()
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        info = client.get_collection(name)
+        if info.status.value == "green":
+            return
+        time.sleep(1)
+    raise TimeoutError(f"Collection {name} was not indexed within {timeout:.0f}s")
+
+
+def run_configuration(
+    label: str, settings: IndexSettings, vectors: np.ndarray, queries: np.ndarray, truth: np.ndarray, k: int,
+) -> Tuple[float, float, float]:
+    """Create, fill and search one collection; returns (p50 ms, p95 ms, recall@k)"""
+    client = clients.qdrant()
+    name = "bench-" + "".join(c if c.isalnum() else "-" for c in label)
+    if client.collection_exists(name):
+        client.delete_collection(name)
+
+    client.create_collection(
+        collection_name=name,
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=1000),
+        **settings.collection_kwargs(vectors.shape[1]),
+    )
+    try:
+        client.upload_collection(name, vectors=vectors, ids=list(range(len(vectors))), batch_size=256)
+        wait_until_indexed(name)
+
+        latencies: List[float] = []
+        hits = 0
+        for query, expected in zip(queries, truth):
+            started = time.perf_counter()
+            found = client.search(name, query_vector=query.tolist(), limit=k, search_params=settings.search_params())
+            latencies.append(time.perf_counter() - started)
+            hits += len({point.id for point in found} & set(expected.tolist()))
+    finally:
+        client.delete_collection(name)
+
+    latencies.sort()
+    return (
+        latencies[len(latencies) // 2] * 1000,
+        latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        hits / (len(queries) * k),
+    )
+
+
+def main(count: int, dimensions: int, query_count: int, k: int, from_collection: bool):
+    """Run the benchmark"""
+    vectors = collection_vectors() if from_collection else synthetic_vectors(count, dimensions)
+    queries = make_queries(vectors, query_count)
+    k = min(k, len(vectors))
+    # Exact top-k by cosine similarity (vectors are unit length)
+    truth = np.argsort(-(queries @ vectors.T), axis=1)[:, :k]
+
+    print("=" * 60)
+    print("QDRANT INDEX SETTINGS BENCHMARK")
+    print("=" * 60 + "\n")
+    print(f"Vectors: {len(vectors)} x {vectors.shape[1]}  Queries: {len(queries)}  k: {k}\n")
+    print(f"{'configuration':<26}{'est. RAM MB':>12}{'p50 ms':>9}{'p95 ms':>9}{'recall@k':>10}")
+
+    for label, settings in CONFIGURATIONS.items():
+        p50, p95, recall = run_configuration(label, settings, vectors, queries, truth, k)
+        ram = estimated_ram_mb(settings, len(vectors), vectors.shape[1])
+        print(f"{label:<26}{ram:>12.1f}{p50:>9.2f}{p95:>9.2f}{recall:>10.3f}")
+
+    clients.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Qdrant quantization/HNSW settings")
+    parser.add_argument("--vectors", type=int, default=20000, help="Synthetic vectors to index")
+    parser.add_argument("--dimensions", type=int, default=1536, help="Synthetic vector dimensions")
+    parser.add_argument("--queries", type=int, default=200, help="Search queries per configuration")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query (recall@k)")
+    parser.add_argument("--from-collection", action="store_true", help="Use the ingested portfolio vectors")
+    args = parser.parse_args()
+    main(args.vectors, args.dimensions, args.queries, args.k, args.from_collection)
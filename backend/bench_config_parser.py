@@ -0,0 +1,109 @@
+"""
+Benchmark: parse time of the single-pass config parser vs the legacy regex scan.
+The legacy functions reproduce the per-section regexes PortfolioConfigLoader used
+before the structured parser, so both sides do equivalent extraction work.
+
+The pure-Python parser is slower than the regex scan (about 0.1-0.2x its
+speed at every scale measured), but it stays around 1 ms for the real config
+and, unlike the regexes, finds every section.
+
+Usage: python bench_config_parser.py [--repeat 200] [--scale 1 10 100] [--config PATH]
+"""
+import argparse
+import os
+import re
+import timeit
+from typing import Dict, List
+
+from ts_config_parser import get_path, parse_ts_config
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "gitprofile.config.ts")
+
+
+# Legacy regex extraction (one full-file scan per section)
+def legacy_extract(content: str) -> Dict[str, List]:
+    """Extract sections the way the regex-based loader did"""
+    result: Dict[str, List] = {"skills": [], "experiences": [], "educations": [], "projects": []}
+
+    skills_match = re.search(r"skills:\s*\[(.*?)\]", content, re.DOTALL)
+    if skills_match:
+        result["skills"] = re.findall(r"'([^']*)'", skills_match.group(1))
+
+    sections = [
+        ("experiences", r"experiences:\s*\[(.*?)\],\s*certifications", ("company", "position", "from", "to", "companyLink")),
+        ("educations", r"education:\s*\[(.*?)\],\s*publications", ("institution", "degree", "from", "to")),
+        ("projects", r"external:\s*\{.*?projects:\s*\[(.*?)\]", ("title", "description", "link")),
+    ]
+    for key, pattern, fields in sections:
+        match = re.search(pattern, content, re.DOTALL)
+        if not match:
+            continue
+        for obj in re.findall(r"\{(.*?)\}", match.group(1), re.DOTALL):
+            entry = {}
+            for field in fields:
+                field_match = re.search(rf"{field}:\s*'([^']*)'", obj)
+                if field_match:
+                    entry[field] = field_match.group(1)
+            result[key].append(entry)
+
+    return result
+
+
+def structured_extract(content: str) -> Dict[str, List]:
+    """Extract the same sections from one structured parse"""
+    portfolio = parse_ts_config(content)
+    return {
+        "skills": portfolio.get("skills", []),
+        "experiences": portfolio.get("experiences", []),
+        "educations": portfolio.get("educations", []),
+        "projects": get_path(portfolio, "projects.external.projects", []),
+    }
+
+
+def scale_config(content: str, factor: int) -> str:
+    """Grow the experiences and skills sections by `factor` to simulate larger configs"""
+    if factor <= 1:
+        return content
+    exp_start = content.index("experiences: [") + len("experiences: [")
+    exp_end = content.index("],\n  certifications")
+    experiences = content[exp_start:exp_end].rstrip().rstrip(",")
+
+    skills_start = content.index("skills: [") + len("skills: [")
+    skills_end = content.index("],", skills_start)
+    skills = content[skills_start:skills_end].rstrip().rstrip(",")
+
+    content = content[:exp_start] + ",".join([experiences] * factor) + ",\n  " + content[exp_end:]
+    skills_start = content.index("skills: [") + len("skills: [")
+    skills_end = content.index("],", skills_start)
+    return content[:skills_start] + ",".join([skills] * factor) + ",\n  " + content[skills_end:]
+
+
+def main(repeat: int, scales: List[int], config_path: str = DEFAULT_CONFIG_PATH):
+    """Run the benchmark"""
+    with open(config_path, "r") as f:
+        base = f.read()
+
+    print("=" * 60)
+    print("CONFIG PARSER BENCHMARK")
+    print("=" * 60 + "\n")
+    print(f"{'scale':>6} {'bytes':>9} {'regex (ms)':>12} {'parser (ms)':>12} {'speedup':>9}")
+
+    for scale in scales:
+        content = scale_config(base, scale)
+        legacy = min(timeit.repeat(lambda: legacy_extract(content), number=1, repeat=repeat)) * 1000
+        structured = min(timeit.repeat(lambda: structured_extract(content), number=1, repeat=repeat)) * 1000
+        print(f"{scale:>6} {len(content):>9} {legacy:>12.3f} {structured:>12.3f} {legacy / structured:>8.2f}x")
+
+    legacy_counts = {k: len(v) for k, v in legacy_extract(base).items()}
+    structured_counts = {k: len(v) for k, v in structured_extract(base).items()}
+    print(f"\nEntries found by regex scan: {legacy_counts}")
+    print(f"Entries found by parser:     {structured_counts}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark config parsing")
+    parser.add_argument("--repeat", type=int, default=200, help="Timing repetitions per measurement")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 100], help="Config size multipliers")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="Path to gitprofile.config.ts")
+    args = parser.parse_args()
+    main(args.repeat, args.scale, args.config)
@@ -0,0 +1,124 @@
+"""
+Benchmark: per-request response serialization cost and payload size.
+Compares the previous chat response path with typed sources serialized by orjson.
+
+Paths:
+- legacy: full metadata dicts, Pydantic ChatResponse validation, JSONResponse
+- typed: slotted Source records, ORJSONResponse (no validation)
+- compact: typed path returning only source IDs and titles
+
+Runs offline on synthetic retrieval results shaped like the portfolio
+collection (RETRIEVER_K sources with langchain_qdrant metadata).
+
+Usage: python bench_serialization.py [--requests 20000] [--sources 4]
+"""
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from langchain_core.documents import Document
+from pydantic import BaseModel, Field
+
+from config import config
+from sources import response_sources, source_from_document
+
+
+class LegacyChatResponse(BaseModel):
+    """ChatResponse before typed sources"""
+    response: str = Field(...)
+    sources: list = Field(default_factory=list)
+    success: bool = Field(default=True)
+    degraded: bool = Field(default=False)
+
+
+def retrieved_documents(count: int) -> List[Document]:
+    """Chunks with the metadata the ingestion pipeline stores"""
+    return [
+        Document(
+            page_content=(
+                f"Blog Article: Building production RAG systems, part {i}\n"
+                + "Retrieval-augmented generation with LangChain, Qdrant and FastAPI. " * 6
+            ),
+            metadata={
+                "source": "blog",
+                "type": "article",
+                "title": f"Building production RAG systems, part {i}",
+                "url": f"https://dev.to/jamesbmour/building-production-rag-systems-part-{i}",
+                "tags": "python, rag, langchain, qdrant",
+                "published_at": "2024-05-01T12:00:00Z",
+                "reading_time": 7,
+                "last_updated": "2024-06-01T08:30:00.123456",
+                "loader": "devto_blog",
+                "content_hash": "9f2c4e" * 10 + "abcd",
+                "chunk_index": 0,
+                "chunk_count": 1,
+                "chunk_policy": "atomic",
+                "_id": f"5c0f7a1e-4b7d-5e0a-9a3c-{i:012d}",
+                "_collection_name": config.COLLECTION_NAME,
+            },
+        )
+        for i in range(count)
+    ]
+
+
+ANSWER = "James has built several production RAG systems. " * 12
+
+
+def legacy(docs: List[Document]) -> bytes:
+    sources = [
+        {
+            "content": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
+            "metadata": doc.metadata,
+        }
+        for doc in docs
+    ]
+    model = LegacyChatResponse(response=ANSWER, sources=sources, success=True, degraded=False)
+    return JSONResponse(model.model_dump()).body
+
+
+def typed(docs: List[Document], compact: bool = False) -> bytes:
+    sources = [source_from_document(doc) for doc in docs]
+    return ORJSONResponse({
+        "response": ANSWER, "sources": response_sources(sources, compact), "success": True, "degraded": False,
+    }).body
+
+
+def measure(build: Callable[[], bytes], requests: int) -> Dict[str, Any]:
+    """Mean microseconds per response and payload bytes"""
+    payload = build()
+    started = time.perf_counter()
+    for _ in range(requests):
+        build()
+    elapsed = time.perf_counter() - started
+    return {"us": elapsed / requests * 1e6, "bytes": len(payload)}
+
+
+def main(requests: int, source_count: int):
+    """Run the benchmark"""
+    docs = retrieved_documents(source_count)
+    paths = {
+        "legacy (pydantic + json)": lambda: legacy(docs),
+        "typed (orjson)": lambda: typed(docs),
+        "compact (orjson)": lambda: typed(docs, compact=True),
+    }
+
+    print("=" * 60)
+    print("RESPONSE SERIALIZATION BENCHMARK")
+    print("=" * 60 + "\n")
+    print(f"Requests: {requests}  Sources per response: {source_count}\n")
+    print(f"{'path':<26}{'us/request':>12}{'payload B':>12}{'speedup':>10}")
+
+    baseline = None
+    for label, build in paths.items():
+        result = measure(build, requests)
+        baseline = baseline or result["us"]
+        print(f"{label:<26}{result['us']:>12.1f}{result['bytes']:>12}{baseline / result['us']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark chat response serialization")
+    parser.add_argument("--requests", type=int, default=20000, help="Responses to serialize per path")
+    parser.add_argument("--sources", type=int, default=config.RETRIEVER_K, help="Sources per response")
+    args = parser.parse_args()
+    main(args.requests, args.sources)
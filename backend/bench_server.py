@@ -0,0 +1,124 @@
+"""
+Benchmark: API throughput as the production server scales across worker processes.
+Starts `serve.py` with each worker count in turn and drives it with concurrent clients.
+
+The question set is answered once first, so the measured requests are served
+from the shared answer cache (or hit any other GET endpoint with --path) and
+the benchmark measures the server itself rather than OpenAI latency. Requires
+a configured .env and an ingested collection for the warm-up answers.
+
+Usage: python bench_server.py [--workers 1 2 4] [--concurrency 64] [--duration 10] [--path /api/chat]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from bench_batch_chat import SCREENING_QUESTIONS
+
+
+def free_port() -> int:
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    """Start serve.py with rate limiting off and wait until it answers"""
+    env = dict(os.environ, RATE_LIMIT_PER_MINUTE="0", CHAT_MAX_QUEUE="10000", INGEST_SCHEDULER_ENABLED="false")
+    process = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/metrics", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"Server with {workers} workers did not start")
+
+
+async def drive(base_url: str, path: str, concurrency: int, duration: float) -> Dict[str, float]:
+    """Send requests from `concurrency` clients for `duration` seconds"""
+    latencies: List[float] = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+
+    async def client(index: int):
+        nonlocal errors
+        async with httpx.AsyncClient(base_url=base_url, timeout=120) as http:
+            i = index
+            while time.perf_counter() < stop_at:
+                started = time.perf_counter()
+                if path == "/api/chat":
+                    response = await http.post(path, json={"message": SCREENING_QUESTIONS[i % len(SCREENING_QUESTIONS)]})
+                else:
+                    response = await http.get(path)
+                latencies.append(time.perf_counter() - started)
+                errors += response.status_code != 200
+                i += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "errors": errors,
+    }
+
+
+def main(worker_counts: List[int], concurrency: int, duration: float, path: str):
+    """Run the benchmark"""
+    print("=" * 60)
+    print("SERVER SCALING BENCHMARK")
+    print("=" * 60 + "\n")
+    print(f"CPUs: {os.cpu_count()}  Path: {path}  Concurrency: {concurrency}  Duration: {duration:.0f}s\n")
+
+    baseline = None
+    for workers in worker_counts:
+        port = free_port()
+        process = start_server(workers, port)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            if path == "/api/chat":
+                # Fill the shared answer cache (one LLM call per question)
+                with httpx.Client(base_url=base_url, timeout=120) as http:
+                    for question in SCREENING_QUESTIONS:
+                        http.post(path, json={"message": question})
+            result = asyncio.run(drive(base_url, path, concurrency, duration))
+        finally:
+            process.terminate()
+            process.wait(30)
+
+        baseline = baseline or result["requests_per_second"]
+        print(
+            f"{workers:>2} worker(s): {result['requests_per_second']:8.1f} req/s  "
+            f"p50 {result['p50_ms']:6.1f} ms  p95 {result['p95_ms']:6.1f} ms  "
+            f"scaling {result['requests_per_second'] / baseline:.2f}x  errors {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark throughput across server worker counts")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per worker count")
+    parser.add_argument("--path", default="/api/chat", help="/api/chat (cached answers) or any GET endpoint")
+    args = parser.parse_args()
+    main(args.workers, args.concurrency, args.duration, args.path)
@@ -0,0 +1,114 @@
+"""
+Benchmark: per-tenant memory and retrieval latency as the number of hosted portfolios grows.
+Builds tenant chains on one shared Qdrant client and embeddings, like the server does.
+
+Each tenant gets its own collection of synthetic chunks in an in-memory
+Qdrant instance; embeddings are deterministic fakes, so the numbers cover
+tenant routing, state loading and vector search, not the embedding API.
+For each tenant count the benchmark reports the Python heap held by the
+loaded tenant states (tracemalloc) and process RSS, the cold latency of a
+tenant's first question (state build + vocabulary scroll + search) and the
+warm latency of later questions. With --cache-size below the tenant count,
+warm questions to evicted tenants pay the cold cost again.
+
+Usage: python bench_tenants.py [--tenants 1,10,100,300] [--chunks 40] [--queries 500] [--cache-size 64]
+"""
+import argparse
+import random
+import resource
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from config import config
+from tenants import Tenant, TenantChain, TenantStates
+
+DIMENSIONS = 64
+SKILLS = ["Python", "Rust", "Go", "Kubernetes", "Docker", "Terraform", "PyTorch", "LangChain", "FastAPI", "PostgreSQL"]
+QUESTIONS = ["What are the technical skills?", "Kubernetes experience?", "Which projects use PyTorch?", "Cloud background?"]
+
+
+def make_tenants(client: QdrantClient, embeddings: DeterministicFakeEmbedding, count: int, chunks: int) -> List[Tenant]:
+    """Tenants with one collection of synthetic chunks each"""
+    tenants = []
+    for index in range(count):
+        tenant = Tenant.from_dict({"id": f"bench-{index}", "owner": f"Owner {index}"})
+        client.create_collection(tenant.collection, vectors_config=VectorParams(size=DIMENSIONS, distance=Distance.COSINE))
+        texts = [f"Technical Skills: {', '.join(random.sample(SKILLS, 3))} ({index}.{chunk})" for chunk in range(chunks)]
+        client.upsert(tenant.collection, points=[
+            PointStruct(id=chunk, vector=vector, payload={"page_content": text, "metadata": {"type": "skills"}})
+            for chunk, (text, vector) in enumerate(zip(texts, embeddings.embed_documents(texts)))
+        ])
+        tenants.append(tenant)
+    return tenants
+
+
+def percentiles(latencies: List[float]) -> Tuple[float, float]:
+    """(p50, p95) in milliseconds"""
+    latencies = sorted(latencies)
+    return latencies[len(latencies) // 2] * 1000, latencies[int(0.95 * (len(latencies) - 1))] * 1000
+
+
+def run(count: int, chunks: int, query_count: int, cache_size: int) -> Tuple[float, float, float, float, float, float, int]:
+    """Serve `count` tenants; returns (heap MB, MB/tenant, cold p50, cold p95, warm p50, warm p95, rebuilds)"""
+    client = QdrantClient(":memory:")
+    embeddings = DeterministicFakeEmbedding(size=DIMENSIONS)
+    tenants = make_tenants(client, embeddings, count, chunks)
+    states: TenantStates[TenantChain] = TenantStates(
+        lambda tenant: TenantChain(tenant, client, None, embeddings, load_vocabulary=True), cache_size,
+    )
+
+    def ask(tenant: Tenant, question: str) -> float:
+        started = time.perf_counter()
+        chain = states.get(tenant)
+        chain.retriever.invoke(chain.search_text(question))
+        return time.perf_counter() - started
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    cold = [ask(tenant, QUESTIONS[0]) for tenant in tenants]
+    heap_mb = (tracemalloc.get_traced_memory()[0] - baseline) / 1024 / 1024
+    tracemalloc.stop()
+
+    builds = states.builds
+    warm = [ask(random.choice(tenants), random.choice(QUESTIONS)) for _ in range(query_count)]
+    rebuilds = states.builds - builds
+
+    client.close()
+    return (heap_mb, heap_mb / min(count, cache_size), *percentiles(cold), *percentiles(warm), rebuilds)
+
+
+def main(tenant_counts: List[int], chunks: int, query_count: int, cache_size: int):
+    """Run the benchmark"""
+    random.seed(7)
+    # Tenant answer caches stay in memory
+    config.SHARED_CACHE_PATH = ":memory:"
+    # Warm-up: lazy imports and first-use allocations are not per-tenant costs
+    run(1, chunks, 10, cache_size)
+
+    print("=" * 60)
+    print("MULTI-TENANT SERVING BENCHMARK")
+    print("=" * 60 + "\n")
+    print(f"Chunks/tenant: {chunks}  Warm queries: {query_count}  Tenant LRU: {cache_size}\n")
+    print(f"{'tenants':>8}{'heap MB':>9}{'MB/ten':>8}{'cold p50':>10}{'cold p95':>10}{'warm p50':>10}{'warm p95':>10}{'rebuilds':>10}{'RSS MB':>8}")
+
+    for count in tenant_counts:
+        heap, per_tenant, cold_p50, cold_p95, warm_p50, warm_p95, rebuilds = run(count, chunks, query_count, cache_size)
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"{count:>8}{heap:>9.1f}{per_tenant:>8.2f}{cold_p50:>10.2f}{cold_p95:>10.2f}{warm_p50:>10.2f}{warm_p95:>10.2f}{rebuilds:>10}{rss:>8.0f}")
+
+    print("\nLatencies in ms. RSS is the process peak so far (includes the in-memory Qdrant collections).")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-tenant memory and latency")
+    parser.add_argument("--tenants", default="1,10,100,300", help="Comma-separated tenant counts")
+    parser.add_argument("--chunks", type=int, default=40, help="Chunks per tenant collection")
+    parser.add_argument("--queries", type=int, default=500, help="Warm queries over random tenants")
+    parser.add_argument("--cache-size", type=int, default=config.TENANT_CACHE_SIZE, help="Tenant states kept (TENANT_CACHE_SIZE)")
+    args = parser.parse_args()
+    main([int(count) for count in args.tenants.split(",")], args.chunks, args.queries, args.cache_size)
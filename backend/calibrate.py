@@ -0,0 +1,198 @@
+"""
+Calibration: retrieval score threshold and dynamic-k gap per embedding model.
+Fits the threshold and RETRIEVER_MIN_GAP against an evaluation set and stores them for the retriever.
+
+Every evaluation question names the chunk types, and optionally keywords,
+that answer it. Each question is searched for the top --candidates chunks
+without a threshold, and every candidate is labelled relevant or not. A grid
+search then picks the threshold and gap with the best F1. Precision is the
+share of returned chunks that are relevant. Recall is measured against the
+relevant chunks within the top RETRIEVER_K. Ties go to the smaller average
+k (shorter prompts).
+
+The result is stored in RETRIEVAL_CALIBRATION_PATH under the embedding
+model ID (model, dimensions and truncation), so each model keeps its own
+settings. The retriever picks them up on the next start. Requires a
+configured .env and an ingested collection.
+
+Usage: python calibrate.py [--eval-set questions.json] [--candidates 20] [--tenant ID] [--dry-run]
+"""
+import argparse
+import json
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from config import config
+from prompts import first_name
+from retrieval import RetrievalPolicy, save_calibration
+from vector_index import embedding_model_id, index_settings
+
+# Evaluation questions: chunk types that answer them, and keywords one of which the chunk must contain
+EVAL_SET: List[Dict[str, Any]] = [
+    {"question": "What are {name}'s technical skills?", "types": ["skills"]},
+    {"question": "What programming languages does {name} know?", "types": ["skills"]},
+    {"question": "What is {name}'s current role?", "types": ["experience"]},
+    {"question": "Tell me about {name}'s work experience", "types": ["experience", "resume_pdf"]},
+    {"question": "What is {name}'s educational background?", "types": ["education", "resume_pdf"]},
+    {"question": "What certifications does {name} have?", "types": ["certification"]},
+    {"question": "Has {name} published any research?", "types": ["publication"]},
+    {"question": "What projects has {name} worked on?", "types": ["project", "external_project"]},
+    {"question": "Has {name} written any technical blog posts?", "types": ["article"]},
+    {"question": "How many views do {name}'s articles get?", "types": ["article_stats"]},
+    {
+        "question": "Does {name} have cloud experience with AWS, Azure or GCP?",
+        "types": ["skills", "experience", "project", "resume_pdf"],
+        "keywords": ["aws", "azure", "gcp", "cloud"],
+    },
+    {
+        "question": "Has {name} worked with LLMs or LangChain?",
+        "types": ["skills", "experience", "project", "external_project", "article", "resume_pdf"],
+        "keywords": ["llm", "langchain", "gpt", "rag", "openai"],
+    },
+    {
+        "question": "What machine learning frameworks has {name} used?",
+        "types": ["skills", "project", "resume_pdf"],
+        "keywords": ["pytorch", "tensorflow", "scikit", "keras", "xgboost"],
+    },
+    {
+        "question": "Does {name} know SQL databases?",
+        "types": ["skills", "experience", "project", "resume_pdf"],
+        "keywords": ["sql", "postgres", "mysql", "database"],
+    },
+    {
+        "question": "Has {name} done reinforcement learning research?",
+        "types": ["project", "publication", "external_project", "article"],
+        "keywords": ["reinforcement", "finrl", " rl "],
+    },
+    {
+        "question": "Does {name} have consulting experience?",
+        "types": ["experience", "resume_pdf"],
+        "keywords": ["consult", "client"],
+    },
+]
+
+# Dynamic-k gaps tried by the grid search (0 = no gap cut)
+GAPS = [0.0, 0.02, 0.03, 0.04, 0.05, 0.06, 0.08, 0.1, 0.12, 0.15, 0.2]
+
+
+def is_relevant(doc: Document, case: Dict[str, Any]) -> bool:
+    """Whether a retrieved chunk answers an evaluation question"""
+    if doc.metadata.get("type") not in case["types"]:
+        return False
+    keywords = case.get("keywords")
+    text = f" {doc.page_content.lower()} "
+    return not keywords or any(keyword in text for keyword in keywords)
+
+
+def evaluate(samples: Sequence[Sequence[Tuple[float, bool]]], policy: RetrievalPolicy) -> Dict[str, Any]:
+    """
+    Retrieval quality of a policy.
+
+    Args:
+        samples: Per question, the (score, relevant) candidates, highest score first
+        policy: Threshold and dynamic-k settings
+
+    Returns:
+        Precision, recall, F1 and mean k over all questions
+    """
+    kept = relevant_kept = reachable = 0
+    for candidates in samples:
+        _, k = policy.select([score for score, _ in candidates])
+        kept += k
+        relevant_kept += sum(relevant for _, relevant in candidates[:k])
+        reachable += sum(relevant for _, relevant in candidates[:policy.max_k])
+    precision = relevant_kept / kept if kept else 0.0
+    recall = relevant_kept / reachable if reachable else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "precision": round(precision, 3),
+        "recall": round(recall, 3),
+        "f1": round(f1, 3),
+        "mean_k": round(kept / len(samples), 2) if samples else 0.0,
+    }
+
+
+def fit(samples: Sequence[Sequence[Tuple[float, bool]]], min_k: int, max_k: int) -> Tuple[RetrievalPolicy, Dict[str, Any]]:
+    """
+    Grid-search the threshold (every candidate score, rounded to 0.01) and gap.
+
+    Returns:
+        The best policy and its metrics (highest F1, then smallest mean k)
+    """
+    thresholds = sorted({0.0} | {round(score, 2) for candidates in samples for score, _ in candidates})
+    best: Optional[Tuple[Tuple[float, float, float], RetrievalPolicy, Dict[str, Any]]] = None
+    for threshold in thresholds:
+        for gap in GAPS:
+            policy = RetrievalPolicy(threshold=threshold, min_k=min_k, max_k=max_k, min_gap=gap)
+            metrics = evaluate(samples, policy)
+            rank = (metrics["f1"], -metrics["mean_k"], threshold)
+            if best is None or rank > best[0]:
+                best = (rank, policy, metrics)
+    return best[1], best[2]
+
+
+def collect_samples(chain, cases: Sequence[Dict[str, Any]], candidates: int) -> List[List[Tuple[float, bool]]]:
+    """Labelled candidates of every evaluation question (searched without a threshold)"""
+    name = first_name(chain.tenant.owner)
+    samples = []
+    for case in cases:
+        question = chain.search_text(case["question"].format(name=name))
+        scored = chain.vector_store.similarity_search_with_score(question, k=candidates, search_params=index_settings.search_params())
+        samples.append([(score, is_relevant(doc, case)) for doc, score in scored])
+    return samples
+
+
+def main(eval_set: Optional[str], candidates: int, tenant: Optional[str], dry_run: bool):
+    """Calibrate the configured embedding model and store the result"""
+    from rag_chain import rag_chain
+
+    print("=" * 60)
+    print("RETRIEVAL CALIBRATION")
+    print("=" * 60 + "\n")
+
+    cases = EVAL_SET
+    if eval_set:
+        with open(eval_set, "r", encoding="utf-8") as file:
+            cases = json.load(file)
+
+    model_id = embedding_model_id()
+    chain = rag_chain.tenant_chain(tenant)
+    print(f"Model: {model_id}  Collection: {chain.tenant.collection}  Questions: {len(cases)}  Candidates: {candidates}\n")
+
+    samples = collect_samples(chain, cases, candidates)
+    current = chain.retriever.policy
+    calibrated, metrics = fit(samples, current.min_k, current.max_k)
+
+    print(f"{'':<12}{'threshold':>10}{'gap':>8}{'precision':>11}{'recall':>8}{'f1':>7}{'mean k':>8}")
+    rows = [("current", current), ("static k", replace(current, min_gap=0.0)), ("calibrated", calibrated)]
+    for label, policy in rows:
+        result = evaluate(samples, policy)
+        print(
+            f"{label:<12}{policy.threshold:>10.2f}{policy.min_gap:>8.2f}{result['precision']:>11.3f}"
+            f"{result['recall']:>8.3f}{result['f1']:>7.3f}{result['mean_k']:>8.2f}"
+        )
+
+    if dry_run:
+        print("\nDry run: calibration not saved")
+        return
+    save_calibration(model_id, {
+        "threshold": calibrated.threshold,
+        "min_gap": calibrated.min_gap,
+        **metrics,
+        "questions": len(cases),
+        "calibrated_at": datetime.now().isoformat(timespec="seconds"),
+    })
+    print(f"\n✓ Saved to {config.RETRIEVAL_CALIBRATION_PATH}; restart the server to apply")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the retrieval score threshold and dynamic-k gap")
+    parser.add_argument("--eval-set", help="JSON list of {question, types, keywords} (default: built-in set)")
+    parser.add_argument("--candidates", type=int, default=20, help="Chunks retrieved per question for labelling")
+    parser.add_argument("--tenant", help="Tenant whose collection is searched (default: DEFAULT_TENANT)")
+    parser.add_argument("--dry-run", action="store_true", help="Report without saving")
+    args = parser.parse_args()
+    main(args.eval_set, args.candidates, args.tenant, args.dry_run)
@@ -0,0 +1,270 @@
+"""
+Chunking module for the ingestion pipeline.
+Splits documents into chunks with a policy chosen per `metadata.type`.
+
+Policies:
+- AtomicPolicy: keep small structured documents (skills, experience, ...) whole
+- HeadingAwarePolicy: split markdown/PDF on headings, repeating the heading in each chunk
+- TokenPolicy: recursive split sized in tokens rather than characters
+
+All sizes are measured in embedding-model tokens.
+"""
+import statistics
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+from langchain_text_splitters import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
+
+from config import config
+
+
+def build_token_counter(model: str = config.EMBEDDING_MODEL) -> Callable[[str], int]:
+    """
+    Build a token counting function for the embedding model.
+
+    Falls back to a ~4 characters/token estimate when the tiktoken encoding
+    is unavailable (e.g. offline without a cached encoding file).
+
+    Args:
+        model: Embedding model name
+
+    Returns:
+        Function returning the token count of a string
+    """
+    try:
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+    except Exception as e:
+        print(f"Warning: tiktoken unavailable ({type(e).__name__}), estimating tokens from length")
+        return lambda text: (len(text) + 3) // 4
+
+
+# Abstract Base Class for Chunking Policies
+class ChunkingPolicy(ABC):
+    """Abstract base class for chunking policies"""
+
+    name = "base"
+
+    @abstractmethod
+    def split(self, doc: Document) -> List[Document]:
+        """Split one document into chunks"""
+        pass
+
+
+class TokenPolicy(ChunkingPolicy):
+    """Recursive character split with chunk size and overlap measured in tokens"""
+
+    name = "token"
+
+    def __init__(self, count_tokens: Callable[[str], int], chunk_size: int, chunk_overlap: int):
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=count_tokens,
+        )
+
+    def split(self, doc: Document) -> List[Document]:
+        return self.splitter.split_documents([doc])
+
+
+class AtomicPolicy(ChunkingPolicy):
+    """Keep a document as a single chunk unless it exceeds `max_tokens`"""
+
+    name = "atomic"
+
+    def __init__(self, count_tokens: Callable[[str], int], max_tokens: int, fallback: ChunkingPolicy):
+        self.count_tokens = count_tokens
+        self.max_tokens = max_tokens
+        self.fallback = fallback
+
+    def split(self, doc: Document) -> List[Document]:
+        if self.count_tokens(doc.page_content) <= self.max_tokens:
+            return [doc]
+        return self.fallback.split(doc)
+
+
+class HeadingAwarePolicy(ChunkingPolicy):
+    """
+    Split on document structure first, then by tokens within a section.
+
+    Markdown is split on `#`/`##`/`###` headings. Documents that already
+    carry section metadata (PDF sections) are kept whole when they fit.
+    Oversized sections are token-split and every piece is prefixed with its
+    heading so chunks remain self-describing; the split budget leaves room
+    for the heading so prefixed chunks still fit in `chunk_size`.
+    """
+
+    name = "heading"
+
+    _MARKDOWN_HEADERS = [("#", "h1"), ("##", "h2"), ("###", "h3")]
+
+    def __init__(self, count_tokens: Callable[[str], int], chunk_size: int, chunk_overlap: int):
+        self.count_tokens = count_tokens
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._splitters: Dict[int, TokenPolicy] = {}
+        self.markdown_splitter = MarkdownHeaderTextSplitter(self._MARKDOWN_HEADERS, strip_headers=False)
+
+    def split(self, doc: Document) -> List[Document]:
+        if doc.metadata.get("type") == "markdown":
+            sections = []
+            for section in self.markdown_splitter.split_text(doc.page_content):
+                heading = " > ".join(section.metadata[key] for _, key in self._MARKDOWN_HEADERS if key in section.metadata)
+                metadata = {**doc.metadata, "section": heading}
+                sections.append(Document(page_content=section.page_content, metadata=metadata))
+        else:
+            sections = [doc]
+
+        chunks = []
+        for section in sections:
+            if self.count_tokens(section.page_content) <= self.chunk_size:
+                chunks.append(section)
+                continue
+
+            heading = self._heading(section)
+            for piece in self._fallback(heading).split(section):
+                if heading and not piece.page_content.startswith(heading):
+                    piece.page_content = f"{heading}\n{piece.page_content}"
+                chunks.append(piece)
+
+        return chunks
+
+    def _fallback(self, heading: str) -> TokenPolicy:
+        """Token splitter whose chunk size leaves room for the heading prefix"""
+        budget = self.chunk_size - (self.count_tokens(f"{heading}\n") if heading else 0)
+        budget = max(1, budget)
+        if budget not in self._splitters:
+            self._splitters[budget] = TokenPolicy(self.count_tokens, budget, min(self.chunk_overlap, budget // 2))
+        return self._splitters[budget]
+
+    @staticmethod
+    def _heading(doc: Document) -> str:
+        parts = [doc.metadata.get("section"), doc.metadata.get("subsection")]
+        return " - ".join(part for part in parts if part)
+
+
+# Default policy for each metadata.type
+DEFAULT_POLICIES: Dict[str, str] = {
+    "skills": "atomic",
+    "experience": "atomic",
+    "education": "atomic",
+    "certification": "atomic",
+    "publication": "atomic",
+    "external_project": "atomic",
+    "project": "atomic",
+    "article": "atomic",
+    "article_stats": "atomic",
+    "resume_pdf": "heading",
+    "document_pdf": "heading",
+    "markdown": "heading",
+}
+
+
+class Chunker:
+    """
+    Applies a chunking policy per document type and records chunk statistics.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = config.CHUNK_SIZE_TOKENS,
+        chunk_overlap: int = config.CHUNK_OVERLAP_TOKENS,
+        atomic_max_tokens: int = config.ATOMIC_MAX_TOKENS,
+        policies: Optional[Dict[str, str]] = None,
+        count_tokens: Optional[Callable[[str], int]] = None,
+    ):
+        self.count_tokens = count_tokens or build_token_counter()
+
+        token_policy = TokenPolicy(self.count_tokens, chunk_size, chunk_overlap)
+        self.policies: Dict[str, ChunkingPolicy] = {
+            "token": token_policy,
+            "atomic": AtomicPolicy(self.count_tokens, atomic_max_tokens, token_policy),
+            "heading": HeadingAwarePolicy(self.count_tokens, chunk_size, chunk_overlap),
+        }
+        self.default_policy = token_policy
+        self.type_policies = dict(DEFAULT_POLICIES if policies is None else policies)
+
+        # Per source: number of input documents and token count of each chunk
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def register_policy(self, doc_type: str, policy: ChunkingPolicy):
+        """Use a custom policy for a document type"""
+        self.policies[policy.name] = policy
+        self.type_policies[doc_type] = policy.name
+
+    def policy_for(self, doc: Document) -> ChunkingPolicy:
+        """Return the policy for a document's type"""
+        name = self.type_policies.get(doc.metadata.get("type", ""))
+        return self.policies.get(name, self.default_policy) if name else self.default_policy
+
+    def split_documents(self, docs: List[Document], stats: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Document]:
+        """
+        Split documents into chunks.
+
+        Input documents are never modified: policies work on copies. Safe to
+        call from several threads on one Chunker.
+
+        Args:
+            docs: Documents to split
+            stats: Optional dict filled with this call's per-source statistics
+                (pass one when splitting concurrently; see `summary`)
+
+        Returns:
+            Chunks, each annotated with chunk_index, chunk_count and token_count
+        """
+        stats = {} if stats is None else stats
+        chunks = []
+
+        for doc in docs:
+            policy = self.policy_for(doc)
+            # Policies may return the document itself (atomic, whole sections)
+            pieces = policy.split(Document(page_content=doc.page_content, metadata=dict(doc.metadata)))
+            source = doc.metadata.get("source", "unknown")
+            source_stats = stats.setdefault(source, {"documents": 0, "chunks": []})
+            source_stats["documents"] += 1
+
+            for index, piece in enumerate(pieces):
+                tokens = self.count_tokens(piece.page_content)
+                piece.metadata.update({
+                    "chunk_index": index,
+                    "chunk_count": len(pieces),
+                    "token_count": tokens,
+                    "chunk_policy": policy.name,
+                })
+                source_stats["chunks"].append(tokens)
+                chunks.append(piece)
+
+        # Replaced in one assignment, so a concurrent split never sees partial counts
+        self.stats = stats
+        return chunks
+
+    def summary(self, stats: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Chunk size statistics per source.
+
+        Args:
+            stats: Statistics collected by one `split_documents` call
+                (default: the most recent call on this Chunker)
+
+        Returns:
+            Dict mapping source to documents, chunks and token min/mean/max/total
+        """
+        summary = {}
+        for source, source_stats in sorted((self.stats if stats is None else stats).items()):
+            sizes = source_stats["chunks"]
+            summary[source] = {
+                "documents": source_stats["documents"],
+                "chunks": len(sizes),
+                "min_tokens": min(sizes) if sizes else 0,
+                "mean_tokens": round(statistics.mean(sizes), 1) if sizes else 0.0,
+                "max_tokens": max(sizes) if sizes else 0,
+                "total_tokens": sum(sizes),
+            }
+        return summary
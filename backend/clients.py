@@ -0,0 +1,184 @@
+"""
+Shared client factory for the RAG chatbot backend.
+Builds OpenAI, Qdrant and HTTP clients once, with explicit connection pools,
+timeouts and retries, and closes them on shutdown.
+
+Every module gets its clients from the `clients` singleton instead of
+constructing its own, so connections are reused across the API server,
+ingestion and the validation scripts.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, TypeVar
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from langchain_core.embeddings import Embeddings
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+from config import config
+from vector_index import TruncatedEmbeddings
+
+T = TypeVar("T")
+
+
+def _limits() -> httpx.Limits:
+    """Connection pool limits shared by all httpx clients"""
+    return httpx.Limits(
+        max_connections=config.HTTP_POOL_SIZE,
+        max_keepalive_connections=config.HTTP_POOL_SIZE,
+        keepalive_expiry=config.HTTP_KEEPALIVE_SECONDS,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    """Request timeouts shared by all httpx clients"""
+    return httpx.Timeout(config.HTTP_TIMEOUT, connect=config.HTTP_CONNECT_TIMEOUT)
+
+
+class ClientFactory:
+    """
+    Lazily creates and caches shared clients.
+
+    Clients are created on first use (thread-safe) and reset in forked
+    child processes, so pre-fork servers never share sockets between workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clients: Dict[str, Any] = {}
+
+    def _get(self, name: str, build: Callable[[], T]) -> T:
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = build()
+                    self._clients[name] = client
+        return client
+
+    # HTTP transports
+    def http_client(self) -> httpx.Client:
+        """Pooled synchronous HTTP client (HTTP/2 when HTTP2_ENABLED)"""
+        return self._get("http", lambda: httpx.Client(
+            limits=_limits(), timeout=_timeout(), http2=config.HTTP2_ENABLED,
+        ))
+
+    def async_http_client(self) -> httpx.AsyncClient:
+        """Pooled asynchronous HTTP client (HTTP/2 when HTTP2_ENABLED)"""
+        return self._get("async_http", lambda: httpx.AsyncClient(
+            limits=_limits(), timeout=_timeout(), http2=config.HTTP2_ENABLED,
+        ))
+
+    def requests_session(self) -> requests.Session:
+        """Pooled requests session with retries, for third-party REST APIs (GitHub, dev.to)"""
+        def build() -> requests.Session:
+            retry = Retry(
+                total=config.HTTP_MAX_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.HTTP_POOL_SIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            return session
+
+        return self._get("requests", build)
+
+    # Qdrant
+    def _qdrant_kwargs(self) -> Dict[str, Any]:
+        return {
+            "url": config.QDRANT_URL,
+            "api_key": config.QDRANT_API_KEY,
+            "timeout": config.QDRANT_TIMEOUT,
+            "prefer_grpc": config.QDRANT_PREFER_GRPC,
+            "grpc_port": config.QDRANT_GRPC_PORT,
+            "limits": _limits(),
+            "http2": config.HTTP2_ENABLED,
+        }
+
+    def qdrant(self) -> QdrantClient:
+        """Shared synchronous Qdrant client (gRPC when QDRANT_PREFER_GRPC)"""
+        return self._get("qdrant", lambda: QdrantClient(**self._qdrant_kwargs()))
+
+    def async_qdrant(self) -> AsyncQdrantClient:
+        """Shared asynchronous Qdrant client (gRPC when QDRANT_PREFER_GRPC)"""
+        return self._get("async_qdrant", lambda: AsyncQdrantClient(**self._qdrant_kwargs()))
+
+    # OpenAI
+    def embeddings(self) -> Embeddings:
+        """Shared OpenAI embeddings client (reduced to EMBEDDING_DIMENSIONS when set)"""
+        def build() -> Embeddings:
+            if config.EMBEDDING_TRUNCATION not in ("provider", "local"):
+                raise ValueError(f"EMBEDDING_TRUNCATION must be 'provider' or 'local', not '{config.EMBEDDING_TRUNCATION}'")
+            dimensions = config.EMBEDDING_DIMENSIONS or None
+            local = dimensions is not None and config.EMBEDDING_TRUNCATION == "local"
+            embeddings = OpenAIEmbeddings(
+                model=config.EMBEDDING_MODEL,
+                dimensions=None if local else dimensions,
+                openai_api_key=config.OPENAI_API_KEY,
+                max_retries=config.OPENAI_MAX_RETRIES,
+                request_timeout=config.HTTP_TIMEOUT,
+                http_client=self.http_client(),
+                http_async_client=self.async_http_client(),
+            )
+            return TruncatedEmbeddings(embeddings, dimensions) if local else embeddings
+
+        return self._get("embeddings", build)
+
+    def llm(self) -> ChatOpenAI:
+        """Shared chat model client"""
+        return self._get("llm", lambda: ChatOpenAI(
+            model=config.LLM_MODEL,
+            temperature=config.LLM_TEMPERATURE,
+            openai_api_key=config.OPENAI_API_KEY,
+            max_retries=config.OPENAI_MAX_RETRIES,
+            request_timeout=config.HTTP_TIMEOUT,
+            http_client=self.http_client(),
+            http_async_client=self.async_http_client(),
+        ))
+
+    # Lifecycle
+    def close(self):
+        """Close synchronous clients (async clients need aclose)"""
+        with self._lock:
+            # The OpenAI clients are built on the pooled HTTP clients; rebuild them on next use
+            self._clients.pop("embeddings", None)
+            self._clients.pop("llm", None)
+            for name in ("http", "requests", "qdrant"):
+                client = self._clients.pop(name, None)
+                if client is not None:
+                    client.close()
+
+    async def aclose(self):
+        """Close every client, async and sync"""
+        with self._lock:
+            async_clients = [self._clients.pop(name, None) for name in ("async_http", "async_qdrant")]
+
+        for client in async_clients:
+            if client is None:
+                continue
+            if isinstance(client, httpx.AsyncClient):
+                await client.aclose()
+            else:
+                await client.close()
+
+        self.close()
+
+    def reset(self):
+        """Forget all clients without closing them (used in forked children)"""
+        self._lock = threading.RLock()
+        self._clients = {}
+
+
+# Create a singleton instance
+clients = ClientFactory()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=clients.reset)
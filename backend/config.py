@@ -3,12 +3,15 @@ Configuration module for the RAG chatbot backend.
 Loads environment variables and provides configuration settings.
 """
 import os
-from typing import List
+from typing import Dict, List
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Backend directory, for paths shared by scripts run from other directories
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 class Config:
     """Configuration class for backend settings"""
@@ -21,15 +24,71 @@ class Config:
     QDRANT_URL: str = os.getenv("QDRANT_URL", "")
     COLLECTION_NAME: str = os.getenv("COLLECTION_NAME", "portfolio-chat")
 
+    # Client Transport Configuration
+    QDRANT_PREFER_GRPC: bool = os.getenv("QDRANT_PREFER_GRPC", "true").lower() == "true"
+    QDRANT_GRPC_PORT: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+    QDRANT_TIMEOUT: int = int(os.getenv("QDRANT_TIMEOUT", "10"))
+    HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "20"))
+    HTTP_KEEPALIVE_SECONDS: float = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60"))
+    HTTP_TIMEOUT: float = float(os.getenv("HTTP_TIMEOUT", "30"))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+    # Qdrant Index Configuration (changes apply when the collection is recreated)
+    QDRANT_QUANTIZATION: str = os.getenv("QDRANT_QUANTIZATION", "none").lower()  # none, scalar or binary
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "true").lower() == "true"
+    QDRANT_QUANTIZATION_RESCORE: bool = os.getenv("QDRANT_QUANTIZATION_RESCORE", "true").lower() == "true"
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = float(os.getenv("QDRANT_QUANTIZATION_OVERSAMPLING", "2.0"))
+    QDRANT_HNSW_M: int = int(os.getenv("QDRANT_HNSW_M", "16"))
+    QDRANT_HNSW_EF_CONSTRUCT: int = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "100"))
+    QDRANT_HNSW_EF: int = int(os.getenv("QDRANT_HNSW_EF", "0"))  # search-time; 0 = Qdrant default
+    QDRANT_ON_DISK_VECTORS: bool = os.getenv("QDRANT_ON_DISK_VECTORS", "false").lower() == "true"
+    QDRANT_ON_DISK_PAYLOAD: bool = os.getenv("QDRANT_ON_DISK_PAYLOAD", "false").lower() == "true"
+
     # Model Configuration
     EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    # Reduced embedding size (e.g. 256 or 512); 0 = the model's native size
+    EMBEDDING_DIMENSIONS: int = int(os.getenv("EMBEDDING_DIMENSIONS", "0"))
+    # How to reduce: "provider" (OpenAI dimensions parameter) or "local" (truncate + renormalize)
+    EMBEDDING_TRUNCATION: str = os.getenv("EMBEDDING_TRUNCATION", "provider").lower()
     LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4o-mini")
     LLM_TEMPERATURE: float = float(os.getenv("LLM_TEMPERATURE", "0.3"))
 
     # Data Sources
+    PORTFOLIO_OWNER: str = os.getenv("PORTFOLIO_OWNER", "James Brendamour")  # named in the prompt
+    RESUME_PDF_PATH: str = os.getenv("RESUME_PDF_PATH", "../src/data/James-Brendamour-Resume.pdf")
     GITHUB_USERNAME: str = os.getenv("GITHUB_USERNAME", "jamesbmour")
     DEV_TO_USERNAME: str = os.getenv("DEV_TO_USERNAME", "jamesbmour")
+    # dev.to API key for article statistics (/api/articles/me) and their SQLite store
+    DEVTO_API_KEY: str = os.getenv("DEVTO_API_KEY", "")
+    # Relative to the backend directory, so src/get_blogs.py and ingestion share one store
+    DEVTO_STATS_PATH: str = os.path.join(BACKEND_DIR, os.getenv("DEVTO_STATS_PATH", ".cache/devto_stats.sqlite3"))
     PORTFOLIO_CONFIG_PATH: str = os.getenv("PORTFOLIO_CONFIG_PATH", "../gitprofile.config.ts")
+    # Extra PDFs (papers, certificates); comma-separated files, directories or globs
+    ADDITIONAL_PDF_PATHS: List[str] = [p for p in os.getenv("ADDITIONAL_PDF_PATHS", "").split(",") if p]
+
+    # Ingestion Performance
+    INGEST_MAX_WORKERS: int = int(os.getenv("INGEST_MAX_WORKERS", "0"))  # 0 = one per CPU
+    PDF_CACHE_DIR: str = os.getenv("PDF_CACHE_DIR", ".cache/pdf")
+
+    # Background Re-ingestion
+    INGEST_SCHEDULER_ENABLED: bool = os.getenv("INGEST_SCHEDULER_ENABLED", "false").lower() == "true"
+    INGEST_DEFAULT_INTERVAL: int = int(os.getenv("INGEST_DEFAULT_INTERVAL", "3600"))
+    # Per-loader intervals in seconds, e.g. "github_repos=1800,devto_blog=3600"
+    INGEST_INTERVALS: Dict[str, int] = {
+        name.strip(): int(seconds)
+        for name, seconds in (
+            item.split("=", 1) for item in os.getenv("INGEST_INTERVALS", "").split(",") if "=" in item
+        )
+    }
+    INGEST_MAX_CONCURRENCY: int = int(os.getenv("INGEST_MAX_CONCURRENCY", "1"))
+    INGEST_NICENESS: int = int(os.getenv("INGEST_NICENESS", "10"))
+    INGEST_BATCH_SIZE: int = int(os.getenv("INGEST_BATCH_SIZE", "64"))  # Chunks per embedding call
+
+    # Admin API (disabled when no key is set)
+    ADMIN_API_KEY: str = os.getenv("ADMIN_API_KEY", "")
 
     # CORS Configuration
     CORS_ORIGINS: List[str] = os.getenv(
@@ -38,12 +97,91 @@ class Config:
     ).split(",")
 
     # RAG Configuration
-    RETRIEVER_K: int = int(os.getenv("RETRIEVER_K", "4"))
+    RETRIEVER_K: int = int(os.getenv("RETRIEVER_K", "4"))  # most chunks per question
     SCORE_THRESHOLD: float = float(os.getenv("SCORE_THRESHOLD", "0.7"))
-
-    # Text Splitting Configuration
-    CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
-    CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "200"))
+    # Dynamic k: cut the candidates at a score drop of at least RETRIEVER_MIN_GAP (0 disables)
+    RETRIEVER_MIN_K: int = int(os.getenv("RETRIEVER_MIN_K", "1"))
+    RETRIEVER_MIN_GAP: float = float(os.getenv("RETRIEVER_MIN_GAP", "0.05"))
+    # Per-model threshold and gap written by calibrate.py (override the two settings above)
+    RETRIEVAL_CALIBRATION_PATH: str = os.getenv("RETRIEVAL_CALIBRATION_PATH", "retrieval_calibration.json")
+    # Query preprocessing (normalization, abbreviations, typo correction) before retrieval and caching
+    QUERY_PREPROCESSING: bool = os.getenv("QUERY_PREPROCESSING", "true").lower() == "true"
+    QUERY_TYPO_CUTOFF: float = float(os.getenv("QUERY_TYPO_CUTOFF", "0.8"))  # difflib similarity
+    QUERY_EMBEDDING_LRU_SIZE: int = int(os.getenv("QUERY_EMBEDDING_LRU_SIZE", "1024"))  # per process; 0 disables
+    # Templated answers to structured questions (education, experience, skills) without an LLM call
+    STRUCTURED_ANSWERS: bool = os.getenv("STRUCTURED_ANSWERS", "true").lower() == "true"
+    STRUCTURED_MIN_CONFIDENCE: float = float(os.getenv("STRUCTURED_MIN_CONFIDENCE", "0.85"))  # share of understood words
+    SOURCE_PREVIEW_CHARS: int = int(os.getenv("SOURCE_PREVIEW_CHARS", "200"))  # content preview per source
+
+    # LLM Deadline, Hedging and Circuit Breaker
+    LLM_DEADLINE_SECONDS: float = float(os.getenv("LLM_DEADLINE_SECONDS", "8"))
+    LLM_HEDGE_AFTER_SECONDS: float = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "0"))  # 0 = adaptive (p95)
+    LLM_HEDGE_MAX_ATTEMPTS: int = int(os.getenv("LLM_HEDGE_MAX_ATTEMPTS", "2"))
+    LLM_BREAKER_FAILURES: int = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    LLM_BREAKER_RESET_SECONDS: float = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+    # Precomputed FAQ Answers
+    FAQ_ENABLED: bool = os.getenv("FAQ_ENABLED", "true").lower() == "true"
+    FAQ_COLLECTION_NAME: str = os.getenv("FAQ_COLLECTION_NAME") or f"{COLLECTION_NAME}-faq"
+    FAQ_MATCH_THRESHOLD: float = float(os.getenv("FAQ_MATCH_THRESHOLD", "0.9"))  # cosine similarity
+    FAQ_MAX_QUESTIONS: int = int(os.getenv("FAQ_MAX_QUESTIONS", "100"))
+    FAQ_PRECOMPUTE_CONCURRENCY: int = int(os.getenv("FAQ_PRECOMPUTE_CONCURRENCY", "4"))
+    FAQ_QUESTIONS_PATH: str = os.getenv("FAQ_QUESTIONS_PATH", "")  # extra curated questions, one per line
+
+    # Multi-tenant Serving (tenants are loaded from TENANTS_PATH; without it only the default tenant exists)
+    TENANTS_PATH: str = os.getenv("TENANTS_PATH", "")
+    DEFAULT_TENANT: str = os.getenv("DEFAULT_TENANT", "default")
+    TENANT_HEADER: str = os.getenv("TENANT_HEADER", "X-Tenant")
+    TENANT_CACHE_SIZE: int = int(os.getenv("TENANT_CACHE_SIZE", "64"))  # tenants with loaded state per worker
+
+    # Shared Caches (one SQLite file shared by all server workers on the host)
+    SHARED_CACHE_PATH: str = os.getenv("SHARED_CACHE_PATH", ".cache/shared.sqlite3")
+    SHARED_CACHE_BUSY_TIMEOUT: float = float(os.getenv("SHARED_CACHE_BUSY_TIMEOUT", "0.05"))  # seconds; then miss/skip
+    ANSWER_CACHE_TTL_SECONDS: float = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))  # 0 disables
+    ANSWER_CACHE_MAX_ENTRIES: int = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+    EMBEDDING_CACHE_MAX_ENTRIES: int = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "20000"))
+
+    # Production Server
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", "8000"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))  # 0 = one worker per CPU
+    SERVER_TIMEOUT: int = int(os.getenv("SERVER_TIMEOUT", "120"))
+
+    # Startup Warm-up and Graceful Shutdown
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_RETRY_SECONDS: float = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+    SHUTDOWN_DRAIN_SECONDS: float = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "60"))  # wait for in-flight requests
+
+    # Chat Traffic Capture (stores user questions; opt-in)
+    TRAFFIC_CAPTURE_ENABLED: bool = os.getenv("TRAFFIC_CAPTURE_ENABLED", "false").lower() == "true"
+    TRAFFIC_CAPTURE_PATH: str = os.getenv("TRAFFIC_CAPTURE_PATH", ".cache/traffic.jsonl")  # one file per worker
+    TRAFFIC_CAPTURE_MAX_BYTES: int = int(os.getenv("TRAFFIC_CAPTURE_MAX_BYTES", "10000000"))
+    TRAFFIC_CAPTURE_BACKUPS: int = int(os.getenv("TRAFFIC_CAPTURE_BACKUPS", "5"))
+
+    # Batch Chat Configuration
+    BATCH_MAX_QUESTIONS: int = int(os.getenv("BATCH_MAX_QUESTIONS", "50"))
+    BATCH_LLM_CONCURRENCY: int = int(os.getenv("BATCH_LLM_CONCURRENCY", "8"))
+
+    # Admission Control and Rate Limiting
+    CHAT_MAX_CONCURRENCY: int = int(os.getenv("CHAT_MAX_CONCURRENCY", "8"))
+    CHAT_MAX_QUEUE: int = int(os.getenv("CHAT_MAX_QUEUE", "16"))
+    CHAT_QUEUE_TIMEOUT: float = float(os.getenv("CHAT_QUEUE_TIMEOUT", "10"))
+    RATE_LIMIT_PER_MINUTE: float = float(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
+    RATE_LIMIT_BURST: int = int(os.getenv("RATE_LIMIT_BURST", "10"))
+    RATE_LIMIT_KEY: str = os.getenv("RATE_LIMIT_KEY", "ip")
+    TRUST_PROXY_HEADERS: bool = os.getenv("TRUST_PROXY_HEADERS", "false").lower() == "true"
+
+    # Chunking Configuration (sizes in embedding-model tokens)
+    CHUNK_SIZE_TOKENS: int = int(os.getenv("CHUNK_SIZE_TOKENS", "300"))
+    CHUNK_OVERLAP_TOKENS: int = int(os.getenv("CHUNK_OVERLAP_TOKENS", "30"))
+    ATOMIC_MAX_TOKENS: int = int(os.getenv("ATOMIC_MAX_TOKENS", "1000"))
+
+    # Near-duplicate Chunk Removal (MinHash/LSH over character shingles)
+    DEDUP_ENABLED: bool = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_THRESHOLD: float = float(os.getenv("DEDUP_THRESHOLD", "0.8"))  # Jaccard similarity of shingles
+    DEDUP_NUM_PERM: int = int(os.getenv("DEDUP_NUM_PERM", "128"))
+    DEDUP_BANDS: int = int(os.getenv("DEDUP_BANDS", "32"))  # must divide DEDUP_NUM_PERM
+    DEDUP_SHINGLE_SIZE: int = int(os.getenv("DEDUP_SHINGLE_SIZE", "5"))  # characters
 
     @classmethod
     def validate(cls) -> bool:
@@ -0,0 +1,225 @@
+"""
+Near-duplicate detection for the ingestion pipeline.
+Drops chunks that nearly repeat another chunk before they are embedded and upserted.
+
+The resume PDF, the `experiences` block of gitprofile.config.ts and GitHub
+descriptions state the same facts, so retrieval used to spend several of its
+RETRIEVER_K slots on copies of one chunk. Each chunk's text is normalized and
+cut into character shingles; MinHash signatures (DEDUP_NUM_PERM hashes) are
+banded for locality-sensitive hashing, so only chunks sharing a band are
+compared. Candidates are confirmed with the exact Jaccard similarity of their
+shingles (at least DEDUP_THRESHOLD).
+
+Each group of near-duplicates keeps one chunk: a chunk already stored in the
+collection if there is one (so syncs never churn stored points), otherwise
+the longest text. The kept chunk records every dropped copy in
+`metadata.duplicates` (loader, source, type, content hash and similarity).
+"""
+import re
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from config import config
+
+# MinHash permutations: (a * x + b) mod MERSENNE_PRIME, truncated to 32 bits
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase words separated by single spaces (formatting differences are not content differences)"""
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def shingles(text: str, size: int) -> Set[int]:
+    """
+    CRC32 hashes of the character n-grams of normalized text.
+
+    Args:
+        text: Chunk text
+        size: Characters per shingle
+
+    Returns:
+        Shingle hashes (the whole text as one shingle when shorter than `size`)
+    """
+    text = normalize_text(text)
+    if not text:
+        return set()
+    if len(text) <= size:
+        return {zlib.crc32(text.encode("utf-8"))}
+    return {zlib.crc32(text[i:i + size].encode("utf-8")) for i in range(len(text) - size + 1)}
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    """Exact Jaccard similarity of two shingle sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures with a fixed set of random permutations"""
+
+    def __init__(self, num_perm: int, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, int(MERSENNE_PRIME), num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(MERSENNE_PRIME), num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_hashes: Set[int]) -> np.ndarray:
+        """Minimum permuted hash per permutation (uint64 wrap-around is part of the hash family)"""
+        x = np.fromiter(shingle_hashes, dtype=np.uint64, count=len(shingle_hashes))[:, None]
+        with np.errstate(over="ignore"):
+            return (((x * self.a + self.b) % MERSENNE_PRIME) & MAX_HASH).min(axis=0)
+
+
+@dataclass
+class DedupResult:
+    """Outcome of one deduplication run"""
+    kept: List[Document]
+    # Stored chunks that gained entries in metadata.duplicates
+    updated_existing: List[Document] = field(default_factory=list)
+    chunks: int = 0
+    dropped: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """Share of incoming chunks dropped as near-duplicates"""
+        return round(self.dropped / self.chunks, 3) if self.chunks else 0.0
+
+
+class Deduplicator:
+    """
+    MinHash/LSH near-duplicate filter for chunks.
+
+    Stateless between runs apart from cumulative counters, so one instance
+    serves full ingestions and per-loader syncs alike.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        shingle_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            threshold: Minimum Jaccard similarity of near-duplicates (default: DEDUP_THRESHOLD)
+            num_perm: MinHash permutations (default: DEDUP_NUM_PERM)
+            bands: LSH bands; more bands find less similar candidates (default: DEDUP_BANDS)
+            shingle_size: Characters per shingle (default: DEDUP_SHINGLE_SIZE)
+        """
+        self.threshold = config.DEDUP_THRESHOLD if threshold is None else threshold
+        num_perm = num_perm or config.DEDUP_NUM_PERM
+        self.bands = bands or config.DEDUP_BANDS
+        if num_perm % self.bands:
+            raise ValueError(f"DEDUP_NUM_PERM ({num_perm}) must be a multiple of DEDUP_BANDS ({self.bands})")
+        self.rows = num_perm // self.bands
+        self.shingle_size = shingle_size or config.DEDUP_SHINGLE_SIZE
+        self.hasher = MinHasher(num_perm)
+
+        self._lock = threading.Lock()
+        self.chunks = 0
+        self.dropped = 0
+
+    def candidate_pairs(self, signatures: List[Optional[np.ndarray]]) -> Set[Tuple[int, int]]:
+        """Index pairs that share at least one LSH band"""
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        for index, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            for band in range(self.bands):
+                key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                buckets.setdefault(key, []).append(index)
+
+        pairs: Set[Tuple[int, int]] = set()
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1:]:
+                    pairs.add((first, second))
+        return pairs
+
+    def deduplicate(self, chunks: List[Document], existing: Sequence[Document] = ()) -> DedupResult:
+        """
+        Drop near-duplicate chunks.
+
+        Args:
+            chunks: New chunks (with `loader` and `content_hash` metadata)
+            existing: Chunks already stored for other loaders; they are always
+                kept, and new chunks repeating them are dropped
+
+        Returns:
+            Kept chunks in their original order, stored chunks whose
+            provenance grew, and counts
+        """
+        documents = list(existing) + list(chunks)
+        offset = len(existing)
+        shingle_sets = [shingles(doc.page_content, self.shingle_size) for doc in documents]
+        signatures = [self.hasher.signature(s) if s else None for s in shingle_sets]
+
+        # Union-find over confirmed pairs
+        parent = list(range(len(documents)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        for first, second in self.candidate_pairs(signatures):
+            if second < offset:
+                continue  # Stored chunks were deduplicated when they were ingested
+            if jaccard(shingle_sets[first], shingle_sets[second]) >= self.threshold:
+                parent[find(second)] = find(first)
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(len(documents)):
+            groups.setdefault(find(index), []).append(index)
+
+        dropped: Set[int] = set()
+        updated: List[Document] = []
+        for members in groups.values():
+            if len(members) == 1:
+                continue
+            stored = [index for index in members if index < offset]
+            keep = stored[0] if stored else max(members, key=lambda index: (len(documents[index].page_content), -index))
+            provenance = documents[keep].metadata.setdefault("duplicates", [])
+            known = {entry.get("content_hash") for entry in provenance}
+            recorded = len(provenance)
+            for index in members:
+                if index == keep or index < offset:
+                    continue
+                dropped.add(index)
+                metadata = documents[index].metadata
+                if metadata.get("content_hash") in known:
+                    continue
+                known.add(metadata.get("content_hash"))
+                provenance.append({
+                    "loader": metadata.get("loader", ""),
+                    "source": metadata.get("source", ""),
+                    "type": metadata.get("type", ""),
+                    "content_hash": metadata.get("content_hash", ""),
+                    "similarity": round(jaccard(shingle_sets[keep], shingle_sets[index]), 3),
+                })
+            if keep < offset and len(provenance) > recorded:
+                updated.append(documents[keep])
+
+        kept = [doc for index, doc in enumerate(documents[offset:], start=offset) if index not in dropped]
+        with self._lock:
+            self.chunks += len(chunks)
+            self.dropped += len(dropped)
+        return DedupResult(kept=kept, updated_existing=updated, chunks=len(chunks), dropped=len(dropped))
+
+    def stats(self) -> Dict[str, Any]:
+        """Cumulative chunk and drop counts"""
+        return {
+            "chunks": self.chunks,
+            "dropped": self.dropped,
+            "ratio": round(self.dropped / self.chunks, 3) if self.chunks else 0.0,
+            "threshold": self.threshold,
+        }
@@ -0,0 +1,300 @@
+"""
+Dev.to article statistics for the RAG chatbot.
+Collects daily page view, reaction and comment counts into an indexed SQLite store.
+
+Replaces the JSON file written by `src/get_blogs.py`, which was read whole,
+scanned linearly per article and per day, and rewritten on every run. Stats
+are keyed by (article id, date), so a daily collection is one paged fetch of
+`/api/articles/me` plus one upsert transaction, whatever the history size.
+Re-running on the same day overwrites that day's counts. The store answers
+time-series queries and feeds ingestion (ingest.DevToStatsLoader).
+
+Usage: python devto_stats.py [--import-json devToArticleStats.json] [--no-fetch]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from clients import clients
+from config import config
+
+ARTICLES_URL = "https://dev.to/api/articles/me"
+
+# Largest page dev.to serves
+PAGE_SIZE = 1000
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS articles ("
+    " id INTEGER PRIMARY KEY, title TEXT NOT NULL, url TEXT, published_at TEXT, tags TEXT)",
+    "CREATE INDEX IF NOT EXISTS articles_title ON articles (title)",
+    # Cumulative counts as of each day; the primary key is the (article, date) index
+    "CREATE TABLE IF NOT EXISTS article_stats ("
+    " article_id INTEGER NOT NULL, date TEXT NOT NULL,"
+    " page_views INTEGER NOT NULL, reactions INTEGER NOT NULL, comments INTEGER NOT NULL,"
+    " PRIMARY KEY (article_id, date)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS article_stats_date ON article_stats (date)",
+)
+
+
+def legacy_article_id(title: str) -> int:
+    """Placeholder ID for articles imported from the JSON file, which has no IDs (negative, so never an API ID)"""
+    return -int(hashlib.sha256(title.encode("utf-8")).hexdigest()[:12], 16)
+
+
+def fetch_my_articles(api_key: Optional[str] = None, page_size: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Fetch every published article of the API key's owner with current counts.
+
+    Args:
+        api_key: dev.to API key (default: DEVTO_API_KEY)
+        page_size: Articles per request
+
+    Returns:
+        Article dictionaries from `/api/articles/me`
+
+    Raises:
+        ValueError: If no API key is configured
+    """
+    api_key = api_key or config.DEVTO_API_KEY
+    if not api_key:
+        raise ValueError("DEVTO_API_KEY is required to fetch article statistics")
+
+    session = clients.requests_session()
+    articles: List[Dict[str, Any]] = []
+    page = 1
+    while True:
+        response = session.get(
+            ARTICLES_URL,
+            params={"page": page, "per_page": page_size},
+            headers={"api-key": api_key, "accept": "application/vnd.forem.api-v1+json"},
+            timeout=config.HTTP_TIMEOUT,
+        )
+        response.raise_for_status()
+        batch = response.json()
+        articles.extend(batch)
+        if len(batch) < page_size:
+            return articles
+        page += 1
+
+
+class StatsStore:
+    """
+    Daily article statistics in a SQLite file.
+
+    Every write is one transaction, so readers (ingestion, queries) never see
+    a partially recorded day.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite database file (default: DEVTO_STATS_PATH)
+        """
+        self.path = path or config.DEVTO_STATS_PATH
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross fork(): re-open in each process
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+        return self._conn
+
+    def _query(self, sql: str, params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        conn = self._connection()
+        with self._lock:
+            return [dict(row) for row in conn.execute(sql, list(params)).fetchall()]
+
+    def record(self, articles: List[Dict[str, Any]], day: Optional[str] = None) -> int:
+        """
+        Store the current counts of `articles` as the stats for `day`.
+
+        Articles previously imported from the JSON file (matched by title)
+        take over their real API ID along with their history.
+
+        Args:
+            articles: Article dictionaries from `/api/articles/me`
+            day: ISO date (default: today)
+
+        Returns:
+            Number of articles recorded
+        """
+        day = day or date.today().isoformat()
+        conn = self._connection()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for article in articles:
+                    title = article.get("title", "Unknown")
+                    legacy_id = legacy_article_id(title)
+                    conn.execute("UPDATE OR IGNORE article_stats SET article_id = ? WHERE article_id = ?", (article["id"], legacy_id))
+                    conn.execute("DELETE FROM article_stats WHERE article_id = ?", (legacy_id,))
+                    conn.execute("DELETE FROM articles WHERE id = ?", (legacy_id,))
+                    conn.execute(
+                        "INSERT INTO articles (id, title, url, published_at, tags) VALUES (?, ?, ?, ?, ?)"
+                        " ON CONFLICT (id) DO UPDATE SET title = excluded.title, url = excluded.url,"
+                        " published_at = excluded.published_at, tags = excluded.tags",
+                        (article["id"], title, article.get("url", ""), article.get("published_at", ""),
+                         ", ".join(article.get("tag_list") or [])),
+                    )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO article_stats VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (article["id"], day, article.get("page_views_count") or 0,
+                         article.get("public_reactions_count") or 0, article.get("comments_count") or 0)
+                        for article in articles
+                    ],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return len(articles)
+
+    def import_json(self, path: str) -> int:
+        """
+        Import the history kept by the old `devToArticleStats.json` collector.
+
+        Articles are matched by title to stored articles; unknown titles get a
+        placeholder ID until the next `record` sees them.
+
+        Args:
+            path: JSON file written by `src/get_blogs.py`
+
+        Returns:
+            Number of daily rows imported
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            legacy = json.load(f)
+
+        known = {row["title"]: row["id"] for row in self._query("SELECT id, title FROM articles")}
+        articles, rows = [], []
+        for article in legacy.get("articles", []):
+            title = article["title"]
+            article_id = known.get(title) or legacy_article_id(title)
+            try:
+                published = datetime.strptime(article.get("published", ""), "%d-%m-%Y %H:%M:%S").isoformat()
+            except ValueError:
+                published = article.get("published", "")
+            articles.append((article_id, title, published))
+            rows.extend(
+                (article_id, stats["date"], stats["page_views_count"], stats["public_reactions_count"], stats["comments_count"])
+                for stats in article.get("stats", [])
+            )
+
+        conn = self._connection()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("INSERT OR IGNORE INTO articles (id, title, published_at) VALUES (?, ?, ?)", articles)
+                # Never overwrite days collected by this module
+                conn.executemany("INSERT OR IGNORE INTO article_stats VALUES (?, ?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def articles(self) -> List[Dict[str, Any]]:
+        """Stored articles, newest first"""
+        return self._query("SELECT id, title, url, published_at, tags FROM articles ORDER BY published_at DESC")
+
+    def series(self, article_id: int, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Daily cumulative counts of one article.
+
+        Args:
+            article_id: dev.to article ID
+            start: First ISO date (inclusive)
+            end: Last ISO date (inclusive)
+
+        Returns:
+            Dictionaries with date, page_views, reactions and comments, oldest first
+        """
+        return self._query(
+            "SELECT date, page_views, reactions, comments FROM article_stats"
+            " WHERE article_id = ? AND date >= ? AND date <= ? ORDER BY date",
+            (article_id, start or "", end or "9999-12-31"),
+        )
+
+    def latest(self) -> List[Dict[str, Any]]:
+        """Most recent counts of every article, most viewed first"""
+        return self._query(
+            "SELECT a.id, a.title, a.url, a.published_at, a.tags, s.date, s.page_views, s.reactions, s.comments"
+            " FROM articles a JOIN article_stats s ON s.article_id = a.id"
+            " WHERE s.date = (SELECT MAX(date) FROM article_stats WHERE article_id = a.id)"
+            " ORDER BY s.page_views DESC"
+        )
+
+    def growth(self, days: int = 30) -> Dict[int, Dict[str, int]]:
+        """
+        Counts gained by each article over the last `days` days.
+
+        Returns:
+            Article ID -> page_views, reactions and comments gained since the
+            last snapshot before the window (or the first snapshot)
+        """
+        since = (date.today() - timedelta(days=days)).isoformat()
+        rows = self._query(
+            "SELECT s.article_id, s.page_views, s.reactions, s.comments,"
+            " b.page_views AS base_views, b.reactions AS base_reactions, b.comments AS base_comments"
+            " FROM article_stats s"
+            " JOIN article_stats b ON b.article_id = s.article_id AND b.date = COALESCE("
+            "  (SELECT MAX(date) FROM article_stats WHERE article_id = s.article_id AND date <= ?),"
+            "  (SELECT MIN(date) FROM article_stats WHERE article_id = s.article_id))"
+            " WHERE s.date = (SELECT MAX(date) FROM article_stats WHERE article_id = s.article_id)",
+            (since,),
+        )
+        return {
+            row["article_id"]: {
+                "page_views": row["page_views"] - row["base_views"],
+                "reactions": row["reactions"] - row["base_reactions"],
+                "comments": row["comments"] - row["base_comments"],
+            }
+            for row in rows
+        }
+
+
+def collect(store: Optional[StatsStore] = None, api_key: Optional[str] = None) -> int:
+    """
+    Fetch today's counts and record them.
+
+    Returns:
+        Number of articles recorded
+    """
+    store = store or StatsStore()
+    return store.record(fetch_my_articles(api_key))
+
+
+def main():
+    """Collect today's stats (and optionally import the legacy JSON history)"""
+    parser = argparse.ArgumentParser(description="Collect dev.to article statistics")
+    parser.add_argument("--import-json", help="Import history from the old devToArticleStats.json file")
+    parser.add_argument("--no-fetch", action="store_true", help="Skip fetching today's counts")
+    args = parser.parse_args()
+
+    store = StatsStore()
+    if args.import_json:
+        print(f"Imported {store.import_json(args.import_json)} daily rows from {args.import_json}")
+    if not args.no_fetch:
+        print(f"Recorded stats for {collect(store)} articles ({date.today().isoformat()}) in {store.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Evaluation: retrieval recall and search latency for reduced embedding dimensions.
+Embeds the ingested chunks and a question set once at full size, then truncates.
+
+For each dimension, vectors are truncated and re-normalized (what
+EMBEDDING_TRUNCATION=local does, and what OpenAI's `dimensions` parameter
+returns for text-embedding-3 models). Each size reports recall@k against
+full-size retrieval, top-1 agreement, brute-force search latency and raw
+index size. --provider-check embeds a sample with the provider's
+`dimensions` parameter to confirm it matches local truncation. Requires a
+configured .env and an ingested collection.
+
+Usage: python eval_dimensions.py [--dimensions 256 512 1024 1536] [--k 4] [--provider-check]
+"""
+import argparse
+import time
+from typing import List, Tuple
+
+import numpy as np
+from langchain_openai import OpenAIEmbeddings
+
+from bench_batch_chat import SCREENING_QUESTIONS
+from clients import clients
+from config import config
+from faq import CURATED_QUESTIONS
+
+
+def load_chunks() -> List[str]:
+    """Texts of every chunk in the collection"""
+    client = clients.qdrant()
+    texts, offset = [], None
+    while True:
+        points, offset = client.scroll(config.COLLECTION_NAME, limit=256, offset=offset, with_payload=["page_content"])
+        texts.extend((point.payload or {}).get("page_content", "") for point in points)
+        if offset is None:
+            return texts
+
+
+def full_size_embeddings(dimensions: int = None) -> OpenAIEmbeddings:
+    return OpenAIEmbeddings(
+        model=config.EMBEDDING_MODEL,
+        dimensions=dimensions,
+        openai_api_key=config.OPENAI_API_KEY,
+        http_client=clients.http_client(),
+    )
+
+
+def reduce(vectors: np.ndarray, dimensions: int) -> np.ndarray:
+    head = vectors[:, :dimensions]
+    return head / np.linalg.norm(head, axis=1, keepdims=True)
+
+
+def evaluate(docs: np.ndarray, queries: np.ndarray, truth: np.ndarray, dimensions: int, k: int) -> Tuple[float, float, float]:
+    """(recall@k, top-1 agreement, search ms per query) at `dimensions`"""
+    reduced_docs = reduce(docs, dimensions).astype(np.float32)
+    reduced_queries = reduce(queries, dimensions).astype(np.float32)
+
+    started = time.perf_counter()
+    repeats = 20
+    for _ in range(repeats):
+        ranked = np.argsort(-(reduced_queries @ reduced_docs.T), axis=1)[:, :k]
+    latency_ms = (time.perf_counter() - started) / (repeats * len(queries)) * 1000
+
+    recall = np.mean([len(set(found) & set(expected)) / k for found, expected in zip(ranked, truth)])
+    top1 = np.mean(ranked[:, 0] == truth[:, 0])
+    return float(recall), float(top1), latency_ms
+
+
+def provider_check(texts: List[str], full: np.ndarray, dimensions: List[int]):
+    """Cosine similarity between provider-reduced and locally truncated vectors"""
+    print("\nProvider `dimensions` vs local truncation (mean cosine):")
+    for size in dimensions:
+        if size >= full.shape[1]:
+            continue
+        provider = np.asarray(full_size_embeddings(size).embed_documents(texts), dtype=np.float64)
+        local = reduce(full, size)
+        print(f"  {size:>5}: {np.mean(np.sum(provider * local, axis=1)):.4f}")
+
+
+def main(dimensions: List[int], k: int, check_provider: bool):
+    """Run the evaluation"""
+    chunks = load_chunks()
+    questions = list(dict.fromkeys(CURATED_QUESTIONS + SCREENING_QUESTIONS))
+    embeddings = full_size_embeddings()
+    docs = np.asarray(embeddings.embed_documents(chunks), dtype=np.float64)
+    queries = np.asarray(embeddings.embed_documents(questions), dtype=np.float64)
+    k = min(k, len(chunks))
+    truth = np.argsort(-(queries @ docs.T), axis=1)[:, :k]
+
+    print("=" * 60)
+    print("EMBEDDING DIMENSION EVALUATION")
+    print("=" * 60 + "\n")
+    print(f"Model: {config.EMBEDDING_MODEL} ({docs.shape[1]} native)  Chunks: {len(chunks)}  Questions: {len(questions)}  k: {k}\n")
+    print(f"{'dims':>6}{'recall@k':>10}{'top-1':>8}{'ms/query':>10}{'index MB':>10}{'per 100k MB':>13}")
+
+    for size in sorted(d for d in dimensions if d <= docs.shape[1]):
+        recall, top1, latency = evaluate(docs, queries, truth, size, k)
+        print(
+            f"{size:>6}{recall:>10.3f}{top1:>8.3f}{latency:>10.4f}"
+            f"{len(chunks) * size * 4 / 1e6:>10.2f}{100000 * size * 4 / 1e6:>13.1f}"
+        )
+
+    if check_provider:
+        provider_check(chunks[:16], docs[:16], dimensions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate reduced embedding dimensions")
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[256, 512, 768, 1024, 1536], help="Sizes to compare")
+    parser.add_argument("--k", type=int, default=4, help="Chunks retrieved per question (RETRIEVER_K)")
+    parser.add_argument("--provider-check", action="store_true", help="Compare with the provider's dimensions parameter")
+    args = parser.parse_args()
+    main(args.dimensions, args.k, args.provider_check)
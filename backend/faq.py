@@ -0,0 +1,365 @@
+"""
+Precomputed FAQ answers for the RAG chatbot.
+Answers predictable recruiter questions ahead of time and serves them without LLM calls.
+
+After ingestion changes the collection, curated questions plus questions
+mined from the ingested metadata (companies, schools, projects, articles)
+are answered once with the normal RAG prompt and stored with their question
+embeddings in a separate Qdrant collection. /api/chat serves a stored answer
+when an incoming question is at least FAQ_MATCH_THRESHOLD similar to a
+stored one. Answers are regenerated only when the collection fingerprint
+(the set of chunk point IDs, which derive from content hashes) changes.
+
+Usage: python faq.py [--force]
+"""
+import argparse
+import hashlib
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from qdrant_client.models import Distance, PointIdsList, PointStruct, SearchRequest, VectorParams
+
+from config import config
+from prompts import first_name
+from sources import source_from_dict
+from vector_index import collection_dimensions
+
+# Questions most recruiters ask, answered regardless of the sources ({name}: owner's first name)
+CURATED_QUESTIONS = [
+    "What are {name}'s technical skills?",
+    "What programming languages does {name} know?",
+    "Tell me about {name}'s work experience",
+    "What is {name}'s current role?",
+    "What is {name}'s educational background?",
+    "Does {name} have cloud experience with AWS, Azure or GCP?",
+    "Has {name} worked with LLMs or LangChain?",
+    "What machine learning frameworks has {name} used?",
+    "Does {name} have consulting experience?",
+    "What projects has {name} worked on?",
+    "Has {name} written any technical blog posts?",
+    "Does {name} know SQL databases?",
+    "What certifications does {name} have?",
+    "Has {name} published any research?",
+    "Why should we hire {name}?",
+]
+
+# Question templates per metadata.type: (metadata field, template)
+MINED_TEMPLATES: Dict[str, Tuple[str, str]] = {
+    "experience": ("company", "What did {name} do at {value}?"),
+    "education": ("institution", "What did {name} study at {value}?"),
+    "certification": ("name", "Tell me about {name}'s {value} certification"),
+    "publication": ("title", "What is {name}'s publication \"{value}\" about?"),
+    "external_project": ("title", "Tell me about {name}'s {value} project"),
+    "project": ("repo_name", "Tell me about {name}'s {value} project"),
+    "article": ("title", "What did {name} write about in \"{value}\"?"),
+}
+
+# Namespace for deterministic FAQ point IDs
+FAQ_NAMESPACE = uuid.UUID("7b1c4f0e-3a52-4d0f-9f38-6c0b8f2d9e41")
+
+
+def curated_questions(owner: Optional[str] = None) -> List[str]:
+    """
+    Built-in questions plus any from FAQ_QUESTIONS_PATH (one per line).
+
+    Args:
+        owner: Portfolio owner named in the built-in questions (default: PORTFOLIO_OWNER)
+    """
+    name = first_name(owner or config.PORTFOLIO_OWNER)
+    questions = [question.format(name=name) for question in CURATED_QUESTIONS]
+    if config.FAQ_QUESTIONS_PATH:
+        with open(config.FAQ_QUESTIONS_PATH, "r", encoding="utf-8") as f:
+            questions.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    return questions
+
+
+def mine_questions(metadatas: Iterable[Dict[str, Any]], owner: Optional[str] = None) -> List[str]:
+    """
+    Generate questions about the entities found in ingested chunk metadata.
+
+    Args:
+        metadatas: Chunk metadata dictionaries
+        owner: Portfolio owner named in the questions (default: PORTFOLIO_OWNER)
+
+    Returns:
+        Unique questions in first-seen order
+    """
+    name = first_name(owner or config.PORTFOLIO_OWNER)
+    questions: Dict[str, None] = {}
+    for metadata in metadatas:
+        field, template = MINED_TEMPLATES.get(metadata.get("type"), (None, None))
+        value = str(metadata.get(field) or "").strip() if field else ""
+        if value and value != "Unknown":
+            questions[template.format(name=name, value=value)] = None
+    return list(questions)
+
+
+def faq_point_id(question: str) -> str:
+    """Deterministic point ID for a question (case and whitespace insensitive)"""
+    return str(uuid.uuid5(FAQ_NAMESPACE, " ".join(question.lower().split())))
+
+
+class FAQIndex:
+    """
+    Stored FAQ answers keyed by question embedding.
+    """
+
+    def __init__(
+        self,
+        qdrant_client,
+        async_qdrant_client,
+        embeddings,
+        collection_name: Optional[str] = None,
+        normalize: Optional[Callable[[str], str]] = None,
+        source_collection: Optional[str] = None,
+        owner: Optional[str] = None,
+    ):
+        """
+        Args:
+            qdrant_client: Sync Qdrant client (precompute)
+            async_qdrant_client: Async Qdrant client (matching)
+            embeddings: Embeddings used for stored and incoming questions
+            collection_name: FAQ collection (default: FAQ_COLLECTION_NAME)
+            normalize: Query preprocessing applied to stored questions, so they
+                are embedded in the same form as the (preprocessed) questions
+                passed to `amatch`
+            source_collection: Chunk collection the answers are generated from
+                (default: COLLECTION_NAME)
+            owner: Portfolio owner named in the questions (default: PORTFOLIO_OWNER)
+        """
+        self.qdrant_client = qdrant_client
+        self.async_qdrant_client = async_qdrant_client
+        self.embeddings = embeddings
+        self.collection_name = collection_name or config.FAQ_COLLECTION_NAME
+        self.normalize = normalize or (lambda question: question)
+        self.source_collection = source_collection or config.COLLECTION_NAME
+        self.owner = owner or config.PORTFOLIO_OWNER
+        self.lookups = 0
+        self.matches = 0
+
+    async def amatch(self, question: str, threshold: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Stored answer for the most similar FAQ question, if similar enough.
+
+        Args:
+            question: Incoming user question, preprocessed like stored ones
+            threshold: Minimum cosine similarity (default: FAQ_MATCH_THRESHOLD)
+
+        Returns:
+            Chat result dictionary, or None when nothing matches (or the
+            FAQ collection is unavailable)
+        """
+        self.lookups += 1
+        try:
+            vector = await self.embeddings.aembed_query(question)
+            hits = await self.async_qdrant_client.search(
+                collection_name=self.collection_name,
+                query_vector=vector,
+                limit=1,
+                score_threshold=config.FAQ_MATCH_THRESHOLD if threshold is None else threshold,
+                with_payload=True,
+            )
+        except Exception:
+            # No FAQ collection yet (or Qdrant hiccup): answer normally
+            return None
+
+        return self._result(hits[0]) if hits else None
+
+    async def amatch_vectors(self, vectors: List[List[float]], threshold: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Like `amatch` for already embedded questions, in one Qdrant batch request.
+
+        Args:
+            vectors: Embeddings of preprocessed questions
+            threshold: Minimum cosine similarity (default: FAQ_MATCH_THRESHOLD)
+
+        Returns:
+            Per question, the chat result dictionary or None
+        """
+        if not vectors:
+            return []
+        self.lookups += len(vectors)
+        try:
+            batch_hits = await self.async_qdrant_client.search_batch(
+                collection_name=self.collection_name,
+                requests=[
+                    SearchRequest(
+                        vector=vector,
+                        limit=1,
+                        score_threshold=config.FAQ_MATCH_THRESHOLD if threshold is None else threshold,
+                        with_payload=True,
+                    )
+                    for vector in vectors
+                ],
+            )
+        except Exception:
+            return [None] * len(vectors)
+        return [self._result(hits[0]) if hits else None for hits in batch_hits]
+
+    def _result(self, hit: Any) -> Dict[str, Any]:
+        """Chat result of a matched FAQ entry"""
+        self.matches += 1
+        payload = hit.payload or {}
+        return {
+            "response": payload.get("response", ""),
+            "sources": [source_from_dict(source) for source in payload.get("sources", [])],
+            "success": True,
+            "degraded": False,
+        }
+
+    def stored_fingerprint(self) -> Optional[str]:
+        """Collection fingerprint the stored answers were generated from"""
+        if not self.qdrant_client.collection_exists(self.collection_name):
+            return None
+        points, _ = self.qdrant_client.scroll(self.collection_name, limit=1, with_payload=["fingerprint"])
+        return points[0].payload.get("fingerprint") if points else None
+
+    def stored_ids(self) -> List[str]:
+        """IDs of every stored FAQ entry"""
+        ids: List[str] = []
+        offset = None
+        while True:
+            points, offset = self.qdrant_client.scroll(
+                self.collection_name, limit=256, offset=offset, with_payload=False, with_vectors=False,
+            )
+            ids.extend(str(point.id) for point in points)
+            if offset is None:
+                return ids
+
+    def store(self, entries: List[Dict[str, Any]], fingerprint: str):
+        """
+        Replace the stored answers with `entries`.
+
+        New answers are upserted before stale ones are deleted, so matching
+        keeps working throughout a regeneration.
+
+        Args:
+            entries: Dictionaries with question, response and sources
+            fingerprint: Collection fingerprint the answers were generated from
+        """
+        vectors = self.embeddings.embed_documents([self.normalize(entry["question"]) for entry in entries])
+        # Rebuild after an embedding size change (EMBEDDING_DIMENSIONS)
+        if collection_dimensions(self.qdrant_client, self.collection_name) not in (None, len(vectors[0])):
+            self.qdrant_client.delete_collection(self.collection_name)
+        if not self.qdrant_client.collection_exists(self.collection_name):
+            self.qdrant_client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=VectorParams(size=len(vectors[0]), distance=Distance.COSINE),
+            )
+
+        generated_at = datetime.now().isoformat()
+        points = [
+            PointStruct(
+                id=faq_point_id(entry["question"]),
+                vector=vector,
+                payload={**entry, "fingerprint": fingerprint, "generated_at": generated_at},
+            )
+            for entry, vector in zip(entries, vectors)
+        ]
+        existing = self.stored_ids()
+        self.qdrant_client.upsert(collection_name=self.collection_name, points=points)
+
+        keep = {point.id for point in points}
+        stale = [point_id for point_id in existing if point_id not in keep]
+        if stale:
+            self.qdrant_client.delete(collection_name=self.collection_name, points_selector=PointIdsList(points=stale))
+
+    def stats(self) -> Dict[str, Any]:
+        """This process's FAQ lookup counters"""
+        return {
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "match_rate": round(self.matches / self.lookups, 3) if self.lookups else None,
+            "threshold": config.FAQ_MATCH_THRESHOLD,
+        }
+
+
+def collection_snapshot(qdrant_client, collection_name: Optional[str] = None) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Fingerprint and chunk metadata of the main collection.
+
+    Returns:
+        (SHA-256 of the sorted point IDs, metadata of every chunk)
+    """
+    collection_name = collection_name or config.COLLECTION_NAME
+    ids: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+    offset = None
+    while True:
+        points, offset = qdrant_client.scroll(
+            collection_name, limit=256, offset=offset, with_payload=["metadata"], with_vectors=False,
+        )
+        for point in points:
+            ids.append(str(point.id))
+            metadatas.append((point.payload or {}).get("metadata") or {})
+        if offset is None:
+            break
+
+    fingerprint = hashlib.sha256("\n".join(sorted(ids)).encode()).hexdigest()
+    return fingerprint, metadatas
+
+
+def precompute(
+    index: FAQIndex,
+    answer: Callable[[str], Optional[Dict[str, Any]]],
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Regenerate FAQ answers if the main collection changed.
+
+    Args:
+        index: FAQ index to fill
+        answer: Answers one question (retrieve + generate); returns None to skip it
+        force: Regenerate even if the fingerprint is unchanged
+
+    Returns:
+        Dictionary with status ("updated", "unchanged", "empty" when the
+        collection has no chunks, "failed" when no answer could be
+        generated), question/answer counts and per-question errors
+    """
+    fingerprint, metadatas = collection_snapshot(index.qdrant_client, index.source_collection)
+    if not metadatas:
+        return {"status": "empty", "questions": 0, "answered": 0, "errors": []}
+    if not force and index.stored_fingerprint() == fingerprint:
+        print("✓ FAQ answers are up to date")
+        return {"status": "unchanged", "questions": 0, "answered": 0, "errors": []}
+
+    questions = curated_questions(index.owner) + mine_questions(metadatas, index.owner)
+    questions = list(dict.fromkeys(questions))[:config.FAQ_MAX_QUESTIONS]
+    print(f"Precomputing answers for {len(questions)} FAQ questions...")
+
+    errors: List[str] = []
+
+    def run(question: str) -> Optional[Dict[str, Any]]:
+        try:
+            result = answer(question)
+        except Exception as e:
+            errors.append(f"{question}: {str(e)}")
+            return None
+        return {"question": question, **result} if result else None
+
+    with ThreadPoolExecutor(max_workers=max(1, config.FAQ_PRECOMPUTE_CONCURRENCY)) as executor:
+        entries = [entry for entry in executor.map(run, questions) if entry]
+
+    # Keep the previous answers if nothing could be generated (e.g. LLM outage)
+    if entries:
+        index.store(entries, fingerprint)
+    print(f"✓ Precomputed {len(entries)}/{len(questions)} FAQ answers" + (f" ({len(errors)} failed)" if errors else ""))
+    return {"status": "updated" if entries else "failed", "questions": len(questions), "answered": len(entries), "errors": errors}
+
+
+def refresh_faq(force: bool = False, tenant: Optional[str] = None) -> Dict[str, Any]:
+    """Regenerate a tenant's FAQ answers with the shared RAG chain (post-ingest hook)"""
+    from rag_chain import rag_chain
+    faq = rag_chain.tenant_chain(tenant).faq
+    return precompute(faq, lambda question: rag_chain.precompute_answer(question, tenant), force=force)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute FAQ answers")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the sources are unchanged")
+    parser.add_argument("--tenant", default=None, help="Tenant to precompute for (default: DEFAULT_TENANT)")
+    args = parser.parse_args()
+    refresh_faq(force=args.force, tenant=args.tenant)
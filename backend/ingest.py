@@ -7,26 +7,62 @@ Data Sources:
 2. Portfolio configuration (gitprofile.config.ts)
 3. GitHub repositories
 4. Dev.to blog articles
+5. Dev.to article statistics (when collected, see devto_stats.py)
 
 Extensible design allows easy addition of new data sources.
 """
 import os
-import re
+import glob
 import json
-import requests
+import re
+import uuid
+import asyncio
+import hashlib
+import argparse
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, List, Dict, Any, Optional, Set
 from datetime import datetime
 
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
-from langchain_qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
-
+from qdrant_client.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    FieldCondition,
+    Filter,
+    FilterSelector,
+    IsEmptyCondition,
+    MatchValue,
+    PayloadField,
+    PayloadSchemaType,
+    PointIdsList,
+    PointStruct,
+)
+
+from chunking import Chunker
+from clients import clients
 from config import config
+from dedup import DedupResult, Deduplicator
+from devto_stats import StatsStore, collect as collect_devto_stats
+from pdf_extraction import PDFTextCache, extract_pdfs
+from profiling import NULL_PROFILER, IngestionProfiler
+from shared_cache import SharedCache, answer_cache as shared_answer_cache
+from tenants import Tenant, TenantRegistry, TenantStates, tenant_answer_cache, tenant_registry
+from vector_index import (
+    IndexSettings,
+    check_collection_dimensions,
+    embedding_dimensions,
+    index_settings as index_settings_from_config,
+)
+from ts_config_parser import ConfigParseError, get_path, parse_ts_config
+
+
+# Full ingestions build into "<collection><BUILD_SUFFIX><timestamp>" before it is aliased to the collection name
+BUILD_SUFFIX = "-build-"
 
 
 # Abstract Base Class for Data Loaders
@@ -40,32 +76,90 @@ class DataLoader(ABC):
 
 
 # Data Loader Implementations
-class ResumePDFLoader(DataLoader):
-    """Load resume PDF document"""
+class PDFLoader(DataLoader):
+    """
+    Load PDF documents as section-level documents.
 
-    def __init__(self, pdf_path: str):
-        self.pdf_path = pdf_path
+    Files are hashed and unchanged files are served from the on-disk
+    extraction cache; the pages of all changed files are parsed in parallel.
+    """
 
-    def load(self) -> List[Document]:
-        """Load resume PDF"""
-        print(f"Loading resume PDF from: {self.pdf_path}")
+    def __init__(
+        self,
+        paths: List[str],
+        source: str = "pdf",
+        doc_type: str = "pdf",
+        cache_dir: str = config.PDF_CACHE_DIR,
+        max_workers: int = config.INGEST_MAX_WORKERS,
+    ):
+        self.paths = paths
+        self.source = source
+        self.doc_type = doc_type
+        self.cache = PDFTextCache(cache_dir)
+        self.max_workers = max_workers
+
+    def _resolve_paths(self) -> List[str]:
+        """Expand globs and directories into a sorted list of PDF files"""
+        resolved = set()
+        for pattern in self.paths:
+            if os.path.isdir(pattern):
+                pattern = os.path.join(pattern, "**", "*.pdf")
+            matches = glob.glob(pattern, recursive=True)
+            if not matches:
+                print(f"Warning: PDF not found at {pattern}")
+            resolved.update(path for path in matches if path.lower().endswith(".pdf"))
+        return sorted(resolved)
 
-        if not os.path.exists(self.pdf_path):
-            print(f"Warning: Resume PDF not found at {self.pdf_path}")
+    def load(self) -> List[Document]:
+        """Load all PDFs"""
+        paths = self._resolve_paths()
+        if not paths:
             return []
 
-        loader = PyPDFLoader(self.pdf_path)
-        docs = loader.load()
+        print(f"Loading {len(paths)} PDF(s): {', '.join(paths)}")
+        extracted = extract_pdfs(paths, self.cache, self.max_workers)
 
-        # Add metadata
-        for doc in docs:
-            doc.metadata["source"] = "resume"
-            doc.metadata["type"] = "resume_pdf"
-            doc.metadata["last_updated"] = datetime.now().isoformat()
+        docs = []
+        for path in paths:
+            result = extracted[path]
+            if result["cached"]:
+                print(f"Unchanged, using cached extraction: {path}")
 
-        print(f"Loaded {len(docs)} pages from resume PDF")
+            modified = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+            for block in result["blocks"]:
+                docs.append(self._block_to_document(path, result["hash"], modified, block))
+
+        print(f"Loaded {len(docs)} sections from {len(paths)} PDF(s)")
         return docs
 
+    def _block_to_document(self, path: str, file_hash: str, modified: str, block: Dict[str, Any]) -> Document:
+        """Convert an extracted section block into a Document"""
+        title = " - ".join(part for part in (block["heading"], block["subheading"]) if part)
+        content = f"{title}\n{block['text']}" if title else block["text"]
+
+        return Document(
+            page_content=content,
+            metadata={
+                "source": self.source,
+                "type": self.doc_type,
+                "file": os.path.basename(path),
+                "file_hash": file_hash,
+                "page": block["page"],
+                "section": block["heading"],
+                "subsection": block["subheading"],
+                "bullet_count": len(block["bullets"]),
+                "last_updated": modified,
+            }
+        )
+
+
+class ResumePDFLoader(PDFLoader):
+    """Load resume PDF document"""
+
+    def __init__(self, pdf_path: str, **kwargs):
+        super().__init__([pdf_path], source="resume", doc_type="resume_pdf", **kwargs)
+        self.pdf_path = pdf_path
+
 
 class PortfolioConfigLoader(DataLoader):
     """Load and parse gitprofile.config.ts"""
@@ -84,197 +178,258 @@ class PortfolioConfigLoader(DataLoader):
         with open(self.config_path, "r") as f:
             content = f.read()
 
+        # Parse the whole config object once; every section reads from it
+        try:
+            portfolio = parse_ts_config(content)
+        except ConfigParseError as e:
+            print(f"Error parsing portfolio config: {str(e)}")
+            return []
+
         docs = []
 
         # Extract skills
-        skills_docs = self._extract_skills(content)
+        skills_docs = self._extract_skills(portfolio)
         docs.extend(skills_docs)
 
         # Extract experience
-        experience_docs = self._extract_experience(content)
+        experience_docs = self._extract_experience(portfolio)
         docs.extend(experience_docs)
 
         # Extract education
-        education_docs = self._extract_education(content)
+        education_docs = self._extract_education(portfolio)
         docs.extend(education_docs)
 
+        # Extract certifications
+        certification_docs = self._extract_certifications(portfolio)
+        docs.extend(certification_docs)
+
+        # Extract publications
+        publication_docs = self._extract_publications(portfolio)
+        docs.extend(publication_docs)
+
         # Extract external projects
-        projects_docs = self._extract_external_projects(content)
+        projects_docs = self._extract_external_projects(portfolio)
         docs.extend(projects_docs)
 
         print(f"Extracted {len(docs)} documents from portfolio config")
         return docs
 
-    def _extract_skills(self, content: str) -> List[Document]:
+    @staticmethod
+    def _entries(portfolio: Dict[str, Any], *paths: str) -> List[Dict[str, Any]]:
+        """Return the object entries of the first list found at any of the given paths"""
+        for path in paths:
+            value = get_path(portfolio, path)
+            if isinstance(value, list):
+                return [entry for entry in value if isinstance(entry, dict)]
+        return []
+
+    @staticmethod
+    def _is_placeholder(entry: Dict[str, Any]) -> bool:
+        """True for template filler entries (lorem ipsum text or example.com links)"""
+        for value in entry.values():
+            if not isinstance(value, str):
+                continue
+            text = value.lower()
+            if "lorem ipsum" in text or re.search(r"https?://(www\.)?example\.(com|org)\b", text):
+                return True
+        return False
+
+    @staticmethod
+    def _text(entry: Dict[str, Any], key: str, default: str = "") -> str:
+        """Return a field as stripped text, falling back to `default` when empty"""
+        value = entry.get(key)
+        if value is None:
+            return default
+        text = str(value).strip()
+        return text if text else default
+
+    def _extract_skills(self, portfolio: Dict[str, Any]) -> List[Document]:
         """Extract skills array from config"""
         docs = []
-        try:
-            # Find skills array
-            skills_match = re.search(r"skills:\s*\[(.*?)\]", content, re.DOTALL)
-            if skills_match:
-                skills_text = skills_match.group(1)
-                # Extract individual skills (quoted strings)
-                skills = re.findall(r"'([^']*)'", skills_text)
-
-                if skills:
-                    skills_content = f"Technical Skills: {', '.join(skills)}"
-                    doc = Document(
-                        page_content=skills_content,
-                        metadata={
-                            "source": "portfolio_config",
-                            "type": "skills",
-                            "last_updated": datetime.now().isoformat(),
-                        }
-                    )
-                    docs.append(doc)
-                    print(f"Extracted {len(skills)} skills")
-
-        except Exception as e:
-            print(f"Error extracting skills: {str(e)}")
+        skills = [str(skill) for skill in portfolio.get("skills") or [] if skill]
+
+        if skills:
+            skills_content = f"Technical Skills: {', '.join(skills)}"
+            doc = Document(
+                page_content=skills_content,
+                metadata={
+                    "source": "portfolio_config",
+                    "type": "skills",
+                    "last_updated": datetime.now().isoformat(),
+                }
+            )
+            docs.append(doc)
+            print(f"Extracted {len(skills)} skills")
 
         return docs
 
-    def _extract_experience(self, content: str) -> List[Document]:
+    def _extract_experience(self, portfolio: Dict[str, Any]) -> List[Document]:
         """Extract work experience from config"""
         docs = []
-        try:
-            # Find experiences array
-            exp_match = re.search(r"experiences:\s*\[(.*?)\],\s*certifications", content, re.DOTALL)
-            if exp_match:
-                experiences_text = exp_match.group(1)
-
-                # Extract individual experience objects
-                exp_objects = re.findall(r"\{(.*?)\}", experiences_text, re.DOTALL)
-
-                for exp_obj in exp_objects:
-                    # Extract fields
-                    company_match = re.search(r"company:\s*'([^']*)'", exp_obj)
-                    position_match = re.search(r"position:\s*'([^']*)'", exp_obj)
-                    from_match = re.search(r"from:\s*'([^']*)'", exp_obj)
-                    to_match = re.search(r"to:\s*'([^']*)'", exp_obj)
-                    comp_url_match = re.search(r"companyLink:\s*'([^']*)'", exp_obj)
-
-                    if company_match and position_match:
-                        company = company_match.group(1)
-                        position = position_match.group(1)
-                        from_date = from_match.group(1) if from_match else "N/A"
-                        to_date = to_match.group(1) if to_match else "Present"
-                        comp_url = comp_url_match.group(1) if comp_url_match else ""
-
-                        exp_content = f"Work Experience: {position} at {company} ({from_date} - {to_date})"
-
-                        doc = Document(
-                            page_content=exp_content,
-                            metadata={
-                                "source": "portfolio_config",
-                                "type": "experience",
-                                "company": company,
-                                "position": position,
-                                "from": from_date,
-                                "to": to_date,
-                                "company_url": comp_url,
-                                "last_updated": datetime.now().isoformat(),
-                            }
-                        )
-                        docs.append(doc)
-
-                print(f"Extracted {len(docs)} work experiences")
-
-        except Exception as e:
-            print(f"Error extracting experience: {str(e)}")
 
+        for exp in self._entries(portfolio, "experiences"):
+            company = self._text(exp, "company")
+            position = self._text(exp, "position")
+            if not (company and position):
+                continue
+
+            from_date = self._text(exp, "from", "N/A")
+            to_date = self._text(exp, "to", "Present")
+            comp_url = self._text(exp, "companyLink")
+
+            exp_content = f"Work Experience: {position} at {company} ({from_date} - {to_date})"
+
+            doc = Document(
+                page_content=exp_content,
+                metadata={
+                    "source": "portfolio_config",
+                    "type": "experience",
+                    "company": company,
+                    "position": position,
+                    "from": from_date,
+                    "to": to_date,
+                    "company_url": comp_url,
+                    "last_updated": datetime.now().isoformat(),
+                }
+            )
+            docs.append(doc)
+
+        print(f"Extracted {len(docs)} work experiences")
         return docs
 
-    def _extract_education(self, content: str) -> List[Document]:
+    def _extract_education(self, portfolio: Dict[str, Any]) -> List[Document]:
         """Extract education from config"""
         docs = []
-        try:
-            # Find education array
-            edu_match = re.search(r"education:\s*\[(.*?)\],\s*publications", content, re.DOTALL)
-            if edu_match:
-                education_text = edu_match.group(1)
-
-                # Extract individual education objects
-                edu_objects = re.findall(r"\{(.*?)\}", education_text, re.DOTALL)
-
-                for edu_obj in edu_objects:
-                    # Extract fields
-                    institution_match = re.search(r"institution:\s*'([^']*)'", edu_obj)
-                    degree_match = re.search(r"degree:\s*'([^']*)'", edu_obj)
-                    from_match = re.search(r"from:\s*'([^']*)'", edu_obj)
-                    to_match = re.search(r"to:\s*'([^']*)'", edu_obj)
-
-                    if institution_match and degree_match:
-                        institution = institution_match.group(1)
-                        degree = degree_match.group(1)
-                        from_date = from_match.group(1) if from_match else "N/A"
-                        to_date = to_match.group(1) if to_match else "N/A"
-
-                        edu_content = f"Education: {degree} from {institution} ({from_date} - {to_date})"
-
-                        doc = Document(
-                            page_content=edu_content,
-                            metadata={
-                                "source": "portfolio_config",
-                                "type": "education",
-                                "institution": institution,
-                                "degree": degree,
-                                "from": from_date,
-                                "to": to_date,
-                                "last_updated": datetime.now().isoformat(),
-                            }
-                        )
-                        docs.append(doc)
-
-                print(f"Extracted {len(docs)} education entries")
 
-        except Exception as e:
-            print(f"Error extracting education: {str(e)}")
+        for edu in self._entries(portfolio, "educations", "education"):
+            institution = self._text(edu, "institution")
+            degree = self._text(edu, "degree")
+            if not (institution and degree):
+                continue
+
+            from_date = self._text(edu, "from", "N/A")
+            to_date = self._text(edu, "to", "N/A")
+            minor = self._text(edu, "minor")
+
+            edu_content = f"Education: {degree} from {institution} ({from_date} - {to_date})"
+            if minor:
+                edu_content += f"\n{minor}"
+
+            doc = Document(
+                page_content=edu_content,
+                metadata={
+                    "source": "portfolio_config",
+                    "type": "education",
+                    "institution": institution,
+                    "degree": degree,
+                    "from": from_date,
+                    "to": to_date,
+                    "last_updated": datetime.now().isoformat(),
+                }
+            )
+            docs.append(doc)
+
+        print(f"Extracted {len(docs)} education entries")
+        return docs
+
+    def _extract_certifications(self, portfolio: Dict[str, Any]) -> List[Document]:
+        """Extract certifications from config"""
+        docs = []
 
+        for cert in self._entries(portfolio, "certifications"):
+            name = self._text(cert, "name")
+            if not name or self._is_placeholder(cert):
+                continue
+
+            body = self._text(cert, "body")
+            year = self._text(cert, "year", "N/A")
+            link = self._text(cert, "link")
+
+            cert_content = f"Certification: {name} ({year})"
+            if body:
+                cert_content += f"\n{body}"
+
+            doc = Document(
+                page_content=cert_content,
+                metadata={
+                    "source": "portfolio_config",
+                    "type": "certification",
+                    "name": name,
+                    "year": year,
+                    "link": link,
+                    "last_updated": datetime.now().isoformat(),
+                }
+            )
+            docs.append(doc)
+
+        print(f"Extracted {len(docs)} certifications")
         return docs
 
-    def _extract_external_projects(self, content: str) -> List[Document]:
-        """Extract external projects from config"""
+    def _extract_publications(self, portfolio: Dict[str, Any]) -> List[Document]:
+        """Extract publications from config"""
         docs = []
-        try:
-            # Find external projects array
-            proj_match = re.search(r"external:\s*\{.*?projects:\s*\[(.*?)\]", content, re.DOTALL)
-            if proj_match:
-                projects_text = proj_match.group(1)
-
-                # Extract individual project objects
-                proj_objects = re.findall(r"\{(.*?)\}", projects_text, re.DOTALL)
-
-                for proj_obj in proj_objects:
-                    # Extract fields
-                    title_match = re.search(r"title:\s*'([^']*)'", proj_obj)
-                    desc_match = re.search(r"description:\s*'([^']*)'", proj_obj)
-                    link_match = re.search(r"link:\s*'([^']*)'", proj_obj)
-
-                    if title_match and desc_match:
-                        title = title_match.group(1)
-                        description = desc_match.group(1)
-                        link = link_match.group(1) if link_match else ""
-
-                        proj_content = f"Project: {title}\n{description}"
-
-                        doc = Document(
-                            page_content=proj_content,
-                            metadata={
-                                "source": "portfolio_config",
-                                "type": "external_project",
-                                "title": title,
-                                "link": link,
-                                "last_updated": datetime.now().isoformat(),
-                            }
-                        )
-                        docs.append(doc)
-
-                print(f"Extracted {len(docs)} external projects")
 
-        except Exception as e:
-            print(f"Error extracting external projects: {str(e)}")
+        for pub in self._entries(portfolio, "publications"):
+            title = self._text(pub, "title")
+            if not title or self._is_placeholder(pub):
+                continue
+
+            venue = self._text(pub, "conferenceName") or self._text(pub, "journalName")
+            authors = self._text(pub, "authors")
+            description = self._text(pub, "description")
+            link = self._text(pub, "link")
+
+            pub_content = f"Publication: {title}"
+            if venue:
+                pub_content += f"\nPublished in: {venue}"
+            if authors:
+                pub_content += f"\nAuthors: {authors}"
+            if description:
+                pub_content += f"\n{description}"
+
+            doc = Document(
+                page_content=pub_content,
+                metadata={
+                    "source": "portfolio_config",
+                    "type": "publication",
+                    "title": title,
+                    "venue": venue,
+                    "link": link,
+                    "last_updated": datetime.now().isoformat(),
+                }
+            )
+            docs.append(doc)
+
+        print(f"Extracted {len(docs)} publications")
+        return docs
+
+    def _extract_external_projects(self, portfolio: Dict[str, Any]) -> List[Document]:
+        """Extract external projects from config"""
+        docs = []
 
+        for proj in self._entries(portfolio, "projects.external.projects"):
+            title = self._text(proj, "title")
+            description = self._text(proj, "description")
+            if not (title and description) or self._is_placeholder(proj):
+                continue
+
+            link = self._text(proj, "link")
+
+            proj_content = f"Project: {title}\n{description}"
+
+            doc = Document(
+                page_content=proj_content,
+                metadata={
+                    "source": "portfolio_config",
+                    "type": "external_project",
+                    "title": title,
+                    "link": link,
+                    "last_updated": datetime.now().isoformat(),
+                }
+            )
+            docs.append(doc)
+
+        print(f"Extracted {len(docs)} external projects")
         return docs
 
 
@@ -291,7 +446,9 @@ class GitHubReposLoader(DataLoader):
 
         try:
             url = f"https://api.github.com/users/{self.username}/repos"
-            response = requests.get(url, params={"sort": "updated", "per_page": 100})
+            response = clients.requests_session().get(
+                url, params={"sort": "updated", "per_page": 100}, timeout=config.HTTP_TIMEOUT
+            )
             response.raise_for_status()
 
             repos = response.json()
@@ -331,8 +488,9 @@ class GitHubReposLoader(DataLoader):
             return docs
 
         except Exception as e:
+            # Re-raise so sync jobs report the failure instead of an empty source
             print(f"Error loading GitHub repos: {str(e)}")
-            return []
+            raise
 
 
 class DevToBlogLoader(DataLoader):
@@ -348,7 +506,7 @@ class DevToBlogLoader(DataLoader):
 
         try:
             url = f"https://dev.to/api/articles?username={self.username}&per_page={self.max_articles}"
-            response = requests.get(url)
+            response = clients.requests_session().get(url, timeout=config.HTTP_TIMEOUT)
             response.raise_for_status()
 
             articles = response.json()
@@ -383,8 +541,103 @@ class DevToBlogLoader(DataLoader):
             return docs
 
         except Exception as e:
+            # Re-raise so sync jobs report the failure instead of an empty source
             print(f"Error loading blog articles: {str(e)}")
-            return []
+            raise
+
+
+class DevToStatsLoader(DataLoader):
+    """
+    Ingestion data source: one document per article with its reader statistics.
+
+    Collects today's counts first when DEVTO_API_KEY is set, otherwise reads
+    what the store already holds.
+    """
+
+    def __init__(self, store: Optional[StatsStore] = None, collect_first: Optional[bool] = None, growth_days: int = 30):
+        """
+        Args:
+            store: Stats store (default: DEVTO_STATS_PATH)
+            collect_first: Fetch today's counts before loading (default: when DEVTO_API_KEY is set)
+            growth_days: Window for the "recent views" figure
+        """
+        self.store = store or StatsStore()
+        self.collect_first = bool(config.DEVTO_API_KEY) if collect_first is None else collect_first
+        self.growth_days = growth_days
+
+    def load(self) -> List[Document]:
+        """Build one document per article from the latest stored counts"""
+        if self.collect_first:
+            collect_devto_stats(self.store)
+
+        growth = self.store.growth(self.growth_days)
+        docs = []
+        for row in self.store.latest():
+            recent = growth.get(row["id"], {}).get("page_views", 0)
+            content = (
+                f"Blog Article Stats: {row['title']}\n"
+                f"Page Views: {row['page_views']}\n"
+                f"Reactions: {row['reactions']}\n"
+                f"Comments: {row['comments']}\n"
+                f"Views in the last {self.growth_days} days: {recent}"
+            )
+            docs.append(Document(
+                page_content=content,
+                metadata={
+                    "source": "devto_stats",
+                    "type": "article_stats",
+                    "title": row["title"],
+                    "url": row["url"] or "",
+                    "tags": row["tags"] or "",
+                    "published_at": row["published_at"] or "",
+                    "stats_date": row["date"],
+                    "last_updated": datetime.now().isoformat(),
+                },
+            ))
+
+        print(f"Loaded stats for {len(docs)} blog articles")
+        return docs
+
+
+# Progress callback: (stage, completed, total) with values added to the stage's
+# running counts, e.g. progress("embed", 0, 120) then progress("embed", 64, 0)
+ProgressCallback = Callable[[str, int, int], None]
+
+
+def _no_progress(stage: str, completed: int, total: int):
+    pass
+
+
+# Metadata fields that change on every load and must not affect content hashes
+VOLATILE_METADATA = ("last_updated",)
+
+
+def content_hash(doc: Document) -> str:
+    """
+    Hash a document's content and stable metadata.
+
+    Args:
+        doc: Document or chunk
+
+    Returns:
+        Hex SHA-256 digest, unchanged across runs when the content is unchanged
+    """
+    metadata = {k: v for k, v in doc.metadata.items() if k not in VOLATILE_METADATA and k != "content_hash"}
+    payload = json.dumps([doc.page_content, metadata], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def point_id(loader_name: str, chunk_hash: str) -> str:
+    """Deterministic Qdrant point ID for a chunk of a loader"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{loader_name}:{chunk_hash}"))
+
+
+class LegacyCollectionError(RuntimeError):
+    """Raised when a delta sync targets a collection with untagged (pre-sync) points"""
+
+
+# Points written before delta sync carry no metadata.loader tag
+UNTAGGED_FILTER = Filter(must=[IsEmptyCondition(is_empty=PayloadField(key="metadata.loader"))])
 
 
 # Main Ingestion Class
@@ -394,105 +647,599 @@ class DataIngestion:
     Coordinates loading from all sources and ingesting into Qdrant.
     """
 
-    def __init__(self):
-        """Initialize ingestion pipeline"""
+    def __init__(
+        self,
+        qdrant_client=None,
+        embeddings=None,
+        chunker: Optional[Chunker] = None,
+        answer_cache: Optional[SharedCache] = None,
+        index_settings: Optional[IndexSettings] = None,
+        collection_name: Optional[str] = None,
+        deduplicator: Optional[Deduplicator] = None,
+    ):
+        """
+        Initialize ingestion pipeline.
+
+        Args:
+            qdrant_client: Qdrant client (default: shared client)
+            embeddings: Embeddings model (default: shared OpenAI embeddings)
+            chunker: Chunker (default: policy per metadata.type from config)
+            answer_cache: Chat answer cache cleared whenever the collection
+                changes (default: the cache shared by all server workers)
+            index_settings: Collection index settings (default: from config)
+            collection_name: Collection to ingest into (default: COLLECTION_NAME;
+                each tenant has its own)
+            deduplicator: Near-duplicate chunk filter (default: MinHash/LSH
+                from config when DEDUP_ENABLED)
+        """
         # Validate configuration
-        config.validate()
+        if qdrant_client is None or embeddings is None:
+            config.validate()
 
-        # Initialize Qdrant client
-        self.qdrant_client = QdrantClient(
-            url=config.QDRANT_URL,
-            api_key=config.QDRANT_API_KEY,
-        )
+        # Shared Qdrant client and embeddings
+        self.qdrant_client = qdrant_client or clients.qdrant()
+        self.embeddings = embeddings or clients.embeddings()
 
-        # Initialize embeddings
-        self.embeddings = OpenAIEmbeddings(
-            model=config.EMBEDDING_MODEL,
-            openai_api_key=config.OPENAI_API_KEY,
-        )
+        # Initialize chunker (policy per metadata.type)
+        self.chunker = chunker or Chunker()
 
-        # Initialize text splitter
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=config.CHUNK_SIZE,
-            chunk_overlap=config.CHUNK_OVERLAP,
-        )
+        # Near-duplicate chunks across sources are dropped before embedding
+        if deduplicator is None and config.DEDUP_ENABLED:
+            deduplicator = Deduplicator()
+        self.deduplicator = deduplicator
+
+        self.collection_name = collection_name or config.COLLECTION_NAME
+
+        # Quantization, HNSW and on-disk options used when creating the collection
+        self.index_settings = index_settings or index_settings_from_config
+        self._vector_size: Optional[int] = None
+
+        # Cached chat answers go stale when the collection changes
+        self.answer_cache = answer_cache if answer_cache is not None else shared_answer_cache
+
+        # Per-loader and per-stage timing (IngestionProfiler with --profile)
+        self.profiler = NULL_PROFILER
+
+        # Callbacks run after ingestion changed the collection (e.g. FAQ precompute)
+        self.post_ingest_hooks: List[Callable[[], Any]] = []
 
         # Data loaders registry
         self.loaders: Dict[str, DataLoader] = {}
 
+        # Hash of each loader's documents from its last successful sync
+        self.loader_hashes: Dict[str, str] = {}
+
+        # One lock per loader so scheduled syncs and admin jobs never write
+        # the same source concurrently
+        self._loader_locks: Dict[str, threading.Lock] = {}
+
+    def add_post_ingest_hook(self, hook: Callable[[], Any]):
+        """Register a callback to run after ingestion changes the collection"""
+        self.post_ingest_hooks.append(hook)
+
+    def run_post_ingest_hooks(self):
+        """Run post-ingest hooks; a failing hook never fails the ingestion"""
+        with self.profiler.section("stage", "post_ingest", len(self.post_ingest_hooks)):
+            for hook in self.post_ingest_hooks:
+                try:
+                    hook()
+                except Exception as e:
+                    print(f"✗ Post-ingest step {getattr(hook, '__name__', hook)} failed: {str(e)}")
+
     def register_loader(self, name: str, loader: DataLoader):
         """Register a new data loader"""
         self.loaders[name] = loader
+        self._loader_locks[name] = threading.Lock()
         print(f"Registered loader: {name}")
 
-    def load_all_sources(self) -> List[Document]:
-        """Load documents from all registered sources"""
+    @contextmanager
+    def _locked(self, names: List[str]):
+        """Hold the locks of the given loaders (acquired in a fixed order)"""
+        locks = [self._loader_locks[name] for name in sorted(names)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def load_source(self, name: str) -> List[Document]:
+        """Load documents from one registered source, tagged with the loader name"""
+        with self.profiler.section("loader", name):
+            docs = self.loaders[name].load()
+        self.profiler.count("loader", name, len(docs))
+        for doc in docs:
+            doc.metadata["loader"] = name
+        return docs
+
+    def load_all_sources(
+        self,
+        progress: ProgressCallback = _no_progress,
+        errors: Optional[Dict[str, str]] = None,
+    ) -> List[Document]:
+        """
+        Load documents from all registered sources.
+
+        Args:
+            progress: Optional per-stage progress callback
+            errors: Optional dict that receives an error message per failed
+                or empty source
+
+        Returns:
+            Documents from every source that loaded
+        """
+        errors = {} if errors is None else errors
+        with self.profiler.section("stage", "load"):
+            all_docs = self._load_all_sources(progress, errors)
+        self.profiler.count("stage", "load", len(all_docs))
+        return all_docs
+
+    def _load_all_sources(self, progress: ProgressCallback, errors: Dict[str, str]) -> List[Document]:
         all_docs = []
+        progress("load", 0, len(self.loaders))
 
-        for name, loader in self.loaders.items():
+        for name in self.loaders:
             try:
                 print(f"\n{'='*60}")
                 print(f"Loading data source: {name}")
                 print(f"{'='*60}")
 
-                docs = loader.load()
+                docs = self.load_source(name)
                 all_docs.extend(docs)
 
-                print(f"✓ Loaded {len(docs)} documents from {name}")
+                if docs:
+                    print(f"✓ Loaded {len(docs)} documents from {name}")
+                else:
+                    errors[name] = "loaded no documents"
+                    print(f"✗ No documents loaded from {name}")
 
             except Exception as e:
+                errors[name] = str(e)
                 print(f"✗ Error loading {name}: {str(e)}")
 
+            progress("load", 1, 0)
+
         return all_docs
 
-    def setup_collection(self):
-        """Setup or recreate Qdrant collection"""
-        collection_name = config.COLLECTION_NAME
+    def collection_exists(self) -> bool:
+        """Check whether the configured collection (or an alias of that name) exists"""
+        return self.qdrant_client.collection_exists(self.collection_name)
+
+    def alias_target(self, name: Optional[str] = None) -> Optional[str]:
+        """Collection an alias points to (None when the name is not an alias)"""
+        name = name or self.collection_name
+        aliases = self.qdrant_client.get_aliases().aliases
+        return next((alias.collection_name for alias in aliases if alias.alias_name == name), None)
+
+    def setup_collection(self, collection_name: Optional[str] = None):
+        """
+        Setup or recreate Qdrant collection.
 
-        # Check if collection exists
-        collections = self.qdrant_client.get_collections()
-        collection_exists = any(col.name == collection_name for col in collections.collections)
+        Vector size, quantization, HNSW and on-disk options come from
+        `self.index_settings` (QDRANT_* configuration by default).
 
-        if collection_exists:
+        Args:
+            collection_name: Collection to create (default: the configured
+                collection; full ingestions build under a temporary name)
+        """
+        collection_name = collection_name or self.collection_name
+
+        target = self.alias_target(collection_name)
+        if target is not None:
+            print(f"Collection '{collection_name}' already exists (alias of '{target}'). Deleting...")
+            self.qdrant_client.delete_collection(target)
+            self.qdrant_client.update_collection_aliases(change_aliases_operations=[
+                DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=collection_name)),
+            ])
+        elif self.qdrant_client.collection_exists(collection_name):
             print(f"Collection '{collection_name}' already exists. Deleting...")
             self.qdrant_client.delete_collection(collection_name)
 
-        # Create collection
-        print(f"Creating collection: {collection_name}")
+        # Create collection (vector size from the embedding model, index settings from config)
+        vector_size = self.vector_size()
+        print(f"Creating collection: {collection_name} ({vector_size} dimensions, quantization: {self.index_settings.quantization})")
         self.qdrant_client.create_collection(
             collection_name=collection_name,
-            vectors_config=VectorParams(
-                size=1536,  # OpenAI text-embedding-3-small dimension
-                distance=Distance.COSINE,
-            ),
+            **self.index_settings.collection_kwargs(vector_size),
+        )
+
+        # Index the loader name so per-loader syncs can filter points cheaply
+        self.qdrant_client.create_payload_index(
+            collection_name=collection_name,
+            field_name="metadata.loader",
+            field_schema=PayloadSchemaType.KEYWORD,
         )
         print(f"✓ Collection '{collection_name}' created")
 
-    def ingest(self, recreate_collection: bool = True):
+    def build_collection_name(self) -> str:
+        """Temporary name a full ingestion builds under (removing builds left by interrupted runs)"""
+        prefix = f"{self.collection_name}{BUILD_SUFFIX}"
+        live = self.alias_target()
+        for collection in self.qdrant_client.get_collections().collections:
+            if collection.name.startswith(prefix) and collection.name != live:
+                print(f"Removing unfinished build '{collection.name}'")
+                self.qdrant_client.delete_collection(collection.name)
+        return f"{prefix}{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+
+    def swap_collection(self, build_name: str):
+        """
+        Serve a freshly built collection under the configured name.
+
+        The name becomes (or stays) an alias; repointing an existing alias is
+        atomic, so searches never see an empty or partial collection. Only
+        the first swap, which replaces a plain collection of that name, has a
+        gap between deleting it and creating the alias.
+        """
+        live = self.collection_name
+        previous = self.alias_target(live)
+        operations = []
+        if previous is not None:
+            operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=live)))
+        elif self.qdrant_client.collection_exists(live):
+            self.qdrant_client.delete_collection(live)
+        operations.append(CreateAliasOperation(create_alias=CreateAlias(collection_name=build_name, alias_name=live)))
+        self.qdrant_client.update_collection_aliases(change_aliases_operations=operations)
+        if previous is not None:
+            self.qdrant_client.delete_collection(previous)
+        print(f"✓ Collection '{live}' now serves '{build_name}'")
+
+    def vector_size(self) -> int:
+        """Dimensions produced by the pipeline's embeddings (probed once)"""
+        if self._vector_size is None:
+            self._vector_size = embedding_dimensions(self.embeddings)
+        return self._vector_size
+
+    def ensure_collection(self):
+        """
+        Create the collection if it does not exist yet.
+
+        Raises:
+            DimensionMismatchError: If it exists with another vector size
+                (e.g. after changing EMBEDDING_DIMENSIONS); rebuild it with a
+                full ingestion
+        """
+        if not self.collection_exists():
+            self.setup_collection()
+            return
+        check_collection_dimensions(self.qdrant_client, self.collection_name, self.vector_size())
+
+    def has_untagged_points(self) -> bool:
+        """
+        Check for points without a metadata.loader tag.
+
+        Collections built before delta sync (random point IDs, no loader tag)
+        cannot be diffed per loader; syncing into them would duplicate every
+        chunk while the old copies are never deleted.
+        """
+        points, _ = self.qdrant_client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=UNTAGGED_FILTER,
+            limit=1,
+            with_payload=False,
+            with_vectors=False,
+        )
+        return bool(points)
+
+    def migrate_legacy_points(self):
+        """Delete untagged points and index metadata.loader (after all loaders were re-ingested)"""
+        self.qdrant_client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=UNTAGGED_FILTER),
+        )
+        self.qdrant_client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name="metadata.loader",
+            field_schema=PayloadSchemaType.KEYWORD,
+        )
+        print("✓ Removed untagged points from the pre-sync collection")
+
+    def prepare_chunks(
+        self, docs: List[Document], progress: ProgressCallback = _no_progress, stats: Optional[Dict[str, Any]] = None,
+    ) -> List[Document]:
+        """Split documents and stamp each chunk with its content hash (per-source chunk statistics go to `stats`)"""
+        progress("split", 0, len(docs))
+        with self.profiler.section("stage", "split", len(docs)):
+            chunks = self.chunker.split_documents(docs, stats)
+            for chunk in chunks:
+                chunk.metadata["content_hash"] = content_hash(chunk)
+        progress("split", len(docs), 0)
+        return chunks
+
+    def deduplicate(self, chunks: List[Document], existing: Optional[List[Document]] = None) -> DedupResult:
+        """
+        Drop near-duplicate chunks before embedding (see dedup.py).
+
+        Args:
+            chunks: Chunks from prepare_chunks
+            existing: Stored chunks of other loaders the new chunks must not repeat
+
+        Returns:
+            Kept chunks and drop counts (every chunk is kept when dedup is disabled)
+        """
+        if self.deduplicator is None:
+            return DedupResult(kept=chunks, chunks=len(chunks))
+        with self.profiler.section("stage", "dedup", len(chunks)):
+            return self.deduplicator.deduplicate(chunks, existing or [])
+
+    def stored_chunks(self, exclude_loader: str) -> List[Document]:
+        """Chunks stored for every loader except one (the dedup reference of a loader sync)"""
+        chunks: List[Document] = []
+        offset = None
+        other_loaders = Filter(must_not=[FieldCondition(key="metadata.loader", match=MatchValue(value=exclude_loader))])
+
+        while True:
+            points, offset = self.qdrant_client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=other_loaders,
+                limit=256,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            chunks.extend(
+                Document(page_content=point.payload.get("page_content", ""), metadata=point.payload.get("metadata") or {})
+                for point in points
+            )
+            if offset is None:
+                return chunks
+
+    def duplicate_loaders(self, ids: List[str], exclude_loader: str) -> List[str]:
+        """Other loaders whose near-duplicates of the given stored chunks were dropped (from `metadata.duplicates`)"""
+        points = self.qdrant_client.retrieve(collection_name=self.collection_name, ids=ids, with_payload=True, with_vectors=False)
+        loaders = {
+            entry.get("loader")
+            for point in points
+            for entry in ((point.payload or {}).get("metadata") or {}).get("duplicates", [])
+        }
+        return sorted(loader for loader in loaders if loader and loader != exclude_loader)
+
+    def record_duplicates(self, chunks: List[Document]):
+        """Write the grown `metadata.duplicates` provenance of stored chunks"""
+        for chunk in chunks:
+            self.qdrant_client.set_payload(
+                collection_name=self.collection_name,
+                payload={"duplicates": chunk.metadata["duplicates"]},
+                points=[point_id(chunk.metadata["loader"], chunk.metadata["content_hash"])],
+                key="metadata",
+            )
+
+    def upsert_chunks(self, chunks: List[Document], progress: ProgressCallback = _no_progress):
+        """
+        Embed chunks in batches and upsert them under deterministic point IDs.
+        Payloads use the same layout as langchain_qdrant (page_content + metadata).
+        """
+        progress("embed", 0, len(chunks))
+        progress("upsert", 0, len(chunks))
+
+        batch_size = config.INGEST_BATCH_SIZE
+        for start in range(0, len(chunks), batch_size):
+            batch = chunks[start:start + batch_size]
+
+            with self.profiler.section("stage", "embed", len(batch)):
+                vectors = self.embeddings.embed_documents([chunk.page_content for chunk in batch])
+            progress("embed", len(batch), 0)
+
+            with self.profiler.section("stage", "upsert", len(batch)):
+                points = [
+                    PointStruct(
+                        id=point_id(chunk.metadata["loader"], chunk.metadata["content_hash"]),
+                        vector=vector,
+                        payload={"page_content": chunk.page_content, "metadata": chunk.metadata},
+                    )
+                    for chunk, vector in zip(batch, vectors)
+                ]
+                self.qdrant_client.upsert(collection_name=self.collection_name, points=points)
+            progress("upsert", len(batch), 0)
+
+    def existing_point_ids(self, loader_name: str) -> Set[str]:
+        """Return the IDs of all points currently stored for a loader"""
+        ids: Set[str] = set()
+        offset = None
+        loader_filter = Filter(must=[FieldCondition(key="metadata.loader", match=MatchValue(value=loader_name))])
+
+        while True:
+            points, offset = self.qdrant_client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=loader_filter,
+                limit=256,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            ids.update(str(point.id) for point in points)
+            if offset is None:
+                return ids
+
+    def sync_loader(
+        self,
+        name: str,
+        force: bool = False,
+        progress: ProgressCallback = _no_progress,
+        run_hooks: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Re-load one source and apply only the changes to Qdrant.
+
+        The loader's documents are hashed first; when nothing changed since the
+        last sync the run stops there. Otherwise chunks are diffed against the
+        stored point IDs (derived from chunk content hashes): new chunks are
+        embedded and upserted, chunks that disappeared are deleted. When a
+        deleted chunk was kept in place of near-duplicates from other loaders
+        (its `metadata.duplicates`), those loaders are re-synced too, so the
+        content they dropped comes back.
+
+        Args:
+            name: Registered loader name
+            force: Diff against Qdrant even if the loader hash is unchanged
+            progress: Optional per-stage progress callback
+            run_hooks: Run post-ingest hooks when the collection changed (callers
+                syncing several loaders pass False and run them once at the end)
+
+        Returns:
+            Dictionary with the sync outcome, added/removed/unchanged counts
+            and the loaders re-synced to restore dropped duplicates
+        """
+        with self._locked([name]):
+            result = self._sync_loader(name, force, progress)
+
+        # Their chunks were dropped as duplicates of chunks this sync deleted; their hashes did not change
+        done, pending = {name}, list(result["dependents"])
+        result["resynced"] = []
+        while pending:
+            dependent = pending.pop(0)
+            if dependent in done or dependent not in self.loaders:
+                continue
+            done.add(dependent)
+            print(f"Re-syncing {dependent}: its near-duplicates of deleted {name} chunks were dropped")
+            with self._locked([dependent]):
+                dependent_result = self._sync_loader(dependent, True, progress)
+            result["resynced"].append(dependent)
+            pending.extend(dependent_result["dependents"])
+            if dependent_result["status"] == "updated":
+                result["status"] = "updated"
+
+        if result["status"] == "updated":
+            self.answer_cache.clear()
+            if run_hooks:
+                self.run_post_ingest_hooks()
+        return result
+
+    def _sync_loader(self, name: str, force: bool, progress: ProgressCallback) -> Dict[str, Any]:
+        progress("load", 0, 1)
+        docs = self.load_source(name)
+        progress("load", 1, 0)
+        loader_hash = hashlib.sha256("".join(sorted(content_hash(doc) for doc in docs)).encode()).hexdigest()
+
+        result: Dict[str, Any] = {
+            "loader": name, "documents": len(docs), "added": 0, "removed": 0, "unchanged": 0, "duplicates": 0, "dependents": [],
+        }
+
+        if not docs:
+            # Treat an empty load as a transient source failure, not a deletion
+            result["status"] = "empty"
+            return result
+
+        if not force and self.loader_hashes.get(name) == loader_hash:
+            result["status"] = "unchanged"
+            return result
+
+        self.ensure_collection()
+        if self.has_untagged_points():
+            raise LegacyCollectionError(
+                f"Collection '{self.collection_name}' contains points from an older ingestion without "
+                f"loader tags; run a full ingestion (python ingest.py, or the admin API with "
+                f"recreate_collection=true) before syncing individual loaders"
+            )
+
+        chunks = self.prepare_chunks(docs, progress)
+        dedup = self.deduplicate(chunks, self.stored_chunks(name) if self.deduplicator is not None else None)
+        wanted = {point_id(name, chunk.metadata["content_hash"]): chunk for chunk in dedup.kept}
+        existing = self.existing_point_ids(name)
+
+        new_chunks = [chunk for pid, chunk in wanted.items() if pid not in existing]
+        stale_ids = [pid for pid in existing if pid not in wanted]
+
+        self.upsert_chunks(new_chunks, progress)
+        if stale_ids:
+            result["dependents"] = self.duplicate_loaders(stale_ids, exclude_loader=name)
+            self.qdrant_client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=stale_ids),
+            )
+        self.record_duplicates(dedup.updated_existing)
+
+        self.loader_hashes[name] = loader_hash
+        result.update({
+            "status": "updated" if new_chunks or stale_ids else "unchanged",
+            "added": len(new_chunks),
+            "removed": len(stale_ids),
+            "unchanged": len(wanted) - len(new_chunks),
+            "duplicates": dedup.dropped,
+        })
+        print(
+            f"✓ Synced {name}: +{result['added']} / -{result['removed']} chunks "
+            f"({result['unchanged']} unchanged, {result['duplicates']} near-duplicates dropped)"
+        )
+        return result
+
+    def ingest(self, recreate_collection: bool = True, progress: ProgressCallback = _no_progress) -> Dict[str, Any]:
         """
         Run full ingestion pipeline.
 
+        A recreated collection is built under a temporary name and swapped
+        in (Qdrant alias) only when it is complete, so the chatbot keeps
+        serving the previous collection during the run and after a failure.
+
         Args:
             recreate_collection: Whether to recreate the collection (default: True)
+            progress: Optional per-stage progress callback
+
+        Returns:
+            Dictionary with status ("succeeded", "partial" when some sources
+            failed or were empty, "aborted" when nothing loaded or a rebuild
+            with failed sources was not swapped in), document and chunk
+            counts, and an error per failed source
         """
+        with self._locked(list(self.loaders)):
+            result = self._ingest(recreate_collection, progress)
+        if result["chunks"]:
+            self.answer_cache.clear()
+            self.run_post_ingest_hooks()
+        return result
+
+    def _ingest(self, recreate_collection: bool, progress: ProgressCallback) -> Dict[str, Any]:
+        if not recreate_collection:
+            return self._ingest_into(None, progress)
+
+        # Rebuild under a temporary name while the live collection keeps serving
+        live = self.collection_name
+        build = self.build_collection_name()
+        swapped = False
+        try:
+            self.collection_name = build
+            result = self._ingest_into(build, progress)
+            self.collection_name = live
+            if result["chunks"] and result["errors"] and self.collection_exists():
+                # Swapping in would drop the failed sources' chunks
+                print(f"✗ Kept the live collection '{live}': some sources failed to load")
+                result.update({"status": "aborted", "chunks": 0})
+            elif result["chunks"]:
+                self.swap_collection(build)
+                swapped = True
+        finally:
+            self.collection_name = live
+            if not swapped and self.qdrant_client.collection_exists(build):
+                self.qdrant_client.delete_collection(build)
+        return result
+
+    def _ingest_into(self, build: Optional[str], progress: ProgressCallback) -> Dict[str, Any]:
+        """Load, split, embed and upsert every source (into a new `build` collection, or the existing one)"""
         print("\n" + "="*60)
         print("STARTING DATA INGESTION PIPELINE")
         print("="*60 + "\n")
 
         # Setup collection
-        if recreate_collection:
-            self.setup_collection()
+        with self.profiler.section("stage", "setup"):
+            if build:
+                self.setup_collection(build)
+                legacy = False
+            else:
+                self.ensure_collection()
+                legacy = self.has_untagged_points()
 
         # Load all documents
         print("\n" + "="*60)
         print("LOADING DATA SOURCES")
         print("="*60)
 
-        all_docs = self.load_all_sources()
+        errors: Dict[str, str] = {}
+        all_docs = self.load_all_sources(progress, errors)
+        result: Dict[str, Any] = {"status": "aborted", "documents": len(all_docs), "chunks": 0, "errors": errors}
 
         if not all_docs:
             print("\n✗ No documents loaded. Aborting ingestion.")
-            return
+            return result
 
         print(f"\n✓ Total documents loaded: {len(all_docs)}")
 
@@ -501,33 +1248,54 @@ class DataIngestion:
         print("SPLITTING DOCUMENTS")
         print("="*60)
 
-        split_docs = self.text_splitter.split_documents(all_docs)
+        chunk_stats: Dict[str, Any] = {}
+        split_docs = self.prepare_chunks(all_docs, progress, chunk_stats)
         print(f"✓ Split into {len(split_docs)} chunks")
 
+        dedup = self.deduplicate(split_docs)
+        split_docs = dedup.kept
+        if dedup.dropped:
+            print(f"✓ Dropped {dedup.dropped} near-duplicate chunks ({dedup.ratio:.1%})")
+
         # Ingest into Qdrant
         print("\n" + "="*60)
         print("INGESTING INTO QDRANT")
         print("="*60)
 
-        vector_store = QdrantVectorStore.from_documents(
-            documents=split_docs,
-            embedding=self.embeddings,
-            url=config.QDRANT_URL,
-            api_key=config.QDRANT_API_KEY,
-            collection_name=config.COLLECTION_NAME,
-        )
+        self.upsert_chunks(split_docs, progress)
 
         print(f"✓ Ingested {len(split_docs)} chunks into Qdrant")
 
+        # Every loader is now stored under tagged IDs; drop the old copies
+        # (only when every source loaded, so nothing is lost)
+        if legacy and not errors:
+            self.migrate_legacy_points()
+        elif legacy:
+            print("✗ Kept untagged points from the pre-sync collection: some sources failed to load")
+
         # Display summary
-        self.print_summary(all_docs, split_docs)
+        self.print_summary(all_docs, split_docs, dedup, chunk_stats)
 
         print("\n" + "="*60)
-        print("INGESTION COMPLETE!")
+        print("INGESTION COMPLETE!" if not errors else f"INGESTION COMPLETE WITH {len(errors)} FAILED SOURCE(S)")
         print("="*60 + "\n")
 
-    def print_summary(self, all_docs: List[Document], split_docs: List[Document]):
-        """Print ingestion summary"""
+        result.update({
+            "status": "partial" if errors else "succeeded",
+            "chunks": len(split_docs),
+            "duplicates": dedup.dropped,
+            "dedup_ratio": dedup.ratio,
+        })
+        return result
+
+    def print_summary(
+        self,
+        all_docs: List[Document],
+        split_docs: List[Document],
+        dedup: Optional[DedupResult] = None,
+        chunk_stats: Optional[Dict[str, Any]] = None,
+    ):
+        """Print ingestion summary (chunk statistics of this run, or the chunker's last split)"""
         print("\n" + "="*60)
         print("INGESTION SUMMARY")
         print("="*60)
@@ -542,40 +1310,218 @@ class DataIngestion:
         for source, count in sorted(source_counts.items()):
             print(f"  - {source}: {count}")
 
+        print("\nChunks by source (tokens min/mean/max):")
+        for source, stats in self.chunker.summary(chunk_stats).items():
+            print(
+                f"  - {source}: {stats['chunks']} chunks from {stats['documents']} documents "
+                f"({stats['min_tokens']}/{stats['mean_tokens']}/{stats['max_tokens']}, "
+                f"{stats['total_tokens']} total)"
+            )
+
         print(f"\nTotal documents: {len(all_docs)}")
         print(f"Total chunks: {len(split_docs)}")
-        print(f"Collection: {config.COLLECTION_NAME}")
+        if dedup is not None and dedup.chunks:
+            print(f"Near-duplicates dropped: {dedup.dropped} of {dedup.chunks} chunks (dedup ratio {dedup.ratio:.1%})")
+        print(f"Collection: {self.collection_name}")
 
 
-def main():
-    """Main ingestion function"""
-    # Initialize ingestion pipeline
-    pipeline = DataIngestion()
+def build_pipeline(tenant: Optional[Tenant] = None) -> DataIngestion:
+    """
+    Create a tenant's ingestion pipeline with its data loaders registered.
+
+    Args:
+        tenant: Tenant to ingest (default: the default tenant, configured by
+            RESUME_PDF_PATH, PORTFOLIO_CONFIG_PATH, GITHUB_USERNAME, ...);
+            loaders whose source is not set for the tenant are skipped
+    """
+    tenant = tenant or tenant_registry.get()
+    pipeline = DataIngestion(collection_name=tenant.collection, answer_cache=tenant_answer_cache(tenant))
 
     # Register data loaders
-    pipeline.register_loader(
-        "resume_pdf",
-        ResumePDFLoader("../src/data/James-Brendamour-Resume.pdf")
-    )
+    if tenant.resume_path:
+        pipeline.register_loader(
+            "resume_pdf",
+            ResumePDFLoader(tenant.resume_path)
+        )
 
-    pipeline.register_loader(
-        "portfolio_config",
-        PortfolioConfigLoader(config.PORTFOLIO_CONFIG_PATH)
-    )
+    if tenant.is_default and config.ADDITIONAL_PDF_PATHS:
+        pipeline.register_loader(
+            "documents_pdf",
+            PDFLoader(config.ADDITIONAL_PDF_PATHS, source="documents", doc_type="document_pdf")
+        )
 
-    pipeline.register_loader(
-        "github_repos",
-        GitHubReposLoader(config.GITHUB_USERNAME, max_repos=4)
-    )
+    if tenant.portfolio_config_path:
+        pipeline.register_loader(
+            "portfolio_config",
+            PortfolioConfigLoader(tenant.portfolio_config_path)
+        )
 
-    pipeline.register_loader(
-        "devto_blog",
-        DevToBlogLoader(config.DEV_TO_USERNAME, max_articles=4)
-    )
+    if tenant.github_username:
+        pipeline.register_loader(
+            "github_repos",
+            GitHubReposLoader(tenant.github_username, max_repos=4)
+        )
 
-    # Run ingestion
-    pipeline.ingest(recreate_collection=True)
+    if tenant.devto_username:
+        pipeline.register_loader(
+            "devto_blog",
+            DevToBlogLoader(tenant.devto_username, max_articles=4)
+        )
+
+    # The dev.to statistics store belongs to the DEVTO_API_KEY account
+    if tenant.is_default and (config.DEVTO_API_KEY or os.path.exists(config.DEVTO_STATS_PATH)):
+        pipeline.register_loader("devto_stats", DevToStatsLoader())
+
+    # Refresh the query typo-correction vocabulary and structured records whenever the collection changes
+    if config.QUERY_PREPROCESSING or config.STRUCTURED_ANSWERS:
+        from query_preprocess import refresh_query_vocabulary
+        pipeline.add_post_ingest_hook(partial(refresh_query_vocabulary, tenant.id))
+
+    # Precompute FAQ answers whenever the collection changes
+    if config.FAQ_ENABLED:
+        from faq import refresh_faq
+        pipeline.add_post_ingest_hook(partial(refresh_faq, tenant=tenant.id))
+
+    return pipeline
+
+
+class TenantIngestion:
+    """
+    Ingestion of every tenant behind the pipeline interface IngestionScheduler uses.
+
+    Loaders are named "<tenant>/<loader>", so one scheduler (one thread
+    pool and INGEST_MAX_CONCURRENCY limit) polls every tenant's sources.
+    Tenant pipelines are kept in an LRU of TENANT_CACHE_SIZE; an evicted
+    pipeline forgets its loader hashes, so its next sync diffs against
+    Qdrant (unchanged chunks are still never re-embedded).
+    """
+
+    def __init__(
+        self,
+        registry: Optional[TenantRegistry] = None,
+        build: Callable[[Tenant], DataIngestion] = build_pipeline,
+        max_pipelines: Optional[int] = None,
+    ):
+        """
+        Args:
+            registry: Tenants to ingest (default: the configured tenants)
+            build: Creates a tenant's pipeline
+            max_pipelines: Pipelines kept (default: TENANT_CACHE_SIZE)
+        """
+        self.registry = registry or tenant_registry
+        self.pipelines: TenantStates[DataIngestion] = TenantStates(
+            build, config.TENANT_CACHE_SIZE if max_pipelines is None else max_pipelines,
+        )
+        self.loaders: Dict[str, Tenant] = {
+            f"{tenant.id}/{name}": tenant
+            for tenant in self.registry
+            for name in self.pipelines.get(tenant).loaders
+        }
+
+    def intervals(self) -> Dict[str, int]:
+        """Seconds between syncs per loader: the tenant's ingest_interval, else INGEST_INTERVALS / INGEST_DEFAULT_INTERVAL"""
+        return {
+            name: tenant.ingest_interval or config.INGEST_INTERVALS.get(name.split("/", 1)[1], config.INGEST_DEFAULT_INTERVAL)
+            for name, tenant in self.loaders.items()
+        }
+
+    def pipeline(self, tenant_id: str) -> DataIngestion:
+        """A tenant's pipeline (rebuilt if it was evicted)"""
+        return self.pipelines.get(self.registry.get(tenant_id))
+
+    def sync_loader(
+        self,
+        name: str,
+        force: bool = False,
+        progress: ProgressCallback = _no_progress,
+        run_hooks: bool = True,
+    ) -> Dict[str, Any]:
+        """Sync one "<tenant>/<loader>" (see DataIngestion.sync_loader)"""
+        tenant_id, _, loader = name.partition("/")
+        result = self.pipeline(tenant_id).sync_loader(loader, force=force, progress=progress, run_hooks=run_hooks)
+        return {**result, "loader": name}
+
+
+def main(
+    schedule: bool = False,
+    profile: bool = False,
+    cprofile: bool = False,
+    profile_dir: str = ".cache/profiles",
+    tenant: Optional[str] = None,
+):
+    """
+    Main ingestion function.
+
+    Args:
+        schedule: Re-sync each source on its interval instead of one full
+            ingestion (every tenant's sources when several are configured)
+        profile: Write a per-loader and per-stage profile report to `profile_dir`
+        cprofile: Also capture cProfile stats of the hottest stage (implies profile)
+        profile_dir: Directory for profile reports
+        tenant: Tenant to ingest (default: DEFAULT_TENANT)
+    """
+    if schedule:
+        # Long-running mode: poll each loader on its interval and apply deltas
+        from scheduler import IngestionScheduler
+
+        if len(tenant_registry) > 1 and tenant is None:
+            ingestion = TenantIngestion()
+            asyncio.run(IngestionScheduler(ingestion, intervals=ingestion.intervals()).run_forever())
+        else:
+            asyncio.run(IngestionScheduler(build_pipeline(tenant_registry.get(tenant))).run_forever())
+        return
+
+    # Initialize ingestion pipeline
+    pipeline = build_pipeline(tenant_registry.get(tenant))
+
+    if not (profile or cprofile):
+        # Run ingestion
+        pipeline.ingest(recreate_collection=True)
+        return
+
+    profiler = IngestionProfiler(cprofile=cprofile)
+    pipeline.profiler = profiler
+    with profiler.running(pipeline.qdrant_client):
+        pipeline.ingest(recreate_collection=True)
+
+    print(profiler.format_report())
+    for kind, path in profiler.write_reports(profile_dir).items():
+        print(f"✓ Profile ({kind}): {path}")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Ingest portfolio data into Qdrant")
+    parser.add_argument(
+        "--schedule",
+        action="store_true",
+        help="Run continuously, re-syncing each source on its interval (INGEST_INTERVALS)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record wall/CPU time, peak memory, network bytes and API calls per loader and stage"
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="With --profile: also save cProfile stats of the hottest stage (for flamegraphs)"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=".cache/profiles",
+        help="Directory for profile reports (default: .cache/profiles)"
+    )
+    parser.add_argument(
+        "--tenant",
+        default=None,
+        help="Tenant to ingest (default: DEFAULT_TENANT; --schedule without it syncs every tenant)"
+    )
+
+    args = parser.parse_args()
+    main(
+        schedule=args.schedule,
+        profile=args.profile,
+        cprofile=args.cprofile,
+        profile_dir=args.profile_dir,
+        tenant=args.tenant,
+    )
@@ -0,0 +1,214 @@
+"""
+Ingestion job manager for the admin API.
+Runs DataIngestion as a background job and tracks per-stage progress.
+
+Only one job runs at a time. Jobs execute in a dedicated worker thread, and
+the pipeline is built off the event loop, so starting a job or polling its
+progress never blocks the event loop.
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stages reported by DataIngestion progress callbacks, in pipeline order
+STAGES = ("load", "split", "embed", "upsert")
+
+# Finished jobs kept for status queries
+MAX_JOB_HISTORY = 20
+
+
+class JobConflictError(RuntimeError):
+    """Raised when a job is requested while another one is running"""
+
+
+@dataclass
+class StageProgress:
+    """Progress of one pipeline stage"""
+    name: str
+    status: str = "pending"
+    completed: int = 0
+    total: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            "name": self.name,
+            "status": self.status,
+            "completed": self.completed,
+            "total": self.total,
+            "duration_seconds": round(elapsed, 3),
+            "throughput_per_second": round(self.completed / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+@dataclass
+class IngestionJob:
+    """A single ingestion run"""
+    job_id: str
+    loaders: List[str]
+    recreate_collection: bool
+    status: str = "queued"
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    stages: Dict[str, StageProgress] = field(default_factory=lambda: {name: StageProgress(name) for name in STAGES})
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def progress(self, stage: str, completed: int, total: int):
+        """DataIngestion progress callback (called from the worker thread)"""
+        with self._lock:
+            progress = self.stages.setdefault(stage, StageProgress(stage))
+            if progress.started_at is None:
+                progress.started_at = time.time()
+            # Earlier stages are complete once a later one starts
+            for name, earlier in self.stages.items():
+                if name == stage:
+                    break
+                if earlier.status == "running":
+                    earlier.status = "done"
+                    earlier.finished_at = time.time()
+            progress.status = "running"
+            progress.finished_at = None
+            progress.completed += completed
+            progress.total += total
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "status": self.status,
+                "loaders": self.loaders,
+                "recreate_collection": self.recreate_collection,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "stages": [stage.to_dict() for stage in self.stages.values()],
+                "results": list(self.results),
+                "errors": list(self.errors),
+            }
+
+
+class IngestionJobManager:
+    """
+    Starts ingestion jobs in the background and keeps their progress.
+    """
+
+    def __init__(self, pipeline_factory: Callable[[], Any]):
+        """
+        Args:
+            pipeline_factory: Returns the (shared) DataIngestion instance
+        """
+        self.pipeline_factory = pipeline_factory
+        self.jobs: "OrderedDict[str, IngestionJob]" = OrderedDict()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-job")
+        self._active: Optional[IngestionJob] = None
+
+    def loader_names(self) -> List[str]:
+        """Names of the loaders registered on the pipeline"""
+        return list(self.pipeline_factory().loaders)
+
+    async def submit(self, loaders: Optional[List[str]] = None, recreate_collection: bool = False) -> IngestionJob:
+        """
+        Start a new ingestion job.
+
+        Args:
+            loaders: Loader names to sync (default: all registered loaders)
+            recreate_collection: Drop and rebuild the whole collection (all loaders only)
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobConflictError: If a job is already running
+            ValueError: If a loader name is unknown or the options conflict
+        """
+        self._check_idle()
+
+        # The first call builds the pipeline (clients, tokenizer); keep it off the event loop
+        loop = asyncio.get_running_loop()
+        available = await loop.run_in_executor(None, self.loader_names)
+        self._check_idle()
+        unknown = [name for name in loaders or [] if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown loaders: {', '.join(unknown)}. Available: {', '.join(available)}")
+        if recreate_collection and loaders and set(loaders) != set(available):
+            raise ValueError("recreate_collection requires all loaders")
+
+        job = IngestionJob(job_id=uuid.uuid4().hex, loaders=loaders or available, recreate_collection=recreate_collection)
+        self._active = job
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > MAX_JOB_HISTORY:
+            self.jobs.popitem(last=False)
+
+        loop.run_in_executor(self.executor, self._run, job)
+        return job
+
+    def _check_idle(self):
+        if self._active is not None:
+            raise JobConflictError(f"Ingestion job {self._active.job_id} is already running")
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        """Look up a job by ID"""
+        return self.jobs.get(job_id)
+
+    def _run(self, job: IngestionJob):
+        """Execute a job (worker thread)"""
+        job.status = "running"
+        job.started_at = datetime.now().isoformat()
+        logger.info(f"Ingestion job {job.job_id} started for loaders: {', '.join(job.loaders)}")
+
+        try:
+            pipeline = self.pipeline_factory()
+            if job.recreate_collection:
+                result = pipeline.ingest(recreate_collection=True, progress=job.progress)
+                job.results.append(result)
+                job.errors.extend(f"{name}: {error}" for name, error in result["errors"].items())
+                if result["status"] == "aborted":
+                    job.errors.append("No documents loaded; ingestion aborted")
+            else:
+                for name in job.loaders:
+                    try:
+                        result = pipeline.sync_loader(name, force=True, progress=job.progress, run_hooks=False)
+                        job.results.append(result)
+                        if result["status"] == "empty":
+                            job.errors.append(f"{name}: loaded no documents")
+                    except Exception as e:
+                        job.errors.append(f"{name}: {str(e)}")
+                        logger.error(f"Ingestion job {job.job_id} failed on {name}: {str(e)}")
+
+                # Post-ingest steps (FAQ precompute) once for the whole job
+                if any(result.get("status") == "updated" for result in job.results):
+                    pipeline.run_post_ingest_hooks()
+
+            job.status = "failed" if job.errors else "succeeded"
+
+        except Exception as e:
+            job.errors.append(str(e))
+            job.status = "failed"
+            logger.error(f"Ingestion job {job.job_id} failed: {str(e)}")
+
+        finally:
+            with job._lock:
+                for stage in job.stages.values():
+                    if stage.status == "running":
+                        stage.status = "done" if job.status == "succeeded" else "error"
+                        stage.finished_at = time.time()
+                    elif stage.status == "pending":
+                        stage.status = "skipped"
+            job.finished_at = datetime.now().isoformat()
+            self._active = None
+            logger.info(f"Ingestion job {job.job_id} {job.status}")
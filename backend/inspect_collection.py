@@ -0,0 +1,390 @@
+"""
+Collection inspection: vectorized similarity debugging over the whole collection.
+Pulls every vector once into NumPy and analyzes queries, neighbours and per-source coverage in bulk.
+
+The collection is scrolled once (vectors and payloads). The questions are
+embedded with a single provider call. Everything after that is matrix
+arithmetic on normalized float32 vectors, so it stays well under a second
+for thousands of chunks:
+
+- Scores: the query x chunk cosine matrix, and the chunks each query would
+  retrieve under the active retrieval policy (threshold and dynamic k)
+- Neighbours: a histogram of all chunk-to-chunk similarities, computed in
+  row blocks so memory stays bounded, plus each chunk's nearest neighbour
+- Outliers: chunks far from the centroid of their type, or with an
+  unusually distant nearest neighbour (modified z-score below -OUTLIER_Z)
+- Orphans: chunks that none of the questions retrieve
+- Coverage per source and type: chunks, share retrieved, best query score
+  and cohesion (mean similarity to the group centroid)
+
+The report is written as JSON (--output) and/or CSV files (--csv DIR).
+
+Usage: python inspect_collection.py [--queries questions.txt] [--output report.json] [--csv report/] [--tenant ID]
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import config
+from retrieval import RetrievalPolicy
+
+# Modified z-score (median/MAD) below -OUTLIER_Z marks an outlier (3.5 is the usual cut-off)
+OUTLIER_Z = 3.5
+
+# Nearest-neighbour similarity at which two chunks are near-duplicates
+DUPLICATE_SIMILARITY = 0.98
+
+
+@dataclass
+class Corpus:
+    """Every chunk of a collection, vectors row-normalized"""
+    ids: List[str]
+    vectors: np.ndarray
+    metadata: List[Dict[str, Any]]
+    texts: List[str]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Row-normalized float32 copy (zero rows stay zero)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def load_corpus(qdrant_client, collection_name: Optional[str] = None, batch_size: int = 512) -> Corpus:
+    """
+    Scroll the whole collection once, with vectors.
+
+    Args:
+        qdrant_client: Qdrant client
+        collection_name: Collection (default: COLLECTION_NAME)
+        batch_size: Points per scroll request
+    """
+    collection_name = collection_name or config.COLLECTION_NAME
+    ids, vectors, metadata, texts = [], [], [], []
+    offset = None
+    while True:
+        points, offset = qdrant_client.scroll(
+            collection_name, limit=batch_size, offset=offset, with_payload=True, with_vectors=True,
+        )
+        for point in points:
+            vector = point.vector
+            if isinstance(vector, dict):  # Named vectors: langchain_qdrant's default is unnamed ("")
+                vector = vector.get("") or next(iter(vector.values()))
+            payload = point.payload or {}
+            ids.append(str(point.id))
+            vectors.append(vector)
+            metadata.append(payload.get("metadata") or {})
+            texts.append(payload.get("page_content") or "")
+        if offset is None:
+            break
+    matrix = normalize(np.array(vectors)) if vectors else np.zeros((0, 0), dtype=np.float32)
+    return Corpus(ids=ids, vectors=matrix, metadata=metadata, texts=texts)
+
+
+def retrieved_chunks(scores: np.ndarray, policy: RetrievalPolicy) -> List[np.ndarray]:
+    """
+    Chunk indices each query would retrieve.
+
+    Args:
+        scores: Query x chunk similarity matrix
+        policy: Threshold and dynamic-k settings
+
+    Returns:
+        Per query, the retrieved chunk indices, best first
+    """
+    k = min(policy.max_k, scores.shape[1])
+    if k == 0:
+        return [np.array([], dtype=int) for _ in range(scores.shape[0])]
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    rows = np.arange(scores.shape[0])[:, None]
+    top = top[rows, np.argsort(-scores[rows, top], axis=1)]
+    return [top[row, :policy.select(scores[row, top[row]].tolist())[1]] for row in range(scores.shape[0])]
+
+
+def _keep_nearest(nearest: np.ndarray, nearest_index: np.ndarray, chunks: np.ndarray, similarity: np.ndarray, index: np.ndarray):
+    """Record neighbours closer than the ones found so far"""
+    closer = similarity > nearest[chunks]
+    nearest[chunks[closer]] = similarity[closer]
+    nearest_index[chunks[closer]] = index[closer]
+
+
+def neighbor_stats(vectors: np.ndarray, bins: int = 20, block: int = 1024) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Chunk-to-chunk similarities, computed in row blocks.
+
+    Each block multiplies its rows with the chunks from its first row on,
+    so every pair is computed once; nearest neighbours are updated from
+    both the row and the column side.
+
+    Args:
+        vectors: Row-normalized chunk vectors
+        bins: Histogram bins over [-1, 1]
+        block: Rows per block (memory is block x chunks floats)
+
+    Returns:
+        (histogram counts of each pair once, bin edges, nearest-neighbour
+        similarity per chunk, nearest-neighbour index per chunk)
+    """
+    count = len(vectors)
+    edges = np.linspace(-1.0, 1.0, bins + 1)
+    histogram = np.zeros(bins, dtype=np.int64)
+    nearest = np.full(count, -1.0, dtype=np.float32)
+    nearest_index = np.full(count, -1, dtype=np.int64)
+    for start in range(0, count, block):
+        stop = min(start + block, count)
+        similarities = np.clip(vectors[start:stop] @ vectors[start:].T, -1.0, 1.0)
+        rows = np.arange(stop - start)
+        within, after = similarities[:, :stop - start], similarities[:, stop - start:]
+
+        # Pairs inside the block above the diagonal, and every pair with later chunks
+        histogram += np.histogram(within[rows[None, :] > rows[:, None]], bins=edges)[0]
+        histogram += np.histogram(after, bins=edges)[0]
+
+        within[rows, rows] = -np.inf
+        _keep_nearest(nearest, nearest_index, rows + start, similarities.max(axis=1), similarities.argmax(axis=1) + start)
+        if stop < count:
+            _keep_nearest(nearest, nearest_index, np.arange(stop, count), after.max(axis=0), after.argmax(axis=0) + start)
+    return histogram, edges, nearest, nearest_index
+
+
+def group_centroid_similarity(vectors: np.ndarray, groups: Sequence[str]) -> np.ndarray:
+    """Similarity of each chunk to the (normalized) centroid of its group"""
+    groups = np.asarray(groups)
+    similarity = np.zeros(len(vectors), dtype=np.float32)
+    for group in np.unique(groups):
+        members = groups == group
+        centroid = normalize(vectors[members].mean(axis=0, keepdims=True))[0]
+        similarity[members] = vectors[members] @ centroid
+    return similarity
+
+
+def robust_z_scores(values: np.ndarray, groups: Optional[Sequence[str]] = None) -> np.ndarray:
+    """
+    Modified z-scores (median and median absolute deviation), within each
+    group when groups are given; robust to the outliers they look for.
+    Constant groups score 0.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    groups = np.asarray(groups) if groups is not None else np.zeros(len(values), dtype=int)
+    scores = np.zeros(len(values))
+    for group in np.unique(groups):
+        members = groups == group
+        median = np.median(values[members])
+        mad = np.median(np.abs(values[members] - median))
+        if mad > 0:
+            scores[members] = 0.6745 * (values[members] - median) / mad
+    return scores
+
+
+def analyze(
+    corpus: Corpus,
+    queries: Sequence[str],
+    query_vectors: np.ndarray,
+    policy: RetrievalPolicy,
+    bins: int = 20,
+    outlier_z: float = OUTLIER_Z,
+) -> Dict[str, Any]:
+    """
+    Bulk similarity analysis of a collection.
+
+    Args:
+        corpus: Every chunk of the collection
+        queries: Questions to score
+        query_vectors: Their embeddings (one row per question)
+        policy: Retrieval policy deciding which chunks each question reaches
+        bins: Chunk-to-chunk histogram bins
+        outlier_z: Modified z-score below which a chunk is an outlier
+
+    Returns:
+        Report with queries, histogram, chunks, outliers, orphans and coverage
+    """
+    started = time.perf_counter()
+    types = [m.get("type", "unknown") for m in corpus.metadata]
+    sources = [m.get("source", "unknown") for m in corpus.metadata]
+
+    scores = normalize(query_vectors) @ corpus.vectors.T if len(queries) else np.zeros((0, len(corpus)), dtype=np.float32)
+    reached = retrieved_chunks(scores, policy)
+    retrieved_by = np.zeros(len(corpus), dtype=np.int64)
+    for indices in reached:
+        retrieved_by[indices] += 1
+    best_score = scores.max(axis=0) if len(queries) else np.zeros(len(corpus), dtype=np.float32)
+
+    histogram, edges, nearest, nearest_index = neighbor_stats(corpus.vectors, bins)
+    centroid = group_centroid_similarity(corpus.vectors, types)
+    centroid_z = robust_z_scores(centroid, types)
+    nearest_z = robust_z_scores(nearest)
+
+    chunks = []
+    for index in range(len(corpus)):
+        reasons = []
+        if centroid_z[index] < -outlier_z:
+            reasons.append("far_from_type")
+        if nearest_z[index] < -outlier_z:
+            reasons.append("isolated")
+        chunks.append({
+            "id": corpus.ids[index],
+            "source": sources[index],
+            "type": types[index],
+            "preview": corpus.texts[index][:80],
+            "nearest_id": corpus.ids[nearest_index[index]] if nearest_index[index] >= 0 else None,
+            "nearest_similarity": round(float(nearest[index]), 4),
+            "type_centroid_similarity": round(float(centroid[index]), 4),
+            "best_query_score": round(float(best_score[index]), 4),
+            "retrieved_by": int(retrieved_by[index]),
+            "outlier": reasons,
+            "orphan": bool(len(queries) and retrieved_by[index] == 0),
+        })
+
+    coverage = []
+    for key, labels in (("source", sources), ("type", types)):
+        labels = np.asarray(labels)
+        for label in sorted(set(labels.tolist())):
+            members = labels == label
+            coverage.append({
+                "by": key,
+                "name": label,
+                "chunks": int(members.sum()),
+                "retrieved_share": round(float((retrieved_by[members] > 0).mean()), 3),
+                "best_query_score": round(float(best_score[members].max()), 4),
+                "cohesion": round(float(centroid[members].mean()), 4),
+            })
+
+    return {
+        "collection": {"chunks": len(corpus), "dimensions": int(corpus.vectors.shape[1]) if len(corpus) else 0},
+        "policy": policy.to_dict(),
+        "queries": [
+            {
+                "query": query,
+                "retrieved": [
+                    {"id": corpus.ids[index], "score": round(float(scores[row, index]), 4), "type": types[index]}
+                    for index in reached[row]
+                ],
+            }
+            for row, query in enumerate(queries)
+        ],
+        "histogram": [
+            {"from": round(float(edges[i]), 2), "to": round(float(edges[i + 1]), 2), "pairs": int(histogram[i])}
+            for i in range(bins)
+        ],
+        "near_duplicates": int((nearest >= DUPLICATE_SIMILARITY).sum()),
+        "chunks": chunks,
+        "outliers": [chunk["id"] for chunk in chunks if chunk["outlier"]],
+        "orphans": [chunk["id"] for chunk in chunks if chunk["orphan"]],
+        "coverage": coverage,
+        "scores": scores,
+        "analysis_seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def write_json(report: Dict[str, Any], path: str):
+    """Report as JSON (the full score matrix as a list of rows)"""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({**report, "scores": np.round(report["scores"], 4).tolist()}, file, indent=2)
+
+
+def write_csv(report: Dict[str, Any], directory: str, ids: Sequence[str]):
+    """
+    Report as CSV files: scores.csv (query x chunk), chunks.csv, coverage.csv, histogram.csv.
+
+    Args:
+        report: Output of `analyze`
+        directory: Output directory (created if missing)
+        ids: Chunk IDs, in corpus order (score matrix columns)
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "scores.csv"), "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["query", *ids])
+        for query, row in zip(report["queries"], report["scores"]):
+            writer.writerow([query["query"], *(f"{score:.4f}" for score in row)])
+
+    tables = {
+        "chunks.csv": [{**chunk, "outlier": ";".join(chunk["outlier"])} for chunk in report["chunks"]],
+        "coverage.csv": report["coverage"],
+        "histogram.csv": report["histogram"],
+    }
+    for name, rows in tables.items():
+        if not rows:
+            continue
+        with open(os.path.join(directory, name), "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def default_queries(owner: str) -> List[str]:
+    """The calibration evaluation questions and the FAQ questions, for the owner"""
+    from calibrate import EVAL_SET
+    from faq import curated_questions
+    from prompts import first_name
+
+    name = first_name(owner)
+    return list(dict.fromkeys([case["question"].format(name=name) for case in EVAL_SET] + curated_questions(owner)))
+
+
+def main(queries_path: Optional[str], output: Optional[str], csv_dir: Optional[str], tenant: Optional[str]):
+    """Inspect a tenant's collection"""
+    from rag_chain import rag_chain
+
+    print("=" * 60)
+    print("COLLECTION INSPECTION")
+    print("=" * 60 + "\n")
+
+    chain = rag_chain.tenant_chain(tenant)
+    started = time.perf_counter()
+    corpus = load_corpus(rag_chain.qdrant_client, chain.tenant.collection)
+    print(f"Loaded {len(corpus)} chunks from '{chain.tenant.collection}' in {time.perf_counter() - started:.2f}s")
+    if not len(corpus):
+        print("Collection is empty; run 'python ingest.py' first.")
+        return
+
+    if queries_path:
+        with open(queries_path, "r", encoding="utf-8") as file:
+            queries = [line.strip() for line in file if line.strip()]
+    else:
+        queries = default_queries(chain.tenant.owner)
+    started = time.perf_counter()
+    query_vectors = np.array(rag_chain.embeddings.embed_documents([chain.search_text(query) for query in queries]))
+    print(f"Embedded {len(queries)} questions in {time.perf_counter() - started:.2f}s (one request)")
+
+    report = analyze(corpus, queries, query_vectors, chain.retriever.policy)
+    print(f"Analyzed in {report['analysis_seconds'] * 1000:.1f} ms\n")
+
+    print("Chunk-to-chunk similarity:")
+    for bucket in report["histogram"]:
+        if bucket["pairs"]:
+            print(f"  {bucket['from']:+.2f} .. {bucket['to']:+.2f}: {bucket['pairs']}")
+    print(f"\nNear-duplicates (nearest neighbour >= {DUPLICATE_SIMILARITY}): {report['near_duplicates']}")
+    print(f"Outliers: {len(report['outliers'])}  Orphans (retrieved by no question): {len(report['orphans'])}")
+
+    print("\nCoverage by type:")
+    for row in report["coverage"]:
+        if row["by"] == "type":
+            print(f"  - {row['name']}: {row['chunks']} chunks, {row['retrieved_share']:.0%} retrieved, cohesion {row['cohesion']:.3f}")
+
+    if output:
+        write_json(report, output)
+        print(f"\n✓ Report written to {output}")
+    if csv_dir:
+        write_csv(report, csv_dir, corpus.ids)
+        print(f"✓ CSV files written to {csv_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk similarity analysis of the vector collection")
+    parser.add_argument("--queries", help="Questions to score, one per line (default: evaluation and FAQ questions)")
+    parser.add_argument("--output", help="Write the report as JSON")
+    parser.add_argument("--csv", help="Write the report as CSV files into this directory")
+    parser.add_argument("--tenant", help="Tenant whose collection is inspected (default: DEFAULT_TENANT)")
+    args = parser.parse_args()
+    main(args.queries, args.output, args.csv, args.tenant)
@@ -0,0 +1,167 @@
+"""
+Server lifecycle for the RAG chatbot API.
+Warms a worker up before it takes traffic and drains in-flight requests before it exits.
+
+A fresh worker pays for cold connection setup (TLS to OpenAI and Qdrant)
+and lazy LangChain/prompt initialization on its first requests. On startup
+`warm_up` runs one uncached embedding call, a Qdrant search through the
+retriever and the async client, and prompt compilation; `/api/ready` stays
+503 until it succeeds (failed attempts are retried every
+WARMUP_RETRY_SECONDS). On shutdown the worker reports not ready and waits
+up to SHUTDOWN_DRAIN_SECONDS for in-flight requests (and their LLM calls)
+to finish before the pooled connections are closed.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from prompts import build_messages, system_prompt
+
+logger = logging.getLogger(__name__)
+
+# Text used for warm-up calls (never cached as an answer)
+WARMUP_TEXT = "warm-up: technical skills and experience"
+
+# Probes are not application traffic: they never hold up a drain
+UNTRACKED_PATHS = {"/api/ready", "/api/health"}
+
+
+async def warm_up(chain, embeddings, async_qdrant_client=None) -> Dict[str, float]:
+    """
+    Exercise every cold component of the query path once.
+
+    Args:
+        chain: Tenant retrieval state (TenantChain) to warm up
+        embeddings: Underlying embeddings client (not the caching wrapper, so
+            the call really opens a provider connection)
+        async_qdrant_client: Async Qdrant client used by FAQ matching and batch search
+
+    Returns:
+        Seconds spent per warm-up step
+
+    Raises:
+        Exception: The first failing step's error (the worker is not ready)
+    """
+    steps: Dict[str, float] = {}
+
+    started = time.perf_counter()
+    vector = await embeddings.aembed_query(WARMUP_TEXT)
+    steps["embed"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await chain.retriever.ainvoke(chain.search_text(WARMUP_TEXT))
+    if async_qdrant_client is not None:
+        await async_qdrant_client.search(collection_name=chain.tenant.collection, query_vector=vector, limit=1)
+    steps["search"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    system_prompt(chain.tenant.owner)
+    build_messages(WARMUP_TEXT, [], chain.tenant.owner)
+    chain.structured.answer(WARMUP_TEXT)
+    steps["prompt"] = time.perf_counter() - started
+
+    return {name: round(seconds, 4) for name, seconds in steps.items()}
+
+
+class ServiceState:
+    """
+    Readiness and in-flight request tracking of one worker.
+
+    Ready once warm-up succeeded and until draining starts.
+    """
+
+    def __init__(self):
+        self.warmed_up = False
+        self.draining = False
+        self.in_flight = 0
+        self.warmup_attempts = 0
+        self.warmup_steps: Dict[str, float] = {}
+        self.warmup_error: Optional[str] = None
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def ready(self) -> bool:
+        return self.warmed_up and not self.draining
+
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        """Count a request as in flight for the duration of the block"""
+        self.in_flight += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self.in_flight == 0:
+                self._idle.set()
+
+    async def warm_up_until_ready(self, warm_up: Callable[[], Awaitable[Dict[str, float]]], retry_seconds: float):
+        """
+        Run `warm_up` until it succeeds (or draining starts), then report ready.
+
+        Args:
+            warm_up: Warm-up coroutine function returning seconds per step
+            retry_seconds: Pause between failed attempts
+        """
+        while not self.draining:
+            self.warmup_attempts += 1
+            try:
+                self.warmup_steps = await warm_up()
+            except Exception as e:
+                self.warmup_error = str(e)
+                logger.warning(f"Warm-up attempt {self.warmup_attempts} failed: {str(e)}; retrying in {retry_seconds:.0f}s")
+                await asyncio.sleep(retry_seconds)
+                continue
+            self.warmup_error = None
+            self.warmed_up = True
+            logger.info(f"Warm-up complete in {sum(self.warmup_steps.values()):.2f}s: {self.warmup_steps}")
+            return
+
+    async def drain(self, timeout: float) -> int:
+        """
+        Stop reporting ready and wait for in-flight requests to finish.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Requests still in flight when the wait ended
+        """
+        self.draining = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.in_flight
+
+    def stats(self) -> Dict[str, Any]:
+        """Readiness, drain state, in-flight requests and warm-up outcome"""
+        return {
+            "ready": self.ready,
+            "draining": self.draining,
+            "in_flight": self.in_flight,
+            "warmup": {
+                "done": self.warmed_up,
+                "attempts": self.warmup_attempts,
+                "seconds": self.warmup_steps,
+                "error": self.warmup_error,
+            },
+        }
+
+
+class InFlightMiddleware:
+    """ASGI middleware counting in-flight HTTP requests (probes excluded) in a ServiceState"""
+
+    def __init__(self, app, state: ServiceState):
+        self.app = app
+        self.state = state
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in UNTRACKED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        async with self.state.track():
+            await self.app(scope, receive, send)
@@ -2,13 +2,30 @@
 FastAPI server for the RAG-powered chatbot backend.
 Provides endpoints for chat interactions and health checks.
 """
+import asyncio
 import logging
-from typing import Dict, Any
-from fastapi import FastAPI, HTTPException
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Annotated, Dict, Any, List, Optional, Union
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
+from admission import AdmissionController, AdmissionRejected, TokenBucketLimiter
+from auth import require_admin
+from clients import clients
 from config import config
 from rag_chain import rag_chain
+from shared_cache import try_host_lock
+from sources import CompactSource, Source, response_sources
+from tenants import TenantRoutingMiddleware, tenant_registry
+from vector_index import DimensionMismatchError
+from scheduler import IngestionScheduler
+from ingest_jobs import IngestionJobManager, JobConflictError
+from lifecycle import InFlightMiddleware, ServiceState, warm_up
+from traffic_capture import TrafficCapture, served_by
 
 # Configure logging
 logging.basicConfig(
@@ -17,11 +34,101 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+# Readiness and in-flight requests of this worker
+service_state = ServiceState()
+
+
+async def warm_up_default_tenant() -> Dict[str, float]:
+    """Open the OpenAI and Qdrant connections and initialize the default tenant's query path"""
+    chain = await rag_chain.atenant_chain()
+    # The uncached client, so the call really reaches the provider (the LLM shares its connection pool)
+    return await warm_up(chain, rag_chain.embeddings.embeddings, rag_chain.async_qdrant_client)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Validate config, start background tasks and warm up on startup; drain
+    in-flight requests and release clients on shutdown.
+    """
+    global ingestion_scheduler
+    logger.info("Starting Portfolio RAG Chatbot API...")
+    try:
+        # Validate configuration
+        config.validate()
+        logger.info("Configuration validated successfully")
+
+        # Refuse to serve a collection built with other embedding dimensions
+        try:
+            dimensions = await asyncio.to_thread(rag_chain.check_dimensions)
+            logger.info(f"Embedding dimensions: {dimensions}")
+        except DimensionMismatchError:
+            raise
+        except Exception as e:
+            logger.warning(f"Could not verify embedding dimensions: {str(e)}")
+
+        # Default tenant's retriever, FAQ index, typo-correction vocabulary and structured records
+        # (other tenants load on their first request)
+        try:
+            chain = await asyncio.to_thread(rag_chain.tenant_chain)
+            logger.info(f"Tenants: {len(tenant_registry)}; query vocabulary: {chain.preprocessor.stats()['vocabulary']} terms")
+        except Exception as e:
+            logger.warning(f"Could not load the default tenant: {str(e)}")
+
+        # Perform health check
+        health = rag_chain.health_check()
+        if health["status"] == "healthy":
+            logger.info(f"RAG chain initialized successfully. Collection: {health.get('collection')}, Vectors: {health.get('vector_count')}")
+        else:
+            logger.warning(f"RAG chain health check failed: {health.get('message')}")
+
+        # Start background re-ingestion (in one worker per host), per tenant when several are hosted
+        if config.INGEST_SCHEDULER_ENABLED and _claim_scheduler():
+            if len(tenant_registry) > 1:
+                from ingest import TenantIngestion
+                ingestion = await asyncio.to_thread(TenantIngestion)
+                ingestion_scheduler = IngestionScheduler(ingestion, intervals=ingestion.intervals())
+            else:
+                ingestion_scheduler = IngestionScheduler(await asyncio.to_thread(get_ingestion_pipeline))
+            await ingestion_scheduler.start()
+
+    except Exception as e:
+        logger.error(f"Error during startup: {str(e)}")
+        raise
+
+    # Readiness (/api/ready) follows warm-up, which retries until it succeeds
+    if config.WARMUP_ENABLED:
+        warmup_task = asyncio.create_task(service_state.warm_up_until_ready(warm_up_default_tenant, config.WARMUP_RETRY_SECONDS))
+    else:
+        warmup_task = None
+        service_state.warmed_up = True
+
+    yield
+
+    # Leave rotation and let in-flight requests (and their LLM calls) finish
+    remaining = await service_state.drain(config.SHUTDOWN_DRAIN_SECONDS)
+    if remaining:
+        logger.warning(f"Shutting down with {remaining} requests still in flight")
+    if warmup_task is not None:
+        warmup_task.cancel()
+
+    # Stop background tasks, then close pooled connections
+    if ingestion_scheduler is not None:
+        await ingestion_scheduler.stop()
+    await clients.aclose()
+    if traffic_capture is not None:
+        traffic_capture.close()
+    logger.info("Shut down Portfolio RAG Chatbot API")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Portfolio RAG Chatbot API",
     description="RAG-powered recruitment assistant for James Brendamour's portfolio",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -33,19 +140,103 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# /t/{tenant}/api/... serves the same endpoints for another tenant
+app.add_middleware(TenantRoutingMiddleware)
+
+# Outermost: counts every in-flight request so shutdown can wait for it
+app.add_middleware(InFlightMiddleware, state=service_state)
+
 
 # Request/Response Models
 class ChatRequest(BaseModel):
     """Chat request model"""
     message: str = Field(..., min_length=1, max_length=1000, description="User's question or message")
     session_id: str = Field(default=None, description="Optional session ID for conversation tracking")
+    compact: bool = Field(default=False, description="Return only the ID and title of each source")
 
 
 class ChatResponse(BaseModel):
     """Chat response model"""
     response: str = Field(..., description="Chatbot's response")
-    sources: list = Field(default_factory=list, description="Source documents used for the response")
+    sources: List[Union[Source, CompactSource]] = Field(default_factory=list, description="Source documents used for the response")
     success: bool = Field(default=True, description="Whether the request was successful")
+    degraded: bool = Field(default=False, description="Whether the answer was extracted from sources because the LLM was unavailable")
+    structured: bool = Field(default=False, description="Whether the answer was templated from structured records without an LLM call")
+
+
+class BatchChatRequest(BaseModel):
+    """Batch chat request model"""
+    messages: List[Annotated[str, Field(min_length=1, max_length=1000)]] = Field(
+        ...,
+        min_length=1,
+        max_length=config.BATCH_MAX_QUESTIONS,
+        description="Questions to answer, in order",
+    )
+    session_id: str = Field(default=None, description="Optional session ID for conversation tracking")
+    compact: bool = Field(default=False, description="Return only the ID and title of each source")
+
+
+class BatchChatItem(BaseModel):
+    """Result for one question of a batch"""
+    index: int = Field(..., description="Position of the question in the request")
+    message: str = Field(..., description="The question")
+    response: str = Field(..., description="Chatbot's response")
+    sources: List[Union[Source, CompactSource]] = Field(default_factory=list, description="Source documents used for the response")
+    success: bool = Field(..., description="Whether this question was answered")
+    degraded: bool = Field(default=False, description="Whether the answer was extracted from sources because the LLM was unavailable")
+    structured: bool = Field(default=False, description="Whether the answer was templated from structured records without an LLM call")
+    error: Optional[str] = Field(default=None, description="Error for this question, if any")
+
+
+class BatchChatResponse(BaseModel):
+    """Batch chat response model"""
+    results: List[BatchChatItem] = Field(..., description="One result per question, in request order")
+    success: bool = Field(..., description="Whether every question was answered")
+
+
+class IngestionStatusResponse(BaseModel):
+    """Background ingestion status response model"""
+    enabled: bool = Field(..., description="Whether the background scheduler is enabled")
+    running: bool = Field(default=False, description="Whether the scheduling loop is active")
+    max_concurrency: int = Field(default=0, description="Maximum loaders syncing at once")
+    loaders: list = Field(default_factory=list, description="Last-run status and duration per loader")
+
+
+class IngestJobRequest(BaseModel):
+    """Admin ingestion job request model"""
+    loaders: Optional[List[str]] = Field(default=None, description="Loader names to sync (default: all)")
+    recreate_collection: bool = Field(default=False, description="Drop and rebuild the collection (all loaders only)")
+
+
+class IngestJobResponse(BaseModel):
+    """Admin ingestion job status model"""
+    job_id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    loaders: List[str] = Field(..., description="Loaders included in the job")
+    recreate_collection: bool = Field(..., description="Whether the collection is rebuilt")
+    created_at: str = Field(..., description="Job creation time")
+    started_at: Optional[str] = Field(default=None, description="Job start time")
+    finished_at: Optional[str] = Field(default=None, description="Job finish time")
+    stages: list = Field(default_factory=list, description="Per-stage progress and throughput")
+    results: list = Field(default_factory=list, description="Per-loader sync results")
+    errors: List[str] = Field(default_factory=list, description="Errors raised during the job")
+
+
+class MetricsResponse(BaseModel):
+    """Admission and rate limiting metrics response model"""
+    admission: Dict[str, Any] = Field(..., description="Chat concurrency, queue depth and rejection counters")
+    rate_limit: Dict[str, Any] = Field(..., description="Per-client rate limiter counters")
+    llm: Dict[str, Any] = Field(..., description="LLM circuit breaker state, latency percentiles and hedge delay")
+    caches: Dict[str, Any] = Field(..., description="Shared answer and query embedding cache statistics")
+    worker_pid: int = Field(..., description="Server worker process that produced these (per-worker) metrics")
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness probe response model"""
+    ready: bool = Field(..., description="Whether this worker is warmed up and accepting traffic")
+    draining: bool = Field(..., description="Whether this worker is shutting down")
+    in_flight: int = Field(..., description="Requests being served by this worker")
+    warmup: Dict[str, Any] = Field(..., description="Warm-up attempts, seconds per step and last error")
 
 
 class HealthResponse(BaseModel):
@@ -55,26 +246,84 @@ class HealthResponse(BaseModel):
     vector_store: str = Field(..., description="Vector store connection status")
 
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize RAG chain on startup"""
-    logger.info("Starting Portfolio RAG Chatbot API...")
-    try:
-        # Validate configuration
-        config.validate()
-        logger.info("Configuration validated successfully")
+# Ingestion pipeline shared by the scheduler and admin jobs (created on first use)
+ingestion_pipeline = None
+_ingestion_pipeline_lock = threading.Lock()
 
-        # Perform health check
-        health = rag_chain.health_check()
-        if health["status"] == "healthy":
-            logger.info(f"RAG chain initialized successfully. Collection: {health.get('collection')}, Vectors: {health.get('vector_count')}")
-        else:
-            logger.warning(f"RAG chain health check failed: {health.get('message')}")
 
-    except Exception as e:
-        logger.error(f"Error during startup: {str(e)}")
-        raise
+def get_ingestion_pipeline():
+    """Return the shared ingestion pipeline, building it on first use (blocking; call from a thread)"""
+    global ingestion_pipeline
+    with _ingestion_pipeline_lock:
+        if ingestion_pipeline is None:
+            from ingest import build_pipeline
+            ingestion_pipeline = build_pipeline()
+    return ingestion_pipeline
+
+
+# Background re-ingestion scheduler (created on startup when enabled)
+ingestion_scheduler: Optional[IngestionScheduler] = None
+_scheduler_lock = None
+
+
+def _claim_scheduler() -> bool:
+    """Whether this worker runs the scheduler (only one worker per host does)"""
+    global _scheduler_lock
+    _scheduler_lock = try_host_lock("ingest-scheduler")
+    if _scheduler_lock is None:
+        logger.info("Ingestion scheduler runs in another worker")
+    return _scheduler_lock is not None
+
+# Admin-triggered ingestion jobs
+ingestion_jobs = IngestionJobManager(get_ingestion_pipeline)
+
+
+# Admission control for RAG queries and per-client rate limiting
+chat_admission = AdmissionController(
+    max_concurrency=config.CHAT_MAX_CONCURRENCY,
+    max_queue=config.CHAT_MAX_QUEUE,
+    queue_timeout=config.CHAT_QUEUE_TIMEOUT,
+)
+rate_limiter = TokenBucketLimiter(config.RATE_LIMIT_PER_MINUTE, config.RATE_LIMIT_BURST)
+
+# Opt-in capture of chat requests for offline replay (replay.py)
+traffic_capture = TrafficCapture() if config.TRAFFIC_CAPTURE_ENABLED else None
+
+
+def capture_traffic(endpoint: str, tenant: str, questions: List[str], started: float, status: int, results: List[Dict[str, Any]] = ()):
+    """Record a chat request when traffic capture is enabled (`started` from time.time())"""
+    if traffic_capture is not None:
+        traffic_capture.capture(endpoint, tenant, questions, started, time.time() - started, status, results)
+
+
+def client_key(request: Request, session_id: Optional[str] = None) -> str:
+    """Rate limiting key: session ID (when RATE_LIMIT_KEY=session) or client IP"""
+    if config.RATE_LIMIT_KEY == "session" and session_id:
+        return f"session:{session_id}"
+
+    forwarded = request.headers.get("x-forwarded-for") if config.TRUST_PROXY_HEADERS else None
+    if forwarded:
+        return f"ip:{forwarded.split(',')[0].strip()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def request_tenant(request: Request) -> str:
+    """
+    Tenant of a request: the /t/{tenant} path prefix, the TENANT_HEADER
+    header, or DEFAULT_TENANT. Unknown tenants are rejected with 404.
+    """
+    tenant_id = request.scope.get("tenant") or request.headers.get(config.TENANT_HEADER) or config.DEFAULT_TENANT
+    if tenant_id not in tenant_registry:
+        raise HTTPException(status_code=404, detail=f"Unknown tenant '{tenant_id}'")
+    return tenant_id
+
+
+def check_rate_limit(request: Request, session_id: Optional[str] = None, cost: int = 1):
+    """Raise 429 with Retry-After when the client is over its rate limit (`cost` = questions asked)"""
+    retry_after = rate_limiter.acquire(client_key(request, session_id), cost=cost)
+    if retry_after:
+        rejection = AdmissionRejected(429, "Rate limit exceeded, please slow down", retry_after)
+        raise HTTPException(status_code=429, detail=rejection.detail, headers=rejection.headers)
 
 
 # Endpoints
@@ -89,13 +338,13 @@ async def root():
 
 
 @app.get("/api/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(tenant: str = Depends(request_tenant)):
     """
     Health check endpoint.
-    Verifies Qdrant connection and collection status.
+    Verifies Qdrant connection and the tenant's collection status.
     """
     try:
-        health = rag_chain.health_check()
+        health = rag_chain.health_check(tenant)
         return HealthResponse(**health)
 
     except Exception as e:
@@ -103,17 +352,102 @@ async def health_check():
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 
+@app.get("/api/ready", response_model=ReadinessResponse, responses={503: {"model": ReadinessResponse}})
+async def readiness():
+    """
+    Readiness probe.
+    503 until warm-up (embedding call, Qdrant search, prompt compilation)
+    has succeeded, and again once the worker starts draining for shutdown.
+    """
+    state = service_state.stats()
+    if not state["ready"]:
+        return ORJSONResponse(status_code=503, content=state)
+    return state
+
+
+@app.get("/api/ingest/status", response_model=IngestionStatusResponse)
+async def ingestion_status():
+    """
+    Background ingestion status.
+    Reports last-run status, duration and chunk deltas for each loader.
+    With several workers, only the worker running the scheduler reports loaders.
+    """
+    if ingestion_scheduler is None:
+        return IngestionStatusResponse(enabled=config.INGEST_SCHEDULER_ENABLED)
+
+    return IngestionStatusResponse(enabled=True, **ingestion_scheduler.status())
+
+
+@app.post("/api/admin/ingest", response_model=IngestJobResponse, status_code=202, dependencies=[Depends(require_admin)])
+async def start_ingestion_job(request: IngestJobRequest):
+    """
+    Start an ingestion job in the background.
+
+    Args:
+        request: Loaders to sync and whether to rebuild the collection
+
+    Returns:
+        The queued job; poll GET /api/admin/ingest/{job_id} for progress
+    """
+    try:
+        job = await ingestion_jobs.submit(request.loaders, request.recreate_collection)
+    except JobConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"Started ingestion job {job.job_id}")
+    return IngestJobResponse(**job.to_dict())
+
+
+@app.get("/api/admin/ingest/{job_id}", response_model=IngestJobResponse, dependencies=[Depends(require_admin)])
+async def get_ingestion_job(job_id: str):
+    """
+    Ingestion job progress.
+    Returns per-stage progress, throughput and errors.
+    """
+    job = ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingestion job '{job_id}' not found")
+
+    return IngestJobResponse(**job.to_dict())
+
+
+@app.get("/api/metrics", response_model=MetricsResponse)
+async def metrics():
+    """
+    Admission control and LLM resilience metrics.
+    Reports active requests, queue depth, rejections, rate limiting counters,
+    circuit breaker state, LLM latency percentiles and cache hit rates.
+    Counters are per worker process; cache entry counts are shared.
+    """
+    return MetricsResponse(
+        admission=chat_admission.stats(),
+        rate_limit=rate_limiter.stats(),
+        llm=rag_chain.resilience_stats(),
+        caches=rag_chain.cache_stats(),
+        worker_pid=os.getpid(),
+    )
+
+
 @app.post("/api/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request, tenant: str = Depends(request_tenant)):
     """
     Chat endpoint for RAG-powered responses.
 
+    Requests are rate limited per client (429) and admitted with bounded
+    concurrency; when the wait queue is full they are rejected with 503.
+
     Args:
         request: ChatRequest containing user's message
+        http_request: Incoming HTTP request (for the client address)
+        tenant: Tenant whose portfolio answers the question
 
     Returns:
-        ChatResponse with bot's answer and source documents
+        ChatResponse with bot's answer and source documents; the X-Served-By
+        header names what answered (structured, cache, faq, llm or degraded)
     """
+    started = time.time()
     try:
         logger.info(f"Received chat request: {request.message[:100]}...")
 
@@ -121,8 +455,15 @@ async def chat(request: ChatRequest):
         if not request.message or request.message.strip() == "":
             raise HTTPException(status_code=400, detail="Message cannot be empty")
 
+        check_rate_limit(http_request, request.session_id)
+
         # Query RAG chain
-        result = await rag_chain.query(request.message)
+        try:
+            async with chat_admission.admit():
+                result = await rag_chain.query(request.message, tenant)
+        except AdmissionRejected as e:
+            logger.warning(f"Chat request rejected: {e.detail} (queue depth {chat_admission.waiting})")
+            raise HTTPException(status_code=e.status_code, detail=e.detail, headers=e.headers)
 
         # Check if query was successful
         if not result.get("success", False):
@@ -132,19 +473,92 @@ async def chat(request: ChatRequest):
                 detail=f"Failed to generate response: {result.get('error', 'Unknown error')}"
             )
 
+        if result.get("degraded"):
+            logger.warning(f"Served degraded answer ({result.get('degraded_reason')})")
+        if result.get("structured"):
+            logger.info(f"Served structured answer ({result.get('intent')}, confidence {result.get('confidence')})")
         logger.info(f"Generated response with {len(result.get('sources', []))} sources")
+        capture_traffic("chat", tenant, [request.message], started, 200, [result])
+
+        # Fast path: the result is already typed, so skip ChatResponse validation
+        return ORJSONResponse({
+            "response": result["response"],
+            "sources": response_sources(result.get("sources", []), request.compact),
+            "success": True,
+            "degraded": result.get("degraded", False),
+            "structured": result.get("structured", False),
+        }, headers={"X-Served-By": served_by(result)})
+
+    except HTTPException as e:
+        capture_traffic("chat", tenant, [request.message], started, e.status_code)
+        raise
+
+    except Exception as e:
+        logger.error(f"Error processing chat request: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.post("/api/chat/batch", response_model=BatchChatResponse)
+async def chat_batch(request: BatchChatRequest, http_request: Request, tenant: str = Depends(request_tenant)):
+    """
+    Answer many questions in one call.
+
+    Questions are embedded and searched in one batch each; completions run
+    with bounded concurrency. Failures are reported per question. Each
+    question counts against the client's rate limit, and each completion is
+    admitted through the same concurrency limit as /api/chat.
 
-        return ChatResponse(
-            response=result["response"],
-            sources=result.get("sources", []),
-            success=True
+    Args:
+        request: BatchChatRequest containing the questions
+        http_request: Incoming HTTP request (for the client address)
+        tenant: Tenant whose portfolio answers the questions
+
+    Returns:
+        BatchChatResponse with one result per question, in order
+    """
+    started = time.time()
+    try:
+        logger.info(f"Received batch chat request with {len(request.messages)} questions")
+
+        if any(not message.strip() for message in request.messages):
+            raise HTTPException(status_code=400, detail="Messages cannot be empty")
+
+        check_rate_limit(http_request, request.session_id, cost=len(request.messages))
+
+        # Every LLM call of the batch goes through the shared admission controller
+        results = await rag_chain.query_batch(request.messages, admit=chat_admission.admit, tenant=tenant)
+
+        items = [
+            {
+                "index": index,
+                "message": message,
+                "response": result["response"],
+                "sources": response_sources(result.get("sources", []), request.compact),
+                "success": result.get("success", False),
+                "degraded": result.get("degraded", False),
+                "structured": result.get("structured", False),
+                "error": result.get("error"),
+            }
+            for index, (message, result) in enumerate(zip(request.messages, results))
+        ]
+        failed = sum(1 for item in items if not item["success"])
+        if failed:
+            logger.error(f"Batch chat: {failed} of {len(items)} questions failed")
+
+        capture_traffic("batch", tenant, request.messages, started, 200, results)
+
+        # Fast path: serialize the typed results directly (BatchChatResponse documents the shape)
+        return ORJSONResponse(
+            {"results": items, "success": failed == 0},
+            headers={"X-Served-By": ",".join(served_by(result) for result in results)},
         )
 
-    except HTTPException:
+    except HTTPException as e:
+        capture_traffic("batch", tenant, request.messages, started, e.status_code)
         raise
 
     except Exception as e:
-        logger.error(f"Error processing chat request: {str(e)}")
+        logger.error(f"Error processing batch chat request: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
@@ -153,25 +567,33 @@ async def chat(request: ChatRequest):
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions"""
     logger.error(f"HTTP {exc.status_code}: {exc.detail}")
-    return {
-        "success": False,
-        "error": exc.detail,
-        "status_code": exc.status_code
-    }
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "success": False,
+            "error": exc.detail,
+            "status_code": exc.status_code
+        },
+        headers=exc.headers,
+    )
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     """Handle general exceptions"""
     logger.error(f"Unhandled exception: {str(exc)}")
-    return {
-        "success": False,
-        "error": "An unexpected error occurred. Please try again later.",
-        "status_code": 500
-    }
+    return JSONResponse(
+        status_code=500,
+        content={
+            "success": False,
+            "error": "An unexpected error occurred. Please try again later.",
+            "status_code": 500
+        },
+    )
 
 
 if __name__ == "__main__":
+    # Development server; use `python serve.py` for the multi-worker production mode
     import uvicorn
     uvicorn.run(
         "main:app",
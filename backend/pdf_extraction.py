@@ -0,0 +1,285 @@
+"""
+PDF extraction module for the ingestion pipeline.
+Parses PDFs page-by-page across a process pool, recovers section structure
+from font sizes, and caches the extracted text on disk keyed by file hash.
+
+Headings are detected from the rendered font size of each text run relative
+to the document's body size, so multi-column layouts (text streams are
+emitted column by column) keep their section boundaries.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from pypdf import PdfReader
+
+
+# Bump when the extraction output format changes to invalidate cached results
+EXTRACTION_VERSION = 2
+
+# Font size ratios (relative to body text) for section headings and subheadings
+HEADING_RATIO = 1.2
+SUBHEADING_RATIO = 1.1
+
+_BULLET_PATTERN = re.compile(r"^\s*(?:[-*•●▪‣◦–]|o\s|\d+[.)])\s*")
+
+# Page footers such as "Page 2 of 4" (often emitted as separate runs)
+_PAGE_FOOTER_PATTERN = re.compile(r"^page\s+\d+(?:\s+(?:of|/)\s+\d+)?$", re.IGNORECASE)
+_MAX_FOOTER_RUNS = 4
+
+# A text run: (font_size, text, continues_previous_line)
+Run = Tuple[float, str, bool]
+
+
+def file_sha256(path: str) -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        path: File path
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def page_count(path: str) -> int:
+    """Return the number of pages in a PDF"""
+    return len(PdfReader(path).pages)
+
+
+def extract_page_runs(path: str, page_index: int) -> List[Run]:
+    """
+    Extract the text runs of one page with their rendered font sizes.
+    Top-level so it can run in a worker process.
+
+    Args:
+        path: PDF path
+        page_index: Zero-based page number
+
+    Returns:
+        List of text runs in content-stream order
+    """
+    page = PdfReader(path).pages[page_index]
+    runs: List[Run] = []
+
+    def visitor(text, cm, tm, font_dict, font_size):
+        if not text or not text.strip():
+            return
+        scale = abs(tm[0]) if tm and tm[0] else 1.0
+        # Runs positioned at the origin of the current line continue it
+        continues = bool(tm) and tm[4] == 0 and tm[5] == 0 and bool(runs)
+        runs.append((round(font_size * scale, 1), text.replace("\xa0", " ").strip(), continues))
+
+    page.extract_text(visitor_text=visitor)
+    return runs
+
+
+def strip_page_footers(runs: List[Run]) -> List[Run]:
+    """
+    Remove "Page N of M" footer runs from a page.
+
+    Args:
+        runs: Text runs of one page
+
+    Returns:
+        The runs without page footers
+    """
+    result: List[Run] = []
+    after_footer = False
+    i = 0
+    while i < len(runs):
+        for length in range(min(_MAX_FOOTER_RUNS, len(runs) - i), 0, -1):
+            if _PAGE_FOOTER_PATTERN.match(" ".join(run[1] for run in runs[i:i + length])):
+                i += length
+                after_footer = True
+                break
+        else:
+            size, text, continues = runs[i]
+            # Whatever followed a footer starts a new line
+            result.append((size, text, continues and not after_footer))
+            after_footer = False
+            i += 1
+    return result
+
+
+def _body_font_size(pages: List[List[Run]]) -> float:
+    """Most common font size weighted by text length"""
+    sizes: Counter = Counter()
+    for runs in pages:
+        for size, text, _ in runs:
+            sizes[size] += len(text)
+    return sizes.most_common(1)[0][0] if sizes else 0.0
+
+
+def build_blocks(pages: List[List[Run]]) -> List[Dict[str, Any]]:
+    """
+    Group text runs into section blocks using font-size headings.
+
+    Args:
+        pages: Text runs for each page
+
+    Returns:
+        List of blocks with heading, subheading, page, text and bullet list
+    """
+    pages = [strip_page_footers(runs) for runs in pages]
+    body_size = _body_font_size(pages)
+    blocks: List[Dict[str, Any]] = []
+    heading = ""
+    subheading = ""
+    current: Optional[Dict[str, Any]] = None
+    standalone: Optional[Dict[str, Any]] = None
+
+    def start_block(page_number: int) -> Dict[str, Any]:
+        block = {"heading": heading, "subheading": subheading, "page": page_number, "lines": []}
+        blocks.append(block)
+        return block
+
+    for page_number, runs in enumerate(pages, 1):
+        current = None
+        for size, text, continues in runs:
+            is_heading = bool(body_size) and size >= body_size * HEADING_RATIO
+            is_subheading = bool(body_size) and size >= body_size * SUBHEADING_RATIO
+
+            if is_subheading and current is None and subheading:
+                # A subheading followed directly by another heading is really
+                # a standalone line (e.g. a tagline under a name); keep it
+                if standalone is None or standalone["heading"] != heading:
+                    standalone = start_block(page_number)
+                    standalone["subheading"] = ""
+                standalone["lines"].append(subheading)
+            elif not is_subheading:
+                standalone = None
+
+            if is_heading:
+                heading, subheading = text, ""
+                current = None
+                continue
+            if is_subheading:
+                subheading = text
+                current = None
+                continue
+
+            if current is None:
+                current = start_block(page_number)
+            if continues and current["lines"]:
+                current["lines"][-1] += " " + text
+            else:
+                current["lines"].append(text)
+
+    result = []
+    for block in blocks:
+        lines = block.pop("lines")
+        if not lines:
+            continue
+        block["text"] = "\n".join(lines)
+        block["bullets"] = [_BULLET_PATTERN.sub("", line) for line in lines if _BULLET_PATTERN.match(line)]
+        result.append(block)
+    return result
+
+
+class PDFTextCache:
+    """On-disk cache of extracted PDF blocks keyed by file hash"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _path(self, file_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{file_hash}.json")
+
+    def get(self, file_hash: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached blocks for a file hash, or None"""
+        try:
+            with open(self._path(file_hash), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("version") != EXTRACTION_VERSION:
+            return None
+        return entry.get("blocks")
+
+    def put(self, file_hash: str, source_path: str, blocks: List[Dict[str, Any]]):
+        """Store blocks atomically (write to a temp file, then rename)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {"version": EXTRACTION_VERSION, "path": source_path, "blocks": blocks}
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(file_hash))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def extract_pdfs(paths: List[str], cache: PDFTextCache, max_workers: int = 0) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract section blocks from several PDFs, reusing cached results for
+    unchanged files and parsing all remaining pages across one process pool.
+
+    Args:
+        paths: PDF paths
+        cache: Extraction cache
+        max_workers: Worker processes (0 = one per CPU)
+
+    Returns:
+        Dict mapping each path to {"hash", "blocks", "cached"}
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, Tuple[str, int]] = {}
+
+    for path in paths:
+        file_hash = file_sha256(path)
+        blocks = cache.get(file_hash)
+        if blocks is not None:
+            results[path] = {"hash": file_hash, "blocks": blocks, "cached": True}
+        else:
+            pending[path] = (file_hash, page_count(path))
+
+    tasks = [(path, index) for path, (_, pages) in pending.items() for index in range(pages)]
+    page_runs = _run_page_tasks(tasks, max_workers)
+
+    for path, (file_hash, pages) in pending.items():
+        blocks = build_blocks([page_runs[(path, index)] for index in range(pages)])
+        cache.put(file_hash, path, blocks)
+        results[path] = {"hash": file_hash, "blocks": blocks, "cached": False}
+
+    return results
+
+
+def _run_page_tasks(tasks: List[Tuple[str, int]], max_workers: int) -> Dict[Tuple[str, int], List[Run]]:
+    """
+    Run page extraction tasks in a process pool, or inline for a single page.
+
+    Workers are spawned rather than forked: ingestion also runs from
+    scheduler threads inside the API server, and forking a multi-threaded
+    process holding event loop, gRPC and HTTP pool state can deadlock.
+    """
+    if not tasks:
+        return {}
+
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                runs = pool.map(extract_page_runs, *zip(*tasks))
+                return dict(zip(tasks, runs))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Warning: process pool unavailable ({str(e)}), extracting serially")
+
+    return {task: extract_page_runs(*task) for task in tasks}
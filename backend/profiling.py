@@ -0,0 +1,356 @@
+"""
+Ingestion profiling for the RAG chatbot.
+Records wall time, CPU time, peak memory, network bytes and API calls per loader and per pipeline stage.
+
+Enabled by `python ingest.py --profile`. Sections are opened by the
+pipeline (`DataIngestion.profiler.section(...)`) and may nest: each loader
+runs inside the "load" stage, and embed/upsert accumulate over batches.
+
+- CPU time includes finished child processes (the PDF extraction pool)
+- Peak memory is Python allocations (tracemalloc) above the section's start
+- Network bytes and calls are counted per host on the shared HTTP clients
+  (OpenAI, GitHub, dev.to) and on Qdrant's REST client; Qdrant over gRPC
+  and in-process Qdrant are not counted
+
+With `--cprofile`, every stage is also profiled with cProfile (main thread)
+and the hottest stage's stats are written for flamegraph tools such as
+`flameprof` or `snakeviz`. cProfile inflates the timings it is enabled for.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from clients import clients
+
+# Section kinds in report order
+SECTION_KINDS = ("stage", "loader")
+
+# Functions listed in the text report of the hottest stage
+CPROFILE_TOP_FUNCTIONS = 25
+
+
+class NetworkMeter:
+    """
+    Counts HTTP requests and bytes per host.
+
+    Attaches response hooks to httpx clients and requests sessions; byte
+    counts are request bodies plus response bodies (as received, before
+    decompression when the server reports Content-Length).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.bytes_sent: Dict[str, int] = defaultdict(int)
+        self.bytes_received: Dict[str, int] = defaultdict(int)
+        self._detach: List[Any] = []
+
+    def record(self, url: str, sent: int, received: int):
+        """Count one request to the host of `url`"""
+        host = urlparse(str(url)).hostname or "unknown"
+        with self._lock:
+            self.calls[host] += 1
+            self.bytes_sent[host] += sent
+            self.bytes_received[host] += received
+
+    def totals(self) -> Tuple[int, int, int]:
+        """(calls, bytes sent, bytes received) over all hosts"""
+        with self._lock:
+            return sum(self.calls.values()), sum(self.bytes_sent.values()), sum(self.bytes_received.values())
+
+    def by_host(self) -> Dict[str, Dict[str, int]]:
+        """Counters per host"""
+        with self._lock:
+            return {
+                host: {"calls": calls, "bytes_sent": self.bytes_sent[host], "bytes_received": self.bytes_received[host]}
+                for host, calls in sorted(self.calls.items())
+            }
+
+    def _httpx_hook(self, response):
+        response.read()
+        received = int(response.headers.get("content-length") or len(response.content))
+        self.record(response.request.url, len(response.request.content or b""), received)
+
+    def _requests_hook(self, response, *args, **kwargs):
+        received = int(response.headers.get("content-length") or len(response.content))
+        self.record(response.url, len(response.request.body or b""), received)
+
+    def attach_httpx(self, client):
+        """Count requests made through a synchronous httpx client"""
+        hooks = client.event_hooks["response"]
+        hooks.append(self._httpx_hook)
+        self._detach.append(lambda: hooks.remove(self._httpx_hook))
+
+    def attach_requests(self, session):
+        """Count requests made through a requests session"""
+        session.hooks["response"].append(self._requests_hook)
+        self._detach.append(lambda: session.hooks["response"].remove(self._requests_hook))
+
+    def attach_qdrant(self, qdrant_client) -> bool:
+        """
+        Count requests of a Qdrant client's REST transport.
+
+        Returns:
+            False when the client has no REST transport to hook (in-process
+            storage) or sends points over gRPC
+        """
+        remote = getattr(qdrant_client, "_client", None)
+        api_client = getattr(getattr(remote, "openapi_client", None), "client", None)
+        transport = getattr(api_client, "_client", None)
+        if transport is None or getattr(remote, "_prefer_grpc", False):
+            return False
+        self.attach_httpx(transport)
+        return True
+
+    def detach(self):
+        """Remove every hook added by this meter"""
+        while self._detach:
+            self._detach.pop()()
+
+
+class _Section:
+    """Accumulated measurements of one loader or stage"""
+
+    __slots__ = ("runs", "items", "wall_seconds", "cpu_seconds", "peak_bytes", "api_calls", "bytes_sent", "bytes_received")
+
+    def __init__(self):
+        self.runs = 0
+        self.items = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes = 0
+        self.api_calls = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "items": self.items,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "peak_memory_bytes": self.peak_bytes,
+            "api_calls": self.api_calls,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process and its finished children"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class IngestionProfiler:
+    """
+    Per-loader and per-stage resource accounting for an ingestion run.
+
+    Usage:
+        profiler = IngestionProfiler(cprofile=True)
+        with profiler.running(pipeline.qdrant_client):
+            pipeline.profiler = profiler
+            pipeline.ingest()
+        profiler.write_reports(".cache/profiles")
+    """
+
+    enabled = True
+
+    def __init__(self, cprofile: bool = False, meter: Optional[NetworkMeter] = None):
+        """
+        Args:
+            cprofile: Also run cProfile in every stage (main thread only)
+            meter: Network meter (default: a new one, attached by `running`)
+        """
+        self.cprofile = cprofile
+        self.meter = meter or NetworkMeter()
+        self.sections: Dict[str, Dict[str, _Section]] = {kind: {} for kind in SECTION_KINDS}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.network_hooked: List[str] = []
+        self.started_at: Optional[str] = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        # Peak seen by each open section (innermost last)
+        self._open_peaks: List[int] = []
+        self._started_tracing = False
+
+    @contextmanager
+    def running(self, qdrant_client=None) -> Iterator["IngestionProfiler"]:
+        """
+        Profile everything inside the block.
+
+        Starts tracemalloc and attaches the network meter to the shared
+        clients (and `qdrant_client` when given).
+        """
+        self.started_at = datetime.now().isoformat()
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        self.meter.attach_httpx(clients.http_client())
+        self.meter.attach_requests(clients.requests_session())
+        self.network_hooked = ["httpx (OpenAI)", "requests (GitHub, dev.to)"]
+        if qdrant_client is not None and self.meter.attach_qdrant(qdrant_client):
+            self.network_hooked.append("qdrant (REST)")
+
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        try:
+            yield self
+        finally:
+            self.wall_seconds = time.perf_counter() - wall
+            self.cpu_seconds = _cpu_seconds() - cpu
+            self.meter.detach()
+            if self._started_tracing:
+                tracemalloc.stop()
+
+    def _propagate_peak(self):
+        """Fold the traced peak since the last reset into every open section"""
+        if not tracemalloc.is_tracing():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        self._open_peaks = [max(seen, peak) for seen in self._open_peaks]
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def section(self, kind: str, name: str, items: int = 0) -> Iterator[None]:
+        """
+        Measure one run of a loader or stage.
+
+        Args:
+            kind: "stage" or "loader"
+            name: Stage or loader name; repeated runs accumulate
+            items: Documents or chunks processed in this run
+        """
+        record = self.sections[kind].setdefault(name, _Section())
+        profile = None
+        if self.cprofile and kind == "stage":
+            profile = self.profiles.setdefault(name, cProfile.Profile())
+
+        self._propagate_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        self._open_peaks.append(start_bytes)
+        calls, sent, received = self.meter.totals()
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            record.runs += 1
+            record.items += items
+            record.wall_seconds += time.perf_counter() - wall
+            record.cpu_seconds += _cpu_seconds() - cpu
+            end_calls, end_sent, end_received = self.meter.totals()
+            record.api_calls += end_calls - calls
+            record.bytes_sent += end_sent - sent
+            record.bytes_received += end_received - received
+            self._propagate_peak()
+            record.peak_bytes = max(record.peak_bytes, self._open_peaks.pop() - start_bytes)
+
+    def count(self, kind: str, name: str, items: int):
+        """Add items to a section measured before its size was known (e.g. a loader's documents)"""
+        self.sections[kind].setdefault(name, _Section()).items += items
+
+    def hottest_stage(self) -> Optional[str]:
+        """Stage with the most wall time"""
+        stages = self.sections["stage"]
+        return max(stages, key=lambda name: stages[name].wall_seconds) if stages else None
+
+    def report(self) -> Dict[str, Any]:
+        """Profile as a JSON-serializable dict"""
+        return {
+            "started_at": self.started_at,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "hottest_stage": self.hottest_stage(),
+            "network_hooked": self.network_hooked,
+            "stages": {name: record.to_dict() for name, record in self.sections["stage"].items()},
+            "loaders": {name: record.to_dict() for name, record in self.sections["loader"].items()},
+            "network_by_host": self.meter.by_host(),
+        }
+
+    def format_report(self) -> str:
+        """Human-readable profile table"""
+        report = self.report()
+        lines = [
+            "=" * 60,
+            "INGESTION PROFILE",
+            "=" * 60,
+            f"Total: {report['wall_seconds']:.2f}s wall, {report['cpu_seconds']:.2f}s CPU",
+        ]
+        header = f"{'':<22}{'runs':>5}{'items':>7}{'wall s':>9}{'cpu s':>8}{'peak MB':>9}{'calls':>7}{'KB out':>9}{'KB in':>9}"
+        for title, key in (("Stages", "stages"), ("Loaders", "loaders")):
+            lines += ["", f"{title}:", header]
+            for name, row in report[key].items():
+                lines.append(
+                    f"  {name:<20}{row['runs']:>5}{row['items']:>7}{row['wall_seconds']:>9.2f}{row['cpu_seconds']:>8.2f}"
+                    f"{row['peak_memory_bytes'] / 1e6:>9.1f}{row['api_calls']:>7}"
+                    f"{row['bytes_sent'] / 1e3:>9.1f}{row['bytes_received'] / 1e3:>9.1f}"
+                )
+        lines += ["", "Network by host:"]
+        if not report["network_by_host"]:
+            lines.append(f"  none counted (hooked: {', '.join(report['network_hooked']) or 'nothing'})")
+        for host, row in report["network_by_host"].items():
+            lines.append(f"  {host:<30}{row['calls']:>6} calls{row['bytes_sent'] / 1e3:>10.1f} KB out{row['bytes_received'] / 1e3:>10.1f} KB in")
+        if report["hottest_stage"]:
+            lines += ["", f"Hottest stage: {report['hottest_stage']}"]
+        return "\n".join(lines)
+
+    def write_reports(self, directory: str) -> Dict[str, str]:
+        """
+        Write the JSON and text reports (and the hottest stage's cProfile stats).
+
+        Args:
+            directory: Output directory (created if missing)
+
+        Returns:
+            Paths written, by kind ("json", "text", "cprofile", "cprofile_text")
+        """
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        paths = {
+            "json": os.path.join(directory, f"ingest-{stamp}.json"),
+            "text": os.path.join(directory, f"ingest-{stamp}.txt"),
+        }
+        with open(paths["json"], "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+        text = self.format_report()
+        hottest = self.hottest_stage()
+        profile = self.profiles.get(hottest) if hottest else None
+        if profile is not None:
+            paths["cprofile"] = os.path.join(directory, f"ingest-{stamp}-{hottest}.prof")
+            profile.dump_stats(paths["cprofile"])
+            summary = io.StringIO()
+            pstats.Stats(profile, stream=summary).sort_stats("cumulative").print_stats(CPROFILE_TOP_FUNCTIONS)
+            text += f"\n\ncProfile of '{hottest}' (top {CPROFILE_TOP_FUNCTIONS} by cumulative time):\n{summary.getvalue()}"
+
+        with open(paths["text"], "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        return paths
+
+
+class NullProfiler:
+    """Profiler used when profiling is off; every section is a no-op"""
+
+    enabled = False
+
+    def section(self, kind: str, name: str, items: int = 0):
+        return nullcontext()
+
+    def count(self, kind: str, name: str, items: int):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
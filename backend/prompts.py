@@ -0,0 +1,200 @@
+"""
+Prompt layout for the RAG chain.
+Keeps the static instructions in a byte-identical system message ahead of all variable content.
+
+Providers cache prompt prefixes (OpenAI: automatically, for prompts of 1024+
+tokens, in 128-token increments), so every token before the first difference
+between two requests can be served from cache. The prompt is therefore laid
+out from most to least stable: the static system instructions, then the
+retrieved context in a deterministic order (evergreen document types such as
+skills and experience first, so questions retrieving them share a longer
+prefix), and the question last. PromptUsageTracker logs prompt and cached
+tokens for every completion.
+
+The prompt names the portfolio owner (PORTFOLIO_OWNER, or the tenant's
+owner when serving several portfolios); each owner's system message is
+built once and reused, so it stays byte-identical across that owner's
+requests.
+"""
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.documents import Document
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import LLMResult
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Static instructions; must not contain per-request content (no dates, IDs or
+# template variables) or the cached prefix ends at the first byte that differs
+SYSTEM_PROMPT_TEMPLATE = """You are a professional recruitment assistant for {owner}'s portfolio website.
+
+Your role is to help recruiters and hiring managers learn about {first_name}'s qualifications:
+- Technical skills and expertise
+- Professional experience and projects
+- Education and certifications
+- Blog articles and thought leadership
+
+Guidelines:
+- Be professional, concise, and helpful
+- Use the context provided to answer accurately
+- If the answer isn't in the context, acknowledge that honestly
+- Highlight relevant skills and achievements
+- Provide specific examples when available
+- Keep responses focused and to-the-point
+- Don't make up information not present in the context
+
+The user message contains context from {first_name}'s portfolio followed by the question. Give a professional answer."""
+
+
+def first_name(owner: str) -> str:
+    """First word of the owner's name, used in possessives ("James's")"""
+    return owner.split()[0] if owner.split() else owner
+
+
+@lru_cache(maxsize=1024)
+def system_prompt(owner: str) -> str:
+    """Static system instructions for one portfolio owner (built once per owner)"""
+    return SYSTEM_PROMPT_TEMPLATE.format(owner=owner, first_name=first_name(owner))
+
+
+SYSTEM_PROMPT = system_prompt(config.PORTFOLIO_OWNER)
+
+# Most frequently retrieved (and least frequently changing) document types first
+CONTEXT_TYPE_ORDER = [
+    "skills",
+    "experience",
+    "education",
+    "certification",
+    "resume_pdf",
+    "publication",
+    "external_project",
+    "project",
+    "article",
+    "article_stats",
+]
+
+# Metadata fields that identify the parent document of a chunk, per loader
+DOCUMENT_KEY_FIELDS = ("file", "company", "institution", "name", "title", "repo_name")
+
+
+def context_sort_key(doc: Document) -> Tuple[int, str, str, int, str]:
+    """Deterministic position of a chunk in the context: type, source, parent document, chunk index, content"""
+    metadata = doc.metadata or {}
+    doc_type = metadata.get("type")
+    rank = CONTEXT_TYPE_ORDER.index(doc_type) if doc_type in CONTEXT_TYPE_ORDER else len(CONTEXT_TYPE_ORDER)
+    parent = next((str(metadata[field]) for field in DOCUMENT_KEY_FIELDS if metadata.get(field)), "")
+    return rank, str(metadata.get("source", "")), parent, int(metadata.get("chunk_index") or 0), doc.page_content
+
+
+def format_context(source_docs: List[Document]) -> str:
+    """
+    Join retrieved chunks in a deterministic order.
+
+    Retrieval returns chunks by score, so the same chunks arrive in a
+    different order for different questions; sorting them makes the prompts
+    of questions with overlapping context share a prefix.
+
+    Args:
+        source_docs: Retrieved documents (any order)
+
+    Returns:
+        Context text
+    """
+    return "\n\n".join(doc.page_content for doc in sorted(source_docs, key=context_sort_key))
+
+
+def build_messages(question: str, source_docs: List[Document], owner: Optional[str] = None) -> List[BaseMessage]:
+    """
+    Chat messages for one RAG completion.
+
+    Args:
+        question: User's question
+        source_docs: Retrieved context documents
+        owner: Portfolio owner (default: PORTFOLIO_OWNER)
+
+    Returns:
+        [static system message, user message with context then question]
+    """
+    owner = owner or config.PORTFOLIO_OWNER
+    return [
+        SystemMessage(content=system_prompt(owner)),
+        HumanMessage(content=f"Context from {first_name(owner)}'s portfolio:\n{format_context(source_docs)}\n\nQuestion: {question}"),
+    ]
+
+
+def prompt_usage(response: LLMResult) -> Optional[Dict[str, int]]:
+    """
+    Prompt, cached and completion tokens of a chat completion.
+
+    Reads the provider's raw usage (OpenAI `prompt_tokens_details.cached_tokens`)
+    and falls back to LangChain's usage metadata (`input_token_details.cache_read`).
+
+    Returns:
+        Dictionary with prompt_tokens, cached_tokens and completion_tokens, or
+        None when the response carries no usage
+    """
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return {
+            "prompt_tokens": usage.get("prompt_tokens") or 0,
+            "cached_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0,
+            "completion_tokens": usage.get("completion_tokens") or 0,
+        }
+
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                return {
+                    "prompt_tokens": metadata.get("input_tokens", 0),
+                    "cached_tokens": (metadata.get("input_token_details") or {}).get("cache_read") or 0,
+                    "completion_tokens": metadata.get("output_tokens", 0),
+                }
+    return None
+
+
+class PromptUsageTracker(BaseCallbackHandler):
+    """
+    LangChain callback logging prompt and cached tokens per completion.
+
+    Pass it in the `callbacks` of an LLM call; totals are reported with the
+    cache metrics.
+    """
+
+    # Update counters in the calling task instead of a thread pool
+    run_inline = True
+
+    def __init__(self):
+        self.completions = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        usage = prompt_usage(response)
+        if usage is None:
+            return
+
+        self.completions += 1
+        self.prompt_tokens += usage["prompt_tokens"]
+        self.cached_tokens += usage["cached_tokens"]
+        self.completion_tokens += usage["completion_tokens"]
+        logger.info(
+            f"LLM usage: {usage['prompt_tokens']} prompt tokens ({usage['cached_tokens']} cached), "
+            f"{usage['completion_tokens']} completion tokens"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Token totals and the share of prompt tokens served from the provider's prefix cache"""
+        return {
+            "completions": self.completions,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_ratio": round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else None,
+        }
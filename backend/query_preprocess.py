@@ -0,0 +1,209 @@
+"""
+Query preprocessing for the RAG chatbot.
+Rewrites sloppy questions into a canonical form before caching, embedding and retrieval.
+
+"Python exp?", "python experience" and "Python experience??" all become
+"python experience", so they share answer-cache, embedding-cache and FAQ
+hits. Steps, all local and cheap:
+1. Unicode/case/whitespace normalization, dropping punctuation and possessives
+2. Abbreviation expansion ("ml" -> "machine learning", "k8s" -> "kubernetes")
+3. Typo correction against a vocabulary of ingested skills, companies,
+   institutions, repository names, languages and tags
+"""
+import difflib
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from config import config
+
+ABBREVIATIONS: Dict[str, str] = {
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "llm": "large language model",
+    "llms": "large language models",
+    "rag": "retrieval augmented generation",
+    "rl": "reinforcement learning",
+    "k8s": "kubernetes",
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "db": "database",
+    "dbs": "databases",
+    "aws": "aws amazon web services",
+    "gcp": "gcp google cloud",
+    "ci/cd": "continuous integration deployment",
+    "cicd": "continuous integration deployment",
+    "exp": "experience",
+    "yrs": "years",
+    "yoe": "years of experience",
+    "edu": "education",
+    "certs": "certifications",
+    "proj": "project",
+    "projs": "projects",
+}
+
+# Recruiter vocabulary that is always known (never "corrected")
+BASE_VOCABULARY = {
+    "experience", "skills", "projects", "project", "education", "degree", "certifications", "certification",
+    "publications", "research", "blog", "articles", "article", "languages", "programming", "framework",
+    "frameworks", "cloud", "data", "science", "engineering", "machine", "learning", "python", "kubernetes",
+    "docker", "consulting", "consultant", "current", "role", "position", "company", "worked", "work",
+    "background", "technical", "years", "senior", "lead", "team", "leadership", "hire", "resume",
+    "portfolio", "github", "repositories", "analytics", "database", "databases", "models", "deployment",
+}
+
+# Common question words, never corrected toward vocabulary terms
+STOPWORDS = {
+    "what", "which", "where", "when", "does", "have", "has", "with", "about", "tell", "there", "their",
+    "they", "this", "that", "these", "those", "from", "into", "your", "would", "could", "should", "know",
+    "knows", "used", "using", "much", "many", "some", "any", "most", "best", "good", "more", "than",
+    "other", "also", "james", "brendamour", "please", "describe", "explain", "give", "list",
+}
+
+MAX_MEMOIZED_CORRECTIONS = 10000
+
+# Word characters plus the symbols of names like c++, c#, node.js and ci/cd
+TOKEN_PATTERN = re.compile(r"[\w][\w+#./-]*")
+
+
+def vocabulary_from_chunks(chunks: Iterable[Dict[str, Any]]) -> Set[str]:
+    """
+    Terms for typo correction from ingested chunk payloads.
+
+    Args:
+        chunks: langchain_qdrant payloads ({"page_content", "metadata"})
+
+    Returns:
+        Lowercase words of skills, companies, institutions, repository names,
+        languages and tags
+    """
+    terms: Set[str] = set()
+    for chunk in chunks:
+        metadata = chunk.get("metadata") or {}
+        values = [metadata.get(field) for field in ("company", "institution", "repo_name", "language", "tags", "position")]
+        if metadata.get("type") == "skills":
+            values.append((chunk.get("page_content") or "").split(":", 1)[-1])
+        for value in values:
+            for token in TOKEN_PATTERN.findall(str(value or "").lower().replace("_", " ")):
+                token = token.strip(".-/")
+                if len(token) >= 2:
+                    terms.add(token)
+    return terms
+
+
+def collection_chunks(qdrant_client, collection_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Payloads of every chunk in the collection (one scroll), with the point ID as metadata `_id`"""
+    collection_name = collection_name or config.COLLECTION_NAME
+    chunks: List[Dict[str, Any]] = []
+    offset = None
+    while True:
+        points, offset = qdrant_client.scroll(collection_name, limit=256, offset=offset, with_payload=True, with_vectors=False)
+        for point in points:
+            payload = point.payload or {}
+            chunks.append({**payload, "metadata": {**(payload.get("metadata") or {}), "_id": str(point.id)}})
+        if offset is None:
+            return chunks
+
+
+def collection_vocabulary(qdrant_client, collection_name: Optional[str] = None) -> Set[str]:
+    """Vocabulary of every chunk in the collection (one scroll)"""
+    return vocabulary_from_chunks(collection_chunks(qdrant_client, collection_name))
+
+
+class QueryPreprocessor:
+    """
+    Canonicalizes questions for retrieval and cache lookups.
+
+    The vocabulary is replaced wholesale by `set_vocabulary` (after
+    ingestion), so reads need no locking.
+    """
+
+    def __init__(self, vocabulary: Iterable[str] = (), typo_cutoff: Optional[float] = None):
+        """
+        Args:
+            vocabulary: Known terms (in addition to BASE_VOCABULARY)
+            typo_cutoff: Minimum difflib similarity for a correction (default: QUERY_TYPO_CUTOFF)
+        """
+        self.typo_cutoff = config.QUERY_TYPO_CUTOFF if typo_cutoff is None else typo_cutoff
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.rewritten = 0
+        self.corrections = 0
+        self.expansions = 0
+        self.set_vocabulary(vocabulary)
+
+    def set_vocabulary(self, vocabulary: Iterable[str]):
+        """Replace the ingested vocabulary"""
+        known = BASE_VOCABULARY | {term.lower() for term in vocabulary}
+        self._known = frozenset(known)
+        # Only plain words are correction targets
+        self._candidates = sorted(term for term in known if term.isalpha() and len(term) >= 4)
+        self._corrections: Dict[str, str] = {}
+
+    def _correct(self, token: str) -> str:
+        if token in self._known or token in STOPWORDS or len(token) < 5 or not token.isalpha():
+            return token
+        if token not in self._corrections:
+            # Bounded memo: arbitrary user tokens must not grow it forever
+            if len(self._corrections) >= MAX_MEMOIZED_CORRECTIONS:
+                self._corrections = {}
+            match = difflib.get_close_matches(token, self._candidates, n=1, cutoff=self.typo_cutoff)
+            self._corrections[token] = match[0] if match else token
+        return self._corrections[token]
+
+    def normalize(self, question: str) -> str:
+        """
+        Canonical form of a question.
+
+        Args:
+            question: Raw user question
+
+        Returns:
+            Lowercase question with punctuation removed, abbreviations
+            expanded and typos corrected
+        """
+        text = unicodedata.normalize("NFKC", question).lower()
+        text = re.sub(r"['’]s\b", "", text)
+
+        words: List[str] = []
+        corrections = expansions = 0
+        for token in TOKEN_PATTERN.findall(text):
+            token = token.strip(".-/")
+            if not token:
+                continue
+            if token in ABBREVIATIONS:
+                words.extend(ABBREVIATIONS[token].split())
+                expansions += 1
+                continue
+            corrected = self._correct(token)
+            corrections += corrected != token
+            words.append(corrected)
+
+        normalized = " ".join(words) or " ".join(question.split())
+        with self._lock:
+            self.queries += 1
+            self.rewritten += normalized != " ".join(question.lower().split())
+            self.corrections += corrections
+            self.expansions += expansions
+        return normalized
+
+    def stats(self) -> Dict[str, Any]:
+        """Rewrite counters and vocabulary size"""
+        return {
+            "queries": self.queries,
+            "rewritten": self.rewritten,
+            "corrections": self.corrections,
+            "expansions": self.expansions,
+            "vocabulary": len(self._known),
+        }
+
+
+def refresh_query_vocabulary(tenant: Optional[str] = None):
+    """Reload a tenant's typo-correction vocabulary and structured records in the shared RAG chain (post-ingest hook)"""
+    from rag_chain import rag_chain
+    print(f"✓ Query vocabulary: {rag_chain.refresh_vocabulary(tenant)} terms")
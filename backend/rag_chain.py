@@ -1,14 +1,32 @@
 """
 RAG Chain module for the chatbot backend.
 Configures LangChain with Qdrant vector store and OpenAI for retrieval-augmented generation.
+
+One chain serves every tenant (see tenants.py): clients, embeddings, the
+LLM and its resilience state are shared, while each tenant's retriever,
+FAQ index, query vocabulary, structured records and answer cache are
+loaded on first use.
 """
-from typing import Dict, Any, List
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_qdrant import QdrantVectorStore
-from langchain.chains import RetrievalQA
-from langchain.prompts import PromptTemplate
-from qdrant_client import QdrantClient
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+from qdrant_client.models import SearchRequest
+from clients import clients
 from config import config
+from prompts import PromptUsageTracker, build_messages
+from resilience import CircuitBreaker, LatencyTracker, extractive_answer, hedged
+from sources import Source, source_from_dict, source_from_document
+from shared_cache import CachedEmbeddings, answer_key, embedding_cache
+from tenants import TenantChain, TenantStates, tenant_registry
+from vector_index import check_collection_dimensions, embedding_dimensions, embedding_model_id, index_settings
+
+logger = logging.getLogger(__name__)
+
+# Bounds for the adaptive hedge delay (seconds)
+MIN_HEDGE_DELAY = 0.5
 
 
 class RAGChain:
@@ -22,125 +40,426 @@ class RAGChain:
         # Validate configuration
         config.validate()
 
-        # Initialize Qdrant client
-        self.qdrant_client = QdrantClient(
-            url=config.QDRANT_URL,
-            api_key=config.QDRANT_API_KEY,
-        )
+        # Hosted portfolios; per-tenant retrieval state is loaded on first use (LRU)
+        self.tenants = tenant_registry
+        self.tenant_chains: TenantStates[TenantChain] = TenantStates(self._build_tenant_chain, config.TENANT_CACHE_SIZE)
 
-        # Initialize OpenAI embeddings
-        self.embeddings = OpenAIEmbeddings(
-            model=config.EMBEDDING_MODEL,
-            openai_api_key=config.OPENAI_API_KEY,
-        )
+        # Shared clients
+        self.bind_clients()
 
-        # Initialize vector store
-        self.vector_store = QdrantVectorStore(
-            client=self.qdrant_client,
-            collection_name=config.COLLECTION_NAME,
-            embedding=self.embeddings,
-        )
+        # Prompt and cached token counters (provider prefix caching)
+        self.prompt_usage = PromptUsageTracker()
 
-        # Initialize retriever
-        self.retriever = self.vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={
-                "k": config.RETRIEVER_K,
-                "score_threshold": config.SCORE_THRESHOLD,
-            },
-        )
+        # Generation deadline, hedging and circuit breaker state
+        self.llm_breaker = CircuitBreaker(config.LLM_BREAKER_FAILURES, config.LLM_BREAKER_RESET_SECONDS)
+        self.llm_latency = LatencyTracker()
+
+    def bind_clients(self):
+        """
+        (Re)bind the shared clients and everything built on them.
+
+        Called on init and in every pre-forked server worker, so workers
+        never reuse connections created in the parent process.
+        """
+        # Shared Qdrant clients (sync for LangChain, async for batch search)
+        self.qdrant_client = clients.qdrant()
+        self.async_qdrant_client = clients.async_qdrant()
 
-        # Initialize LLM
-        self.llm = ChatOpenAI(
-            model=config.LLM_MODEL,
-            temperature=config.LLM_TEMPERATURE,
-            openai_api_key=config.OPENAI_API_KEY,
+        # Shared OpenAI embeddings; query vectors are cached in-process (LRU) and across workers
+        self.embeddings = CachedEmbeddings(
+            clients.embeddings(), embedding_cache, embedding_model_id(), memory_entries=config.QUERY_EMBEDDING_LRU_SIZE,
         )
 
-        # Create prompt template
-        self.prompt_template = self._create_prompt_template()
+        # Shared LLM
+        self.llm = clients.llm()
+
+        # Tenant retrievers hold the previous clients
+        self.tenant_chains.clear()
 
-        # Build RAG chain
-        self.qa_chain = RetrievalQA.from_chain_type(
-            llm=self.llm,
-            chain_type="stuff",
-            retriever=self.retriever,
-            return_source_documents=True,
-            chain_type_kwargs={"prompt": self.prompt_template},
+    def _build_tenant_chain(self, tenant) -> TenantChain:
+        """Retrieval state of one tenant on the shared clients (collection scrolled when QUERY_PREPROCESSING or STRUCTURED_ANSWERS)"""
+        return TenantChain(
+            tenant, self.qdrant_client, self.async_qdrant_client, self.embeddings,
+            load_vocabulary=config.QUERY_PREPROCESSING or config.STRUCTURED_ANSWERS,
         )
 
-    def _create_prompt_template(self) -> PromptTemplate:
+    def tenant_chain(self, tenant: Optional[str] = None) -> TenantChain:
+        """
+        Retrieval state of a tenant, loading it on first use (blocking).
+
+        Args:
+            tenant: Tenant ID (default: DEFAULT_TENANT)
+
+        Raises:
+            UnknownTenantError: If the tenant is not configured
+        """
+        return self.tenant_chains.get(self.tenants.get(tenant))
+
+    async def atenant_chain(self, tenant: Optional[str] = None) -> TenantChain:
+        """Like `tenant_chain`, loading a cold tenant off the event loop"""
+        resolved = self.tenants.get(tenant)
+        chain = self.tenant_chains.peek(resolved.id)
+        return chain if chain is not None else await asyncio.to_thread(self.tenant_chains.load, resolved)
+
+    def refresh_vocabulary(self, tenant: Optional[str] = None) -> int:
+        """
+        Rebuild a tenant's typo-correction vocabulary and structured records from its collection.
+
+        Returns:
+            Number of ingested terms
+        """
+        return self.tenant_chain(tenant).refresh_vocabulary()
+
+    async def query(self, question: str, tenant: Optional[str] = None) -> Dict[str, Any]:
         """
-        Create the prompt template for the RAG chain.
+        Query the RAG chain with a question.
+
+        The question is normalized first (case, punctuation, abbreviations,
+        typos), so differently worded repeats share cache entries and
+        retrieval; the LLM still sees the original wording. Structured
+        questions ("Where did he study?", "List his skills") are answered
+        from templates over typed records when the intent is confident.
+        Other answers are served from the cross-worker answer cache or the
+        precomputed FAQ answers when the question matches one. Generation runs under a
+        deadline with hedged retries; when the LLM misses the deadline,
+        fails, or its circuit breaker is open, a degraded extractive answer
+        is built from the retrieved documents instead.
+
+        Args:
+            question: User's question
+            tenant: Tenant ID (default: DEFAULT_TENANT)
 
         Returns:
-            PromptTemplate: Configured prompt template for recruitment assistant
+            Dictionary with response, source documents and degraded and
+            structured flags; cache and FAQ answers are marked by `served_by`
+
+        Raises:
+            UnknownTenantError: If the tenant is not configured
         """
-        template = """You are a professional recruitment assistant for James Brendamour's portfolio website.
+        chain = await self.atenant_chain(tenant)
+        search_text = chain.search_text(question)
 
-Your role is to help recruiters and hiring managers learn about James's qualifications:
-- Technical skills and expertise
-- Professional experience and projects
-- Education and certifications
-- Blog articles and thought leadership
+        stored = await self._stored_answer(chain, search_text)
+        if stored is not None:
+            return stored
 
-Guidelines:
-- Be professional, concise, and helpful
-- Use the context provided to answer accurately
-- If the answer isn't in the context, acknowledge that honestly
-- Highlight relevant skills and achievements
-- Provide specific examples when available
-- Keep responses focused and to-the-point
-- Don't make up information not present in the context
+        if config.FAQ_ENABLED:
+            faq_result = await chain.faq.amatch(search_text)
+            if faq_result is not None:
+                return self._served_by(faq_result, "faq")
 
-Context from James's portfolio:
-{context}
+        try:
+            source_docs = await chain.retriever.ainvoke(search_text)
+        except Exception as e:
+            return self._error_result(e)
 
-Question: {question}
+        result = await self._answer(question, source_docs, chain.tenant.owner)
+        await self._cache_answers(chain, {search_text: result})
+        return result
 
-Professional Answer:"""
+    async def _stored_answer(self, chain: TenantChain, search_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer without embedding, retrieval or the LLM when possible.
 
-        return PromptTemplate(
-            template=template,
-            input_variables=["context", "question"]
-        )
+        Tries a structured answer from typed records, then the cross-worker
+        answer cache. FAQ answers need the question's embedding and are
+        matched by the caller.
 
-    async def query(self, question: str) -> Dict[str, Any]:
+        Returns:
+            The result, or None
         """
-        Query the RAG chain with a question.
+        if config.STRUCTURED_ANSWERS:
+            structured = chain.structured.answer(search_text)
+            if structured is not None:
+                return structured
+
+        if config.ANSWER_CACHE_TTL_SECONDS > 0:
+            cached = await chain.answer_cache.aget(answer_key(search_text))
+            if cached is not None:
+                cached["sources"] = [source_from_dict(source) for source in cached["sources"]]
+                return self._served_by(cached, "cache")
+        return None
+
+    @staticmethod
+    def _served_by(result: Dict[str, Any], served_by: str) -> Dict[str, Any]:
+        result["served_by"] = served_by
+        return result
+
+    @staticmethod
+    async def _cache_answers(chain: TenantChain, results: Dict[str, Dict[str, Any]]):
+        """Store generated answers by search text (degraded answers are temporary; the next request retries the LLM)"""
+        if config.ANSWER_CACHE_TTL_SECONDS > 0:
+            await chain.answer_cache.aset_many({
+                answer_key(search_text): result
+                for search_text, result in results.items()
+                if result.get("success") and not result.get("degraded")
+            })
+
+    async def query_batch(
+        self,
+        questions: List[str],
+        admit: Optional[Callable[[], AsyncContextManager[Any]]] = None,
+        tenant: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Answer many questions in one call.
+
+        Every question takes the same shortcuts as `query`: structured
+        answers and the answer cache first. The remaining questions are
+        embedded with a single provider call, matched against the FAQ
+        answers and searched with one Qdrant batch request each; LLM
+        completions then run with bounded concurrency
+        (BATCH_LLM_CONCURRENCY).
 
         Args:
-            question: User's question
+            questions: User questions
+            admit: Optional admission context (e.g. AdmissionController.admit)
+                entered around every LLM call, so batch completions share the
+                server-wide concurrency limit
+            tenant: Tenant ID (default: DEFAULT_TENANT)
 
         Returns:
-            Dictionary with response and source documents
+            One result per question, in input order, each with its own
+            success flag and error
+
+        Raises:
+            UnknownTenantError: If the tenant is not configured
         """
+        chain = await self.atenant_chain(tenant)
+        search_texts = [chain.search_text(question) for question in questions]
+        results = list(await asyncio.gather(*(self._stored_answer(chain, text) for text in search_texts)))
+        # Only questions without a stored answer are embedded
+        pending = [index for index, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        policy = chain.retriever.policy
         try:
-            # Run the QA chain
-            result = await self.qa_chain.ainvoke({"query": question})
-
-            # Extract response and sources
-            response_text = result.get("result", "")
-            source_docs = result.get("source_documents", [])
+            vectors = await self.embeddings.aembed_documents([search_texts[index] for index in pending])
+            if config.FAQ_ENABLED:
+                faq_results = await chain.faq.amatch_vectors(vectors)
+                for index, faq_result in zip(pending, faq_results):
+                    if faq_result is not None:
+                        results[index] = self._served_by(faq_result, "faq")
+                vectors = [vector for vector, faq_result in zip(vectors, faq_results) if faq_result is None]
+                pending = [index for index in pending if results[index] is None]
+                if not pending:
+                    return results
+
+            batch_hits = await self.async_qdrant_client.search_batch(
+                collection_name=chain.tenant.collection,
+                requests=[
+                    SearchRequest(
+                        vector=vector, limit=policy.max_k, with_payload=True, params=index_settings.search_params(),
+                    )
+                    for vector in vectors
+                ],
+            )
 
-            # Format sources for response
-            sources = self._format_sources(source_docs)
+        except Exception as e:
+            return [result or self._error_result(e) for result in results]
+
+        semaphore = asyncio.Semaphore(config.BATCH_LLM_CONCURRENCY)
+
+        async def answer(question: str, hits: List[Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    # Same threshold and dynamic k as single questions
+                    hits = policy.apply([(hit, hit.score) for hit in hits], chain.retrieval_stats)
+                    source_docs = [self._point_to_document(hit) for hit in hits]
+                    async with admit() if admit else nullcontext():
+                        return await self._answer(question, source_docs, chain.tenant.owner)
+
+                except Exception as e:
+                    return self._error_result(e)
+
+        generated = await asyncio.gather(*(answer(questions[index], hits) for index, hits in zip(pending, batch_hits)))
+        for index, result in zip(pending, generated):
+            results[index] = result
+        await self._cache_answers(chain, {search_texts[index]: results[index] for index in pending})
+        return results
+
+    async def _answer(self, question: str, source_docs: List[Document], owner: Optional[str] = None) -> Dict[str, Any]:
+        """Generate (or degrade to an extractive answer) and format the result"""
+        response_text, degraded_reason = await self._generate_resilient(question, source_docs, owner)
+        result = {
+            "response": response_text,
+            "sources": self._format_sources(source_docs),
+            "success": True,
+            "degraded": degraded_reason is not None,
+        }
+        if degraded_reason:
+            result["degraded_reason"] = degraded_reason
+        return result
+
+    async def _generate_resilient(
+        self, question: str, source_docs: List[Document], owner: Optional[str] = None,
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Generate an answer within LLM_DEADLINE_SECONDS.
 
-            return {
-                "response": response_text,
-                "sources": sources,
-                "success": True,
-            }
+        Returns:
+            (answer text, degraded reason or None)
+        """
+        if not self.llm_breaker.allow():
+            return extractive_answer(question, source_docs, owner), "circuit_open"
 
+        try:
+            response_text = await hedged(
+                lambda: self._timed_generate(question, source_docs, owner),
+                deadline=config.LLM_DEADLINE_SECONDS,
+                hedge_after=self._hedge_delay(),
+                max_attempts=config.LLM_HEDGE_MAX_ATTEMPTS,
+            )
+        except asyncio.TimeoutError:
+            self.llm_breaker.record_failure()
+            logger.warning(f"LLM missed the {config.LLM_DEADLINE_SECONDS}s deadline; serving extractive answer")
+            return extractive_answer(question, source_docs, owner), "timeout"
         except Exception as e:
-            return {
-                "response": f"I apologize, but I encountered an error: {str(e)}",
-                "sources": [],
-                "success": False,
-                "error": str(e),
-            }
+            self.llm_breaker.record_failure()
+            logger.warning(f"LLM generation failed ({str(e)}); serving extractive answer")
+            return extractive_answer(question, source_docs, owner), "llm_error"
+
+        self.llm_breaker.record_success()
+        return response_text, None
+
+    def _hedge_delay(self) -> float:
+        """Seconds before a hedged second attempt: LLM_HEDGE_AFTER_SECONDS, or the recent p95 latency"""
+        if config.LLM_HEDGE_AFTER_SECONDS > 0:
+            return config.LLM_HEDGE_AFTER_SECONDS
+        p95 = self.llm_latency.percentile(0.95)
+        upper = config.LLM_DEADLINE_SECONDS / 2
+        return upper if p95 is None else min(upper, max(MIN_HEDGE_DELAY, p95))
+
+    async def _timed_generate(self, question: str, source_docs: List[Document], owner: Optional[str] = None) -> str:
+        """One generation attempt, recording its latency on success"""
+        started = time.perf_counter()
+        response_text = await self._generate(question, source_docs, owner)
+        self.llm_latency.record(time.perf_counter() - started)
+        return response_text
+
+    def precompute_answer(self, question: str, tenant: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Answer a question synchronously for the FAQ precompute (no deadline).
 
-    def _format_sources(self, source_docs: List[Any]) -> List[Dict[str, Any]]:
+        Args:
+            question: FAQ question
+            tenant: Tenant ID (default: DEFAULT_TENANT)
+
+        Returns:
+            Dictionary with response and sources, or None when nothing relevant
+            was retrieved
+        """
+        chain = self.tenant_chain(tenant)
+        source_docs = chain.retriever.invoke(chain.search_text(question))
+        if not source_docs:
+            return None
+        messages = build_messages(question, source_docs, chain.tenant.owner)
+        message = self.llm.invoke(messages, config={"callbacks": [self.prompt_usage]})
+        # Stored as a Qdrant payload
+        return {"response": message.content, "sources": [source.to_dict() for source in self._format_sources(source_docs)]}
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Answer, query embedding, FAQ, structured answer, retrieval and prompt cache statistics.
+
+        Answer, query preprocessing, FAQ, structured answer and retrieval
+        counters are summed over the tenants loaded in this worker.
+        """
+        chains = self.tenant_chains.loaded()
+        answers = [chain.answer_cache.stats() for chain in chains]
+        hits, misses = sum(s["hits"] for s in answers), sum(s["misses"] for s in answers)
+        faq = [chain.faq.stats() for chain in chains]
+        lookups, matches = sum(s["lookups"] for s in faq), sum(s["matches"] for s in faq)
+        preprocessing = [chain.preprocessor.stats() for chain in chains]
+        structured = [chain.structured.stats() for chain in chains]
+        retrieval = [chain.retrieval_stats.stats() for chain in chains]
+        searches = sum(s["searches"] for s in retrieval)
+        lookups_structured, answers_structured = sum(s["lookups"] for s in structured), sum(s["answers"] for s in structured)
+        return {
+            "answers": {
+                "entries": sum(s["entries"] for s in answers),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+                "contended": sum(s["contended"] for s in answers),
+            },
+            "query_embeddings": embedding_cache.stats(),
+            "query_embeddings_memory": self.embeddings.memory.stats(),
+            "query_preprocessing": {
+                key: sum(s[key] for s in preprocessing)
+                for key in ("queries", "rewritten", "corrections", "expansions", "vocabulary")
+            },
+            "faq": {
+                "lookups": lookups,
+                "matches": matches,
+                "match_rate": round(matches / lookups, 3) if lookups else None,
+                "threshold": config.FAQ_MATCH_THRESHOLD,
+            },
+            "structured": {
+                "lookups": lookups_structured,
+                "answers": answers_structured,
+                "answer_rate": round(answers_structured / lookups_structured, 3) if lookups_structured else None,
+                "records": sum(s["records"] for s in structured),
+            },
+            "retrieval": {
+                "policy": chains[0].retriever.policy.to_dict() if chains else None,
+                "searches": searches,
+                **{key: sum(s[key] for s in retrieval) for key in ("candidates", "below_threshold", "cut_by_gap")},
+                "mean_k": round(sum(k * n for s in retrieval for k, n in s["k"].items()) / searches, 2) if searches else None,
+            },
+            "prompt_prefix": self.prompt_usage.stats(),
+            "tenants": {"configured": len(self.tenants), **self.tenant_chains.stats()},
+        }
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        """Circuit breaker state and LLM latency percentiles"""
+        return {
+            "circuit_breaker": self.llm_breaker.stats(),
+            "llm_latency": self.llm_latency.stats(),
+            "hedge_delay_seconds": round(self._hedge_delay(), 3),
+            "deadline_seconds": config.LLM_DEADLINE_SECONDS,
+        }
+
+    async def _generate(self, question: str, source_docs: List[Document], owner: Optional[str] = None) -> str:
+        """
+        Generate an answer from retrieved documents with the RAG prompt.
+
+        The static system message comes first and the context is sorted
+        deterministically, so the provider can reuse its cached prompt prefix.
+
+        Args:
+            question: User's question
+            source_docs: Retrieved context documents
+            owner: Portfolio owner named in the prompt (default: PORTFOLIO_OWNER)
+
+        Returns:
+            The LLM's answer text
+        """
+        messages = build_messages(question, source_docs, owner)
+        message = await self.llm.ainvoke(messages, config={"callbacks": [self.prompt_usage]})
+        return message.content
+
+    @staticmethod
+    def _point_to_document(point: Any) -> Document:
+        """Convert a Qdrant search hit (langchain_qdrant payload layout) to a Document"""
+        payload = point.payload or {}
+        return Document(
+            page_content=payload.get("page_content", ""),
+            metadata={**(payload.get("metadata") or {}), "_id": str(point.id)},
+        )
+
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        """Failed query result"""
+        return {
+            "response": f"I apologize, but I encountered an error: {str(error)}",
+            "sources": [],
+            "success": False,
+            "error": str(error),
+        }
+
+    def _format_sources(self, source_docs: List[Any]) -> List[Source]:
         """
         Format source documents for API response.
 
@@ -148,48 +467,55 @@ Professional Answer:"""
             source_docs: List of source documents from retrieval
 
         Returns:
-            List of formatted source dictionaries
+            Typed sources (ID, title, type, source, URL and a content preview)
         """
-        sources = []
-        for doc in source_docs:
-            source_info = {
-                "content": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
-                "metadata": doc.metadata,
-            }
-            sources.append(source_info)
+        return [source_from_document(doc) for doc in source_docs]
+
+    def check_dimensions(self) -> int:
+        """
+        Verify the default tenant's collection matches the configured embedding size (startup guard).
+
+        All tenants share the embeddings, so every collection must have this size.
+
+        Returns:
+            The embedding dimensions
 
-        return sources
+        Raises:
+            DimensionMismatchError: If the collection was built with another size
+        """
+        dimensions = embedding_dimensions(self.embeddings)
+        check_collection_dimensions(self.qdrant_client, config.COLLECTION_NAME, dimensions)
+        return dimensions
 
-    def health_check(self) -> Dict[str, Any]:
+    def health_check(self, tenant: Optional[str] = None) -> Dict[str, Any]:
         """
         Check health of RAG chain components.
 
+        Args:
+            tenant: Tenant whose collection is checked (default: DEFAULT_TENANT)
+
         Returns:
             Dictionary with health status
         """
         try:
-            # Check Qdrant connection
-            collections = self.qdrant_client.get_collections()
-            collection_exists = any(
-                col.name == config.COLLECTION_NAME
-                for col in collections.collections
-            )
+            collection_name = self.tenants.get(tenant).collection
 
-            if not collection_exists:
+            # Check Qdrant connection (the name is an alias after a full ingestion)
+            if not self.qdrant_client.collection_exists(collection_name):
                 return {
                     "status": "unhealthy",
-                    "message": f"Collection '{config.COLLECTION_NAME}' not found in Qdrant",
+                    "message": f"Collection '{collection_name}' not found in Qdrant",
                     "vector_store": "disconnected",
                 }
 
             # Get collection info
-            collection_info = self.qdrant_client.get_collection(config.COLLECTION_NAME)
+            collection_info = self.qdrant_client.get_collection(collection_name)
 
             return {
                 "status": "healthy",
                 "message": "RAG chain operational",
                 "vector_store": "connected",
-                "collection": config.COLLECTION_NAME,
+                "collection": collection_name,
                 "vector_count": collection_info.vectors_count,
             }
 
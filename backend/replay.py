@@ -0,0 +1,242 @@
+"""
+Offline replay of captured chat traffic.
+Re-runs requests recorded by traffic capture (TRAFFIC_CAPTURE_ENABLED) against a local stack and compares builds.
+
+Requests are sent with their original timing (scaled by --speed) or, with
+--fast, as fast as --concurrency allows. Each run records latency, status,
+what answered every question (the X-Served-By header) and the retrieved
+source IDs, and is compared with a baseline: the captured production
+traffic itself, or a previous run saved with --output. The comparison
+reports latency percentiles, the answer cache hit rate and how much the
+retrieved sources changed, so retrieval and cache changes can be measured
+on the real query distribution.
+
+Captured latencies are measured by the server, replayed ones by the client
+(including the local network hop). Rate limiting distorts replays; run the
+local stack with RATE_LIMIT_PER_MINUTE=0.
+
+Usage:
+    python replay.py                                   # replay .cache/traffic.*.jsonl against localhost:8000
+    python replay.py --fast --output before.json       # save a run of this build
+    python replay.py --fast --baseline before.json     # compare another build with it
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+import orjson
+
+from config import config
+from traffic_capture import capture_files, read_traffic
+
+
+def load_traffic(path: str, tenant: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Captured requests in time order.
+
+    Args:
+        path: Capture file, directory or TRAFFIC_CAPTURE_PATH pattern
+        tenant: Only this tenant's requests
+        limit: Only the first `limit` requests
+    """
+    records = sorted(read_traffic(capture_files(path)), key=lambda record: record["ts"])
+    if tenant:
+        records = [record for record in records if record.get("tenant") == tenant]
+    return records[:limit] if limit else records
+
+
+async def send(http: httpx.AsyncClient, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one captured request and record the outcome in capture format"""
+    headers = {config.TENANT_HEADER: record["tenant"]} if record.get("tenant") else {}
+    if record["ep"] == "batch":
+        request = http.post("/api/chat/batch", json={"messages": record["q"], "compact": True}, headers=headers)
+    else:
+        request = http.post("/api/chat", json={"message": record["q"][0], "compact": True}, headers=headers)
+
+    started = time.perf_counter()
+    try:
+        response = await request
+    except httpx.HTTPError as e:
+        return {"ep": record["ep"], "q": record["q"], "status": 0, "ms": None, "by": [], "src": [], "error": str(e)}
+    latency = time.perf_counter() - started
+
+    src: List[List[str]] = []
+    if response.status_code == 200:
+        body = response.json()
+        items = body["results"] if record["ep"] == "batch" else [body]
+        src = [[source["id"] for source in item.get("sources", [])] for item in items]
+    served = response.headers.get("x-served-by")
+    return {
+        "ep": record["ep"],
+        "q": record["q"],
+        "status": response.status_code,
+        "ms": round(latency * 1000, 1),
+        "by": served.split(",") if served else [],
+        "src": src,
+    }
+
+
+async def replay(
+    records: Sequence[Dict[str, Any]], http: httpx.AsyncClient, speed: float = 1.0, concurrency: int = 16,
+) -> List[Dict[str, Any]]:
+    """
+    Replay captured requests.
+
+    Args:
+        records: Captured requests in time order
+        http: Client for the stack under test (base URL set)
+        speed: Timing scale: 1.0 keeps the original gaps between requests,
+            2.0 halves them; 0 sends as fast as `concurrency` allows
+        concurrency: Requests in flight at once when speed is 0
+
+    Returns:
+        One result per record, in record order
+    """
+    if not records:
+        return []
+    first = records[0]["ts"]
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+
+    async def timed(record: Dict[str, Any]) -> Dict[str, Any]:
+        if speed > 0:
+            await asyncio.sleep(max(0.0, (record["ts"] - first) / speed - (time.perf_counter() - started)))
+            return await send(http, record)
+        async with semaphore:
+            return await send(http, record)
+
+    return list(await asyncio.gather(*(timed(record) for record in records)))
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))]
+
+
+def summarize(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Latency percentiles, errors, answer sources and cache hit rate of a run (or of captured traffic)"""
+    latencies = [result["ms"] for result in results if result.get("status") == 200 and result.get("ms") is not None]
+    served = Counter(by for result in results for by in result.get("by", []))
+    answered = sum(served.values())
+    return {
+        "requests": len(results),
+        "questions": sum(len(result["q"]) for result in results),
+        "errors": sum(result.get("status") != 200 for result in results),
+        "p50_ms": percentile(latencies, 0.5),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "served_by": dict(served),
+        "cache_hit_rate": round(served["cache"] / answered, 3) if answered else None,
+    }
+
+
+def jaccard(a: Sequence[str], b: Sequence[str]) -> float:
+    a, b = set(a), set(b)
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def compare(baseline: Sequence[Dict[str, Any]], candidate: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compare two runs of the same captured traffic.
+
+    Runs are matched by position; sources are compared per question for
+    requests that succeeded in both runs.
+
+    Returns:
+        Both summaries, and the compared questions, the mean Jaccard overlap
+        of their source IDs and the share with identical (ordered) sources
+    """
+    overlaps: List[float] = []
+    identical = 0
+    for before, after in zip(baseline, candidate):
+        if before.get("status") != 200 or after.get("status") != 200:
+            continue
+        for before_ids, after_ids in zip(before.get("src", []), after.get("src", [])):
+            overlaps.append(jaccard(before_ids, after_ids))
+            identical += before_ids == after_ids
+    return {
+        "baseline": summarize(baseline),
+        "candidate": summarize(candidate),
+        "sources": {
+            "questions": len(overlaps),
+            "mean_overlap": round(sum(overlaps) / len(overlaps), 3) if overlaps else None,
+            "identical_rate": round(identical / len(overlaps), 3) if overlaps else None,
+        },
+    }
+
+
+def print_comparison(report: Dict[str, Any], baseline_label: str, candidate_label: str):
+    """Print a side-by-side comparison"""
+    baseline, candidate = report["baseline"], report["candidate"]
+
+    def cell(value: Any) -> str:
+        return "-" if value is None else f"{value:.1f}" if isinstance(value, float) else str(value)
+
+    print(f"{'':<16}{baseline_label:>20}{candidate_label:>20}")
+    for key in ("requests", "questions", "errors", "p50_ms", "p95_ms", "p99_ms", "cache_hit_rate"):
+        print(f"{key:<16}{cell(baseline[key]):>20}{cell(candidate[key]):>20}")
+    for by in sorted(set(baseline["served_by"]) | set(candidate["served_by"])):
+        print(f"{'served_by ' + by:<16}{baseline['served_by'].get(by, 0):>20}{candidate['served_by'].get(by, 0):>20}")
+    sources = report["sources"]
+    print(
+        f"\nSources over {sources['questions']} questions: mean overlap {cell(sources['mean_overlap'])}, "
+        f"identical {cell(sources['identical_rate'])}"
+    )
+
+
+def main(
+    traffic: str, base_url: str, speed: float, concurrency: int, tenant: Optional[str],
+    limit: Optional[int], output: Optional[str], baseline: Optional[str],
+):
+    """Replay captured traffic and compare with the capture or a saved run"""
+    print("=" * 60)
+    print("CHAT TRAFFIC REPLAY")
+    print("=" * 60 + "\n")
+
+    records = load_traffic(traffic, tenant, limit)
+    if not records:
+        print(f"No captured traffic found at {traffic}")
+        return
+    span = records[-1]["ts"] - records[0]["ts"]
+    mode = "as fast as possible" if speed == 0 else f"original timing x{speed:g} ({span / speed:.0f}s)"
+    print(f"Replaying {len(records)} requests against {base_url}, {mode}\n")
+
+    async def run() -> List[Dict[str, Any]]:
+        async with httpx.AsyncClient(base_url=base_url, timeout=120) as http:
+            return await replay(records, http, speed, concurrency)
+
+    results = asyncio.run(run())
+    if output:
+        with open(output, "wb") as file:
+            file.write(orjson.dumps({"base_url": base_url, "traffic": traffic, "results": results}))
+        print(f"Saved run to {output}\n")
+
+    if baseline:
+        with open(baseline, "rb") as file:
+            reference = orjson.loads(file.read())["results"]
+        print_comparison(compare(reference, results), baseline, "this run")
+    else:
+        print_comparison(compare(records, results), "captured", "replayed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay captured chat traffic against a local stack")
+    parser.add_argument("--traffic", default=config.TRAFFIC_CAPTURE_PATH, help="Capture file, directory or TRAFFIC_CAPTURE_PATH")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Stack under test")
+    parser.add_argument("--speed", type=float, default=1.0, help="Timing scale (2 = twice as fast)")
+    parser.add_argument("--fast", action="store_true", help="Ignore the original timing")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight with --fast")
+    parser.add_argument("--tenant", help="Only replay this tenant's requests")
+    parser.add_argument("--limit", type=int, help="Only replay the first N requests")
+    parser.add_argument("--output", help="Save this run (JSON) for later comparisons")
+    parser.add_argument("--baseline", help="Compare with a saved run instead of the captured traffic")
+    args = parser.parse_args()
+    main(
+        args.traffic, args.base_url, 0 if args.fast else args.speed, args.concurrency,
+        args.tenant, args.limit, args.output, args.baseline,
+    )
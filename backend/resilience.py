@@ -0,0 +1,223 @@
+"""
+Resilience helpers for LLM calls in the RAG chain.
+Deadlines with hedged retries, a circuit breaker, and extractive fallback answers.
+
+Generation gets a fixed deadline. If the first attempt has not answered
+after the hedge delay (the recent p95 latency unless configured), a second
+attempt is started and the first answer wins. When the deadline passes, the
+circuit is open or every attempt fails, the caller serves an extractive
+answer built from the retrieved documents instead.
+"""
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from langchain_core.documents import Document
+
+from config import config
+from prompts import first_name
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is skipped because the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after `failure_threshold` consecutive failures, rejects calls for
+    `reset_timeout` seconds, then lets a single trial call through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+            clock: Time source in seconds (injectable for tests)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        # A failed trial re-opens the circuit; otherwise open at the threshold
+        if self.trial_in_flight or (self.opened_at is None and self.failures >= self.failure_threshold):
+            self.opened_at = self.clock()
+            self.times_opened += 1
+        self.trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies"""
+
+    def __init__(self, window: int = 200):
+        self.samples: deque = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency at quantile `q` (0-1), or None without samples"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p95, p99 = (self.percentile(q) for q in (0.5, 0.95, 0.99))
+        return {
+            "samples": len(self.samples),
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+            "p99_seconds": round(p99, 3) if p99 is not None else None,
+        }
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    deadline: float,
+    hedge_after: float,
+    max_attempts: int = 2,
+) -> T:
+    """
+    Run `call` with a deadline, starting another attempt every `hedge_after`
+    seconds (up to `max_attempts`) while no attempt has succeeded.
+
+    Args:
+        call: Coroutine factory; every attempt calls it once
+        deadline: Seconds until giving up
+        hedge_after: Seconds to wait for an attempt before starting the next
+        max_attempts: Maximum concurrent attempts
+
+    Returns:
+        The result of the first successful attempt
+
+    Raises:
+        asyncio.TimeoutError: If no attempt succeeded before the deadline
+        Exception: The last attempt's error if every attempt failed
+    """
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + deadline
+    pending = {asyncio.ensure_future(call())}
+    attempts = 1
+    last_error: Optional[BaseException] = None
+
+    try:
+        while pending:
+            remaining = give_up_at - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError(f"No answer within {deadline:.1f}s")
+
+            wait = min(remaining, hedge_after) if attempts < max_attempts else remaining
+            done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+
+            # Every attempt so far failed or is slower than the hedge delay
+            if attempts < max_attempts and give_up_at > loop.time():
+                pending.add(asyncio.ensure_future(call()))
+                attempts += 1
+
+        raise last_error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "does", "did", "do", "for", "has", "have", "he", "his", "how", "in",
+    "is", "of", "on", "or", "the", "to", "what", "when", "where", "which",
+    "who", "with", "about", "tell", "me", "any", "can", "you",
+}
+
+
+def extractive_answer(question: str, docs: List[Document], owner: Optional[str] = None, max_lines: int = 4) -> str:
+    """
+    Build a fast answer from retrieved documents without the LLM.
+
+    Picks the lines of the top documents that share the most terms with the
+    question, keeping document order.
+
+    Args:
+        question: User's question
+        docs: Retrieved documents (most relevant first)
+        owner: Portfolio owner named in the answer (default: PORTFOLIO_OWNER)
+        max_lines: Maximum lines to quote
+
+    Returns:
+        Answer text
+    """
+    owner = owner or config.PORTFOLIO_OWNER
+    name = first_name(owner)
+    if not docs:
+        return f"I couldn't find information about that in {name}'s portfolio right now. Please try again shortly."
+
+    # The owner's name is in most questions but says nothing about which line answers them
+    ignored = _STOPWORDS | set(_WORD.findall(owner.lower()))
+    terms = {word for word in _WORD.findall(question.lower()) if word not in ignored}
+    candidates = []
+    for doc_rank, doc in enumerate(docs):
+        for line_rank, line in enumerate(_SENTENCE_SPLIT.split(doc.page_content)):
+            line = line.strip()
+            if len(line) < 3:
+                continue
+            overlap = len(terms & set(_WORD.findall(line.lower())))
+            candidates.append((-overlap, doc_rank, line_rank, line))
+
+    best = sorted(candidates)[:max_lines]
+    # Nothing matched the question: fall back to the opening of the top documents
+    if best and best[0][0] == 0:
+        best = sorted(candidates, key=lambda c: (c[1], c[2]))[:max_lines]
+    lines = [line for _, _, _, line in sorted(best, key=lambda c: (c[1], c[2]))]
+
+    return f"Here is what {name}'s portfolio says about that:\n" + "\n".join(f"- {line}" for line in lines)
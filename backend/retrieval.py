@@ -0,0 +1,184 @@
+"""
+Score-aware retrieval for the RAG chain.
+Enforces the similarity threshold in the open and picks k per question from the score distribution.
+
+The retriever fetches up to RETRIEVER_K candidates with their scores and
+filters them locally, so every search reports how many candidates the
+threshold removed. It then cuts the list at its largest score gap (the
+elbow): when the gap is at least RETRIEVER_MIN_GAP, only the candidates
+above it are kept (never fewer than RETRIEVER_MIN_K). A simple question
+with one clearly matching chunk gets a short prompt. A question whose
+candidates score alike keeps the full context.
+
+The threshold and gap default to SCORE_THRESHOLD and RETRIEVER_MIN_GAP.
+`python calibrate.py` fits both per embedding model against an evaluation
+set and writes them to RETRIEVAL_CALIBRATION_PATH, which overrides the
+defaults for the model it was fitted on.
+"""
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from langchain_core.callbacks import AsyncCallbackManagerForRetrieverRun, CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from config import config
+from vector_index import embedding_model_id
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RetrievalPolicy:
+    """Threshold and dynamic-k settings for one embedding model"""
+    threshold: float
+    min_k: int
+    max_k: int
+    # Smallest score drop that ends the context early (0 keeps every candidate above the threshold)
+    min_gap: float
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None, model_id: Optional[str] = None) -> "RetrievalPolicy":
+        """
+        Policy for the configured embedding model.
+
+        Args:
+            path: Calibration file (default: RETRIEVAL_CALIBRATION_PATH)
+            model_id: Embedding model ID (default: the configured model)
+
+        Returns:
+            The calibrated threshold and gap for the model when the file has
+            them, otherwise SCORE_THRESHOLD and RETRIEVER_MIN_GAP
+        """
+        policy = cls(
+            threshold=config.SCORE_THRESHOLD,
+            min_k=config.RETRIEVER_MIN_K,
+            max_k=config.RETRIEVER_K,
+            min_gap=config.RETRIEVER_MIN_GAP,
+        )
+        calibrated = load_calibration(path).get(model_id or embedding_model_id())
+        if not calibrated:
+            return policy
+        return cls(threshold=calibrated["threshold"], min_k=policy.min_k, max_k=policy.max_k, min_gap=calibrated["min_gap"])
+
+    def select(self, scores: Sequence[float]) -> Tuple[int, int]:
+        """
+        Number of candidates to keep.
+
+        Args:
+            scores: Candidate scores, highest first
+
+        Returns:
+            (candidates above the threshold, candidates kept after the gap cut)
+        """
+        above = 0
+        for score in scores[:self.max_k]:
+            if score < self.threshold:
+                break
+            above += 1
+        if self.min_gap <= 0 or above <= max(self.min_k, 1):
+            return above, above
+
+        # Largest drop between consecutive scores, cutting after at least min_k
+        gap, cut = max((scores[i - 1] - scores[i], i) for i in range(max(self.min_k, 1), above))
+        return above, cut if gap >= self.min_gap else above
+
+    def apply(self, scored: Sequence[Tuple[T, float]], stats: Optional["RetrievalStats"] = None) -> List[T]:
+        """Keep the selected (item, score) pairs, highest first, and record the search"""
+        above, kept = self.select([score for _, score in scored])
+        if stats is not None:
+            stats.record(len(scored), above, kept)
+        return [item for item, _ in scored[:kept]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class RetrievalStats:
+    """Thread-safe counts of candidates, threshold filtering and chosen k"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.searches = 0
+        self.candidates = 0
+        self.below_threshold = 0
+        self.cut_by_gap = 0
+        self.k = Counter()
+
+    def record(self, candidates: int, above: int, kept: int):
+        with self._lock:
+            self.searches += 1
+            self.candidates += candidates
+            self.below_threshold += candidates - above
+            self.cut_by_gap += above - kept
+            self.k[kept] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Search counts, filtered candidates and the distribution of k"""
+        kept = sum(k * count for k, count in self.k.items())
+        return {
+            "searches": self.searches,
+            "candidates": self.candidates,
+            "below_threshold": self.below_threshold,
+            "cut_by_gap": self.cut_by_gap,
+            "mean_k": round(kept / self.searches, 2) if self.searches else None,
+            "k": dict(sorted(self.k.items())),
+        }
+
+
+class ScoredRetriever(BaseRetriever):
+    """
+    Retriever applying a RetrievalPolicy to scored vector store results.
+
+    Replaces `as_retriever(search_type="similarity")`, which hides the
+    scores and so what the threshold removed.
+    """
+    vector_store: Any
+    policy: RetrievalPolicy
+    stats: Any = None
+    search_params: Any = None
+
+    def _search_kwargs(self) -> Dict[str, Any]:
+        return {"k": self.policy.max_k, "search_params": self.search_params}
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        scored = self.vector_store.similarity_search_with_score(query, **self._search_kwargs())
+        return self.policy.apply(scored, self.stats)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        scored = await self.vector_store.asimilarity_search_with_score(query, **self._search_kwargs())
+        return self.policy.apply(scored, self.stats)
+
+
+def load_calibration(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Calibrated settings per embedding model ID ({} when the file is missing or unreadable)"""
+    path = path or config.RETRIEVAL_CALIBRATION_PATH
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read retrieval calibration {path}: {str(e)}")
+        return {}
+
+
+def save_calibration(model_id: str, settings: Dict[str, Any], path: Optional[str] = None):
+    """Store the calibrated settings of one embedding model, keeping the others"""
+    path = path or config.RETRIEVAL_CALIBRATION_PATH
+    calibration = load_calibration(path)
+    calibration[model_id] = settings
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(calibration, file, indent=2, sort_keys=True)
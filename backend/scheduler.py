@@ -0,0 +1,175 @@
+"""
+Background re-ingestion scheduler for the RAG chatbot backend.
+Polls each registered loader on its own interval and applies only the
+changes (see DataIngestion.sync_loader).
+
+Syncs run in a small dedicated thread pool whose threads are lowered in OS
+scheduling priority, and at most INGEST_MAX_CONCURRENCY loaders sync at
+once, so background ingestion does not compete with request handling.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoaderStatus:
+    """Last-run status of one scheduled loader"""
+    name: str
+    interval_seconds: int
+    status: str = "pending"
+    last_started: Optional[str] = None
+    last_finished: Optional[str] = None
+    last_duration_seconds: Optional[float] = None
+    last_error: Optional[str] = None
+    added: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    runs: int = 0
+    next_run: float = 0.0
+
+
+def _lower_thread_priority():
+    """Thread pool initializer: raise the niceness of the worker thread (Linux only)"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), config.INGEST_NICENESS)
+    except (AttributeError, OSError) as e:
+        logger.debug(f"Could not lower ingestion thread priority: {str(e)}")
+
+
+class IngestionScheduler:
+    """
+    Runs DataIngestion.sync_loader for every registered loader on its interval.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        intervals: Optional[Dict[str, int]] = None,
+        default_interval: int = config.INGEST_DEFAULT_INTERVAL,
+        max_concurrency: int = config.INGEST_MAX_CONCURRENCY,
+    ):
+        """
+        Args:
+            pipeline: DataIngestion instance with loaders registered
+            intervals: Seconds between syncs per loader name
+            default_interval: Interval for loaders without an explicit entry
+            max_concurrency: Maximum number of loaders syncing at once
+        """
+        self.pipeline = pipeline
+        intervals = config.INGEST_INTERVALS if intervals is None else intervals
+
+        self.loaders: Dict[str, LoaderStatus] = {
+            name: LoaderStatus(name=name, interval_seconds=intervals.get(name, default_interval))
+            for name in pipeline.loaders
+        }
+
+        self.max_concurrency = max(1, max_concurrency)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="ingest",
+            initializer=_lower_thread_priority,
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Task] = {}
+
+    async def start(self):
+        """Start the scheduling loop as a background task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run_forever())
+            logger.info(f"Ingestion scheduler started for {len(self.loaders)} loaders")
+
+    async def stop(self):
+        """Stop scheduling and wait for in-progress syncs to finish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._running:
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+        self.executor.shutdown(wait=False)
+
+    async def run_forever(self):
+        """Scheduling loop: start every due loader, then sleep until the next one is due"""
+        while True:
+            now = time.monotonic()
+            for name, status in self.loaders.items():
+                if status.next_run <= now and name not in self._running:
+                    self._running[name] = asyncio.create_task(self.run_loader(name))
+
+            upcoming = [s.next_run for n, s in self.loaders.items() if n not in self._running]
+            delay = min(upcoming) - time.monotonic() if upcoming else config.INGEST_DEFAULT_INTERVAL
+            await asyncio.sleep(max(1.0, min(delay, 60.0)))
+
+    async def run_loader(self, name: str) -> Dict[str, Any]:
+        """
+        Sync one loader now (bounded by the concurrency limit).
+
+        Args:
+            name: Registered loader name
+
+        Returns:
+            The loader's status after the run
+        """
+        status = self.loaders[name]
+        try:
+            async with self.semaphore:
+                status.status = "running"
+                status.last_started = datetime.now().isoformat()
+                started = time.perf_counter()
+
+                try:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(self.executor, self.pipeline.sync_loader, name)
+                    status.status = result.get("status", "ok")
+                    status.added = result.get("added", 0)
+                    status.removed = result.get("removed", 0)
+                    status.unchanged = result.get("unchanged", 0)
+                    status.last_error = None
+                except Exception as e:
+                    status.status = "error"
+                    status.last_error = str(e)
+                    logger.error(f"Scheduled sync of {name} failed: {str(e)}")
+
+                status.last_duration_seconds = round(time.perf_counter() - started, 3)
+                status.last_finished = datetime.now().isoformat()
+                status.runs += 1
+                status.next_run = time.monotonic() + status.interval_seconds
+        finally:
+            self._running.pop(name, None)
+
+        return self.loader_status(name)
+
+    def loader_status(self, name: str) -> Dict[str, Any]:
+        """Status of one loader as a dict"""
+        status = asdict(self.loaders[name])
+        status["next_run_in_seconds"] = max(0, round(status.pop("next_run") - time.monotonic()))
+        return status
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Status of the scheduler and every loader.
+
+        Returns:
+            Dictionary with scheduler state and per-loader last-run details
+        """
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "max_concurrency": self.max_concurrency,
+            "loaders": [self.loader_status(name) for name in self.loaders],
+        }
@@ -0,0 +1,109 @@
+"""
+Production server for the RAG chatbot backend.
+Runs the FastAPI app with several worker processes and a preloaded app.
+
+With gunicorn installed (Linux/macOS), the app is imported once in the master
+process (config, prompt templates, tokenizer and module imports) and forked
+into each uvicorn worker; every worker then binds its own connections.
+Without gunicorn, uvicorn's process manager starts the workers instead
+(no preloading). Answer and query embedding caches are shared by all
+workers through the SQLite store in shared_cache.py.
+
+Usage:
+    python serve.py                          # WEB_CONCURRENCY workers (default: one per CPU)
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import logging
+import os
+from typing import Any, Dict
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count(requested: int = 0) -> int:
+    """Workers to start: `requested`, WEB_CONCURRENCY, or one per CPU"""
+    if requested > 0:
+        return requested
+    if config.WEB_CONCURRENCY > 0:
+        return config.WEB_CONCURRENCY
+    return os.cpu_count() or 1
+
+
+def post_fork(server, worker):
+    """gunicorn hook: give each forked worker its own connections"""
+    from rag_chain import rag_chain
+    rag_chain.bind_clients()
+
+
+def gunicorn_options(workers: int, host: str, port: int) -> Dict[str, Any]:
+    """gunicorn settings for the production server"""
+    return {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "timeout": config.SERVER_TIMEOUT,
+        # Workers finish in-flight requests before exiting on SIGTERM
+        "graceful_timeout": int(config.SHUTDOWN_DRAIN_SECONDS),
+        "keepalive": 5,
+        "post_fork": post_fork,
+        "loglevel": "info",
+    }
+
+
+def run_gunicorn(options: Dict[str, Any]):
+    """Run the app under gunicorn with the given settings"""
+    from gunicorn.app.base import BaseApplication
+
+    class ProductionServer(BaseApplication):
+        def __init__(self, options: Dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from clients import clients
+            from main import app
+            # Preloading validates the collection; don't leak those sockets into workers
+            clients.close()
+            return app
+
+    ProductionServer(options).run()
+
+
+def run_uvicorn(workers: int, host: str, port: int):
+    """Run the app with uvicorn's own multi-process manager"""
+    import uvicorn
+    uvicorn.run(
+        "main:app", host=host, port=port, workers=workers, timeout_keep_alive=5,
+        timeout_graceful_shutdown=int(config.SHUTDOWN_DRAIN_SECONDS), log_level="info",
+    )
+
+
+def main(workers: int, host: str, port: int):
+    """Start the production server"""
+    workers = worker_count(workers)
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        logging.basicConfig(level=logging.INFO)
+        logger.warning("gunicorn not installed; starting uvicorn workers without app preloading")
+        run_uvicorn(workers, host, port)
+        return
+
+    run_gunicorn(gunicorn_options(workers, host, port))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the production API server")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: WEB_CONCURRENCY or CPUs)")
+    parser.add_argument("--host", default=config.SERVER_HOST, help="Bind address")
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT, help="Bind port")
+    args = parser.parse_args()
+    main(args.workers, args.host, args.port)
@@ -0,0 +1,448 @@
+"""
+Cross-process caches for the RAG chatbot backend.
+SQLite-backed key/value store shared by every server worker on the host.
+
+Each worker process opens its own connection to one WAL-mode database file,
+so an answer or query embedding computed by one worker is a cache hit for
+all the others, and ingestion (server job or CLI) can invalidate cached
+answers for every worker at once. `try_host_lock` elects a single worker
+for host-wide background work such as scheduled ingestion.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from array import array
+from collections import OrderedDict
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional
+
+import orjson
+from langchain_core.embeddings import Embeddings
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Writes between evictions of entries beyond max_entries
+EVICT_EVERY = 100
+
+# Seconds a new connection (schema setup) and clear() wait for the lock
+INIT_TIMEOUT = 5
+
+# Every SharedCache in this process, so a forked child gets fresh counter locks
+_instances: "weakref.WeakSet[SharedCache]" = weakref.WeakSet()
+
+
+def _reset_after_fork():
+    for cache in list(_instances):
+        cache._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _pack_vector(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack_vector(blob: bytes) -> List[float]:
+    return array("f", blob).tolist()
+
+
+class SharedCache:
+    """
+    Namespaced key/value cache in a SQLite file with optional TTL.
+
+    Safe to use from several processes and threads: every thread opens its
+    own connection (re-opened after fork). Lookups and writes give up after
+    `busy_timeout` instead of queueing behind another worker's write, so a
+    contended cache costs a miss or a skipped write rather than a stall.
+    The async methods run in a worker thread and never block the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        ttl_seconds: float = 0,
+        max_entries: int = 10000,
+        dumps: Callable[[Any], Any] = json.dumps,
+        loads: Callable[[Any], Any] = json.loads,
+        busy_timeout: Optional[float] = None,
+    ):
+        """
+        Args:
+            path: SQLite database file (created on first use)
+            namespace: Key namespace, so several caches share one file
+            ttl_seconds: Entry lifetime; 0 keeps entries until evicted
+            max_entries: Entries kept per namespace (oldest evicted first)
+            dumps: Value serializer (to str or bytes)
+            loads: Value deserializer
+            busy_timeout: Seconds to wait for a lock held by another
+                connection (default: SHARED_CACHE_BUSY_TIMEOUT)
+        """
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.dumps = dumps
+        self.loads = loads
+        self.busy_timeout = config.SHARED_CACHE_BUSY_TIMEOUT if busy_timeout is None else busy_timeout
+        self._local = threading.local()
+        # Guards the counters only; SQLite serializes the connections
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.contended = 0
+        _instances.add(self)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread, and connections must not cross fork()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Opening waits longer: creating the schema must not be skipped
+        conn = sqlite3.connect(self.path, timeout=INIT_TIMEOUT, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, created_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache (namespace, created_at)")
+        self._set_busy_timeout(conn, self.busy_timeout)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _set_busy_timeout(conn: sqlite3.Connection, seconds: float):
+        conn.execute(f"PRAGMA busy_timeout = {int(seconds * 1000)}")
+
+    def _count(self, hits: int = 0, misses: int = 0, contended: int = 0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.contended += contended
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for `key`, or None"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values for the keys that are present and fresh (none when the file is locked)"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        min_created = time.time() - self.ttl_seconds if self.ttl_seconds > 0 else 0
+        placeholders = ",".join("?" * len(keys))
+        try:
+            rows = self._connection().execute(
+                f"SELECT key, value FROM cache WHERE namespace = ? AND created_at >= ? AND key IN ({placeholders})",
+                [self.namespace, min_created, *keys],
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Shared cache read skipped ({self.namespace}): {str(e)}")
+            self._count(misses=len(keys), contended=1)
+            return {}
+
+        found = {key: self.loads(value) for key, value in rows}
+        self._count(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def set(self, key: str, value: Any):
+        """Store `value` under `key`"""
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Any]):
+        """Store several values in one transaction (skipped when another writer holds the lock)"""
+        if not items:
+            return
+
+        now = time.time()
+        rows = [(self.namespace, key, self.dumps(value), now) for key, value in items.items()]
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Shared cache write skipped ({self.namespace}): {str(e)}")
+            self._count(contended=1)
+            return
+        try:
+            conn.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", rows)
+            with self._lock:
+                self._writes += len(rows)
+                evict = self._writes >= EVICT_EVERY
+                if evict:
+                    self._writes = 0
+            if evict:
+                self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """`get` in a worker thread"""
+        return (await self.aget_many([key])).get(key)
+
+    async def aget_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """`get_many` in a worker thread"""
+        keys = list(keys)
+        return await asyncio.to_thread(self.get_many, keys) if keys else {}
+
+    async def aset(self, key: str, value: Any):
+        """`set` in a worker thread"""
+        await self.aset_many({key: value})
+
+    async def aset_many(self, items: Dict[str, Any]):
+        """`set_many` in a worker thread"""
+        if items:
+            await asyncio.to_thread(self.set_many, items)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop expired entries and the oldest ones beyond max_entries"""
+        if self.ttl_seconds > 0:
+            conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND created_at < ?",
+                (self.namespace, time.time() - self.ttl_seconds),
+            )
+        conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache WHERE namespace = ? ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries),
+        )
+
+    def clear(self):
+        """Remove every entry in this namespace (for all processes; waits for the lock)"""
+        conn = self._connection()
+        self._set_busy_timeout(conn, INIT_TIMEOUT)
+        try:
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+        finally:
+            self._set_busy_timeout(conn, self.busy_timeout)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and this process's hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "contended": self.contended,
+        }
+
+
+class LRUCache:
+    """In-process least-recently-used cache (thread-safe)"""
+
+    def __init__(self, max_entries: int):
+        """
+        Args:
+            max_entries: Entries kept; 0 disables the cache
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values for the keys that are present"""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return found
+
+    def set_many(self, items: Dict[str, Any]):
+        """Store values, evicting the least recently used beyond max_entries"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def keys(self) -> List[str]:
+        """Keys from least to most recently used"""
+        with self._lock:
+            return list(self._entries)
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Value for `key` without counting a lookup or refreshing its recency"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves repeated texts from a SharedCache.
+
+    An optional in-process LRU in front of the shared cache serves hot
+    queries without a SQLite read. Keys include the embedding model, so
+    changing models never returns vectors from the old one.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: SharedCache, model: str, memory_entries: int = 0):
+        """
+        Args:
+            embeddings: Underlying embeddings client
+            cache: Shared vector cache
+            model: Embedding model identifier, part of every key
+            memory_entries: Size of the in-process LRU (0 disables it)
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.memory = LRUCache(memory_entries)
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _split(self, texts: List[str]):
+        keys = [self._key(text) for text in texts]
+        cached = self.memory.get_many(keys) if self.memory.max_entries > 0 else {}
+        shared = self.cache.get_many([key for key in keys if key not in cached])
+        self.memory.set_many(shared)
+        cached.update(shared)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        return keys, cached, missing
+
+    async def _asplit(self, texts: List[str]):
+        keys = [self._key(text) for text in texts]
+        cached = self.memory.get_many(keys) if self.memory.max_entries > 0 else {}
+        shared = await self.cache.aget_many([key for key in keys if key not in cached])
+        self.memory.set_many(shared)
+        cached.update(shared)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        return keys, cached, missing
+
+    def _merge(self, keys: List[str], cached: Dict[str, List[float]], missing: List[int], vectors: List[List[float]]):
+        fresh = {keys[i]: vector for i, vector in zip(missing, vectors)}
+        self.cache.set_many(fresh)
+        self.memory.set_many(fresh)
+        cached.update(fresh)
+        return [cached[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, cached, missing = self._split(texts)
+        vectors = self.embeddings.embed_documents([texts[i] for i in missing]) if missing else []
+        return self._merge(keys, cached, missing, vectors)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # The SQLite lookups and writes run in a worker thread, off the event loop
+        keys, cached, missing = await self._asplit(texts)
+        vectors = await self.embeddings.aembed_documents([texts[i] for i in missing]) if missing else []
+        fresh = {keys[i]: vector for i, vector in zip(missing, vectors)}
+        await self.cache.aset_many(fresh)
+        self.memory.set_many(fresh)
+        cached.update(fresh)
+        return [cached[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+
+def try_host_lock(name: str) -> Optional[IO]:
+    """
+    Take a non-blocking exclusive lock shared by all processes on the host.
+
+    The lock lives next to the shared cache file and is released when the
+    returned handle is closed or the process exits.
+
+    Args:
+        name: Lock name
+
+    Returns:
+        Open lock file to keep a reference to, or None if another process holds it
+    """
+    try:
+        import fcntl
+    except ImportError:
+        # No fcntl (Windows): single-process servers only, so always succeed
+        return open(os.devnull, "w")
+
+    directory = os.path.dirname(config.SHARED_CACHE_PATH) or "."
+    os.makedirs(directory, exist_ok=True)
+    handle = open(os.path.join(directory, f"{name}.lock"), "w")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def answer_key(question: str) -> str:
+    """Cache key for a chat question (case and whitespace insensitive)"""
+    normalized = " ".join(question.lower().split())
+    return hashlib.sha256(f"{config.COLLECTION_NAME}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+# Create singleton instances
+answer_cache = SharedCache(
+    config.SHARED_CACHE_PATH,
+    namespace="answers",
+    ttl_seconds=config.ANSWER_CACHE_TTL_SECONDS,
+    max_entries=config.ANSWER_CACHE_MAX_ENTRIES,
+    # orjson serializes the typed sources (dataclasses) natively
+    dumps=orjson.dumps,
+    loads=orjson.loads,
+)
+embedding_cache = SharedCache(
+    config.SHARED_CACHE_PATH,
+    namespace="query_embeddings",
+    max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES,
+    dumps=_pack_vector,
+    loads=_unpack_vector,
+)
@@ -0,0 +1,93 @@
+"""
+Source attribution models for chat responses.
+Typed, slotted records built from retrieved chunks instead of copies of their metadata.
+
+A source carries a fixed set of fields (point ID, title, type, source, URL
+and a content preview), so responses no longer repeat internal metadata
+such as `last_updated`, hashes or chunking details. Compact responses carry
+only the ID and title. Both are plain dataclasses that orjson serializes
+natively, so the chat endpoints can skip Pydantic validation.
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Union
+
+from langchain_core.documents import Document
+
+from config import config
+
+# Metadata fields naming a chunk's document, most specific first
+TITLE_FIELDS = ("title", "company", "institution", "name", "repo_name", "section", "file")
+
+# Metadata fields holding a link to the original
+URL_FIELDS = ("url", "repo_url")
+
+
+@dataclass(slots=True)
+class Source:
+    """One retrieved chunk used for an answer"""
+    id: str
+    title: str
+    type: str
+    source: str
+    url: str
+    content: str
+
+    def compact(self) -> "CompactSource":
+        return CompactSource(id=self.id, title=self.title)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class CompactSource:
+    """Source reference for compact responses"""
+    id: str
+    title: str
+
+
+def preview(text: str, limit: int) -> str:
+    """`text`, cut at the last word boundary within `limit` characters"""
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[:cut if cut > 0 else limit].rstrip() + "..."
+
+
+def source_from_document(doc: Document) -> Source:
+    """
+    Build a source from a retrieved chunk.
+
+    Args:
+        doc: Retrieved document (langchain_qdrant stores the point ID as `_id`)
+
+    Returns:
+        Source with a preview of at most SOURCE_PREVIEW_CHARS characters
+    """
+    metadata = doc.metadata or {}
+    doc_type = metadata.get("type") or "source"
+    return Source(
+        id=str(metadata.get("_id") or metadata.get("content_hash") or ""),
+        title=next((str(metadata[field]) for field in TITLE_FIELDS if metadata.get(field)), doc_type.replace("_", " ").title()),
+        type=doc_type,
+        source=metadata.get("source") or "",
+        url=next((str(metadata[field]) for field in URL_FIELDS if metadata.get(field)), ""),
+        content=preview(doc.page_content, config.SOURCE_PREVIEW_CHARS),
+    )
+
+
+def source_from_dict(data: Dict[str, Any]) -> Source:
+    """
+    Rebuild a source from its stored form (answer cache, FAQ payloads).
+
+    Entries stored before sources were typed ({"content", "metadata"}) are
+    converted as if they were documents.
+    """
+    if "metadata" in data:
+        return source_from_document(Document(page_content=data.get("content", ""), metadata=data["metadata"] or {}))
+    return Source(**{field: data.get(field, "") for field in Source.__slots__})
+
+
+def response_sources(sources: List[Source], compact: bool = False) -> List[Union[Source, CompactSource]]:
+    """Sources as returned to the client"""
+    return [source.compact() for source in sources] if compact else sources
@@ -0,0 +1,253 @@
+"""
+Structured answers for the RAG chatbot.
+Answers simple questions about education, experience, skills and certifications from typed records, without an LLM call.
+
+PortfolioConfigLoader stores education, experience, certifications and
+skills as typed chunks (institution, degree, company, position, dates).
+Questions such as "Where did he study?" or "List his skills" are answered
+from templates over those records in microseconds. The records are held in
+memory and reloaded with the query vocabulary after each ingestion.
+
+Intent detection is deliberately conservative: a question must name an
+intent ("study", "skills", "certifications", ...) and every other word must
+be a filler word, the owner's name or a word of that intent. The share of
+understood words is the confidence; below STRUCTURED_MIN_CONFIDENCE (or
+without matching records) the question goes through the full RAG chain.
+"""
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from config import config
+from prompts import first_name
+from sources import source_from_document
+
+# Words that carry no intent
+FILLER_WORDS = frozenset({
+    "a", "about", "all", "an", "and", "any", "are", "can", "could", "did", "do", "does", "give", "has", "have",
+    "he", "her", "his", "i", "is", "list", "me", "my", "of", "please", "see", "she", "show", "tell", "the",
+    "their", "them", "they", "to", "was", "were", "what", "whats", "which", "you", "your",
+})
+
+
+@dataclass(frozen=True)
+class Intent:
+    """A structured question type"""
+    name: str
+    record_type: str
+    # At least one trigger word must appear in the question
+    triggers: FrozenSet[str]
+    # Other words the intent understands
+    words: FrozenSet[str] = frozenset()
+
+
+# Checked in order; the first confident intent wins
+INTENTS = (
+    Intent(
+        "current_role", "experience",
+        triggers=frozenset({"current", "currently", "now"}),
+        words=frozenset({"role", "position", "job", "title", "doing", "working", "work", "works", "where", "employer", "company"}),
+    ),
+    Intent(
+        "certifications", "certification",
+        triggers=frozenset({"certifications", "certification", "certified", "certificates", "certs"}),
+        words=frozenset({"professional", "hold", "holds", "earned", "get", "got"}),
+    ),
+    Intent(
+        "education", "education",
+        triggers=frozenset({"study", "studied", "education", "educational", "degree", "degrees", "school", "university",
+                            "universities", "college", "graduate", "graduated", "academic"}),
+        words=frozenset({"where", "background", "go", "went", "attend", "attended", "hold", "holds", "qualifications", "from"}),
+    ),
+    Intent(
+        "skills", "skills",
+        triggers=frozenset({"skills", "skill", "skillset", "stack", "technologies"}),
+        words=frozenset({"technical", "tech", "key", "main", "core", "top", "hard"}),
+    ),
+    Intent(
+        "experience", "experience",
+        triggers=frozenset({"experience", "worked", "work", "employers", "companies", "jobs", "career", "employment"}),
+        words=frozenset({"where", "professional", "previous", "past", "history", "has", "for", "summary", "background"}),
+    ),
+)
+
+# Record types loaded from the collection
+RECORD_TYPES = {intent.record_type for intent in INTENTS}
+
+# `to` values of an ongoing position
+ONGOING = {"", "present", "current", "now", "n/a"}
+
+
+def question_words(question: str) -> List[str]:
+    """Lowercase words of a question, possessives removed"""
+    return re.findall(r"[a-z0-9+#]+", re.sub(r"['’]s\b", "", question.lower()))
+
+
+def classify(question: str, owner: str) -> Tuple[Optional[Intent], float]:
+    """
+    Structured intent of a question.
+
+    Args:
+        question: Question (raw or preprocessed)
+        owner: Portfolio owner (their name counts as understood)
+
+    Returns:
+        (intent, confidence): the first intent whose trigger appears, with the
+        share of words it understands; (None, 0.0) when no intent is named
+    """
+    words = question_words(question)
+    if not words:
+        return None, 0.0
+    names = set(question_words(owner))
+    for intent in INTENTS:
+        if intent.triggers.isdisjoint(words):
+            continue
+        known = FILLER_WORDS | names | intent.triggers | intent.words
+        return intent, sum(word in known for word in words) / len(words)
+    return None, 0.0
+
+
+def _dates(metadata: Dict[str, Any]) -> str:
+    start, end = metadata.get("from") or "N/A", metadata.get("to") or "Present"
+    return f" ({start} - {end})" if start != "N/A" else ""
+
+
+def _is_ongoing(metadata: Dict[str, Any]) -> bool:
+    return str(metadata.get("to") or "").strip().lower() in ONGOING
+
+
+def _skills(doc: Document) -> List[str]:
+    """Skill names of a "Technical Skills: a, b, c" chunk"""
+    return [skill.strip() for skill in doc.page_content.split(":", 1)[-1].split(",") if skill.strip()]
+
+
+def render(intent: Intent, records: List[Document], owner: str) -> Optional[Tuple[str, List[Document]]]:
+    """
+    Templated answer for an intent.
+
+    Returns:
+        (answer, records used), or None when the records cannot answer it
+    """
+    name = first_name(owner)
+    metadata = [doc.metadata for doc in records]
+
+    if intent.name == "current_role":
+        current = [doc for doc in records if _is_ongoing(doc.metadata)]
+        if not current:
+            return None
+        roles = [f"{doc.metadata['position']} at {doc.metadata['company']}" for doc in current]
+        since = current[0].metadata.get("from")
+        suffix = f" (since {since})" if len(current) == 1 and since and since != "N/A" else ""
+        return f"{name} is currently {' and '.join(roles)}{suffix}.", current
+
+    if intent.name == "skills":
+        skills = list(dict.fromkeys(skill for doc in records for skill in _skills(doc)))
+        if not skills:
+            return None
+        return f"{name}'s technical skills: {', '.join(skills)}.", records
+
+    if intent.name == "education":
+        lines = [f"- {m['degree']}, {m['institution']}{_dates(m)}" for m in metadata]
+        return f"{name}'s education:\n" + "\n".join(lines), records
+
+    if intent.name == "experience":
+        lines = [f"- {m['position']} at {m['company']}{_dates(m)}" for m in metadata]
+        return f"{name}'s work experience:\n" + "\n".join(lines), records
+
+    if intent.name == "certifications":
+        lines = [f"- {m['name']}" + (f" ({m['year']})" if m.get("year") and m["year"] != "N/A" else "") for m in metadata]
+        return f"{name}'s certifications:\n" + "\n".join(lines), records
+
+    return None
+
+
+# Metadata every record of a type needs to be templated
+REQUIRED_FIELDS = {
+    "experience": ("company", "position"),
+    "education": ("institution", "degree"),
+    "certification": ("name",),
+    "skills": (),
+}
+
+
+class StructuredAnswerer:
+    """
+    Templated answers over a tenant's typed records.
+
+    Records are replaced wholesale by `set_records` (after ingestion), so
+    reads need no locking.
+    """
+
+    def __init__(self, owner: Optional[str] = None, min_confidence: Optional[float] = None):
+        """
+        Args:
+            owner: Portfolio owner named in answers (default: PORTFOLIO_OWNER)
+            min_confidence: Share of understood words needed to answer
+                (default: STRUCTURED_MIN_CONFIDENCE)
+        """
+        self.owner = owner or config.PORTFOLIO_OWNER
+        self.min_confidence = config.STRUCTURED_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        self._records: Dict[str, List[Document]] = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.answers = 0
+
+    def set_records(self, chunks: Iterable[Dict[str, Any]]):
+        """
+        Replace the records from chunk payloads.
+
+        Args:
+            chunks: langchain_qdrant payloads ({"page_content", "metadata"}),
+                with the point ID as metadata `_id` when known
+        """
+        records: Dict[str, List[Document]] = {}
+        for chunk in chunks:
+            metadata = chunk.get("metadata") or {}
+            record_type = metadata.get("type")
+            if record_type not in RECORD_TYPES or not all(metadata.get(field) for field in REQUIRED_FIELDS[record_type]):
+                continue
+            records.setdefault(record_type, []).append(Document(page_content=chunk.get("page_content") or "", metadata=metadata))
+        self._records = records
+
+    def answer(self, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Structured answer to a question, if it is a confident structured intent.
+
+        Args:
+            question: Question (raw or preprocessed)
+
+        Returns:
+            Chat result dictionary flagged `structured`, or None to use the RAG chain
+        """
+        intent, confidence = classify(question, self.owner)
+        answered = None
+        if intent is not None and confidence >= self.min_confidence and self._records.get(intent.record_type):
+            answered = render(intent, self._records[intent.record_type], self.owner)
+
+        with self._lock:
+            self.lookups += 1
+            self.answers += answered is not None
+        if answered is None:
+            return None
+
+        text, used = answered
+        return {
+            "response": text,
+            "sources": [source_from_document(doc) for doc in used],
+            "success": True,
+            "degraded": False,
+            "structured": True,
+            "intent": intent.name,
+            "confidence": round(confidence, 3),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup and answer counts and loaded records per type"""
+        return {
+            "lookups": self.lookups,
+            "answers": self.answers,
+            "records": sum(len(records) for records in self._records.values()),
+        }
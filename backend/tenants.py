@@ -0,0 +1,338 @@
+"""
+Multi-tenant serving for the RAG chatbot.
+Hosts several portfolios from one backend: each tenant has its own collection, prompt owner and data sources.
+
+Tenants are listed in a JSON file (TENANTS_PATH); the default tenant always
+exists and is built from the single-portfolio settings (COLLECTION_NAME,
+PORTFOLIO_OWNER, GITHUB_USERNAME, ...). Requests pick a tenant with a
+`/t/{tenant}/...` path prefix or the TENANT_HEADER header.
+
+Clients, embeddings, the LLM and the shared caches are shared by all
+tenants. Per-tenant retrieval state (vector store, retriever, FAQ index,
+query vocabulary, structured records, answer cache namespace) is built on a tenant's first
+request and kept in an LRU of TENANT_CACHE_SIZE tenants per worker.
+
+Example TENANTS_PATH file:
+    [{"id": "jane", "owner": "Jane Doe", "github_username": "janedoe",
+      "devto_username": "janedoe", "resume_path": "tenants/jane/resume.pdf",
+      "portfolio_config_path": "tenants/jane/gitprofile.config.ts",
+      "ingest_interval": 7200}]
+"""
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, TypeVar
+
+import orjson
+from langchain_qdrant import QdrantVectorStore
+
+from config import config
+from faq import FAQIndex
+from query_preprocess import QueryPreprocessor, collection_chunks, vocabulary_from_chunks
+from retrieval import RetrievalPolicy, RetrievalStats, ScoredRetriever
+from shared_cache import LRUCache, SharedCache, answer_cache
+from structured_answers import StructuredAnswerer
+from vector_index import index_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Tenant IDs appear in URLs, collection names and cache namespaces
+TENANT_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,62}$")
+
+# Path prefix that selects a tenant: /t/{tenant}/api/chat
+TENANT_PATH_PREFIX = "/t/"
+
+
+class TenantConfigError(ValueError):
+    """Raised when the tenants file is malformed"""
+
+
+class UnknownTenantError(KeyError):
+    """Raised when a request names a tenant that is not configured"""
+
+
+@dataclass(frozen=True)
+class Tenant:
+    """One hosted portfolio"""
+    id: str
+    owner: str
+    collection: str
+    faq_collection: str
+    github_username: str = ""
+    devto_username: str = ""
+    resume_path: str = ""
+    portfolio_config_path: str = ""
+    ingest_interval: int = 0  # 0 = INGEST_INTERVALS / INGEST_DEFAULT_INTERVAL
+
+    @property
+    def is_default(self) -> bool:
+        return self.id == config.DEFAULT_TENANT
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "Tenant":
+        """
+        Build a tenant from a TENANTS_PATH entry.
+
+        Collections default to `<COLLECTION_NAME>-<id>` and `<collection>-faq`.
+
+        Raises:
+            TenantConfigError: If the ID or owner is missing or invalid, or
+                the entry has unknown keys
+        """
+        tenant_id = str(entry.get("id", ""))
+        if not TENANT_ID_PATTERN.match(tenant_id):
+            raise TenantConfigError(f"Invalid tenant id '{tenant_id}' (lowercase letters, digits, '-' and '_')")
+        if not entry.get("owner"):
+            raise TenantConfigError(f"Tenant '{tenant_id}' has no owner")
+        unknown = set(entry) - {field.name for field in fields(cls)}
+        if unknown:
+            raise TenantConfigError(f"Tenant '{tenant_id}' has unknown keys: {', '.join(sorted(unknown))}")
+
+        collection = entry.get("collection") or f"{config.COLLECTION_NAME}-{tenant_id}"
+        return cls(**{**entry, "collection": collection, "faq_collection": entry.get("faq_collection") or f"{collection}-faq"})
+
+
+def default_tenant() -> Tenant:
+    """The single-portfolio tenant described by the main configuration"""
+    return Tenant(
+        id=config.DEFAULT_TENANT,
+        owner=config.PORTFOLIO_OWNER,
+        collection=config.COLLECTION_NAME,
+        faq_collection=config.FAQ_COLLECTION_NAME,
+        github_username=config.GITHUB_USERNAME,
+        devto_username=config.DEV_TO_USERNAME,
+        resume_path=config.RESUME_PDF_PATH,
+        portfolio_config_path=config.PORTFOLIO_CONFIG_PATH,
+    )
+
+
+def load_tenants(path: str) -> List[Tenant]:
+    """
+    Tenants listed in a JSON file (a list of tenant objects).
+
+    Raises:
+        TenantConfigError: If the file is not a list of valid, uniquely
+            named tenants
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise TenantConfigError(f"{path} must contain a JSON list of tenants")
+
+    tenants = [Tenant.from_dict(entry) for entry in entries]
+    ids = [tenant.id for tenant in tenants]
+    duplicates = sorted({tenant_id for tenant_id in ids if ids.count(tenant_id) > 1})
+    if duplicates:
+        raise TenantConfigError(f"Duplicate tenant ids in {path}: {', '.join(duplicates)}")
+    return tenants
+
+
+class TenantRegistry:
+    """Configured tenants by ID; the default tenant is always present"""
+
+    def __init__(self, tenants: Optional[List[Tenant]] = None):
+        self._tenants: Dict[str, Tenant] = {config.DEFAULT_TENANT: default_tenant()}
+        for tenant in tenants or []:
+            self._tenants[tenant.id] = tenant
+
+    @classmethod
+    def from_config(cls) -> "TenantRegistry":
+        """Registry of the default tenant plus any tenants in TENANTS_PATH"""
+        return cls(load_tenants(config.TENANTS_PATH) if config.TENANTS_PATH else None)
+
+    def get(self, tenant_id: Optional[str] = None) -> Tenant:
+        """
+        Look up a tenant.
+
+        Args:
+            tenant_id: Tenant ID (default: DEFAULT_TENANT)
+
+        Raises:
+            UnknownTenantError: If no such tenant is configured
+        """
+        tenant = self._tenants.get(tenant_id or config.DEFAULT_TENANT)
+        if tenant is None:
+            raise UnknownTenantError(tenant_id)
+        return tenant
+
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._tenants
+
+    def __iter__(self) -> Iterator[Tenant]:
+        return iter(self._tenants.values())
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+
+class TenantStates(Generic[T]):
+    """
+    Per-tenant state, built on first use and kept for the most recently
+    used `max_entries` tenants.
+    """
+
+    def __init__(self, build: Callable[[Tenant], T], max_entries: int):
+        """
+        Args:
+            build: Creates a tenant's state (may do I/O)
+            max_entries: Tenants kept before the least recently used is evicted
+        """
+        self.build = build
+        self._states = LRUCache(max(1, max_entries))
+        self._build_lock = threading.Lock()
+        self.builds = 0
+
+    def peek(self, tenant_id: str) -> Optional[T]:
+        """State of a tenant if it is loaded (counted as an LRU lookup)"""
+        return self._states.get_many([tenant_id]).get(tenant_id)
+
+    def get(self, tenant: Tenant) -> T:
+        """State of a tenant, building it if needed"""
+        state = self.peek(tenant.id)
+        return state if state is not None else self.load(tenant)
+
+    def load(self, tenant: Tenant) -> T:
+        """Build a tenant's state unless it is already loaded (one build at a time)"""
+        with self._build_lock:
+            # Another thread may have built it while this one waited
+            state = self._states.peek(tenant.id)
+            if state is None:
+                state = self.build(tenant)
+                self._states.set_many({tenant.id: state})
+                self.builds += 1
+        return state
+
+    def loaded(self) -> List[T]:
+        """States currently loaded (not counted as lookups)"""
+        return [state for state in (self._states.peek(key) for key in self._states.keys()) if state is not None]
+
+    def clear(self):
+        """Drop every loaded state (e.g. after rebinding clients in a forked worker)"""
+        self._states.clear()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def stats(self) -> Dict[str, Any]:
+        """Loaded tenants, builds and LRU counters"""
+        return {**self._states.stats(), "builds": self.builds}
+
+
+def tenant_answer_cache(tenant: Tenant) -> SharedCache:
+    """Answer cache of a tenant: the shared "answers" namespace for the default tenant, its own namespace otherwise"""
+    if tenant.is_default:
+        return answer_cache
+    return SharedCache(
+        config.SHARED_CACHE_PATH,
+        namespace=f"answers:{tenant.id}",
+        ttl_seconds=config.ANSWER_CACHE_TTL_SECONDS,
+        max_entries=config.ANSWER_CACHE_MAX_ENTRIES,
+        dumps=orjson.dumps,
+        loads=orjson.loads,
+    )
+
+
+class TenantChain:
+    """
+    Retrieval state of one tenant, built on the shared clients and embeddings.
+
+    Holds the tenant's vector store and retriever, FAQ index, query
+    preprocessor (with the vocabulary of the tenant's collection),
+    structured answerer (with its typed records) and answer cache.
+    """
+
+    def __init__(self, tenant: Tenant, qdrant_client, async_qdrant_client, embeddings, load_vocabulary: bool = False):
+        """
+        Args:
+            tenant: Tenant served
+            qdrant_client: Shared sync Qdrant client
+            async_qdrant_client: Shared async Qdrant client
+            embeddings: Shared (cached) query embeddings
+            load_vocabulary: Load the typo-correction vocabulary and structured
+                records now (one scroll of the collection); failures leave them empty
+        """
+        self.tenant = tenant
+        self.qdrant_client = qdrant_client
+        self.preprocessor = QueryPreprocessor()
+        self.structured = StructuredAnswerer(tenant.owner)
+        self.answer_cache = tenant_answer_cache(tenant)
+
+        self.vector_store = QdrantVectorStore(
+            client=qdrant_client,
+            collection_name=tenant.collection,
+            embedding=embeddings,
+        )
+        # Threshold and dynamic k applied to scored candidates (calibrated per embedding model)
+        self.retrieval_stats = RetrievalStats()
+        self.retriever = ScoredRetriever(
+            vector_store=self.vector_store,
+            policy=RetrievalPolicy.from_config(),
+            stats=self.retrieval_stats,
+            search_params=index_settings.search_params(),
+        )
+
+        # Precomputed FAQ answers (separate collection per tenant)
+        self.faq = FAQIndex(
+            qdrant_client, async_qdrant_client, embeddings,
+            collection_name=tenant.faq_collection,
+            normalize=self.search_text,
+            source_collection=tenant.collection,
+            owner=tenant.owner,
+        )
+
+        if load_vocabulary:
+            try:
+                self.refresh_vocabulary()
+            except Exception as e:
+                logger.warning(f"Could not load the query vocabulary of tenant '{tenant.id}': {str(e)}")
+
+    def search_text(self, question: str) -> str:
+        """Preprocessed question used for retrieval and cache keys (QUERY_PREPROCESSING)"""
+        return self.preprocessor.normalize(question) if config.QUERY_PREPROCESSING else question
+
+    def refresh_vocabulary(self) -> int:
+        """
+        Rebuild the typo-correction vocabulary and structured records from the tenant's collection.
+
+        Returns:
+            Number of ingested terms
+        """
+        chunks = collection_chunks(self.qdrant_client, self.tenant.collection)
+        vocabulary = vocabulary_from_chunks(chunks)
+        self.preprocessor.set_vocabulary(vocabulary)
+        self.structured.set_records(chunks)
+        return len(vocabulary)
+
+
+class TenantRoutingMiddleware:
+    """
+    ASGI middleware routing `/t/{tenant}/<path>` to `<path>`.
+
+    The tenant ID is stored in the request scope (`scope["tenant"]`), so
+    every endpoint serves any tenant without tenant-specific routes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(TENANT_PATH_PREFIX):
+            tenant_id, _, rest = scope["path"][len(TENANT_PATH_PREFIX):].partition("/")
+            if tenant_id:
+                prefix = f"{TENANT_PATH_PREFIX}{tenant_id}"
+                raw_path = scope.get("raw_path")
+                scope = {
+                    **scope,
+                    "path": f"/{rest}",
+                    "raw_path": raw_path[len(prefix.encode()):] if raw_path else raw_path,
+                    "tenant": tenant_id,
+                }
+        await self.app(scope, receive, send)
+
+
+# Create a singleton instance
+tenant_registry = TenantRegistry.from_config()
@@ -0,0 +1,147 @@
+"""
+Tests for chat admission control and per-client rate limiting.
+
+Run with: python -m pytest test_admission.py
+"""
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected, TokenBucketLimiter
+
+
+async def settle(condition, timeout: float = 2.0):
+    """Yield to the event loop until `condition()` holds"""
+    async def wait():
+        while not condition():
+            await asyncio.sleep(0)
+    await asyncio.wait_for(wait(), timeout)
+
+
+def run(scenario, timeout: float = 5.0):
+    """Run a scenario coroutine with an overall timeout"""
+    async def bounded():
+        return await asyncio.wait_for(scenario(), timeout)
+    return asyncio.run(bounded())
+
+
+class FakeClock:
+    """Manually advanced time source"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_limits():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate_per_minute=60, burst=3, clock=clock)
+
+    assert [limiter.acquire("ip:a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("ip:a") == pytest.approx(1.0)
+
+    # Other clients have their own bucket
+    assert limiter.acquire("ip:b") == 0.0
+
+    clock.now = 1.0
+    assert limiter.acquire("ip:a") == 0.0
+    assert limiter.stats()["limited"] == 1
+
+
+def test_token_bucket_charges_large_requests_as_debt():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate_per_minute=60, burst=5, clock=clock)
+
+    # A 20-question batch is allowed from a full bucket...
+    assert limiter.acquire("ip:a", cost=20) == 0.0
+    # ...and then the client waits for the debt plus one token
+    assert limiter.acquire("ip:a") == pytest.approx(16.0)
+
+    clock.now = 16.0
+    assert limiter.acquire("ip:a") == 0.0
+
+
+def test_token_bucket_disabled_and_evicts_idle_clients():
+    assert TokenBucketLimiter(rate_per_minute=0, burst=1).acquire("ip:a") == 0.0
+
+    limiter = TokenBucketLimiter(rate_per_minute=60, burst=1, max_clients=2, clock=FakeClock())
+    for key in ("ip:a", "ip:b", "ip:c"):
+        limiter.acquire(key)
+    assert list(limiter.buckets) == ["ip:b", "ip:c"]
+
+
+def test_admission_rejects_when_queue_full():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=2, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        holders = [asyncio.create_task(hold()) for _ in range(3)]
+        await settle(lambda: controller.active == 2 and controller.waiting == 1)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with controller.admit():
+                pass
+        assert rejected.value.status_code == 503
+        assert int(rejected.value.headers["Retry-After"]) >= 1
+
+        release.set()
+        await asyncio.gather(*holders)
+        return controller.stats()
+
+    stats = run(scenario)
+    assert stats["admitted"] == 3
+    assert stats["rejected_queue_full"] == 1
+    assert stats["max_queue_depth_seen"] <= 3
+    assert stats["active"] == 0 and stats["queue_depth"] == 0
+
+
+def test_admission_times_out_queued_requests():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await settle(lambda: controller.active == 1)
+        with pytest.raises(AdmissionRejected):
+            async with controller.admit():
+                pass
+
+        release.set()
+        await holder
+        return controller.stats()
+
+    stats = run(scenario)
+    assert stats["rejected_timeout"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_admission_bounds_a_same_tick_burst():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=2, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        # All ten requests arrive before any of them acquires a slot
+        tasks = [asyncio.create_task(hold()) for _ in range(10)]
+        await settle(lambda: sum(task.done() for task in tasks) == 7)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return controller.stats(), results
+
+    stats, results = run(scenario)
+    assert sum(isinstance(result, AdmissionRejected) for result in results) == 7
+    assert stats["admitted"] == 3
+    assert stats["max_queue_depth_seen"] <= 3
@@ -0,0 +1,171 @@
+"""
+Tests for batch chat: input order, per-question failures, one embedding call and one search per batch, and shared shortcuts.
+Uses an in-memory Qdrant collection, deterministic fake embeddings and a fake LLM.
+
+Run with: python -m pytest test_batch.py
+"""
+import asyncio
+from typing import List
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.messages import AIMessage
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from config import Config, config
+
+# rag_chain and main build their singletons on import; placeholder credentials
+# satisfy config.validate (no request is made with them)
+for _name, _value in (("OPENAI_API_KEY", "test-key"), ("QDRANT_API_KEY", "test-key"), ("QDRANT_URL", "https://localhost:6333")):
+    if not getattr(Config, _name):
+        setattr(Config, _name, _value)
+
+import main  # noqa: E402
+import rag_chain as rag_chain_module  # noqa: E402
+from retrieval import RetrievalPolicy  # noqa: E402
+from shared_cache import SharedCache, _pack_vector, _unpack_vector, answer_key  # noqa: E402
+
+VECTOR_SIZE = 256
+
+CHUNKS = [
+    "Technical Skills: Python, Docker, Kubernetes",
+    "Work Experience: Consultant at EY (2021 - Present)",
+    "Projects: FinRL trading agents",
+]
+
+# Its metadata is not a mapping, so building the document for it fails
+CORRUPT = "Awards: corrupted record"
+
+# Provider calls, shared by every CountingEmbeddings instance (pydantic models)
+embed_calls: List[List[str]] = []
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings recording every batch sent to the provider"""
+
+    async def aembed_documents(self, texts):
+        embed_calls.append(list(texts))
+        return self.embed_documents(texts)
+
+
+class CountingAsyncQdrant:
+    """Async facade over an in-memory client, recording batch searches"""
+
+    def __init__(self, client: QdrantClient):
+        self.client = client
+        self.batches = []
+
+    async def search_batch(self, collection_name, requests):
+        self.batches.append((collection_name, len(requests)))
+        return self.client.search_batch(collection_name, requests)
+
+    async def search(self, **kwargs):
+        return self.client.search(**kwargs)
+
+
+class FakeLLM:
+    """Answers with the question it was asked"""
+
+    def __init__(self):
+        self.questions = []
+
+    async def ainvoke(self, messages, config=None):
+        question = messages[-1].content.rsplit("Question:", 1)[-1].strip()
+        self.questions.append(question)
+        return AIMessage(content=f"answer to {question}")
+
+
+class FakeClients:
+    def __init__(self, qdrant, async_qdrant, embeddings, llm):
+        self._clients = {"qdrant": qdrant, "async_qdrant": async_qdrant, "embeddings": embeddings, "llm": llm}
+
+    def __getattr__(self, name):
+        return lambda: self._clients[name]
+
+
+@pytest.fixture
+def chain(tmp_path, monkeypatch):
+    """RAGChain on fake clients, with FAQ answers off unless a test turns them on"""
+    embed_calls.clear()
+    for name, value in (("QUERY_PREPROCESSING", False), ("FAQ_ENABLED", False), ("ANSWER_CACHE_TTL_SECONDS", 3600)):
+        monkeypatch.setattr(config, name, value)
+
+    client = QdrantClient(":memory:")
+    collection = config.COLLECTION_NAME
+    client.create_collection(collection, vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE))
+    embeddings = DeterministicFakeEmbedding(size=VECTOR_SIZE)
+    client.upsert(collection, points=[
+        PointStruct(id=index, vector=embeddings.embed_query(text), payload={"page_content": text, "metadata": {"type": "skills"}})
+        for index, text in enumerate(CHUNKS)
+    ] + [
+        PointStruct(id=len(CHUNKS), vector=embeddings.embed_query(CORRUPT), payload={"page_content": CORRUPT, "metadata": "corrupt"}),
+    ])
+
+    async_client = CountingAsyncQdrant(client)
+    fake_clients = FakeClients(client, async_client, CountingEmbeddings(size=VECTOR_SIZE), FakeLLM())
+    monkeypatch.setattr(rag_chain_module, "clients", fake_clients)
+    monkeypatch.setattr(rag_chain_module, "embedding_cache", SharedCache(
+        str(tmp_path / "shared.sqlite3"), namespace="query_embeddings", dumps=_pack_vector, loads=_unpack_vector,
+    ))
+
+    rag = rag_chain_module.RAGChain()
+    tenant_chain = rag.tenant_chain()
+    tenant_chain.answer_cache = SharedCache(str(tmp_path / "shared.sqlite3"), namespace="answers", dumps=orjson.dumps, loads=orjson.loads)
+    tenant_chain.retriever.policy = RetrievalPolicy(threshold=0.7, min_k=1, max_k=4, min_gap=0.0)
+    return rag
+
+
+def test_batch_keeps_order_isolates_failures_and_batches_provider_calls(chain):
+    questions = [CHUNKS[2], CORRUPT, CHUNKS[0]]
+
+    results = asyncio.run(chain.query_batch(questions))
+
+    assert [result["response"] for result in (results[0], results[2])] == [f"answer to {CHUNKS[2]}", f"answer to {CHUNKS[0]}"]
+    assert results[0]["success"] and results[2]["success"] and not results[0]["degraded"]
+    assert results[1]["success"] is False and results[1]["error"]
+    # One embedding call and one search for the whole batch
+    assert embed_calls == [questions]
+    assert chain.async_qdrant_client.batches == [(config.COLLECTION_NAME, 3)]
+
+
+def test_batch_takes_the_same_shortcuts_as_single_questions(chain, monkeypatch):
+    monkeypatch.setattr(config, "FAQ_ENABLED", True)
+    tenant_chain = chain.tenant_chain()
+    cached_question, faq_question, new_question = "Cached question?", "Faq question?", CHUNKS[1]
+    tenant_chain.answer_cache.set(answer_key(cached_question), {"response": "from cache", "sources": [], "success": True, "degraded": False})
+    chain.qdrant_client.create_collection(tenant_chain.tenant.faq_collection, vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE))
+    chain.qdrant_client.upsert(tenant_chain.tenant.faq_collection, points=[PointStruct(
+        id=1, vector=DeterministicFakeEmbedding(size=VECTOR_SIZE).embed_query(faq_question), payload={"response": "from faq", "sources": []},
+    )])
+
+    results = asyncio.run(chain.query_batch([cached_question, faq_question, new_question]))
+
+    assert [result["response"] for result in results] == ["from cache", "from faq", f"answer to {new_question}"]
+    assert [result.get("served_by") for result in results] == ["cache", "faq", None]
+    assert chain.llm.questions == [new_question]
+    # The cached question is not embedded; the FAQ and chunk searches are one batch each
+    assert embed_calls == [[faq_question, new_question]]
+    assert chain.async_qdrant_client.batches == [(tenant_chain.tenant.faq_collection, 2), (config.COLLECTION_NAME, 1)]
+
+    # The generated answer is cached like a single question's
+    assert asyncio.run(chain.query(new_question))["served_by"] == "cache"
+    assert chain.llm.questions == [new_question]
+
+
+def test_batch_endpoint_reports_every_question_in_order(chain, monkeypatch):
+    monkeypatch.setattr(main, "rag_chain", chain)
+    client = TestClient(main.app)
+
+    response = client.post("/api/chat/batch", json={"messages": [CHUNKS[0], CORRUPT, CHUNKS[2]]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is False
+    assert [(item["index"], item["message"], item["success"]) for item in body["results"]] == [
+        (0, CHUNKS[0], True), (1, CORRUPT, False), (2, CHUNKS[2], True),
+    ]
+    assert body["results"][1]["error"] and body["results"][2]["response"] == f"answer to {CHUNKS[2]}"
+    assert response.headers["X-Served-By"] == "llm,error,llm"
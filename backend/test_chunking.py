@@ -0,0 +1,108 @@
+"""
+Tests for the per-type chunking policies.
+
+Run with: python -m pytest test_chunking.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.documents import Document
+
+from chunking import Chunker
+
+
+def count_words(text: str) -> int:
+    """Deterministic token counter for tests (one token per word)"""
+    return len(text.split())
+
+
+def make_chunker() -> Chunker:
+    return Chunker(chunk_size=50, chunk_overlap=5, atomic_max_tokens=200, count_tokens=count_words)
+
+
+def test_structured_documents_stay_whole():
+    doc = Document(page_content="Work Experience: " + "word " * 120, metadata={"source": "portfolio_config", "type": "experience"})
+    chunks = make_chunker().split_documents([doc])
+
+    assert len(chunks) == 1
+    assert chunks[0].metadata["chunk_policy"] == "atomic"
+
+
+def test_oversized_atomic_document_falls_back_to_token_split():
+    doc = Document(page_content="word " * 500, metadata={"source": "portfolio_config", "type": "skills"})
+    chunks = make_chunker().split_documents([doc])
+
+    assert len(chunks) > 1
+    assert all(count_words(chunk.page_content) <= 50 for chunk in chunks)
+
+
+def test_pdf_sections_repeat_heading_in_every_chunk():
+    doc = Document(
+        page_content="Experience - EY\n" + "word " * 200,
+        metadata={"source": "resume", "type": "resume_pdf", "section": "Experience", "subsection": "EY"},
+    )
+    chunks = make_chunker().split_documents([doc])
+
+    assert len(chunks) > 1
+    assert all(chunk.page_content.startswith("Experience - EY") for chunk in chunks)
+    assert [chunk.metadata["chunk_index"] for chunk in chunks] == list(range(len(chunks)))
+
+
+def test_heading_prefixed_chunks_fit_chunk_size():
+    doc = Document(
+        page_content="word " * 400,
+        metadata={"source": "resume", "type": "resume_pdf", "section": "Projects and Research", "subsection": "Georgia Tech"},
+    )
+    chunks = make_chunker().split_documents([doc])
+
+    assert len(chunks) > 1
+    assert all(chunk.metadata["token_count"] <= 50 for chunk in chunks)
+
+
+def test_markdown_split_on_headings():
+    doc = Document(page_content="# Intro\nhello there\n## Usage\nrun it", metadata={"source": "docs", "type": "markdown"})
+    chunks = make_chunker().split_documents([doc])
+
+    assert [chunk.metadata["section"] for chunk in chunks] == ["Intro", "Intro > Usage"]
+
+
+def test_summary_reports_per_source_statistics():
+    chunker = make_chunker()
+    chunker.split_documents([
+        Document(page_content="a b c", metadata={"source": "github", "type": "project"}),
+        Document(page_content="a b c d e", metadata={"source": "github", "type": "project"}),
+        Document(page_content="x y", metadata={"source": "blog", "type": "article"}),
+    ])
+    summary = chunker.summary()
+
+    assert summary["github"] == {
+        "documents": 2,
+        "chunks": 2,
+        "min_tokens": 3,
+        "mean_tokens": 4.0,
+        "max_tokens": 5,
+        "total_tokens": 8,
+    }
+    assert summary["blog"]["chunks"] == 1
+
+
+def test_concurrent_splits_keep_their_own_stats_and_leave_inputs_alone():
+    chunker = make_chunker()
+    batches = {
+        source: [Document(page_content=" ".join(["word"] * (index + 1)), metadata={"source": source, "type": "skills"}) for index in range(50)]
+        for source in ("github", "blog", "resume", "devto")
+    }
+
+    def split(source):
+        stats = {}
+        chunks = chunker.split_documents(batches[source], stats)
+        return source, chunks, stats
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(split, batches))
+
+    for source, chunks, stats in results:
+        assert list(stats) == [source] and chunker.summary(stats)[source]["documents"] == 50
+        assert len(chunks) == 50 and all(chunk.metadata["source"] == source for chunk in chunks)
+        # Atomic chunks are copies: the loaded documents gain no chunk metadata
+        assert all(chunk is not doc for chunk, doc in zip(chunks, batches[source]))
+        assert all(set(doc.metadata) == {"source", "type"} for doc in batches[source])
@@ -0,0 +1,91 @@
+"""
+Tests for the shared client factory: one pooled client per kind, closing on shutdown and fresh clients after fork.
+No request is sent; clients are only constructed.
+
+Run with: python -m pytest test_clients.py
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from clients import ClientFactory, clients
+from config import config
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setattr(config, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(config, "QDRANT_URL", "https://localhost:6333")
+
+
+def test_clients_are_created_once_and_shared():
+    factory = ClientFactory()
+    barrier = threading.Barrier(8)
+    created = []
+
+    def first_use():
+        barrier.wait()
+        created.append(factory.http_client())
+
+    threads = [threading.Thread(target=first_use) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Concurrent first use builds one pool
+    assert len({id(client) for client in created}) == 1
+    assert factory.qdrant() is factory.qdrant() and factory.async_qdrant() is factory.async_qdrant()
+    # The OpenAI clients run on the pooled HTTP clients
+    assert factory.embeddings() is factory.embeddings()
+    assert factory.embeddings().http_client is created[0] is factory.llm().http_client
+    assert factory.embeddings().http_async_client is factory.async_http_client()
+
+
+def test_close_and_aclose_close_the_pooled_clients(monkeypatch):
+    factory = ClientFactory()
+    http, async_http = factory.http_client(), factory.async_http_client()
+    qdrant, async_qdrant = factory.qdrant(), factory.async_qdrant()
+    embeddings = factory.embeddings()
+    closed = []
+    monkeypatch.setattr(qdrant, "close", lambda **kwargs: closed.append("qdrant"))
+
+    async def close_async_qdrant(**kwargs):
+        closed.append("async_qdrant")
+
+    monkeypatch.setattr(async_qdrant, "close", close_async_qdrant)
+
+    factory.close()
+    assert http.is_closed and closed == ["qdrant"] and not async_http.is_closed
+    # Nothing built on a closed pool is handed out again
+    assert factory.http_client() is not http and factory.embeddings() is not embeddings
+
+    asyncio.run(factory.aclose())
+    assert async_http.is_closed and closed == ["qdrant", "async_qdrant"]
+    assert factory._clients == {}
+
+
+def _report_child_clients(queue):
+    http = clients.http_client()
+    queue.put((dict(clients._clients) == {"http": http}, getattr(http, "inherited", False)))
+
+
+@pytest.mark.skipif(not hasattr(os, "register_at_fork"), reason="fork() is not available")
+def test_forked_children_get_fresh_clients():
+    parent = clients.http_client()
+    parent.inherited = True
+    try:
+        queue = multiprocessing.get_context("fork").Queue()
+        child = multiprocessing.get_context("fork").Process(target=_report_child_clients, args=(queue,))
+        child.start()
+        only_new_client, inherited = queue.get(timeout=30)
+        child.join(30)
+
+        assert only_new_client and not inherited
+        # The parent keeps its own pool
+        assert clients.http_client() is parent and not parent.is_closed
+    finally:
+        clients.close()
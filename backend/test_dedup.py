@@ -0,0 +1,120 @@
+"""
+Tests for near-duplicate chunk removal: MinHash/LSH detection, provenance and the ingestion dedup stage.
+Uses an in-memory Qdrant collection and deterministic fake embeddings.
+
+Run with: python -m pytest test_dedup.py
+"""
+from datetime import datetime
+from typing import List
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+
+from chunking import Chunker
+from config import config
+from dedup import Deduplicator, jaccard, shingles
+from ingest import DataIngestion, DataLoader
+from shared_cache import SharedCache
+
+RESUME_EY = "Consultant at Ernst & Young (EY), 2021 - present. Built machine learning pipelines on Azure for Fortune 500 clients."
+CONFIG_EY = "Consultant at Ernst & Young (EY) 2021 - Present: built machine-learning pipelines on Azure for Fortune 500 clients"
+GITHUB_REPO = "finrl_trading: reinforcement learning agents for portfolio allocation, written in Python with PyTorch."
+
+
+class FakeLoader(DataLoader):
+    def __init__(self, texts: List[str], doc_type: str = "experience"):
+        self.texts = texts
+        self.doc_type = doc_type
+
+    def load(self) -> List[Document]:
+        return [
+            Document(page_content=text, metadata={"source": "fake", "type": self.doc_type, "last_updated": datetime.now().isoformat()})
+            for text in self.texts
+        ]
+
+
+def make_pipeline(**loaders: List[str]) -> DataIngestion:
+    pipeline = DataIngestion(
+        qdrant_client=QdrantClient(":memory:"),
+        embeddings=DeterministicFakeEmbedding(size=32),
+        chunker=Chunker(count_tokens=lambda text: len(text.split())),
+        answer_cache=SharedCache(":memory:", namespace="answers"),
+        deduplicator=Deduplicator(threshold=0.8, num_perm=128, bands=32, shingle_size=5),
+    )
+    for name, texts in loaders.items():
+        pipeline.register_loader(name, FakeLoader(texts))
+    return pipeline
+
+
+def stored_texts(pipeline: DataIngestion) -> List[str]:
+    points, _ = pipeline.qdrant_client.scroll(config.COLLECTION_NAME, limit=100, with_payload=True)
+    return sorted(point.payload["page_content"] for point in points)
+
+
+def stored_metadata(pipeline: DataIngestion, text: str) -> dict:
+    points, _ = pipeline.qdrant_client.scroll(config.COLLECTION_NAME, limit=100, with_payload=True)
+    return next(point.payload["metadata"] for point in points if point.payload["page_content"] == text)
+
+
+def test_formatting_variants_are_near_duplicates():
+    assert jaccard(shingles(RESUME_EY, 5), shingles(CONFIG_EY, 5)) >= 0.8
+    assert jaccard(shingles(RESUME_EY, 5), shingles(GITHUB_REPO, 5)) < 0.2
+
+
+def test_deduplicate_keeps_longest_and_records_provenance():
+    chunks = [
+        Document(page_content=CONFIG_EY, metadata={"loader": "portfolio_config", "type": "experience", "content_hash": "c"}),
+        Document(page_content=GITHUB_REPO, metadata={"loader": "github_repos", "type": "project", "content_hash": "g"}),
+        Document(page_content=RESUME_EY, metadata={"loader": "resume_pdf", "type": "resume_pdf", "content_hash": "r"}),
+    ]
+
+    result = Deduplicator(threshold=0.8).deduplicate(chunks)
+
+    assert [chunk.metadata["loader"] for chunk in result.kept] == ["github_repos", "resume_pdf"]
+    assert (result.chunks, result.dropped, result.ratio) == (3, 1, 0.333)
+    provenance = result.kept[1].metadata["duplicates"]
+    assert [(entry["loader"], entry["content_hash"]) for entry in provenance] == [("portfolio_config", "c")]
+    assert provenance[0]["similarity"] >= 0.8
+
+
+def test_full_ingest_drops_cross_source_duplicates():
+    pipeline = make_pipeline(resume_pdf=[RESUME_EY, GITHUB_REPO], portfolio_config=[CONFIG_EY])
+
+    result = pipeline.ingest(recreate_collection=True)
+
+    assert (result["chunks"], result["duplicates"]) == (2, 1)
+    assert stored_texts(pipeline) == sorted([RESUME_EY, GITHUB_REPO])
+    assert stored_metadata(pipeline, RESUME_EY)["duplicates"][0]["loader"] == "portfolio_config"
+
+
+def test_sync_skips_chunks_stored_by_other_loaders():
+    pipeline = make_pipeline(resume_pdf=[RESUME_EY], portfolio_config=[CONFIG_EY, "Technical Skills: Rust, Go"])
+    pipeline.sync_loader("resume_pdf")
+
+    result = pipeline.sync_loader("portfolio_config")
+
+    assert (result["added"], result["duplicates"]) == (1, 1)
+    assert stored_texts(pipeline) == sorted([RESUME_EY, "Technical Skills: Rust, Go"])
+    # The stored chunk gains the provenance of the copy that was skipped
+    assert stored_metadata(pipeline, RESUME_EY)["duplicates"][0]["loader"] == "portfolio_config"
+    # Re-syncing neither re-adds the duplicate nor repeats its provenance
+    again = pipeline.sync_loader("portfolio_config", force=True)
+    assert (again["added"], again["duplicates"]) == (0, 1)
+    assert len(stored_metadata(pipeline, RESUME_EY)["duplicates"]) == 1
+
+
+def test_dropped_duplicates_come_back_when_the_kept_chunk_is_deleted():
+    pipeline = make_pipeline(resume_pdf=[RESUME_EY], portfolio_config=[CONFIG_EY, "Technical Skills: Rust, Go"])
+    pipeline.sync_loader("resume_pdf")
+    pipeline.sync_loader("portfolio_config")
+    assert CONFIG_EY not in stored_texts(pipeline)
+
+    # The resume drops its EY chunk; portfolio_config's content hash is unchanged
+    pipeline.loaders["resume_pdf"].texts = [GITHUB_REPO]
+    result = pipeline.sync_loader("resume_pdf")
+
+    assert result["resynced"] == ["portfolio_config"]
+    assert stored_texts(pipeline) == sorted([GITHUB_REPO, CONFIG_EY, "Technical Skills: Rust, Go"])
+    # Without deletions of kept chunks nothing else is re-synced
+    assert pipeline.sync_loader("resume_pdf", force=True)["resynced"] == []
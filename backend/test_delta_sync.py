@@ -0,0 +1,221 @@
+"""
+Tests for per-loader delta sync and the background re-ingestion scheduler.
+Uses an in-memory Qdrant collection and deterministic fake embeddings.
+
+Run with: python -m pytest test_delta_sync.py
+"""
+import asyncio
+import uuid
+from datetime import datetime
+from typing import List
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from chunking import Chunker
+from config import config
+from ingest import DataIngestion, DataLoader, LegacyCollectionError, content_hash
+from scheduler import IngestionScheduler
+from shared_cache import SharedCache
+
+VECTOR_SIZE = 1536
+
+
+class FakeLoader(DataLoader):
+    """Loader returning a configurable list of texts"""
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+
+    def load(self) -> List[Document]:
+        return [
+            Document(page_content=text, metadata={"source": "fake", "type": "skills", "last_updated": datetime.now().isoformat()})
+            for text in self.texts
+        ]
+
+
+def make_pipeline(answer_cache: SharedCache = None, **loaders: List[str]) -> DataIngestion:
+    pipeline = DataIngestion(
+        qdrant_client=QdrantClient(":memory:"),
+        embeddings=DeterministicFakeEmbedding(size=VECTOR_SIZE),
+        chunker=Chunker(count_tokens=lambda text: len(text.split())),
+        answer_cache=answer_cache if answer_cache is not None else SharedCache(":memory:", namespace="answers"),
+    )
+    for name, texts in loaders.items():
+        pipeline.register_loader(name, FakeLoader(texts))
+    return pipeline
+
+
+def point_count(pipeline: DataIngestion) -> int:
+    return pipeline.qdrant_client.count(config.COLLECTION_NAME, exact=True).count
+
+
+def test_content_hash_ignores_volatile_metadata():
+    first = Document(page_content="Python", metadata={"type": "skills", "last_updated": "2024-01-01"})
+    second = Document(page_content="Python", metadata={"type": "skills", "last_updated": "2025-06-30"})
+    changed = Document(page_content="Python", metadata={"type": "experience", "last_updated": "2024-01-01"})
+
+    assert content_hash(first) == content_hash(second)
+    assert content_hash(first) != content_hash(changed)
+
+
+def test_sync_adds_removes_and_skips_unchanged():
+    pipeline = make_pipeline(skills=["Python", "Docker", "SQL"], blog=["Post one"])
+
+    first = pipeline.sync_loader("skills")
+    assert (first["status"], first["added"], first["removed"]) == ("updated", 3, 0)
+    pipeline.sync_loader("blog")
+    assert point_count(pipeline) == 4
+
+    # Same content (only last_updated differs): stops after hashing
+    assert pipeline.sync_loader("skills")["status"] == "unchanged"
+
+    pipeline.loaders["skills"].texts = ["Python", "SQL", "Kubernetes"]
+    delta = pipeline.sync_loader("skills")
+    assert (delta["added"], delta["removed"], delta["unchanged"]) == (1, 1, 2)
+    assert point_count(pipeline) == 4
+
+    # Other loaders' points are untouched
+    assert len(pipeline.existing_point_ids("blog")) == 1
+
+
+def test_collection_changes_clear_cached_answers(tmp_path):
+    answers = SharedCache(str(tmp_path / "shared.sqlite3"), namespace="answers")
+    pipeline = make_pipeline(answer_cache=answers, skills=["Python"])
+    pipeline.sync_loader("skills")
+
+    answers.set("skills", {"response": "Python"})
+    pipeline.sync_loader("skills", force=True)
+    assert answers.get("skills") == {"response": "Python"}
+
+    pipeline.loaders["skills"].texts = ["Python", "Rust"]
+    pipeline.sync_loader("skills")
+    assert answers.get("skills") is None
+
+
+def test_empty_load_does_not_delete_points():
+    pipeline = make_pipeline(skills=["Python", "Docker"])
+    pipeline.sync_loader("skills")
+
+    pipeline.loaders["skills"].texts = []
+    assert pipeline.sync_loader("skills", force=True)["status"] == "empty"
+    assert point_count(pipeline) == 2
+
+
+def test_legacy_collection_requires_full_ingest():
+    pipeline = make_pipeline(skills=["Python", "Docker"])
+    pipeline.qdrant_client.create_collection(
+        config.COLLECTION_NAME, vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE)
+    )
+    # Point written by the old QdrantVectorStore.from_documents ingestion
+    pipeline.qdrant_client.upsert(config.COLLECTION_NAME, points=[PointStruct(
+        id=str(uuid.uuid4()),
+        vector=[0.1] * VECTOR_SIZE,
+        payload={"page_content": "Python", "metadata": {"source": "portfolio_config"}},
+    )])
+
+    with pytest.raises(LegacyCollectionError):
+        pipeline.sync_loader("skills")
+
+    pipeline.ingest(recreate_collection=False)
+    assert not pipeline.has_untagged_points()
+    assert point_count(pipeline) == 2
+    assert pipeline.sync_loader("skills", force=True)["status"] == "unchanged"
+
+
+class ProbeLoader(DataLoader):
+    """Loader recording how many points the live collection serves while it loads"""
+
+    def __init__(self, pipeline: DataIngestion, texts: List[str], fail: bool = False):
+        self.pipeline = pipeline
+        self.texts = texts
+        self.fail = fail
+        self.seen: List[int] = []
+
+    def load(self) -> List[Document]:
+        self.seen.append(point_count(self.pipeline))
+        if self.fail:
+            raise RuntimeError("source unavailable")
+        return FakeLoader(self.texts).load()
+
+
+def test_recreate_builds_aside_and_swaps_in_complete_collections():
+    pipeline = make_pipeline(skills=["Python", "Docker", "SQL"])
+    pipeline.ingest(recreate_collection=True)
+    probe = ProbeLoader(pipeline, ["Post one", "Post two"])
+    pipeline.register_loader("blog", probe)
+
+    # The old collection keeps serving while the new one is built
+    result = pipeline.ingest(recreate_collection=True)
+    assert result["status"] == "succeeded" and probe.seen == [3]
+    assert point_count(pipeline) == 5
+    assert pipeline.alias_target() is not None
+    collections = [collection.name for collection in pipeline.qdrant_client.get_collections().collections]
+    assert collections == [pipeline.alias_target()]
+
+    # A rebuild with a failed source is not swapped in
+    probe.fail = True
+    failed = pipeline.ingest(recreate_collection=True)
+    assert (failed["status"], failed["chunks"]) == ("aborted", 0) and "blog" in failed["errors"]
+    assert point_count(pipeline) == 5
+    assert len(pipeline.qdrant_client.get_collections().collections) == 1
+
+    # Syncs keep working through the alias
+    probe.fail = False
+    pipeline.loaders["skills"].texts = ["Python", "Rust"]
+    assert pipeline.sync_loader("skills")["added"] == 1
+    assert point_count(pipeline) == 4
+
+
+class RecordingPipeline:
+    """Stand-in pipeline recording sync_loader calls"""
+
+    def __init__(self, *names: str, fail: str = ""):
+        self.loaders = {name: None for name in names}
+        self.fail = fail
+        self.calls: List[str] = []
+
+    def sync_loader(self, name: str):
+        self.calls.append(name)
+        if name == self.fail:
+            raise RuntimeError("source unavailable")
+        return {"status": "updated", "added": 2, "removed": 1, "unchanged": 3}
+
+
+def test_scheduler_uses_per_loader_intervals_and_records_status():
+    async def scenario():
+        pipeline = RecordingPipeline("github_repos", "resume_pdf", fail="resume_pdf")
+        scheduler = IngestionScheduler(pipeline, intervals={"github_repos": 60}, default_interval=3600)
+
+        github = await scheduler.run_loader("github_repos")
+        resume = await scheduler.run_loader("resume_pdf")
+        await scheduler.stop()
+        return github, resume
+
+    github, resume = asyncio.run(asyncio.wait_for(scenario(), 10))
+
+    assert github["interval_seconds"] == 60
+    assert (github["status"], github["added"], github["removed"], github["runs"]) == ("updated", 2, 1, 1)
+    assert 0 < github["next_run_in_seconds"] <= 60
+
+    assert resume["interval_seconds"] == 3600
+    assert (resume["status"], resume["last_error"]) == ("error", "source unavailable")
+    assert resume["next_run_in_seconds"] > 3000
+
+
+def test_scheduler_loop_starts_due_loaders_once():
+    async def scenario():
+        pipeline = RecordingPipeline("a", "b")
+        scheduler = IngestionScheduler(pipeline, intervals={}, default_interval=3600, max_concurrency=2)
+        await scheduler.start()
+        while len(pipeline.calls) < 2:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        return pipeline.calls
+
+    calls = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert sorted(calls) == ["a", "b"]
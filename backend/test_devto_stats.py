@@ -0,0 +1,119 @@
+"""
+Tests for the dev.to stats store: paged fetching, daily upserts, legacy JSON import and the ingestion loader.
+
+Run with: python -m pytest test_devto_stats.py
+"""
+import json
+import os
+import subprocess
+import sys
+from datetime import date, timedelta
+
+import devto_stats
+from devto_stats import StatsStore, fetch_my_articles
+from ingest import DevToStatsLoader
+
+
+def article(article_id: int, title: str, views: int, reactions: int = 0, comments: int = 0):
+    return {
+        "id": article_id, "title": title, "url": f"https://dev.to/a/{article_id}", "published_at": "2024-01-02T10:00:00Z",
+        "tag_list": ["python", "rag"], "page_views_count": views, "public_reactions_count": reactions,
+        "comments_count": comments,
+    }
+
+
+def days_ago(days: int) -> str:
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self, articles):
+        self.articles = articles
+        self.pages = []
+
+    def get(self, url, params, headers, timeout):
+        self.pages.append(params["page"])
+        start = (params["page"] - 1) * params["per_page"]
+        return FakeResponse(self.articles[start:start + params["per_page"]])
+
+
+def test_fetch_pages_until_a_short_page(monkeypatch):
+    session = FakeSession([article(i, f"A{i}", i) for i in range(5)])
+    monkeypatch.setattr(devto_stats.clients, "requests_session", lambda: session)
+
+    articles = fetch_my_articles(api_key="key", page_size=2)
+
+    assert [a["id"] for a in articles] == [0, 1, 2, 3, 4]
+    assert session.pages == [1, 2, 3]
+
+
+def test_daily_upserts_series_and_growth(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.sqlite3"))
+    store.record([article(1, "RAG", 100, 5), article(2, "Agents", 40)], day=days_ago(40))
+    store.record([article(1, "RAG", 150, 6)], day=days_ago(10))
+    store.record([article(1, "RAG", 200, 7), article(2, "Agents", 45)])
+    # Re-running on the same day replaces that day's counts
+    store.record([article(1, "RAG", 210, 8), article(2, "Agents", 45)])
+
+    assert [row["page_views"] for row in store.series(1)] == [100, 150, 210]
+    assert [row["date"] for row in store.series(1, start=days_ago(20))] == [days_ago(10), date.today().isoformat()]
+    assert [(row["title"], row["page_views"]) for row in store.latest()] == [("RAG", 210), ("Agents", 45)]
+    assert store.growth(30)[1] == {"page_views": 110, "reactions": 3, "comments": 0}
+    assert store.growth(30)[2]["page_views"] == 5
+
+
+def test_legacy_json_history_is_adopted_by_real_ids(tmp_path):
+    legacy = tmp_path / "devToArticleStats.json"
+    legacy.write_text(json.dumps({"articles": [{
+        "title": "RAG", "published": "02-01-2024 10:00:00",
+        "stats": [
+            {"date": days_ago(3), "page_views_count": 80, "public_reactions_count": 4, "comments_count": 1},
+            {"date": days_ago(2), "page_views_count": 90, "public_reactions_count": 4, "comments_count": 1},
+        ],
+    }]}))
+    store = StatsStore(str(tmp_path / "stats.sqlite3"))
+
+    assert store.import_json(str(legacy)) == 2
+    store.record([article(7, "RAG", 120, 5, 1)])
+
+    assert [row["page_views"] for row in store.series(7)] == [80, 90, 120]
+    assert [row["id"] for row in store.articles()] == [7]
+
+
+def test_loader_builds_one_document_per_article(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.sqlite3"))
+    store.record([article(1, "RAG", 100)], day=days_ago(40))
+    store.record([article(1, "RAG", 180, 9, 2)])
+
+    docs = DevToStatsLoader(store, collect_first=False).load()
+
+    assert len(docs) == 1
+    assert docs[0].metadata["type"] == "article_stats"
+    assert docs[0].metadata["stats_date"] == date.today().isoformat()
+    assert "Page Views: 180" in docs[0].page_content
+    assert "Views in the last 30 days: 80" in docs[0].page_content
+
+
+def test_default_store_is_shared_by_scripts_run_from_any_directory(tmp_path):
+    backend = os.path.dirname(os.path.abspath(__file__))
+    env = {key: value for key, value in os.environ.items() if key != "DEVTO_STATS_PATH"}
+    env["PYTHONPATH"] = backend
+
+    # e.g. `cd src && python get_blogs.py` and ingestion run from backend/
+    path = subprocess.run(
+        [sys.executable, "-c", "from config import config; print(config.DEVTO_STATS_PATH)"],
+        cwd=tmp_path, env=env, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+    assert path == os.path.join(backend, ".cache", "devto_stats.sqlite3")
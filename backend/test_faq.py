@@ -0,0 +1,123 @@
+"""
+Tests for precomputed FAQ answers: question mining, fingerprint-driven regeneration and matching.
+Uses an in-memory Qdrant collection and deterministic fake embeddings.
+
+Run with: python -m pytest test_faq.py
+"""
+import asyncio
+from typing import List
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+
+from chunking import Chunker
+from faq import CURATED_QUESTIONS, FAQIndex, mine_questions, precompute
+from ingest import DataIngestion, DataLoader
+from shared_cache import SharedCache
+
+
+class FakeLoader(DataLoader):
+    def __init__(self, docs: List[Document]):
+        self.docs = docs
+
+    def load(self) -> List[Document]:
+        return list(self.docs)
+
+
+class AsyncSearch:
+    """Async facade over the sync in-memory client (separate in-memory clients don't share data)"""
+
+    def __init__(self, client: QdrantClient):
+        self.client = client
+
+    async def search(self, **kwargs):
+        return self.client.search(**kwargs)
+
+
+def experience(company: str) -> Document:
+    return Document(page_content=f"Consultant at {company}", metadata={"type": "experience", "company": company})
+
+
+def make_index(*docs: Document):
+    embeddings = DeterministicFakeEmbedding(size=1536)
+    pipeline = DataIngestion(
+        qdrant_client=QdrantClient(":memory:"),
+        embeddings=embeddings,
+        chunker=Chunker(count_tokens=lambda text: len(text.split())),
+        answer_cache=SharedCache(":memory:", namespace="answers"),
+    )
+    pipeline.register_loader("portfolio_config", FakeLoader(list(docs)))
+    pipeline.sync_loader("portfolio_config")
+    index = FAQIndex(pipeline.qdrant_client, AsyncSearch(pipeline.qdrant_client), embeddings, collection_name="faq")
+    return pipeline, index
+
+
+def test_questions_are_mined_from_metadata():
+    questions = mine_questions([
+        {"type": "experience", "company": "EY"},
+        {"type": "experience", "company": "EY"},
+        {"type": "project", "repo_name": "finrl"},
+        {"type": "article", "title": "Unknown"},
+        {"type": "skills"},
+    ])
+
+    assert questions == ["What did James do at EY?", "Tell me about James's finrl project"]
+
+
+def test_answers_regenerate_only_when_sources_change():
+    pipeline, index = make_index(experience("EY"))
+    asked: List[str] = []
+
+    def answer(question):
+        asked.append(question)
+        return {"response": f"Answer to {question}", "sources": []}
+
+    first = precompute(index, answer)
+    assert first["status"] == "updated"
+    assert first["answered"] == len(CURATED_QUESTIONS) + 1
+    assert "What did James do at EY?" in asked
+
+    asked.clear()
+    assert precompute(index, answer)["status"] == "unchanged"
+    assert asked == []
+
+    # New source content: regenerate, and drop questions that no longer apply
+    pipeline.loaders["portfolio_config"].docs = [experience("Siemens")]
+    pipeline.sync_loader("portfolio_config")
+    assert precompute(index, answer)["status"] == "updated"
+    stored = {point.payload["question"] for point in pipeline.qdrant_client.scroll("faq", limit=100)[0]}
+    assert "What did James do at Siemens?" in stored
+    assert "What did James do at EY?" not in stored
+
+
+def test_failed_regeneration_keeps_previous_answers():
+    pipeline, index = make_index(experience("EY"))
+    precompute(index, lambda q: {"response": "ok", "sources": []})
+
+    def outage(question):
+        raise RuntimeError("LLM unavailable")
+
+    result = precompute(index, outage, force=True)
+    assert result["status"] == "failed"
+    assert len(result["errors"]) == result["questions"]
+    assert pipeline.qdrant_client.count("faq").count == len(CURATED_QUESTIONS) + 1
+
+
+def test_matching_serves_stored_answer_and_reports_match_rate():
+    pipeline, index = make_index(experience("EY"))
+
+    async def scenario():
+        missing = await index.amatch("What are James's technical skills?")
+        precompute(index, lambda q: {"response": f"Stored: {q}", "sources": [{"content": "c", "metadata": {}}]})
+        hit = await index.amatch("What are James's technical skills?")
+        miss = await index.amatch("Completely unrelated question about the weather")
+        return missing, hit, miss
+
+    missing, hit, miss = asyncio.run(scenario())
+
+    assert missing is None
+    assert hit["response"] == "Stored: What are James's technical skills?"
+    assert hit["success"] and not hit["degraded"]
+    assert miss is None
+    assert index.stats()["match_rate"] == round(1 / 3, 3)
@@ -0,0 +1,165 @@
+"""
+Tests for admin ingestion jobs and admin authentication.
+
+Run with: python -m pytest test_ingest_jobs.py
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+import ingest_jobs
+from auth import require_admin
+from config import config
+from ingest_jobs import IngestionJobManager, JobConflictError
+
+
+class FakePipeline:
+    """Stand-in for DataIngestion reporting progress like the real pipeline"""
+
+    def __init__(self, results=None, fail=(), gate: threading.Event = None):
+        self.loaders = {"resume_pdf": None, "github_repos": None}
+        self.results = results or {}
+        self.fail = set(fail)
+        self.gate = gate
+        self.hook_runs = 0
+
+    def run_post_ingest_hooks(self):
+        self.hook_runs += 1
+
+    def sync_loader(self, name, force=False, progress=None, run_hooks=True):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if name in self.fail:
+            raise RuntimeError("API rate limited")
+        progress("load", 0, 1)
+        progress("load", 1, 0)
+        progress("split", 0, 2)
+        progress("split", 2, 0)
+        progress("embed", 0, 4)
+        progress("embed", 4, 0)
+        progress("upsert", 0, 4)
+        progress("upsert", 4, 0)
+        return self.results.get(name, {"loader": name, "status": "updated", "added": 4, "removed": 0, "unchanged": 0})
+
+    def ingest(self, recreate_collection=True, progress=None):
+        return self.results["ingest"]
+
+
+async def finish(job):
+    while job.status in ("queued", "running"):
+        await asyncio.sleep(0.01)
+    return job.to_dict()
+
+
+def run(scenario):
+    return asyncio.run(asyncio.wait_for(scenario(), 10))
+
+
+def test_job_reports_stage_progress():
+    pipeline = FakePipeline()
+
+    async def scenario():
+        manager = IngestionJobManager(lambda: pipeline)
+        job = await manager.submit(["resume_pdf", "github_repos"])
+        return await finish(job)
+
+    job = run(scenario)
+    assert job["status"] == "succeeded"
+    # Post-ingest hooks run once per job, not once per loader
+    assert pipeline.hook_runs == 1
+    stages = {stage["name"]: stage for stage in job["stages"]}
+    assert [stage["name"] for stage in job["stages"]] == ["load", "split", "embed", "upsert"]
+    assert (stages["embed"]["completed"], stages["embed"]["total"], stages["embed"]["status"]) == (8, 8, "done")
+
+
+def test_second_job_conflicts_while_running():
+    async def scenario():
+        gate = threading.Event()
+        manager = IngestionJobManager(lambda: FakePipeline(gate=gate))
+        job = await manager.submit()
+        with pytest.raises(JobConflictError):
+            await manager.submit()
+        gate.set()
+        await finish(job)
+        # Idle again: new jobs are accepted
+        return await finish(await manager.submit(["resume_pdf"]))
+
+    assert run(scenario)["status"] == "succeeded"
+
+
+def test_invalid_requests_are_rejected():
+    async def scenario():
+        manager = IngestionJobManager(lambda: FakePipeline())
+        with pytest.raises(ValueError, match="Unknown loaders: nope"):
+            await manager.submit(["nope"])
+        with pytest.raises(ValueError, match="requires all loaders"):
+            await manager.submit(["resume_pdf"], recreate_collection=True)
+        return manager.jobs
+
+    assert not run(scenario)
+
+
+def test_failed_and_empty_loaders_fail_the_job():
+    async def scenario():
+        pipeline = FakePipeline(
+            results={"resume_pdf": {"loader": "resume_pdf", "status": "empty", "added": 0, "removed": 0, "unchanged": 0}},
+            fail={"github_repos"},
+        )
+        manager = IngestionJobManager(lambda: pipeline)
+        return await finish(await manager.submit())
+
+    job = run(scenario)
+    assert job["status"] == "failed"
+    assert job["errors"] == ["resume_pdf: loaded no documents", "github_repos: API rate limited"]
+
+
+def test_aborted_full_ingestion_fails_the_job():
+    async def scenario():
+        pipeline = FakePipeline(results={"ingest": {
+            "status": "aborted", "documents": 0, "chunks": 0, "errors": {"github_repos": "timeout"},
+        }})
+        manager = IngestionJobManager(lambda: pipeline)
+        return await finish(await manager.submit(recreate_collection=True))
+
+    job = run(scenario)
+    assert job["status"] == "failed"
+    assert job["errors"] == ["github_repos: timeout", "No documents loaded; ingestion aborted"]
+
+
+def test_job_history_is_bounded(monkeypatch):
+    monkeypatch.setattr(ingest_jobs, "MAX_JOB_HISTORY", 3)
+
+    async def scenario():
+        manager = IngestionJobManager(lambda: FakePipeline())
+        ids = []
+        for _ in range(5):
+            job = await manager.submit(["resume_pdf"])
+            ids.append(job.job_id)
+            await finish(job)
+        return manager, ids
+
+    manager, ids = run(scenario)
+    assert list(manager.jobs) == ids[-3:]
+    assert manager.get(ids[0]) is None
+
+
+def test_require_admin(monkeypatch):
+    app = FastAPI()
+
+    @app.get("/admin", dependencies=[Depends(require_admin)])
+    async def admin():
+        return {"ok": True}
+
+    client = TestClient(app)
+
+    monkeypatch.setattr(config, "ADMIN_API_KEY", "")
+    assert client.get("/admin", headers={"X-Admin-Key": "anything"}).status_code == 403
+
+    monkeypatch.setattr(config, "ADMIN_API_KEY", "s3cret")
+    assert client.get("/admin").status_code == 401
+    assert client.get("/admin", headers={"X-Admin-Key": "wrong"}).status_code == 401
+    assert client.get("/admin", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+    assert client.get("/admin", headers={"X-Admin-Key": "s3cret"}).status_code == 200
@@ -3,9 +3,8 @@ Test script to validate Qdrant ingestion and retrieval.
 Checks collection status and runs sample queries.
 """
 import argparse
-from qdrant_client import QdrantClient
-from langchain_openai import OpenAIEmbeddings
 from langchain_qdrant import QdrantVectorStore
+from clients import clients
 from config import config
 
 
@@ -25,10 +24,7 @@ def main(skip_query: bool = False):
 
     # Initialize Qdrant client
     print("Connecting to Qdrant...")
-    client = QdrantClient(
-        url=config.QDRANT_URL,
-        api_key=config.QDRANT_API_KEY,
-    )
+    client = clients.qdrant()
 
     # Check collection exists
     collections = client.get_collections()
@@ -90,10 +86,7 @@ def main(skip_query: bool = False):
         print("="*60 + "\n")
 
         # Initialize embeddings and vector store
-        embeddings = OpenAIEmbeddings(
-            model=config.EMBEDDING_MODEL,
-            openai_api_key=config.OPENAI_API_KEY,
-        )
+        embeddings = clients.embeddings()
 
         vector_store = QdrantVectorStore(
             client=client,
@@ -124,6 +117,8 @@ def main(skip_query: bool = False):
                 print(f"Type: {doc.metadata.get('type', 'unknown')}")
                 print(f"Content: {doc.page_content[:200]}...")
 
+    clients.close()
+
     print("\n" + "="*60)
     print("VALIDATION COMPLETE!")
     print("="*60 + "\n")
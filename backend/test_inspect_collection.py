@@ -0,0 +1,108 @@
+"""
+Tests for the collection inspection CLI: full scroll, score matrices, neighbour histogram, outliers, orphans and output.
+Uses an in-memory Qdrant collection with clustered random vectors.
+
+Run with: python -m pytest test_inspect_collection.py -s   (prints analysis time)
+"""
+import csv
+import json
+import time
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from inspect_collection import Corpus, analyze, load_corpus, normalize, write_csv, write_json
+from retrieval import RetrievalPolicy
+
+POLICY = RetrievalPolicy(threshold=0.5, min_k=1, max_k=4, min_gap=0.0)
+
+
+def clustered_corpus(per_type: int = 200, dimensions: int = 64, seed: int = 7) -> Corpus:
+    """Three tight clusters (one per type), plus one skills chunk pointing elsewhere"""
+    rng = np.random.default_rng(seed)
+    centers = normalize(rng.normal(size=(3, dimensions)))
+    types = ["skills", "experience", "project"]
+    vectors, metadata = [], []
+    for center, doc_type in zip(centers, types):
+        vectors.append(center + 0.15 * rng.normal(size=(per_type, dimensions)) / np.sqrt(dimensions))
+        metadata += [{"type": doc_type, "source": "portfolio_config" if doc_type != "project" else "github"}] * per_type
+    vectors.append(rng.normal(size=(1, dimensions)))
+    metadata.append({"type": "skills", "source": "portfolio_config"})
+    matrix = normalize(np.vstack(vectors))
+    ids = [str(index) for index in range(len(matrix))]
+    return Corpus(ids=ids, vectors=matrix, metadata=metadata, texts=[f"chunk {index}" for index in ids])
+
+
+def test_load_corpus_scrolls_every_point_with_vectors():
+    client = QdrantClient(":memory:")
+    client.create_collection("chunks", vectors_config=VectorParams(size=8, distance=Distance.COSINE))
+    vectors = np.random.default_rng(1).normal(size=(700, 8))
+    client.upsert("chunks", points=[
+        PointStruct(id=index, vector=vector.tolist(), payload={"page_content": f"text {index}", "metadata": {"type": "skills"}})
+        for index, vector in enumerate(vectors)
+    ])
+
+    corpus = load_corpus(client, "chunks", batch_size=256)
+
+    assert len(corpus) == 700 and corpus.vectors.shape == (700, 8)
+    assert np.allclose(np.linalg.norm(corpus.vectors, axis=1), 1.0, atol=1e-5)
+    assert corpus.metadata[0] == {"type": "skills"} and corpus.texts[0] == "text 0"
+
+
+def test_analyze_scores_neighbours_outliers_and_orphans():
+    corpus = clustered_corpus()
+    # Questions aimed at the skills and experience clusters; projects are never asked about
+    queries = ["skills?", "experience?"]
+    query_vectors = np.vstack([corpus.vectors[:200].mean(axis=0), corpus.vectors[200:400].mean(axis=0)])
+
+    report = analyze(corpus, queries, query_vectors, POLICY, bins=20)
+
+    count = len(corpus)
+    assert report["scores"].shape == (2, count)
+    assert sum(bucket["pairs"] for bucket in report["histogram"]) == count * (count - 1) // 2
+    assert [hit["type"] for hit in report["queries"][0]["retrieved"]] == ["skills"] * 4
+    assert report["queries"][1]["retrieved"][0]["score"] >= report["queries"][1]["retrieved"][-1]["score"]
+
+    # The stray skills chunk is far from its type and isolated
+    stray = report["chunks"][-1]
+    assert stray["outlier"] == ["far_from_type", "isolated"] and report["outliers"] == [stray["id"]]
+    # Retrieved chunks are not orphans; the unasked project cluster is
+    assert set(report["orphans"]) >= {str(index) for index in range(400, 600)}
+    assert not set(hit["id"] for query in report["queries"] for hit in query["retrieved"]) & set(report["orphans"])
+
+    coverage = {(row["by"], row["name"]): row for row in report["coverage"]}
+    assert coverage[("type", "project")]["retrieved_share"] == 0.0
+    assert coverage[("source", "github")]["chunks"] == 200
+    assert coverage[("type", "experience")]["cohesion"] > 0.9
+
+
+def test_analysis_of_thousands_of_chunks_takes_well_under_a_second():
+    corpus = clustered_corpus(per_type=1000, dimensions=384)
+    query_vectors = normalize(np.random.default_rng(3).normal(size=(32, 384)))
+
+    started = time.perf_counter()
+    report = analyze(corpus, [f"q{index}" for index in range(32)], query_vectors, POLICY)
+    elapsed = time.perf_counter() - started
+
+    print(f"\nanalyzed {len(corpus)} chunks x 32 queries in {elapsed * 1000:.0f} ms")
+    assert elapsed < 1.0
+    assert report["near_duplicates"] > 0  # tight clusters
+
+
+def test_report_is_written_as_json_and_csv(tmp_path):
+    corpus = clustered_corpus(per_type=5)
+    report = analyze(corpus, ["skills?"], corpus.vectors[:1], POLICY)
+
+    write_json(report, str(tmp_path / "report.json"))
+    write_csv(report, str(tmp_path / "csv"), corpus.ids)
+
+    saved = json.loads((tmp_path / "report.json").read_text())
+    assert len(saved["scores"][0]) == len(corpus) and saved["collection"]["chunks"] == len(corpus)
+    with open(tmp_path / "csv" / "scores.csv", newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["query", *corpus.ids] and rows[1][0] == "skills?"
+    with open(tmp_path / "csv" / "chunks.csv", newline="") as file:
+        chunks = list(csv.DictReader(file))
+    assert len(chunks) == len(corpus) and chunks[-1]["outlier"] == "far_from_type;isolated"
+    assert (tmp_path / "csv" / "coverage.csv").exists() and (tmp_path / "csv" / "histogram.csv").exists()
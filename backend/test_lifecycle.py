@@ -0,0 +1,142 @@
+"""
+Tests for the server lifecycle: startup warm-up, readiness gating and draining in-flight requests.
+Uses an in-memory Qdrant collection and fake embeddings with a one-time connection setup delay.
+
+Run with: python -m pytest test_lifecycle.py -s   (prints first-request latencies)
+"""
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from lifecycle import InFlightMiddleware, ServiceState, warm_up
+from prompts import build_messages
+from tenants import Tenant, TenantChain
+
+# Simulated TLS handshake of the first provider call
+CONNECT_SECONDS = 0.3
+
+# Provider calls made, shared by all ColdEmbeddings instances (pydantic models)
+connected = []
+
+
+class ColdEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings whose first call pays for connection setup"""
+
+    def embed_query(self, text: str):
+        if not connected:
+            time.sleep(CONNECT_SECONDS)
+        connected.append(text)
+        return super().embed_query(text)
+
+
+def make_chain() -> TenantChain:
+    connected.clear()
+    client = QdrantClient(":memory:")
+    embeddings = ColdEmbeddings(size=16)
+    tenant = Tenant.from_dict({"id": "jane", "owner": "Jane Doe"})
+    client.create_collection(tenant.collection, vectors_config=VectorParams(size=16, distance=Distance.COSINE))
+    texts = ["Technical Skills: Python, PyTorch", "Work Experience: Consultant at EY (2021 - Present)"]
+    client.upsert(tenant.collection, points=[
+        PointStruct(id=index, vector=DeterministicFakeEmbedding(size=16).embed_query(text), payload={"page_content": text, "metadata": {}})
+        for index, text in enumerate(texts)
+    ])
+    return TenantChain(tenant, client, None, embeddings, load_vocabulary=True)
+
+
+async def first_request(chain: TenantChain) -> float:
+    """Latency of the query path (retrieval and prompt) for one question"""
+    started = time.perf_counter()
+    docs = await chain.retriever.ainvoke(chain.search_text("Does Jane know PyTorch?"))
+    build_messages("Does Jane know PyTorch?", docs, chain.tenant.owner)
+    return time.perf_counter() - started
+
+
+def test_warm_up_cuts_first_request_latency():
+    cold_chain = make_chain()
+    cold = asyncio.run(first_request(cold_chain))
+
+    warm_chain = make_chain()
+    steps = asyncio.run(warm_up(warm_chain, warm_chain.vector_store.embeddings))
+    warm = asyncio.run(first_request(warm_chain))
+
+    print(f"\nfirst request: cold {cold * 1000:.1f} ms, after warm-up {warm * 1000:.1f} ms ({steps})")
+    assert set(steps) == {"embed", "search", "prompt"}
+    assert steps["embed"] >= CONNECT_SECONDS
+    assert cold >= CONNECT_SECONDS > warm * 3
+
+
+def test_readiness_waits_for_successful_warm_up():
+    state = ServiceState()
+    attempts = []
+
+    async def flaky_warm_up():
+        attempts.append(state.ready)
+        if len(attempts) < 3:
+            raise ConnectionError("Qdrant unavailable")
+        return {"embed": 0.1}
+
+    assert not state.ready
+    asyncio.run(state.warm_up_until_ready(flaky_warm_up, retry_seconds=0))
+
+    assert attempts == [False, False, False]
+    assert state.ready
+    assert state.stats()["warmup"] == {"done": True, "attempts": 3, "seconds": {"embed": 0.1}, "error": None}
+
+
+def test_drain_waits_for_in_flight_requests():
+    async def scenario():
+        state = ServiceState()
+        state.warmed_up = True
+        finished = []
+
+        async def request():
+            async with state.track():
+                await asyncio.sleep(0.1)
+                finished.append(True)
+
+        task = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        remaining = await state.drain(timeout=5)
+        await task
+        return state, finished, remaining
+
+    state, finished, remaining = asyncio.run(scenario())
+
+    assert (finished, remaining) == ([True], 0)
+    assert not state.ready and state.draining
+
+    # A request outliving the timeout is reported, not waited for
+    async def stuck():
+        state = ServiceState()
+        async with state.track():
+            return await state.drain(timeout=0.05)
+
+    assert asyncio.run(stuck()) == 1
+
+
+def test_ready_endpoint_and_in_flight_middleware():
+    state = ServiceState()
+    app = FastAPI()
+    app.add_middleware(InFlightMiddleware, state=state)
+    seen = []
+
+    @app.get("/api/ready")
+    async def ready():
+        return state.stats()
+
+    @app.get("/api/chat")
+    async def chat():
+        seen.append(state.in_flight)
+        return {}
+
+    with TestClient(app) as client:
+        client.get("/api/chat")
+        probe = client.get("/api/ready").json()
+
+    assert seen == [1]
+    assert (probe["ready"], probe["in_flight"]) == (False, 0)
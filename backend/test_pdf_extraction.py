@@ -0,0 +1,123 @@
+"""
+Tests for PDF section extraction and the extraction cache.
+
+Run with: python -m pytest test_pdf_extraction.py
+"""
+import os
+
+import pytest
+
+import pdf_extraction
+from pdf_extraction import PDFTextCache, build_blocks, extract_pdfs, strip_page_footers
+
+
+RESUME_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "data", "James-Brendamour-Resume.pdf")
+
+BODY = 10.0
+SUBHEADING = 11.5
+HEADING = 13.0
+
+
+def test_headings_and_subheadings_split_sections():
+    pages = [[
+        (HEADING, "Experience", False),
+        (SUBHEADING, "EY", False),
+        (BODY, "Senior Consultant", False),
+        (BODY, "(2018 - 2022)", True),
+        (SUBHEADING, "Siemens", False),
+        (BODY, "Data Science Intern", False),
+        (HEADING, "Education", False),
+        (BODY, "Georgia Tech", False),
+    ]]
+    blocks = build_blocks(pages)
+
+    assert [(b["heading"], b["subheading"], b["text"]) for b in blocks] == [
+        ("Experience", "EY", "Senior Consultant (2018 - 2022)"),
+        ("Experience", "Siemens", "Data Science Intern"),
+        ("Education", "", "Georgia Tech"),
+    ]
+
+
+def test_subheading_directly_before_heading_is_kept_as_text():
+    pages = [[
+        (HEADING, "James Brendamour", False),
+        (SUBHEADING, "Data Scientist and ML Engineer", False),
+        (HEADING, "Summary", False),
+        (BODY, "Builds machine learning systems and data products end to end", False),
+    ]]
+    blocks = build_blocks(pages)
+
+    assert blocks[0]["heading"] == "James Brendamour"
+    assert blocks[0]["text"] == "Data Scientist and ML Engineer"
+    assert blocks[1]["heading"] == "Summary"
+
+
+def test_bullets_are_detected():
+    pages = [[
+        (HEADING, "Projects", False),
+        (BODY, "Highlights:", False),
+        (BODY, "• Built a RAG chatbot", False),
+        (BODY, "- Automated 150 tests", False),
+        (BODY, "2) Led a hackathon team", False),
+    ]]
+    [block] = build_blocks(pages)
+
+    assert block["bullets"] == ["Built a RAG chatbot", "Automated 150 tests", "Led a hackathon team"]
+
+
+def test_page_footers_are_removed():
+    runs = [
+        (BODY, "(January 2021)", False),
+        (9.0, "Page", True),
+        (9.0, "4", False),
+        (9.0, "of", False),
+        (9.0, "4", False),
+        (BODY, "continued", True),
+        (9.0, "Page 5 of 5", False),
+    ]
+    assert strip_page_footers(runs) == [(BODY, "(January 2021)", False), (BODY, "continued", False)]
+
+
+def test_cache_hit_and_version_invalidation(tmp_path, monkeypatch):
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"%PDF-fake")
+    calls = []
+
+    def fake_extract(path, index):
+        calls.append((path, index))
+        return [(HEADING, "Skills", False), (BODY, "Python", False)]
+
+    monkeypatch.setattr(pdf_extraction, "page_count", lambda path: 2)
+    monkeypatch.setattr(pdf_extraction, "extract_page_runs", fake_extract)
+    cache = PDFTextCache(str(tmp_path / "cache"))
+
+    first = extract_pdfs([str(pdf)], cache, max_workers=1)[str(pdf)]
+    second = extract_pdfs([str(pdf)], cache, max_workers=1)[str(pdf)]
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["blocks"] == first["blocks"]
+    assert len(calls) == 2
+
+    monkeypatch.setattr(pdf_extraction, "EXTRACTION_VERSION", pdf_extraction.EXTRACTION_VERSION + 1)
+    third = extract_pdfs([str(pdf)], cache, max_workers=1)[str(pdf)]
+    assert third["cached"] is False
+    assert len(calls) == 4
+
+
+def test_process_pool_failure_falls_back_to_serial(tmp_path, monkeypatch):
+    class BrokenPool:
+        def __init__(self, *args, **kwargs):
+            raise OSError("no semaphores")
+
+    monkeypatch.setattr(pdf_extraction, "ProcessPoolExecutor", BrokenPool)
+    monkeypatch.setattr(pdf_extraction, "extract_page_runs", lambda path, index: [(BODY, f"page {index}", False)])
+
+    runs = pdf_extraction._run_page_tasks([("a.pdf", 0), ("a.pdf", 1)], max_workers=4)
+    assert runs == {("a.pdf", 0): [(BODY, "page 0", False)], ("a.pdf", 1): [(BODY, "page 1", False)]}
+
+
+@pytest.mark.skipif(not os.path.exists(RESUME_PATH), reason="resume PDF not available")
+def test_real_resume_sections(tmp_path):
+    blocks = extract_pdfs([RESUME_PATH], PDFTextCache(str(tmp_path)), max_workers=1)[RESUME_PATH]["blocks"]
+
+    assert {"Experience", "Education"} <= {block["heading"] for block in blocks}
+    assert not any("Page" in block["text"] and " of" in block["text"] for block in blocks)
@@ -0,0 +1,97 @@
+"""
+Tests for ingestion profiling: per-stage/per-loader sections, nested peaks, network metering and reports.
+Uses an in-memory Qdrant collection and deterministic fake embeddings.
+
+Run with: python -m pytest test_profiling.py
+"""
+import json
+from datetime import datetime
+from typing import List
+
+import httpx
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+
+from chunking import Chunker
+from ingest import DataIngestion, DataLoader
+from profiling import IngestionProfiler, NetworkMeter
+from shared_cache import SharedCache
+
+
+class AllocatingLoader(DataLoader):
+    """Loader that allocates a few MB while loading"""
+
+    def __init__(self, texts: List[str], scratch_bytes: int = 0):
+        self.texts = texts
+        self.scratch_bytes = scratch_bytes
+
+    def load(self) -> List[Document]:
+        scratch = bytearray(self.scratch_bytes)
+        del scratch
+        return [
+            Document(page_content=text, metadata={"source": "fake", "type": "skills", "last_updated": datetime.now().isoformat()})
+            for text in self.texts
+        ]
+
+
+def make_pipeline() -> DataIngestion:
+    pipeline = DataIngestion(
+        qdrant_client=QdrantClient(":memory:"),
+        embeddings=DeterministicFakeEmbedding(size=64),
+        chunker=Chunker(count_tokens=lambda text: len(text.split())),
+        answer_cache=SharedCache(":memory:", namespace="answers"),
+    )
+    pipeline.register_loader("small", AllocatingLoader(["Python", "Docker"]))
+    pipeline.register_loader("large", AllocatingLoader(["Kubernetes", "Qdrant", "FastAPI"], scratch_bytes=8_000_000))
+    return pipeline
+
+
+def test_profile_covers_every_stage_and_loader(tmp_path):
+    pipeline = make_pipeline()
+    profiler = IngestionProfiler(cprofile=True)
+    pipeline.profiler = profiler
+
+    with profiler.running(pipeline.qdrant_client):
+        pipeline.ingest(recreate_collection=True)
+    report = profiler.report()
+
+    assert list(report["stages"]) == ["setup", "load", "split", "dedup", "embed", "upsert", "post_ingest"]
+    assert report["loaders"]["small"]["items"] == 2
+    assert report["loaders"]["large"]["items"] == 3
+    assert report["stages"]["embed"]["items"] == 5
+    # The large loader's scratch buffer is attributed to it and to the enclosing load stage
+    assert report["loaders"]["large"]["peak_memory_bytes"] >= 8_000_000
+    assert report["loaders"]["small"]["peak_memory_bytes"] < 8_000_000
+    assert report["stages"]["load"]["peak_memory_bytes"] >= 8_000_000
+    assert report["hottest_stage"] in report["stages"]
+
+    paths = profiler.write_reports(str(tmp_path))
+    assert json.loads(open(paths["json"]).read())["loaders"]["large"]["items"] == 3
+    assert "INGESTION PROFILE" in open(paths["text"]).read()
+    assert paths["cprofile"].endswith(f"-{report['hottest_stage']}.prof")
+
+
+def test_network_meter_counts_calls_and_bytes_per_host():
+    meter = NetworkMeter()
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"x" * 100)))
+    meter.attach_httpx(client)
+
+    client.post("https://api.openai.com/v1/embeddings", content=b"y" * 40)
+    client.get("https://dev.to/api/articles")
+
+    assert meter.totals() == (2, 40, 200)
+    assert meter.by_host()["api.openai.com"] == {"calls": 1, "bytes_sent": 40, "bytes_received": 100}
+
+    meter.detach()
+    client.get("https://dev.to/api/articles")
+    assert meter.totals()[0] == 2
+
+
+def test_pipeline_without_profiler_is_unchanged():
+    pipeline = make_pipeline()
+
+    result = pipeline.ingest(recreate_collection=True)
+
+    assert result["status"] == "succeeded"
+    assert not pipeline.profiler.enabled
@@ -0,0 +1,74 @@
+"""
+Tests for the prompt-prefix caching layout and prompt token accounting.
+
+Run with: python -m pytest test_prompts.py
+"""
+import asyncio
+
+from langchain_core.documents import Document
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from prompts import SYSTEM_PROMPT, PromptUsageTracker, build_messages, format_context, prompt_usage
+
+SKILLS = Document(page_content="Technical Skills: Python, Docker", metadata={"source": "portfolio_config", "type": "skills"})
+EY = Document(page_content="Consultant at EY", metadata={"source": "portfolio_config", "type": "experience", "company": "EY"})
+ARTICLE_1 = Document(page_content="# RAG\nPart one", metadata={"source": "blog", "type": "article", "title": "RAG", "chunk_index": 0})
+ARTICLE_2 = Document(page_content="# RAG\nPart two", metadata={"source": "blog", "type": "article", "title": "RAG", "chunk_index": 1})
+
+
+def test_system_prefix_is_static():
+    first = build_messages("What are James's skills?", [SKILLS, EY])
+    second = build_messages("Tell me about his blog", [ARTICLE_1])
+
+    assert isinstance(first[0], SystemMessage)
+    assert first[0].content == second[0].content == SYSTEM_PROMPT
+    # Variable content only after the system message, question last
+    assert first[1].content.endswith("Question: What are James's skills?")
+
+
+def test_context_order_is_deterministic_and_evergreen_first():
+    by_score = format_context([ARTICLE_2, EY, ARTICLE_1, SKILLS])
+    other_question = format_context([SKILLS, ARTICLE_1, ARTICLE_2, EY])
+
+    assert by_score == other_question
+    assert by_score.split("\n\n") == [SKILLS.page_content, EY.page_content, ARTICLE_1.page_content, ARTICLE_2.page_content]
+
+
+def test_prompt_usage_reads_openai_and_langchain_usage():
+    openai_style = LLMResult(
+        generations=[[ChatGeneration(message=AIMessage(content="a"))]],
+        llm_output={"token_usage": {
+            "prompt_tokens": 1500, "completion_tokens": 80, "prompt_tokens_details": {"cached_tokens": 1280},
+        }},
+    )
+    metadata_style = LLMResult(generations=[[ChatGeneration(message=AIMessage(
+        content="a",
+        usage_metadata={
+            "input_tokens": 900, "output_tokens": 40, "total_tokens": 940, "input_token_details": {"cache_read": 768},
+        },
+    ))]])
+
+    assert prompt_usage(openai_style) == {"prompt_tokens": 1500, "cached_tokens": 1280, "completion_tokens": 80}
+    assert prompt_usage(metadata_style) == {"prompt_tokens": 900, "cached_tokens": 768, "completion_tokens": 40}
+    assert prompt_usage(LLMResult(generations=[[ChatGeneration(message=AIMessage(content="a"))]])) is None
+
+
+def test_tracker_counts_tokens_per_completion():
+    tracker = PromptUsageTracker()
+    llm = GenericFakeChatModel(messages=iter([
+        AIMessage(content="one", usage_metadata={"input_tokens": 1200, "output_tokens": 50, "total_tokens": 1250}),
+        AIMessage(content="two", usage_metadata={
+            "input_tokens": 1200, "output_tokens": 50, "total_tokens": 1250, "input_token_details": {"cache_read": 1024},
+        }),
+    ]))
+
+    llm.invoke(build_messages("q1", [SKILLS]), config={"callbacks": [tracker]})
+    asyncio.run(llm.ainvoke(build_messages("q2", [SKILLS]), config={"callbacks": [tracker]}))
+
+    stats = tracker.stats()
+    assert stats["completions"] == 2
+    assert stats["prompt_tokens"] == 2400
+    assert stats["cached_tokens"] == 1024
+    assert stats["cached_ratio"] == round(1024 / 2400, 3)
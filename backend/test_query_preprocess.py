@@ -0,0 +1,89 @@
+"""
+Tests for query preprocessing (normalization, abbreviations, typo correction) and the in-process embedding LRU.
+
+Run with: python -m pytest test_query_preprocess.py
+"""
+from typing import List
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from query_preprocess import QueryPreprocessor, collection_vocabulary
+from shared_cache import CachedEmbeddings, LRUCache, SharedCache
+
+VOCABULARY = {"langchain", "pytorch", "siemens", "azure", "postgresql", "fastapi"}
+
+
+EMBEDDED: List[List[str]] = []
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    def embed_documents(self, texts):
+        EMBEDDED.append(list(texts))
+        return super().embed_documents(texts)
+
+
+def test_variants_share_one_canonical_query():
+    preprocessor = QueryPreprocessor(VOCABULARY, typo_cutoff=0.8)
+
+    variants = {preprocessor.normalize(q) for q in ("Python exp?", "python experience", "Python   experience??")}
+
+    assert variants == {"python experience"}
+    assert preprocessor.stats()["rewritten"] == 2
+
+
+def test_abbreviations_and_possessives():
+    preprocessor = QueryPreprocessor(typo_cutoff=0.8)
+
+    assert preprocessor.normalize("What are James's ML skills?") == "what are james machine learning skills"
+    assert preprocessor.normalize("Does he know k8s or ci/cd?") == "does he know kubernetes or continuous integration deployment"
+    assert preprocessor.normalize("C++, C# or node.js?") == "c++ c# or node.js"
+
+
+def test_typos_are_corrected_against_ingested_vocabulary_only():
+    preprocessor = QueryPreprocessor(VOCABULARY, typo_cutoff=0.8)
+
+    assert preprocessor.normalize("Langchian or pytroch experince?") == "langchain or pytorch experience"
+    assert preprocessor.normalize("Did he work at Siemns with Azrue?") == "did he work at siemens with azure"
+    # Common words and unknown terms are left alone
+    assert preprocessor.normalize("Where would James thrive?") == "where would james thrive"
+
+
+def test_vocabulary_is_mined_from_collection_payloads():
+    client = QdrantClient(":memory:")
+    client.create_collection("portfolio", vectors_config=VectorParams(size=4, distance=Distance.COSINE))
+    payloads = [
+        {"page_content": "Technical Skills: Python, LangChain, PyTorch", "metadata": {"type": "skills"}},
+        {"page_content": "Consultant at EY", "metadata": {"type": "experience", "company": "Ernst & Young"}},
+        {"page_content": "finrl", "metadata": {"type": "project", "repo_name": "finrl_trading", "language": "Python"}},
+    ]
+    client.upsert("portfolio", points=[PointStruct(id=i, vector=[1, 0, 0, 0], payload=p) for i, p in enumerate(payloads)])
+
+    vocabulary = collection_vocabulary(client, "portfolio")
+
+    assert {"langchain", "pytorch", "ernst", "young", "finrl", "trading", "python"} <= vocabulary
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(2)
+    lru.set_many({"a": 1, "b": 2})
+    lru.get_many(["a"])
+    lru.set_many({"c": 3})
+
+    assert lru.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert lru.stats()["hits"] == 3
+
+
+def test_embedding_lru_serves_repeats_before_the_shared_cache():
+    shared = SharedCache(":memory:", namespace="vectors")
+    embeddings = CachedEmbeddings(CountingEmbeddings(size=8), shared, "fake", memory_entries=16)
+    EMBEDDED.clear()
+
+    first = embeddings.embed_query("python experience")
+    second = embeddings.embed_query("python experience")
+
+    assert first == second
+    assert EMBEDDED == [["python experience"]]
+    assert embeddings.memory.stats()["hits"] == 1
+    assert shared.stats()["hits"] == 0
@@ -0,0 +1,125 @@
+"""
+Tests for LLM deadlines, hedged retries, the circuit breaker and extractive fallback answers.
+
+Run with: python -m pytest test_resilience.py
+"""
+import asyncio
+
+import pytest
+from langchain_core.documents import Document
+
+from resilience import CircuitBreaker, LatencyTracker, extractive_answer, hedged
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+
+def test_circuit_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=clock)
+
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 31
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    # Only one trial call while half-open
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 62
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats()["times_opened"] == 2
+
+
+def test_hedged_second_attempt_wins_over_slow_first():
+    delays = [5.0, 0.01]
+    started = []
+
+    async def call():
+        delay = delays[len(started)]
+        started.append(delay)
+        await asyncio.sleep(delay)
+        return f"answer after {delay}s"
+
+    assert run(hedged(call, deadline=2, hedge_after=0.05)) == "answer after 0.01s"
+    assert started == [5.0, 0.01]
+
+
+def test_hedged_retries_failures_then_raises_last_error():
+    calls = []
+
+    async def call():
+        calls.append(1)
+        raise RuntimeError(f"attempt {len(calls)} failed")
+
+    with pytest.raises(RuntimeError, match="attempt 2 failed"):
+        run(hedged(call, deadline=2, hedge_after=1, max_attempts=2))
+    assert len(calls) == 2
+
+
+def test_hedged_deadline_bounds_latency():
+    async def call():
+        await asyncio.sleep(5)
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(asyncio.TimeoutError):
+            await hedged(call, deadline=0.2, hedge_after=0.05)
+        return loop.time() - started
+
+    assert run(timed()) < 0.5
+
+
+def test_latency_tracker_percentiles():
+    tracker = LatencyTracker(window=100)
+    assert tracker.percentile(0.95) is None
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+    assert tracker.percentile(0.5) == pytest.approx(0.051)
+    assert tracker.percentile(0.95) == pytest.approx(0.096)
+
+
+def test_extractive_answer_quotes_matching_lines():
+    docs = [
+        Document(page_content="Work Experience: Senior Consultant at EY (2018 - 2022)\nLed SAP test automation."),
+        Document(page_content="Technical Skills: Python, Docker, Kubernetes"),
+    ]
+    answer = extractive_answer("Does James know Kubernetes?", docs, max_lines=1)
+
+    assert answer.endswith("- Technical Skills: Python, Docker, Kubernetes")
+    assert "couldn't find" in extractive_answer("Anything?", [])
+
+
+def test_extractive_answer_names_the_tenant_owner():
+    docs = [
+        Document(page_content="Anna led the platform team at Acme."),
+        Document(page_content="Technical Skills: Go, Terraform, Kubernetes"),
+    ]
+    # The owner's name is ignored when matching, so it does not pull in the line that mentions Anna
+    answer = extractive_answer("What does Anna know about Kubernetes?", docs, owner="Anna Schmidt", max_lines=1)
+
+    assert answer.startswith("Here is what Anna's portfolio says about that:")
+    assert answer.endswith("- Technical Skills: Go, Terraform, Kubernetes")
+    assert "James" not in answer
+    assert "Anna's portfolio" in extractive_answer("Anything?", [], owner="Anna Schmidt")
+    # A question to another tenant still matches on "james"
+    assert extractive_answer("James", [Document(page_content="Intro\nJames Smith, mentor")], owner="Anna Schmidt", max_lines=1).endswith("- James Smith, mentor")
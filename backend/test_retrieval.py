@@ -0,0 +1,105 @@
+"""
+Tests for score-aware retrieval: threshold enforcement, dynamic k, per-model calibration and fitting.
+Uses an in-memory Qdrant collection and fixed query vectors.
+
+Run with: python -m pytest test_retrieval.py
+"""
+import math
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+from langchain_qdrant import QdrantVectorStore
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from calibrate import evaluate, fit
+from retrieval import RetrievalPolicy, RetrievalStats, ScoredRetriever, save_calibration
+
+
+def unit(angle: float) -> List[float]:
+    """2-D unit vector whose cosine similarity with [1, 0] is cos(angle)"""
+    return [math.cos(angle), math.sin(angle)]
+
+
+class FixedEmbeddings(Embeddings):
+    """Every query embeds to [1, 0]"""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[1.0, 0.0] for _ in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [1.0, 0.0]
+
+
+def make_retriever(similarities: List[float], policy: RetrievalPolicy) -> ScoredRetriever:
+    client = QdrantClient(":memory:")
+    client.create_collection("chunks", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    client.upsert("chunks", points=[
+        PointStruct(id=index, vector=unit(math.acos(score)), payload={"page_content": f"chunk {score}", "metadata": {}})
+        for index, score in enumerate(similarities)
+    ])
+    store = QdrantVectorStore(client=client, collection_name="chunks", embedding=FixedEmbeddings())
+    return ScoredRetriever(vector_store=store, policy=policy, stats=RetrievalStats())
+
+
+def test_select_cuts_at_threshold_and_score_gap():
+    policy = RetrievalPolicy(threshold=0.5, min_k=1, max_k=4, min_gap=0.1)
+
+    # One clear match: the drop after it ends the context
+    assert policy.select([0.9, 0.62, 0.6, 0.58]) == (4, 1)
+    # Candidates scoring alike keep the full context
+    assert policy.select([0.8, 0.78, 0.75, 0.74]) == (4, 4)
+    # The threshold is applied before the gap; max_k caps both
+    assert policy.select([0.7, 0.68, 0.4, 0.3]) == (2, 2)
+    assert policy.select([0.9, 0.88, 0.87, 0.86, 0.85]) == (4, 4)
+    assert policy.select([0.3]) == (0, 0)
+    # A gap of 0 disables dynamic k; min_k keeps at least that many above the threshold
+    assert RetrievalPolicy(0.5, 1, 4, 0.0).select([0.9, 0.6, 0.55]) == (3, 3)
+    assert RetrievalPolicy(0.5, 2, 4, 0.1).select([0.9, 0.6, 0.55]) == (3, 3)
+
+
+def test_retriever_enforces_threshold_and_records_stats():
+    retriever = make_retriever([0.95, 0.7, 0.68, 0.3], RetrievalPolicy(threshold=0.5, min_k=1, max_k=4, min_gap=0.1))
+
+    docs = retriever.invoke("anything")
+
+    assert [doc.page_content for doc in docs] == ["chunk 0.95"]
+    assert retriever.stats.stats() == {
+        "searches": 1, "candidates": 4, "below_threshold": 1, "cut_by_gap": 2, "mean_k": 1.0, "k": {1: 1},
+    }
+
+    # Without a gap cut every candidate above the threshold is returned
+    static = make_retriever([0.95, 0.7, 0.68, 0.3], RetrievalPolicy(threshold=0.5, min_k=1, max_k=4, min_gap=0.0))
+    assert len(static.invoke("anything")) == 3
+
+
+def test_calibration_is_stored_per_embedding_model(tmp_path):
+    path = str(tmp_path / "calibration.json")
+    save_calibration("model-a:native", {"threshold": 0.42, "min_gap": 0.06}, path)
+    save_calibration("model-b:256:local", {"threshold": 0.3, "min_gap": 0.0}, path)
+
+    policy = RetrievalPolicy.from_config(path, model_id="model-a:native")
+    other = RetrievalPolicy.from_config(path, model_id="model-b:256:local")
+    default = RetrievalPolicy.from_config(path, model_id="uncalibrated")
+
+    assert (policy.threshold, policy.min_gap) == (0.42, 0.06)
+    assert (other.threshold, other.min_gap) == (0.3, 0.0)
+    assert default == RetrievalPolicy.from_config(str(tmp_path / "missing.json"))
+
+
+def test_fit_finds_threshold_and_gap_that_shorten_simple_questions():
+    samples = [
+        # Simple: one relevant chunk far ahead of the rest
+        [(0.82, True), (0.55, False), (0.52, False), (0.5, False)],
+        [(0.78, True), (0.5, False), (0.48, False), (0.45, False)],
+        # Hard: several relevant chunks scoring alike, then noise
+        [(0.66, True), (0.64, True), (0.63, True), (0.41, False)],
+        [(0.7, True), (0.69, True), (0.44, False), (0.4, False)],
+    ]
+    static = RetrievalPolicy(threshold=0.0, min_k=1, max_k=4, min_gap=0.0)
+
+    policy, metrics = fit(samples, min_k=1, max_k=4)
+
+    assert evaluate(samples, static) == {"precision": 0.438, "recall": 1.0, "f1": 0.609, "mean_k": 4.0}
+    assert metrics == {"precision": 1.0, "recall": 1.0, "f1": 1.0, "mean_k": 1.75}
+    assert [policy.select([score for score, _ in candidates])[1] for candidates in samples] == [1, 1, 3, 2]
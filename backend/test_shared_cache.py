@@ -0,0 +1,141 @@
+"""
+Tests for the cross-worker answer/embedding caches and the host lock.
+
+Run with: python -m pytest test_shared_cache.py
+"""
+import asyncio
+import multiprocessing
+import sqlite3
+import threading
+import time
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+import shared_cache
+from config import config
+from shared_cache import CachedEmbeddings, SharedCache, answer_key, try_host_lock
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """Fake embeddings recording every text sent to the provider"""
+    calls: list = []
+
+    def embed_documents(self, texts):
+        self.calls.extend(texts)
+        return super().embed_documents(texts)
+
+
+def _write_from_worker(path: str):
+    SharedCache(path, namespace="answers").set("q", {"response": "from another worker"})
+
+
+def test_values_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    worker = multiprocessing.get_context("spawn").Process(target=_write_from_worker, args=(path,))
+    worker.start()
+    worker.join(30)
+
+    assert SharedCache(path, namespace="answers").get("q") == {"response": "from another worker"}
+    # Namespaces are independent
+    assert SharedCache(path, namespace="other").get("q") is None
+
+
+def test_ttl_eviction_and_clear(tmp_path, monkeypatch):
+    path = str(tmp_path / "shared.sqlite3")
+    now = [1000.0]
+    monkeypatch.setattr(shared_cache.time, "time", lambda: now[0])
+    monkeypatch.setattr(shared_cache, "EVICT_EVERY", 1)
+
+    cache = SharedCache(path, namespace="answers", ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    now[0] += 61
+    assert cache.get("a") is None
+
+    cache.set_many({"b": 2})
+    now[0] += 1
+    cache.set_many({"c": 3})
+    now[0] += 1
+    cache.set_many({"d": 4})
+    assert cache.get_many(["a", "b", "c", "d"]) == {"c": 3, "d": 4}
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 2
+
+
+def test_cached_embeddings_only_embed_misses(tmp_path):
+    cache = SharedCache(
+        str(tmp_path / "shared.sqlite3"), namespace="query_embeddings",
+        dumps=shared_cache._pack_vector, loads=shared_cache._unpack_vector,
+    )
+    inner = CountingEmbeddings(size=8)
+    inner.calls = []
+    embeddings = CachedEmbeddings(inner, cache, model="test-model")
+
+    first = embeddings.embed_documents(["python", "docker"])
+    second = embeddings.embed_documents(["docker", "sql", "python"])
+
+    assert inner.calls == ["python", "docker", "sql"]
+    assert [round(x, 5) for x in second[0]] == [round(x, 5) for x in first[1]]
+    # A different model never reuses vectors
+    CachedEmbeddings(inner, cache, model="other-model").embed_query("python")
+    assert inner.calls[-1] == "python"
+
+
+def test_contended_writes_are_skipped_instead_of_blocking(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    cache = SharedCache(path, namespace="answers", busy_timeout=0.05)
+    cache.set("a", 1)
+
+    # Another worker holds the write lock
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.perf_counter()
+        cache.set("b", 2)
+        assert asyncio.run(cache.aget("a")) == 1  # WAL readers are not blocked by the writer
+        assert time.perf_counter() - started < 1.0
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    assert cache.get("b") is None and cache.stats()["contended"] == 1
+    asyncio.run(cache.aset("b", 2))
+    assert cache.get("b") == 2
+
+
+def test_each_thread_opens_its_own_connection(tmp_path):
+    cache = SharedCache(str(tmp_path / "shared.sqlite3"), namespace="answers")
+    errors, connections = [], []
+
+    def worker(index: int):
+        try:
+            cache.set(f"k{index}", index)
+            assert cache.get(f"k{index}") == index
+            connections.append(cache._connection())
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [] and len({id(conn) for conn in connections}) == 8 and len(cache) == 8
+
+
+def test_answer_key_normalizes_case_and_whitespace():
+    assert answer_key("What are  James's skills?") == answer_key("what are james's skills? ")
+    assert answer_key("Skills?") != answer_key("Education?")
+
+
+def test_host_lock_is_exclusive(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "SHARED_CACHE_PATH", str(tmp_path / "shared.sqlite3"))
+
+    first = try_host_lock("ingest-scheduler")
+    assert first is not None
+    assert try_host_lock("ingest-scheduler") is None
+    first.close()
+    assert try_host_lock("ingest-scheduler") is not None
@@ -0,0 +1,58 @@
+"""
+Tests for typed response sources: field extraction, previews, compact mode and stored-form round trips.
+
+Run with: python -m pytest test_sources.py
+"""
+import orjson
+from langchain_core.documents import Document
+
+from sources import CompactSource, Source, preview, response_sources, source_from_dict, source_from_document
+
+ARTICLE = Document(
+    page_content="Blog Article: Building RAG systems\n" + "word " * 100,
+    metadata={
+        "source": "blog", "type": "article", "title": "Building RAG systems", "url": "https://dev.to/a/1",
+        "last_updated": "2024-06-01T08:30:00", "content_hash": "abc", "_id": "point-1", "_collection_name": "portfolio-chat",
+    },
+)
+
+
+def test_source_keeps_only_typed_fields():
+    source = source_from_document(ARTICLE)
+
+    assert (source.id, source.title, source.type, source.source, source.url) == (
+        "point-1", "Building RAG systems", "article", "blog", "https://dev.to/a/1",
+    )
+    assert len(source.content) <= 203 and source.content.endswith("...")
+    assert not hasattr(source, "__dict__")  # slotted
+    assert set(orjson.loads(orjson.dumps(source))) == {"id", "title", "type", "source", "url", "content"}
+
+
+def test_title_falls_back_to_type():
+    skills = source_from_document(Document(page_content="Python", metadata={"type": "skills", "source": "portfolio_config"}))
+    experience = source_from_document(Document(page_content="EY", metadata={"type": "experience", "company": "EY"}))
+
+    assert skills.title == "Skills"
+    assert experience.title == "EY"
+
+
+def test_preview_cuts_at_word_boundary():
+    assert preview("short text", 200) == "short text"
+    assert preview("alpha beta gamma", 12) == "alpha beta..."
+
+
+def test_compact_mode_returns_ids_and_titles():
+    sources = [source_from_document(ARTICLE)]
+
+    assert response_sources(sources) is sources
+    assert response_sources(sources, compact=True) == [CompactSource(id="point-1", title="Building RAG systems")]
+
+
+def test_stored_sources_round_trip_including_legacy_entries():
+    source = source_from_document(ARTICLE)
+    legacy = {"content": "Consultant at EY", "metadata": {"type": "experience", "company": "EY", "_id": "point-2"}}
+
+    assert source_from_dict(orjson.loads(orjson.dumps(source))) == source
+    assert source_from_dict(legacy) == Source(
+        id="point-2", title="EY", type="experience", source="", url="", content="Consultant at EY",
+    )
@@ -0,0 +1,96 @@
+"""
+Tests for structured answers: intent detection, confidence fallback, templates and record loading.
+Uses an in-memory Qdrant collection and deterministic fake embeddings.
+
+Run with: python -m pytest test_structured_answers.py
+"""
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from query_preprocess import QueryPreprocessor
+from structured_answers import StructuredAnswerer, classify
+from tenants import Tenant, TenantChain
+
+OWNER = "James Brendamour"
+
+CHUNKS = [
+    {"page_content": "Technical Skills: Python, PyTorch, LangChain", "metadata": {"type": "skills", "source": "portfolio_config"}},
+    {"page_content": "Work Experience: Consultant at EY (2021 - Present)", "metadata": {
+        "type": "experience", "company": "EY", "position": "Consultant", "from": "2021", "to": "Present"}},
+    {"page_content": "Work Experience: Data Scientist at Siemens (2018 - 2021)", "metadata": {
+        "type": "experience", "company": "Siemens", "position": "Data Scientist", "from": "2018", "to": "2021"}},
+    {"page_content": "Education: M.S. Data Science from Northwestern (2019 - 2021)", "metadata": {
+        "type": "education", "institution": "Northwestern", "degree": "M.S. Data Science", "from": "2019", "to": "2021"}},
+    {"page_content": "Resume: Experience section", "metadata": {"type": "resume_pdf", "section": "Experience"}},
+]
+
+
+def make_answerer() -> StructuredAnswerer:
+    answerer = StructuredAnswerer(OWNER, min_confidence=0.85)
+    answerer.set_records(CHUNKS)
+    return answerer
+
+
+def test_classify_names_intent_and_confidence():
+    cases = {
+        "Where did he study?": ("education", 1.0),
+        "List James's skills": ("skills", 1.0),
+        "What is his current role?": ("current_role", 1.0),
+        "Where has James worked?": ("experience", 1.0),
+    }
+    for question, (intent, confidence) in cases.items():
+        found, score = classify(question, OWNER)
+        assert (found.name, score) == (intent, confidence), question
+
+    # Specific questions are only partly understood; open questions name no intent
+    assert classify("What did he study at Northwestern?", OWNER)[1] < 0.85
+    assert classify("Does he know Kubernetes?", OWNER) == (None, 0.0)
+
+
+def test_templates_answer_from_records_with_sources():
+    answerer = make_answerer()
+
+    education = answerer.answer("where did he study")
+    current = answerer.answer("what is his current role")
+    experience = answerer.answer("where has james worked")
+    skills = answerer.answer("list his skills")
+
+    assert education["response"] == "James's education:\n- M.S. Data Science, Northwestern (2019 - 2021)"
+    assert current["response"] == "James is currently Consultant at EY (since 2021)."
+    assert experience["response"].splitlines()[1:] == ["- Consultant at EY (2021 - Present)", "- Data Scientist at Siemens (2018 - 2021)"]
+    assert skills["response"] == "James's technical skills: Python, PyTorch, LangChain."
+    assert education["structured"] and not education["degraded"]
+    assert [source.title for source in experience["sources"]] == ["EY", "Siemens"]
+
+
+def test_low_confidence_or_missing_records_fall_back():
+    answerer = make_answerer()
+
+    assert answerer.answer("what did he study at northwestern and why") is None
+    assert answerer.answer("what certifications does he have") is None  # no certification records
+    assert answerer.stats() == {"lookups": 2, "answers": 0, "records": 4}
+
+
+def test_preprocessed_abbreviations_reach_the_fast_path():
+    answerer = make_answerer()
+    question = QueryPreprocessor(typo_cutoff=0.8).normalize("James's edu?")
+
+    assert answerer.answer(question)["intent"] == "education"
+
+
+def test_tenant_chain_loads_records_from_its_collection():
+    client = QdrantClient(":memory:")
+    embeddings = DeterministicFakeEmbedding(size=16)
+    tenant = Tenant.from_dict({"id": "jane", "owner": "Jane Doe"})
+    client.create_collection(tenant.collection, vectors_config=VectorParams(size=16, distance=Distance.COSINE))
+    client.upsert(tenant.collection, points=[
+        PointStruct(id=index, vector=embeddings.embed_query(chunk["page_content"]), payload=chunk)
+        for index, chunk in enumerate(CHUNKS)
+    ])
+
+    chain = TenantChain(tenant, client, None, embeddings, load_vocabulary=True)
+    result = chain.structured.answer(chain.search_text("Where did Jane study?"))
+
+    assert result["response"].startswith("Jane's education:")
+    assert result["sources"][0].id == "3"
@@ -0,0 +1,147 @@
+"""
+Tests for multi-tenant serving: the tenant registry, path routing, per-tenant state LRU, retrieval and ingestion.
+Uses an in-memory Qdrant instance and deterministic fake embeddings.
+
+Run with: python -m pytest test_tenants.py
+"""
+import asyncio
+import json
+from typing import Any, Dict, List
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from config import config
+from ingest import TenantIngestion
+from prompts import build_messages, system_prompt
+from tenants import (
+    Tenant,
+    TenantChain,
+    TenantConfigError,
+    TenantRegistry,
+    TenantRoutingMiddleware,
+    TenantStates,
+    UnknownTenantError,
+    load_tenants,
+)
+
+JANE = Tenant.from_dict({"id": "jane", "owner": "Jane Doe", "github_username": "janedoe", "ingest_interval": 600})
+
+
+def test_tenant_defaults_and_validation():
+    assert JANE.collection == f"{config.COLLECTION_NAME}-jane"
+    assert JANE.faq_collection == f"{config.COLLECTION_NAME}-jane-faq"
+    assert not JANE.is_default
+
+    for entry in ({"id": "Jane!", "owner": "Jane"}, {"id": "jane"}, {"id": "jane", "owner": "Jane", "colour": "red"}):
+        with pytest.raises(TenantConfigError):
+            Tenant.from_dict(entry)
+
+
+def test_registry_loads_file_and_always_has_default(tmp_path):
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps([{"id": "jane", "owner": "Jane Doe", "collection": "jane-docs"}]))
+
+    registry = TenantRegistry(load_tenants(str(path)))
+
+    assert len(registry) == 2
+    assert registry.get().id == config.DEFAULT_TENANT
+    assert registry.get("jane").faq_collection == "jane-docs-faq"
+    with pytest.raises(UnknownTenantError):
+        registry.get("bob")
+
+    path.write_text(json.dumps([{"id": "jane", "owner": "A"}, {"id": "jane", "owner": "B"}]))
+    with pytest.raises(TenantConfigError):
+        load_tenants(str(path))
+
+
+def test_middleware_strips_tenant_prefix():
+    seen: List[Dict[str, Any]] = []
+
+    async def app(scope, receive, send):
+        seen.append(scope)
+
+    middleware = TenantRoutingMiddleware(app)
+    asyncio.run(middleware({"type": "http", "path": "/t/jane/api/chat", "raw_path": b"/t/jane/api/chat"}, None, None))
+    asyncio.run(middleware({"type": "http", "path": "/api/chat", "raw_path": b"/api/chat"}, None, None))
+
+    assert (seen[0]["path"], seen[0]["raw_path"], seen[0]["tenant"]) == ("/api/chat", b"/api/chat", "jane")
+    assert seen[1]["path"] == "/api/chat" and "tenant" not in seen[1]
+
+
+def test_tenant_states_build_once_and_evict_least_recently_used():
+    built: List[str] = []
+    states = TenantStates(lambda tenant: built.append(tenant.id) or tenant.id.upper(), max_entries=2)
+    tenants = [Tenant.from_dict({"id": tenant_id, "owner": "Owner"}) for tenant_id in ("a", "b", "c")]
+
+    assert [states.get(tenant) for tenant in tenants[:2]] == ["A", "B"]
+    states.get(tenants[0])
+    states.get(tenants[2])  # evicts "b"
+
+    assert states.peek("b") is None
+    assert sorted(states.loaded()) == ["A", "C"]
+    assert built == ["a", "b", "c"]
+    assert states.stats()["evictions"] == 1
+
+
+def test_tenant_chains_retrieve_from_their_own_collection():
+    client = QdrantClient(":memory:")
+    embeddings = DeterministicFakeEmbedding(size=32)
+    default = TenantRegistry().get()
+    for tenant, text in ((default, "Technical Skills: Python, Docker"), (JANE, "Technical Skills: Terraform, Kubernetes")):
+        client.create_collection(tenant.collection, vectors_config=VectorParams(size=32, distance=Distance.COSINE))
+        client.upsert(tenant.collection, points=[PointStruct(
+            id=0, vector=embeddings.embed_query(text), payload={"page_content": text, "metadata": {"type": "skills"}},
+        )])
+
+    chains = {tenant.id: TenantChain(tenant, client, None, embeddings, load_vocabulary=True) for tenant in (default, JANE)}
+
+    assert chains["jane"].vector_store.similarity_search("skills", k=2)[0].page_content.endswith("Terraform, Kubernetes")
+    assert chains[default.id].vector_store.similarity_search("skills", k=2)[0].page_content.endswith("Python, Docker")
+    assert chains["jane"].faq.collection_name == JANE.faq_collection
+    assert chains["jane"].answer_cache.namespace == "answers:jane"
+    # Typo correction only knows the tenant's own terms
+    assert chains["jane"].search_text("terrafrom or kubernets") == "terraform or kubernetes"
+    assert chains[default.id].search_text("terrafrom") == "terrafrom"
+
+
+def test_prompts_name_the_tenant_owner():
+    assert "Jane Doe's portfolio" in system_prompt("Jane Doe")
+    assert system_prompt("Jane Doe") is system_prompt("Jane Doe")
+
+    messages = build_messages("Skills?", [], owner="Jane Doe")
+
+    assert "Jane Doe" in messages[0].content
+    assert "Jane's portfolio" in messages[1].content
+
+
+class FakePipeline:
+    def __init__(self, tenant: Tenant, loaders: List[str]):
+        self.tenant = tenant
+        self.loaders = {name: None for name in loaders}
+        self.synced: List[str] = []
+
+    def sync_loader(self, name: str, force: bool = False, progress=None, run_hooks: bool = True) -> Dict[str, Any]:
+        self.synced.append(name)
+        return {"loader": name, "tenant": self.tenant.id}
+
+
+def test_tenant_ingestion_names_loaders_per_tenant():
+    pipelines: Dict[str, FakePipeline] = {}
+
+    def build(tenant: Tenant) -> FakePipeline:
+        pipelines[tenant.id] = FakePipeline(tenant, ["resume_pdf", "github_repos"] if tenant.is_default else ["github_repos"])
+        return pipelines[tenant.id]
+
+    ingestion = TenantIngestion(TenantRegistry([JANE]), build=build, max_pipelines=4)
+    result = ingestion.sync_loader("jane/github_repos")
+
+    assert set(ingestion.loaders) == {
+        f"{config.DEFAULT_TENANT}/resume_pdf", f"{config.DEFAULT_TENANT}/github_repos", "jane/github_repos",
+    }
+    assert ingestion.intervals()["jane/github_repos"] == 600
+    assert result == {"loader": "jane/github_repos", "tenant": "jane"}
+    assert pipelines["jane"].synced == ["github_repos"]
+    assert pipelines[config.DEFAULT_TENANT].synced == []
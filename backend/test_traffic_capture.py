@@ -0,0 +1,125 @@
+"""
+Tests for chat traffic capture and replay: record format, rotation, timed and fast replay, and build comparison.
+Replays against a small in-process FastAPI app standing in for the chat API.
+
+Run with: python -m pytest test_traffic_capture.py
+"""
+import asyncio
+import os
+import time
+
+import httpx
+import orjson
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+from replay import compare, load_traffic, replay
+from sources import Source
+from traffic_capture import TrafficCapture, capture_files
+
+
+def result(*ids: str, **flags) -> dict:
+    sources = [Source(id=id, title=id, type="skills", source="portfolio_config", url="", content="") for id in ids]
+    return {"response": "answer", "sources": sources, "success": True, "degraded": False, **flags}
+
+
+def fake_api(cached: set) -> FastAPI:
+    """Chat API answering from "cache" for questions in `cached`"""
+    app = FastAPI()
+
+    def answer(message: str) -> dict:
+        return {"response": message, "sources": [{"id": word, "title": word} for word in message.split()[:2]]}
+
+    @app.post("/api/chat")
+    async def chat(body: dict):
+        return ORJSONResponse(answer(body["message"]), headers={"X-Served-By": "cache" if body["message"] in cached else "llm"})
+
+    @app.post("/api/chat/batch")
+    async def batch(body: dict):
+        served = ",".join("cache" if message in cached else "llm" for message in body["messages"])
+        return ORJSONResponse({"results": [answer(message) for message in body["messages"]]}, headers={"X-Served-By": served})
+
+    return app
+
+
+def test_capture_writes_compact_records(tmp_path):
+    capture = TrafficCapture(str(tmp_path / "traffic.jsonl"), max_bytes=10_000, backups=2)
+
+    capture.capture("chat", "default", ["Where did he study?"], 1000.0, 0.8124, 200, [result("3", structured=True)])
+    capture.capture("batch", "jane", ["a", "b"], 1001.5, 1.2, 200, [result("1", served_by="cache"), result("2", degraded=True)])
+    capture.capture("chat", "default", ["too fast"], 1002.0, 0.001, 429)
+    capture.close()
+
+    files = capture_files(str(tmp_path / "traffic.jsonl"))
+    assert files == [str(tmp_path / f"traffic.{os.getpid()}.jsonl")]
+    records = load_traffic(str(tmp_path))
+    assert records[0] == {
+        "ts": 1000.0, "ep": "chat", "tenant": "default", "q": ["Where did he study?"],
+        "status": 200, "ms": 812.4, "by": ["structured"], "src": [["3"]],
+    }
+    assert (records[1]["by"], records[1]["src"]) == (["cache", "degraded"], [["1"], ["2"]])
+    assert (records[2]["status"], records[2]["by"]) == (429, [])
+
+
+def test_capture_rotates_and_keeps_backups(tmp_path):
+    capture = TrafficCapture(str(tmp_path / "traffic.jsonl"), max_bytes=300, backups=2)
+
+    for index in range(20):
+        capture.capture("chat", "default", [f"question {index}"], 1000.0 + index, 0.1, 200, [result("1")])
+    capture.close()
+
+    files = capture_files(str(tmp_path / "traffic.jsonl"))
+    assert len(files) == 3  # current file and two backups
+    assert all(os.path.getsize(path) <= 300 for path in files)
+    # Oldest records were rotated out; the rest replay in time order
+    questions = [record["q"][0] for record in load_traffic(str(tmp_path))]
+    assert questions[-1] == "question 19" and "question 0" not in questions
+    assert questions == sorted(questions, key=lambda question: int(question.split()[1]))
+
+
+def test_replay_keeps_original_timing_or_runs_fast():
+    records = [
+        {"ts": 100.0, "ep": "chat", "tenant": "default", "q": ["python skills"]},
+        {"ts": 100.3, "ep": "batch", "tenant": "default", "q": ["rust go", "python skills"]},
+    ]
+
+    async def run(speed: float):
+        transport = httpx.ASGITransport(app=fake_api(cached={"python skills"}))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            started = time.perf_counter()
+            results = await replay(records, http, speed=speed)
+            return results, time.perf_counter() - started
+
+    timed, timed_seconds = asyncio.run(run(speed=1.0))
+    fast, fast_seconds = asyncio.run(run(speed=0))
+
+    assert timed_seconds >= 0.3 > fast_seconds
+    assert [result["by"] for result in fast] == [["cache"], ["llm", "cache"]]
+    assert [result["src"] for result in fast] == [[["python", "skills"]], [["rust", "go"], ["python", "skills"]]]
+    assert all(result["status"] == 200 for result in timed + fast)
+
+
+def test_compare_reports_latency_cache_and_source_changes(tmp_path):
+    captured = [
+        {"ep": "chat", "q": ["a"], "status": 200, "ms": 900.0, "by": ["llm"], "src": [["1", "2"]]},
+        {"ep": "chat", "q": ["b"], "status": 200, "ms": 800.0, "by": ["llm"], "src": [["3", "4"]]},
+        {"ep": "chat", "q": ["c"], "status": 429, "ms": 1.0, "by": [], "src": []},
+    ]
+    replayed = [
+        {"ep": "chat", "q": ["a"], "status": 200, "ms": 20.0, "by": ["cache"], "src": [["1", "2"]]},
+        {"ep": "chat", "q": ["b"], "status": 200, "ms": 700.0, "by": ["llm"], "src": [["3", "5"]]},
+        {"ep": "chat", "q": ["c"], "status": 200, "ms": 650.0, "by": ["llm"], "src": [["6"]]},
+    ]
+
+    report = compare(captured, replayed)
+
+    assert report["baseline"]["errors"] == 1 and report["candidate"]["errors"] == 0
+    assert (report["baseline"]["cache_hit_rate"], report["candidate"]["cache_hit_rate"]) == (0.0, 0.333)
+    assert report["candidate"]["p50_ms"] == 650.0
+    # Only requests that succeeded in both runs are compared
+    assert report["sources"] == {"questions": 2, "mean_overlap": round((1 + 1 / 3) / 2, 3), "identical_rate": 0.5}
+
+    # Saved runs round-trip through JSON
+    path = tmp_path / "run.json"
+    path.write_bytes(orjson.dumps({"results": replayed}))
+    assert compare(orjson.loads(path.read_bytes())["results"], replayed)["sources"]["identical_rate"] == 1.0
@@ -0,0 +1,202 @@
+"""
+Tests for the TypeScript config parser.
+Regression tests against gitprofile.config.ts plus randomized fuzz tests.
+
+Run with: python -m pytest test_ts_config_parser.py
+"""
+import json
+import os
+import random
+from typing import Any
+
+import pytest
+
+from ts_config_parser import ConfigParseError, get_path, parse_literal, parse_ts_config
+
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "gitprofile.config.ts")
+
+
+# Regression tests
+def test_parses_repository_config():
+    """The real portfolio config parses and exposes every section"""
+    with open(CONFIG_PATH, "r") as f:
+        portfolio = parse_ts_config(f.read())
+
+    assert portfolio["github"]["username"] == "jamesbmour"
+    assert "Python" in portfolio["skills"]
+    assert [exp["company"] for exp in portfolio["experiences"]][0] == "EY"
+    assert len(portfolio["educations"]) == 2
+    assert len(portfolio["certifications"]) == 1
+    assert portfolio["hotjar"]["snippetVersion"] == 6
+    assert portfolio["themeConfig"]["customTheme"]["--rounded-box"] == "3rem"
+
+
+def test_placeholder_certification_is_skipped():
+    """Template filler entries (lorem ipsum, example.com) are not ingested"""
+    from ingest import PortfolioConfigLoader
+
+    with open(CONFIG_PATH, "r") as f:
+        portfolio = parse_ts_config(f.read())
+
+    loader = PortfolioConfigLoader(CONFIG_PATH)
+    assert loader._extract_certifications(portfolio) == []
+
+    portfolio["certifications"].append({"name": "AWS Solutions Architect", "year": "2023", "link": "https://aws.amazon.com"})
+    assert [doc.metadata["name"] for doc in loader._extract_certifications(portfolio)] == ["AWS Solutions Architect"]
+
+
+def test_double_quoted_strings_with_apostrophes():
+    """Double-quoted values containing single quotes are kept whole"""
+    with open(CONFIG_PATH, "r") as f:
+        portfolio = parse_ts_config(f.read())
+
+    titles = [p["title"] for p in get_path(portfolio, "projects.external.projects")]
+    assert "Optimizing DQN Performance in OpenAI Gym's Lunar Lander: A Comprehensive Hyperparameter Study" in titles
+
+
+def test_section_order_does_not_matter():
+    """Sections are found regardless of which key follows them"""
+    source = """
+    const CONFIG = {
+      educations: [{ institution: 'A', degree: 'B' }],
+      experiences: [{ company: 'C', position: 'D', nested: { deep: [1, 2] } }],
+    };
+    export default CONFIG;
+    """
+    portfolio = parse_ts_config(source)
+    assert portfolio["experiences"][0]["nested"] == {"deep": [1, 2]}
+    assert portfolio["educations"][0]["institution"] == "A"
+
+
+def test_comments_trailing_commas_and_escapes():
+    source = r"""
+    // leading comment
+    const CONFIG: Config = {
+      /* block
+         comment */
+      'quoted-key': "say \"hi\"",
+      template: `multi
+line`,
+      escaped: 'it\'s é',
+      numbers: [1, -2, 3.5, 1e3, 0x10,],
+      flags: [true, false, null, undefined],
+    } as const;
+    """
+    portfolio = parse_ts_config(source)
+    assert portfolio["quoted-key"] == 'say "hi"'
+    assert portfolio["template"] == "multi\nline"
+    assert portfolio["escaped"] == "it's é"
+    assert portfolio["numbers"] == [1, -2, 3.5, 1000.0, 16]
+    assert portfolio["flags"] == [True, False, None, None]
+
+
+def test_export_default_literal():
+    assert parse_ts_config("export default { a: 1 };") == {"a": 1}
+
+
+@pytest.mark.parametrize("source", [
+    "const CONFIG = { a: 1",
+    "const CONFIG = { a: }",
+    "const CONFIG = { a: someVariable }",
+    "const CONFIG = { a: 'unterminated }",
+    "const OTHER = { a: 1 }",
+    "const CONFIG = { a: 1 b: 2 }",
+])
+def test_malformed_input_raises_parse_error(source):
+    with pytest.raises(ConfigParseError):
+        parse_ts_config(source)
+
+
+# Fuzz tests
+def _random_string(rng: random.Random) -> str:
+    alphabet = "abcXYZ 019'\"`\\\n\t{}[]:,/*-é€"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+
+
+def _random_value(rng: random.Random, depth: int = 0) -> Any:
+    choice = rng.randint(0, 6 if depth < 4 else 3)
+    if choice == 0:
+        return _random_string(rng)
+    if choice == 1:
+        return rng.randint(-10**6, 10**6)
+    if choice == 2:
+        return rng.choice([True, False, None])
+    if choice == 3:
+        return round(rng.uniform(-1000, 1000), 3)
+    if choice in (4, 5):
+        return {f"k{i}_{rng.randint(0, 99)}": _random_value(rng, depth + 1) for i in range(rng.randint(0, 4))}
+    return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+def _quote(rng: random.Random, text: str) -> str:
+    quote = rng.choice(["'", '"', "`"])
+    escaped = text.replace("\\", "\\\\").replace(quote, "\\" + quote)
+    if quote != "`":
+        escaped = escaped.replace("\n", "\\n")
+    return quote + escaped + quote
+
+
+def _to_ts(rng: random.Random, value: Any) -> str:
+    """Serialize a Python value as a TypeScript literal with random formatting"""
+    def sep() -> str:
+        return rng.choice(["", " ", "\n  ", " /* c */ ", " // c\n"])
+
+    if isinstance(value, dict):
+        items = []
+        for key, item in value.items():
+            key_text = key if rng.random() < 0.5 else _quote(rng, key).replace("`", "'")
+            items.append(f"{sep()}{key_text}{sep()}:{sep()}{_to_ts(rng, item)}")
+        trailing = "," if items and rng.random() < 0.5 else ""
+        return "{" + ",".join(items) + trailing + sep() + "}"
+    if isinstance(value, list):
+        items = [sep() + _to_ts(rng, item) for item in value]
+        trailing = "," if items and rng.random() < 0.5 else ""
+        return "[" + ",".join(items) + trailing + sep() + "]"
+    if isinstance(value, str):
+        return _quote(rng, value)
+    if value is None:
+        return rng.choice(["null", "undefined"])
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return repr(value)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_fuzz_round_trip(seed):
+    """Randomly generated configs parse back to the values they were built from"""
+    rng = random.Random(seed)
+    value = {f"section{i}": _random_value(rng) for i in range(rng.randint(1, 5))}
+    source = f"// generated\nconst CONFIG = {_to_ts(rng, value)};\nexport default CONFIG;\n"
+
+    assert parse_ts_config(source) == json.loads(json.dumps(value))
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_fuzz_mutations_fail_cleanly(seed):
+    """Corrupted configs either parse or raise ConfigParseError, never anything else"""
+    rng = random.Random(seed)
+    with open(CONFIG_PATH, "r") as f:
+        source = f.read()
+
+    chars = list(source)
+    for _ in range(rng.randint(1, 8)):
+        pos = rng.randrange(len(chars))
+        action = rng.randint(0, 2)
+        if action == 0:
+            del chars[pos]
+        elif action == 1:
+            chars.insert(pos, rng.choice("{}[]:,'\"`/*\\"))
+        else:
+            chars[pos] = rng.choice("{}[]:,'\"`/*\\ a1")
+
+    try:
+        result = parse_ts_config("".join(chars))
+    except ConfigParseError:
+        return
+    assert isinstance(result, dict)
+
+
+def test_deep_nesting_fails_cleanly():
+    with pytest.raises(ConfigParseError):
+        parse_literal("[" * 50000 + "]" * 50000)
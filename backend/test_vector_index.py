@@ -0,0 +1,104 @@
+"""
+Tests for Qdrant collection index settings (quantization, HNSW, on-disk), vector size
+inference and reduced-dimension embeddings.
+
+Run with: python -m pytest test_vector_index.py
+"""
+import math
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+from qdrant_client.models import BinaryQuantization, ScalarQuantization
+
+from chunking import Chunker
+from clients import ClientFactory
+from config import config
+from ingest import DataIngestion
+from shared_cache import SharedCache
+from vector_index import DimensionMismatchError, IndexSettings, TruncatedEmbeddings, embedding_model_id, truncate
+
+
+def make_pipeline(client: QdrantClient, size: int, **kwargs) -> DataIngestion:
+    return DataIngestion(
+        qdrant_client=client,
+        embeddings=DeterministicFakeEmbedding(size=size),
+        chunker=Chunker(count_tokens=lambda text: len(text.split())),
+        answer_cache=SharedCache(":memory:", namespace="answers"),
+        **kwargs,
+    )
+
+
+def test_default_settings_use_qdrant_defaults_at_search_time():
+    settings = IndexSettings()
+    kwargs = settings.collection_kwargs(256)
+
+    assert kwargs["vectors_config"].size == 256
+    assert kwargs["vectors_config"].on_disk is False
+    assert kwargs["quantization_config"] is None
+    assert (kwargs["hnsw_config"].m, kwargs["hnsw_config"].ef_construct) == (16, 100)
+    assert settings.search_params() is None
+
+
+def test_quantization_modes_and_rescoring():
+    scalar = IndexSettings(quantization="scalar", hnsw_ef=128, oversampling=3.0)
+    assert isinstance(scalar.quantization_config(), ScalarQuantization)
+    params = scalar.search_params()
+    assert params.hnsw_ef == 128
+    assert (params.quantization.rescore, params.quantization.oversampling) == (True, 3.0)
+
+    binary = IndexSettings(quantization="binary", quantization_always_ram=False, on_disk_vectors=True)
+    assert isinstance(binary.quantization_config(), BinaryQuantization)
+    assert binary.quantization_config().binary.always_ram is False
+    assert binary.collection_kwargs(1536)["vectors_config"].on_disk is True
+    assert binary.search_params().hnsw_ef is None
+
+    with pytest.raises(ValueError, match="Unknown quantization 'pq'"):
+        IndexSettings(quantization="pq")
+
+
+def test_collection_size_follows_embedding_model():
+    pipeline = make_pipeline(
+        QdrantClient(":memory:"), 256, index_settings=IndexSettings(quantization="scalar", on_disk_payload=True),
+    )
+    pipeline.setup_collection()
+
+    info = pipeline.qdrant_client.get_collection(config.COLLECTION_NAME)
+    assert info.config.params.vectors.size == 256
+
+
+def test_truncation_keeps_prefix_and_unit_length():
+    assert truncate([3.0, 4.0, 12.0], 2) == [0.6, 0.8]
+
+    vectors = TruncatedEmbeddings(DeterministicFakeEmbedding(size=1536), 256).embed_documents(["python", "docker"])
+    assert [len(vector) for vector in vectors] == [256, 256]
+    assert all(math.isclose(math.sqrt(sum(x * x for x in vector)), 1.0) for vector in vectors)
+
+
+def test_reduced_dimensions_are_wired_into_the_embeddings_client(monkeypatch):
+    monkeypatch.setattr(config, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(config, "EMBEDDING_DIMENSIONS", 512)
+
+    monkeypatch.setattr(config, "EMBEDDING_TRUNCATION", "provider")
+    assert ClientFactory().embeddings().dimensions == 512
+    provider_id = embedding_model_id()
+
+    monkeypatch.setattr(config, "EMBEDDING_TRUNCATION", "local")
+    local = ClientFactory().embeddings()
+    assert isinstance(local, TruncatedEmbeddings) and local.embeddings.dimensions is None
+    # Cache keys never mix embedding spaces
+    assert len({provider_id, embedding_model_id(), config.EMBEDDING_MODEL}) == 3
+
+
+def test_dimension_mismatch_is_refused_until_rebuilt():
+    client = QdrantClient(":memory:")
+    make_pipeline(client, 1536).setup_collection()
+
+    reduced = make_pipeline(client, 256)
+    with pytest.raises(DimensionMismatchError, match="stores 1536-dimensional vectors but the embedding settings produce 256"):
+        reduced.ensure_collection()
+
+    # A full ingestion recreates the collection with the new size
+    reduced.setup_collection()
+    reduced.ensure_collection()
+    assert client.get_collection(config.COLLECTION_NAME).config.params.vectors.size == 256
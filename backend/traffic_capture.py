@@ -0,0 +1,177 @@
+"""
+Chat traffic capture for the RAG chatbot API.
+Records /api/chat and /api/chat/batch requests to a rotating local log for offline replay (replay.py).
+
+Capture is opt-in (TRAFFIC_CAPTURE_ENABLED) because it stores user questions.
+Each request is one compact JSON line:
+
+    {"ts": 1760870000.123, "ep": "chat", "tenant": "default", "q": ["Where did he study?"],
+     "status": 200, "ms": 812.4, "by": ["llm"], "src": [["42", "57"]]}
+
+- ts: request start (Unix seconds), used to replay with the original timing
+- ep: "chat" or "batch"; q: the questions (one for /api/chat)
+- status, ms: response status and server-side latency
+- by: per question, what answered it (structured, cache, faq, llm, degraded or error)
+- src: per question, the IDs of the retrieved sources
+
+Session IDs, client addresses and answers are not recorded. Every worker
+writes its own file (`<stem>.<pid>.jsonl`, so workers never interleave or
+race on rotation), rotated at TRAFFIC_CAPTURE_MAX_BYTES with
+TRAFFIC_CAPTURE_BACKUPS old files kept per worker.
+"""
+import glob
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import orjson
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+def served_by(result: Dict[str, Any]) -> str:
+    """What answered a chat result: structured, cache, faq, llm, degraded or error"""
+    if not result.get("success", True):
+        return "error"
+    if result.get("degraded"):
+        return "degraded"
+    return result.get("served_by") or ("structured" if result.get("structured") else "llm")
+
+
+def source_ids(result: Dict[str, Any]) -> List[str]:
+    """IDs of a chat result's sources (typed sources or their dictionaries)"""
+    return [source["id"] if isinstance(source, dict) else source.id for source in result.get("sources", [])]
+
+
+class TrafficCapture:
+    """
+    Rotating JSON-lines writer for captured chat requests.
+
+    Appends are serialized with a lock; a line is a few hundred bytes, so
+    writing on the event loop costs microseconds.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None, backups: Optional[int] = None):
+        """
+        Args:
+            path: Capture file; the worker's PID is added before the suffix
+                (default: TRAFFIC_CAPTURE_PATH)
+            max_bytes: Size at which the file is rotated (default: TRAFFIC_CAPTURE_MAX_BYTES)
+            backups: Rotated files kept (default: TRAFFIC_CAPTURE_BACKUPS)
+        """
+        self.base = Path(path or config.TRAFFIC_CAPTURE_PATH)
+        # Resolved on first write: with a preloaded app the capture is created before workers fork
+        self.path: Optional[Path] = None
+        self.max_bytes = max_bytes or config.TRAFFIC_CAPTURE_MAX_BYTES
+        self.backups = config.TRAFFIC_CAPTURE_BACKUPS if backups is None else backups
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+        self.records = 0
+        self.errors = 0
+
+    def _open(self):
+        self.path = self.base.with_name(f"{self.base.stem}.{os.getpid()}{self.base.suffix}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        """Shift `<file>.1` ... `<file>.<backups>` and start a new file"""
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._open()
+
+    def write(self, record: Dict[str, Any]):
+        """Append one record (capture failures are logged, never raised to the request)"""
+        line = orjson.dumps(record) + b"\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._open()
+                elif self._size and self._size + len(line) > self.max_bytes:
+                    self._rotate()
+                self._file.write(line)
+                self._file.flush()
+                self._size += len(line)
+                self.records += 1
+            except OSError as e:
+                self.errors += 1
+                logger.warning(f"Could not capture chat traffic: {str(e)}")
+
+    def capture(
+        self,
+        endpoint: str,
+        tenant: str,
+        questions: Sequence[str],
+        started_at: float,
+        latency: float,
+        status: int,
+        results: Sequence[Dict[str, Any]] = (),
+    ):
+        """
+        Record one chat request.
+
+        Args:
+            endpoint: "chat" or "batch"
+            tenant: Tenant that answered
+            questions: The request's questions
+            started_at: Request start (Unix seconds)
+            latency: Seconds spent serving the request
+            status: Response status code
+            results: Chat results, one per question (empty when the request failed)
+        """
+        self.write({
+            "ts": round(started_at, 3),
+            "ep": endpoint,
+            "tenant": tenant,
+            "q": list(questions),
+            "status": status,
+            "ms": round(latency * 1000, 1),
+            "by": [served_by(result) for result in results],
+            "src": [source_ids(result) for result in results],
+        })
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def capture_files(path: str) -> List[str]:
+    """
+    Capture files of every worker, including rotated ones.
+
+    Args:
+        path: A capture file or directory, or the configured TRAFFIC_CAPTURE_PATH
+            (whose per-worker files are found by pattern)
+    """
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, "*.jsonl*")))
+    if os.path.isfile(path):
+        return [path]
+    base = Path(path)
+    return sorted(glob.glob(str(base.with_name(f"{base.stem}.*{base.suffix}*"))))
+
+
+def read_traffic(paths: Sequence[str]) -> Iterator[Dict[str, Any]]:
+    """Captured records of the given files (unreadable lines are skipped)"""
+    for path in paths:
+        with open(path, "rb") as file:
+            for line in file:
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Truncated by a crash mid-write
@@ -0,0 +1,322 @@
+"""
+TypeScript config parser for the RAG chatbot backend.
+Turns the object literal exported by gitprofile.config.ts into a Python dict.
+
+The parser understands the subset of TypeScript/JavaScript used for static
+configuration: object and array literals, single/double/backtick strings,
+numbers, booleans, null/undefined, comments and trailing commas. The source
+is tokenized in a single pass and parsed with a small recursive-descent
+parser, so section order, nesting and quote style no longer matter.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ConfigParseError(ValueError):
+    """Raised when the config source cannot be parsed"""
+
+    def __init__(self, message: str, position: int = -1):
+        self.position = position
+        if position >= 0:
+            message = f"{message} (at offset {position})"
+        super().__init__(message)
+
+
+# Token types
+PUNCT = "punct"
+STRING = "string"
+NUMBER = "number"
+IDENT = "ident"
+EOF = "eof"
+
+# Master pattern: one alternation matched repeatedly from the current offset.
+# Whitespace and comments are matched (and dropped) like any other token.
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>\s+)
+  | (?P<line_comment>//[^\n]*)
+  | (?P<block_comment>/\*.*?\*/)
+  | (?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*"|`(?:[^`\\]|\\.)*`)
+  | (?P<number>-?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))
+  | (?P<ident>[A-Za-z_$][A-Za-z0-9_$]*)
+  | (?P<punct>\.\.\.|[{}\[\]:,;()=.?<>|&!*+-])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_SIMPLE_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "0": "\0",
+    "\\": "\\",
+    "'": "'",
+    '"': '"',
+    "`": "`",
+    "\n": "",  # Line continuation
+}
+
+_ESCAPE_PATTERN = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", re.DOTALL)
+
+_LITERAL_IDENTIFIERS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "undefined": None,
+}
+
+_DECLARATION_PATTERN = r"\b(?:const|let|var)\s+{name}\b[^=;]*="
+
+
+def _unescape(raw: str) -> str:
+    """Resolve JavaScript escape sequences in a string literal body"""
+    if "\\" not in raw:
+        return raw
+
+    def replace(match: "re.Match[str]") -> str:
+        escape = match.group(1)
+        if escape.startswith("u{"):
+            return chr(int(escape[2:-1], 16))
+        if escape.startswith("u") and len(escape) == 5:
+            return chr(int(escape[1:], 16))
+        if escape.startswith("x") and len(escape) == 3:
+            return chr(int(escape[1:], 16))
+        return _SIMPLE_ESCAPES.get(escape, escape)
+
+    return _ESCAPE_PATTERN.sub(replace, raw)
+
+
+def tokenize(source: str, start: int = 0, balanced: bool = False) -> List[Tuple[str, Any, int]]:
+    """
+    Tokenize TypeScript source in a single pass.
+
+    Args:
+        source: Source text
+        start: Offset to start tokenizing from
+        balanced: Stop after the first complete literal, i.e. once the bracket
+            closing the first `{` or `[` is seen, so trailing TypeScript
+            (exports, type assertions) is never scanned
+
+    Returns:
+        List of (token_type, value, offset) tuples, terminated by an EOF token
+    """
+    tokens: List[Tuple[str, Any, int]] = []
+    append = tokens.append
+    depth = 0
+    pos = start
+
+    for match in _TOKEN_PATTERN.finditer(source, start):
+        if match.start() != pos:
+            raise ConfigParseError(f"Unexpected character {source[pos]!r}", pos)
+        pos = match.end()
+
+        kind = match.lastgroup
+        if kind == "ws" or kind == "line_comment" or kind == "block_comment":
+            continue
+
+        text = match.group()
+        offset = match.start()
+        if kind == "punct":
+            append((PUNCT, text, offset))
+            if text == "{" or text == "[":
+                depth += 1
+            elif text == "}" or text == "]":
+                depth -= 1
+        elif kind == "string":
+            append((STRING, _unescape(text[1:-1]), offset))
+        elif kind == "ident":
+            append((IDENT, text, offset))
+        else:
+            append((NUMBER, _to_number(text), offset))
+
+        if balanced and depth <= 0:
+            break
+    else:
+        if pos < len(source):
+            raise ConfigParseError(f"Unexpected character {source[pos]!r}", pos)
+
+    tokens.append((EOF, None, pos))
+    return tokens
+
+
+def _to_number(text: str) -> Any:
+    """Convert a numeric literal to int or float"""
+    negative = text.startswith("-")
+    body = text[1:] if negative else text
+
+    if body[:2] in ("0x", "0X"):
+        value: Any = int(body, 16)
+    elif any(ch in body for ch in ".eE"):
+        value = float(body)
+    else:
+        value = int(body)
+
+    return -value if negative else value
+
+
+class _Parser:
+    """Recursive-descent parser over a token list"""
+
+    def __init__(self, tokens: List[Tuple[str, Any, int]]):
+        self.tokens = tokens
+        self.index = 0
+
+    def peek(self) -> Tuple[str, Any, int]:
+        return self.tokens[self.index]
+
+    def advance(self) -> Tuple[str, Any, int]:
+        token = self.tokens[self.index]
+        if token[0] != EOF:
+            self.index += 1
+        return token
+
+    def expect(self, value: str) -> None:
+        kind, token_value, pos = self.advance()
+        if kind != PUNCT or token_value != value:
+            raise ConfigParseError(f"Expected {value!r}, found {token_value!r}", pos)
+
+    def at_punct(self, value: str) -> bool:
+        kind, token_value, _ = self.peek()
+        return kind == PUNCT and token_value == value
+
+    def parse_value(self) -> Any:
+        kind, value, pos = self.peek()
+
+        if kind == PUNCT and value == "{":
+            return self.parse_object()
+        if kind == PUNCT and value == "[":
+            return self.parse_array()
+        if kind == PUNCT and value == "-":
+            # Unary minus separated from its number by whitespace
+            self.advance()
+            kind, value, pos = self.advance()
+            if kind != NUMBER:
+                raise ConfigParseError("Expected number after '-'", pos)
+            return -value
+        if kind in (STRING, NUMBER):
+            self.advance()
+            return value
+        if kind == IDENT:
+            self.advance()
+            if value in _LITERAL_IDENTIFIERS:
+                return _LITERAL_IDENTIFIERS[value]
+            raise ConfigParseError(f"Unsupported expression {value!r}", pos)
+
+        raise ConfigParseError(f"Unexpected token {value!r}", pos)
+
+    def parse_object(self) -> Dict[str, Any]:
+        self.expect("{")
+        result: Dict[str, Any] = {}
+
+        while not self.at_punct("}"):
+            kind, key, pos = self.advance()
+            if kind == PUNCT and key == "[":
+                # Computed key: only literal keys are meaningful here
+                key = self.parse_value()
+                self.expect("]")
+            elif kind not in (IDENT, STRING, NUMBER):
+                raise ConfigParseError(f"Expected object key, found {key!r}", pos)
+
+            self.expect(":")
+            result[str(key)] = self.parse_value()
+
+            if not self.at_punct(","):
+                break
+            self.advance()
+
+        self.expect("}")
+        return result
+
+    def parse_array(self) -> List[Any]:
+        self.expect("[")
+        result: List[Any] = []
+
+        while not self.at_punct("]"):
+            result.append(self.parse_value())
+            if not self.at_punct(","):
+                break
+            self.advance()
+
+        self.expect("]")
+        return result
+
+
+def parse_literal(source: str, start: int = 0) -> Any:
+    """
+    Parse a single literal value starting at the given offset.
+
+    Args:
+        source: Source text
+        start: Offset of the first character of the literal
+
+    Returns:
+        Parsed Python value
+    """
+    parser = _Parser(tokenize(source, start, balanced=True))
+    try:
+        return parser.parse_value()
+    except RecursionError:
+        raise ConfigParseError("Literal is nested too deeply", start) from None
+
+
+def find_config_literal(source: str, variable: str = "CONFIG") -> int:
+    """
+    Locate the object literal assigned to the config variable.
+
+    Args:
+        source: TypeScript source
+        variable: Name of the config variable
+
+    Returns:
+        Offset of the opening brace of the config object
+    """
+    match = re.search(_DECLARATION_PATTERN.format(name=re.escape(variable)), source)
+    if match is None:
+        match = re.search(r"\bexport\s+default\s*(?=\{)", source)
+    if match is None:
+        raise ConfigParseError(f"Could not find '{variable}' object literal")
+
+    brace = source.find("{", match.end())
+    if brace < 0:
+        raise ConfigParseError(f"'{variable}' is not assigned an object literal", match.end())
+    return brace
+
+
+def parse_ts_config(source: str, variable: str = "CONFIG") -> Dict[str, Any]:
+    """
+    Parse a gitprofile-style TypeScript config into a dict.
+
+    Args:
+        source: Contents of gitprofile.config.ts
+        variable: Name of the config variable
+
+    Returns:
+        Dict mirroring the config object literal
+    """
+    value = parse_literal(source, find_config_literal(source, variable))
+    if not isinstance(value, dict):
+        raise ConfigParseError(f"'{variable}' is not an object literal")
+    return value
+
+
+def get_path(data: Dict[str, Any], path: str, default: Optional[Any] = None) -> Any:
+    """
+    Look up a dotted path (e.g. "projects.external.projects") in a parsed config.
+
+    Args:
+        data: Parsed config dict
+        path: Dotted key path
+        default: Value returned when any segment is missing
+
+    Returns:
+        The value at `path`, or `default`
+    """
+    current: Any = data
+    for key in path.split("."):
+        if not isinstance(current, dict) or key not in current:
+            return default
+        current = current[key]
+    return current
@@ -0,0 +1,198 @@
+"""
+Qdrant collection and search settings for the RAG chatbot.
+Builds vector, HNSW and quantization parameters from configuration.
+
+Collections are created with the vector size of the embedding model
+(instead of a hardcoded 1536), optional scalar (int8) or binary
+quantization, HNSW `m`/`ef_construct` and on-disk vectors/payloads.
+Searches use the matching `hnsw_ef` and quantization rescoring
+parameters, so the same settings apply to ingestion and the query path.
+
+Embeddings can be reduced to EMBEDDING_DIMENSIONS (Matryoshka-style), either
+by the provider's `dimensions` parameter or by local truncation and
+re-normalization; a collection built with another size is refused with a
+DimensionMismatchError instead of failing on every search.
+"""
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Distance,
+    HnswConfigDiff,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
+
+from config import config
+
+QUANTIZATION_MODES = ("none", "scalar", "binary")
+
+
+class DimensionMismatchError(RuntimeError):
+    """Raised when a collection's vector size differs from the configured embeddings"""
+
+
+@dataclass
+class IndexSettings:
+    """Vector storage, HNSW and quantization settings for one collection"""
+    quantization: str = "none"
+    quantization_always_ram: bool = True
+    rescore: bool = True
+    oversampling: float = 2.0
+    hnsw_m: int = 16
+    hnsw_ef_construct: int = 100
+    hnsw_ef: int = 0  # 0 = Qdrant's default at search time
+    on_disk_vectors: bool = False
+    on_disk_payload: bool = False
+
+    def __post_init__(self):
+        if self.quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unknown quantization '{self.quantization}'. Use one of: {', '.join(QUANTIZATION_MODES)}"
+            )
+
+    @classmethod
+    def from_config(cls) -> "IndexSettings":
+        """Settings from the QDRANT_* environment variables"""
+        return cls(
+            quantization=config.QDRANT_QUANTIZATION,
+            quantization_always_ram=config.QDRANT_QUANTIZATION_ALWAYS_RAM,
+            rescore=config.QDRANT_QUANTIZATION_RESCORE,
+            oversampling=config.QDRANT_QUANTIZATION_OVERSAMPLING,
+            hnsw_m=config.QDRANT_HNSW_M,
+            hnsw_ef_construct=config.QDRANT_HNSW_EF_CONSTRUCT,
+            hnsw_ef=config.QDRANT_HNSW_EF,
+            on_disk_vectors=config.QDRANT_ON_DISK_VECTORS,
+            on_disk_payload=config.QDRANT_ON_DISK_PAYLOAD,
+        )
+
+    def quantization_config(self):
+        """Qdrant quantization config, or None"""
+        if self.quantization == "scalar":
+            return ScalarQuantization(scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8, quantile=0.99, always_ram=self.quantization_always_ram,
+            ))
+        if self.quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=self.quantization_always_ram))
+        return None
+
+    def collection_kwargs(self, vector_size: int) -> Dict[str, Any]:
+        """
+        Keyword arguments for QdrantClient.create_collection.
+
+        Args:
+            vector_size: Embedding dimensions
+
+        Returns:
+            vectors_config, hnsw_config, quantization_config and on_disk_payload
+        """
+        return {
+            "vectors_config": VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=self.on_disk_vectors),
+            "hnsw_config": HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct),
+            "quantization_config": self.quantization_config(),
+            "on_disk_payload": self.on_disk_payload,
+        }
+
+    def search_params(self) -> Optional[SearchParams]:
+        """Search-time parameters (hnsw_ef, quantization rescoring), or None for Qdrant defaults"""
+        quantization = None
+        if self.quantization != "none":
+            quantization = QuantizationSearchParams(rescore=self.rescore, oversampling=self.oversampling)
+        if quantization is None and not self.hnsw_ef:
+            return None
+        return SearchParams(hnsw_ef=self.hnsw_ef or None, quantization=quantization)
+
+
+def truncate(vector: List[float], dimensions: int) -> List[float]:
+    """First `dimensions` components of `vector`, re-normalized to unit length"""
+    head = vector[:dimensions]
+    norm = math.sqrt(sum(x * x for x in head)) or 1.0
+    return [x / norm for x in head]
+
+
+class TruncatedEmbeddings(Embeddings):
+    """
+    Reduces embeddings to their first `dimensions` components (local Matryoshka truncation).
+
+    For text-embedding-3 models this matches the provider's `dimensions`
+    parameter; it also works for providers without one.
+    """
+
+    def __init__(self, embeddings: Embeddings, dimensions: int):
+        """
+        Args:
+            embeddings: Full-size embeddings client
+            dimensions: Dimensions to keep
+        """
+        self.embeddings = embeddings
+        self.dimensions = dimensions
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [truncate(vector, self.dimensions) for vector in self.embeddings.embed_documents(texts)]
+
+    def embed_query(self, text: str) -> List[float]:
+        return truncate(self.embeddings.embed_query(text), self.dimensions)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [truncate(vector, self.dimensions) for vector in await self.embeddings.aembed_documents(texts)]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return truncate(await self.embeddings.aembed_query(text), self.dimensions)
+
+
+def embedding_model_id() -> str:
+    """Identifies the configured embedding space (model and reduced size), e.g. for cache keys"""
+    if not config.EMBEDDING_DIMENSIONS:
+        return config.EMBEDDING_MODEL
+    return f"{config.EMBEDDING_MODEL}:{config.EMBEDDING_DIMENSIONS}:{config.EMBEDDING_TRUNCATION}"
+
+
+def embedding_dimensions(embeddings) -> int:
+    """
+    Vector size produced by an embeddings client (one short probe request).
+
+    Args:
+        embeddings: Embeddings client
+
+    Returns:
+        Number of dimensions
+    """
+    return len(embeddings.embed_query("dimension probe"))
+
+
+def collection_dimensions(qdrant_client, collection_name: str) -> Optional[int]:
+    """Vector size of an existing collection, or None if it does not exist"""
+    if not qdrant_client.collection_exists(collection_name):
+        return None
+    vectors = qdrant_client.get_collection(collection_name).config.params.vectors
+    # Unnamed vectors are VectorParams; named vectors a dict of them
+    return vectors.size if hasattr(vectors, "size") else next(iter(vectors.values())).size
+
+
+def check_collection_dimensions(qdrant_client, collection_name: str, expected: int):
+    """
+    Refuse to use a collection built with another embedding size.
+
+    Raises:
+        DimensionMismatchError: If the collection exists with a different vector size
+    """
+    actual = collection_dimensions(qdrant_client, collection_name)
+    if actual is not None and actual != expected:
+        raise DimensionMismatchError(
+            f"Collection '{collection_name}' stores {actual}-dimensional vectors but the embedding settings "
+            f"produce {expected} (EMBEDDING_MODEL={config.EMBEDDING_MODEL}, "
+            f"EMBEDDING_DIMENSIONS={config.EMBEDDING_DIMENSIONS or 'native'}). Rebuild the collection with "
+            f"`python ingest.py` or restore the previous embedding settings."
+        )
+
+
+# Create a singleton instance
+index_settings = IndexSettings.from_config()
@@ -74,9 +74,9 @@ const Message: React.FC<MessageProps> = ({ message }) => {
                 <span
                   key={index}
                   className="text-xs px-2 py-1 bg-gray-300 text-gray-700 rounded-full"
-                  title={source.content}
+                  title={source.content || source.title}
                 >
-                  {source.metadata?.type || 'source'} {index + 1}
+                  {source.type || 'source'} {index + 1}
                 </span>
               ))}
             </div>
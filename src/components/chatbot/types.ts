@@ -11,12 +11,12 @@ export interface Message {
 }
 
 export interface Source {
-  content: string;
-  metadata?: {
-    source?: string;
-    type?: string;
-    [key: string]: any;
-  };
+  id: string;
+  title: string;
+  type?: string;
+  source?: string;
+  url?: string;
+  content?: string;
 }
 
 export interface ChatState {